@@ -4,19 +4,28 @@ This module provides an abstract base class that can be extended for any TCG
 """
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional
-import random
+
+from deck_accumulator import DeckAccumulator
+from deck_sampler import sample_cards
+from deck_profile import get_cards_profile
+from random_source import RandomSource, make_rng
 
 
 class BaseDeckBuilder(ABC):
     """Abstract base class for TCG deck builders"""
     
-    def __init__(self, db_session=None):
-        """Initialize the deck builder with card database"""
+    def __init__(self, db_session=None, seed: RandomSource = None):
+        """
+        Initialize the deck builder with card database
+        
+        Args:
+            db_session: Database session to load cards from (optional)
+            seed: Seed, random.Random or NumPy Generator for card choices (optional)
+        """
         self.db = db_session
+        self.rng = make_rng(seed)
         self.cards = None  # Will be loaded from database
         self.max_copies = 4  # Most TCGs use 4 as default
-        self.max_deck_build_attempts = 1000
-        self.max_improvement_attempts = 200
     
     @property
     @abstractmethod
@@ -102,7 +111,7 @@ class BaseDeckBuilder(ABC):
         Returns:
             List of selected cards
         """
-        selected = []
+        selected = DeckAccumulator(self.max_copies)
         cards_by_type = {}
         
         # Group cards by type
@@ -118,44 +127,15 @@ class BaseDeckBuilder(ABC):
                 continue
             
             type_count = int(target_count * percentage)
-            type_cards = cards_by_type[card_type].copy()  # Create a copy to avoid modifying original
             
-            # Select cards of this type
-            attempts = 0
-            max_attempts = 1000
-            while len([c for c in selected if c['type'] == card_type]) < type_count and type_cards and attempts < max_attempts:
-                attempts += 1
-                card = random.choice(type_cards)
-                # Check if we haven't exceeded max copies
-                card_count = len([c for c in selected if c['name'] == card['name']])
-                if card_count < self.max_copies:
-                    selected.append(card)
-                else:
-                    type_cards.remove(card)
-                
-                # If no more cards available, break
-                if not type_cards:
-                    break
+            # Select this type's quota in one draw
+            sample_cards(selected, cards_by_type[card_type],
+                         type_count - selected.type_counts[card_type], self.rng)
         
         # Fill remaining slots with random cards
-        attempts = 0
-        max_attempts = 1000
-        available_copy = available_cards.copy()
-        while len(selected) < target_count and available_copy and attempts < max_attempts:
-            attempts += 1
-            card = random.choice(available_copy)
-            card_count = len([c for c in selected if c['name'] == card['name']])
-            if card_count < self.max_copies:
-                selected.append(card)
-            else:
-                # Remove from available if we've maxed out this card
-                available_copy = [c for c in available_copy if c['name'] != card['name']]
-            
-            # Safety check
-            if not available_copy:
-                break
+        sample_cards(selected, available_cards, target_count - len(selected), self.rng)
         
-        return selected
+        return selected.cards
     
     def analyze_deck(self, deck: List[Dict]) -> Dict:
         """
@@ -173,31 +153,10 @@ class BaseDeckBuilder(ABC):
                 'suggestions': ['Deck is empty']
             }
         
-        # Calculate statistics
-        total_cards = len(deck)
-        
-        # Cost distribution
-        cost_distribution = {}
-        for card in deck:
-            cost = card.get('cost', 0)
-            cost_distribution[cost] = cost_distribution.get(cost, 0) + 1
-        
-        # Type distribution
-        type_distribution = {}
-        for card in deck:
-            card_type = card.get('type', 'Unknown')
-            type_distribution[card_type] = type_distribution.get(card_type, 0) + 1
-        
-        # Color distribution
-        color_distribution = {}
-        for card in deck:
-            colors = card.get('colors', [])
-            for color in colors:
-                color_distribution[color] = color_distribution.get(color, 0) + 1
-        
-        # Calculate average cost
-        total_cost = sum(card.get('cost', 0) for card in deck)
-        avg_cost = total_cost / total_cards if total_cards > 0 else 0
+        # Statistics are memoized per decklist (see deck_profile.py)
+        profile = get_cards_profile(deck)
+        total_cards = profile.total_cards
+        avg_cost = profile.avg_cost
         
         # Generate suggestions
         suggestions = []
@@ -215,8 +174,8 @@ class BaseDeckBuilder(ABC):
         return {
             'total_cards': total_cards,
             'average_cost': round(avg_cost, 2),
-            'cost_distribution': cost_distribution,
-            'type_distribution': type_distribution,
-            'color_distribution': color_distribution,
+            'cost_distribution': dict(profile.cost_histogram),
+            'type_distribution': dict(profile.type_counts),
+            'color_distribution': dict(profile.color_counts),
             'suggestions': suggestions if suggestions else ['Deck looks balanced!']
         }
@@ -0,0 +1,381 @@
+"""
+Batch Combat Simulator for One Piece TCG
+Plays N games in lockstep with NumPy arrays, following the same simplified
+rules as CombatSimulator._play_turn
+"""
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+from combat_simulator import CombatSimulator
+from compiled_deck import CompiledDeck, OnPlayEffect, TriggerEffect, compile_deck
+from random_source import RandomSource, make_seed
+
+INT_MAX = np.iinfo(np.int64).max
+
+
+class _DeckTables:
+    """Per-player card attribute arrays padded to a common deck length"""
+
+    def __init__(self, deck1: CompiledDeck, deck2: CompiledDeck, hand_size: int):
+        decks = (deck1, deck2)
+        self.length = np.array([len(d.cards) for d in decks], dtype=np.int64)
+        size = max(1, int(self.length.max()))
+
+        self.cost = np.zeros((2, size), dtype=np.int64)
+        self.power = np.zeros((2, size), dtype=np.int64)
+        self.attack_power = np.zeros((2, size), dtype=np.int64)
+        self.is_character = np.zeros((2, size), dtype=bool)
+        self.blocker = np.zeros((2, size), dtype=bool)
+        self.on_play = np.zeros((2, size), dtype=np.int64)
+        self.on_play_value = np.zeros((2, size), dtype=np.int64)
+        self.counter = np.zeros((2, size), dtype=np.int64)
+        self.trigger = np.zeros((2, size), dtype=np.int64)
+        self.trigger_value = np.zeros((2, size), dtype=np.int64)
+        self.leader_life = np.array([d.leader_life for d in decks], dtype=np.int64)
+        self.leader_power = np.array([d.leader_power for d in decks], dtype=np.int64)
+        # Opening hand and life cards dealt from each library
+        self.hand_size = np.minimum(hand_size, self.length)
+        self.life_cards = np.minimum(self.leader_life, self.length - self.hand_size)
+
+        for player, deck in enumerate(decks):
+            for slot, card in enumerate(deck.cards):
+                self.cost[player, slot] = card.cost
+                self.power[player, slot] = card.power
+                self.attack_power[player, slot] = (
+                    card.power + deck.leader_power_boost + card.attack_boost
+                )
+                self.is_character[player, slot] = card.is_character
+                self.blocker[player, slot] = card.blocker
+                self.on_play[player, slot] = card.on_play
+                self.on_play_value[player, slot] = card.on_play_value
+                self.counter[player, slot] = card.counter
+                self.trigger[player, slot] = card.trigger
+                self.trigger_value[player, slot] = card.trigger_value
+
+        self.size = size
+
+
+class _GameArrays:
+    """
+    State of the live games, one row per game, stored by seat
+
+    Seat 0 is whoever goes first in that game, so every live game has the
+    same active seat on a given turn; first[g] is the deck (0 or 1) sitting
+    in seat 0. Card zones are per deck slot: pos is a slot's position in its
+    shuffled library, so a slot is drawn once pos < cursor. The life cards
+    are the positions after the opening hand, hand_size up to hand_size +
+    life_left, and the top one is taken first. Slots that were played,
+    discarded or trashed are marked used.
+    """
+
+    def __init__(self, tables: _DeckTables, num_games: int, rng: np.random.Generator):
+        self.tables = tables
+        size = tables.size
+        self.first = rng.integers(0, 2, size=num_games)
+        self.seat_deck = np.stack([self.first, 1 - self.first], axis=1)
+
+        # Padding slots of the shorter deck get a position that is never drawn
+        self.pos = np.full((num_games, 2, size), size, dtype=np.int64)
+        for deck_index in (0, 1):
+            length = int(tables.length[deck_index])
+            if length:
+                order = rng.permuted(np.broadcast_to(np.arange(length), (num_games, length)), axis=1)
+                seat = np.where(self.first == deck_index, 0, 1)
+                self.pos[np.arange(num_games), seat, :length] = order
+        self.life_left = tables.life_cards[self.seat_deck]
+        self.cursor = tables.hand_size[self.seat_deck] + self.life_left
+        self.life = tables.leader_life[self.seat_deck]
+
+        self.used = np.zeros((num_games, 2, size), dtype=bool)
+        self.board = np.zeros((num_games, 2, size), dtype=bool)
+        self.board_time = np.zeros((num_games, 2, size), dtype=np.int64)  # Play order, for KO targeting
+        self.clock = 0
+        self.game_ids = np.arange(num_games)  # Original game index of every row
+
+    def keep(self, rows: np.ndarray):
+        """Drop every row not selected by the boolean mask"""
+        for name in ('first', 'seat_deck', 'pos', 'life_left', 'cursor', 'life',
+                     'used', 'board', 'board_time', 'game_ids'):
+            setattr(self, name, getattr(self, name)[rows])
+
+    def hand(self, rows: np.ndarray, seat: int) -> np.ndarray:
+        """Boolean mask of the slots in the hands of seat in the given rows"""
+        pos = self.pos[rows, seat]
+        deck = self.seat_deck[rows, seat]
+        life_start = self.tables.hand_size[deck][:, None]
+        in_life = (pos >= life_start) & (pos < life_start + self.life_left[rows, seat, None])
+        return (pos < self.cursor[rows, seat, None]) & ~self.used[rows, seat] & ~in_life
+
+    def put_on_board(self, rows: np.ndarray, seat: int, slots: np.ndarray):
+        """Put characters on the board of seat, stamping their play order"""
+        self.clock += 1
+        self.board[rows, seat, slots] = True
+        self.board_time[rows, seat, slots] = self.clock
+
+    def ko_first(self, rows: np.ndarray, seat: int, max_cost: np.ndarray):
+        """KO the first played character of seat with at most max_cost, where there is one"""
+        targets = self.board[rows, seat] & (self.tables.cost[self.seat_deck[rows, seat]] <= max_cost[:, None])
+        has_target = targets.any(axis=1)
+        first_played = np.where(targets, self.board_time[rows, seat], INT_MAX).argmin(axis=1)
+        self.board[rows[has_target], seat, first_played[has_target]] = False
+
+    def take_life(self, rows: np.ndarray, seat: int):
+        """
+        Deal 1 damage to the leader of seat in the given rows
+
+        The top life card activates its trigger or goes to hand (it simply
+        leaves the life area).
+        """
+        tables = self.tables
+        self.life[rows, seat] -= 1
+        rows = rows[self.life_left[rows, seat] > 0]
+        if not len(rows):
+            return
+        self.life_left[rows, seat] -= 1
+        deck = self.seat_deck[rows, seat]
+        position = tables.hand_size[deck] + self.life_left[rows, seat]
+        slot = (self.pos[rows, seat] == position[:, None]).argmax(axis=1)
+        trigger = tables.trigger[deck, slot]
+
+        draw = trigger == TriggerEffect.DRAW
+        if draw.any():
+            drawn = rows[draw]
+            self.cursor[drawn, seat] += self.cursor[drawn, seat] < tables.length[deck[draw]]
+        play = trigger == TriggerEffect.PLAY
+        if play.any():
+            self.put_on_board(rows[play], seat, slot[play])
+        ko = trigger == TriggerEffect.KO
+        if ko.any():
+            self.ko_first(rows[ko], 1 - seat, tables.trigger_value[deck[ko], slot[ko]])
+        # Played and spent triggers leave the hand as well
+        spent = draw | play | ko
+        self.used[rows[spent], seat, slot[spent]] = True
+
+    def resolve_attacks(self, rows: np.ndarray, seat: int, power: np.ndarray, attacker: np.ndarray,
+                        defender: np.ndarray, don: np.ndarray, don_power: int):
+        """
+        Resolve one attack per row by seat, as in CombatSimulator._resolve_attack
+
+        Args:
+            rows: Rows that attack
+            power: Attack power before DON!!
+            attacker: Attacking slot, -1 for the leader (never KO'd)
+            defender: Defending slot, -1 for the opposing leader
+            don: DON!! left per row (all live rows), reduced by what is attached
+        """
+        tables = self.tables
+        opp = 1 - seat
+        opp_deck = self.seat_deck[rows, opp]
+        at_leader = defender < 0
+        defense = np.where(at_leader, tables.leader_power[opp_deck],
+                           tables.power[opp_deck, np.maximum(defender, 0)])
+
+        # Attach the fewest DON!! that lets the attacker at least match the defender
+        needed = np.maximum(0, -((power - defense) // don_power))
+        attach = (needed > 0) & (needed <= don[rows])
+        don[rows[attach]] -= needed[attach]
+        power = power + np.where(attach, needed * don_power, 0)
+
+        battle = ~at_leader
+        if battle.any():
+            b_rows = rows[battle]
+            a_power = power[battle]
+            d_power = defense[battle]
+            defender_ko = a_power >= d_power
+            attacker_ko = (d_power >= a_power) & (attacker[battle] >= 0)
+            self.board[b_rows[defender_ko], opp, defender[battle][defender_ko]] = False
+            self.board[b_rows[attacker_ko], seat, attacker[battle][attacker_ko]] = False
+
+        hit = at_leader & (power >= defense)
+        if not hit.any():
+            return
+        h_rows = rows[hit]
+        gap = power[hit] - defense[hit]
+        counters = np.where(self.hand(h_rows, opp), tables.counter[opp_deck[hit]], 0)
+        countered = counters.sum(axis=1) > gap
+
+        if countered.any():
+            # Discard the highest counters first (ties in hand order) until they exceed the gap
+            c_rows = h_rows[countered]
+            values = counters[countered]
+            size = tables.size
+            key = np.where(values > 0, -values * (size + 1) + self.pos[c_rows, opp], INT_MAX)
+            order = np.argsort(key, axis=1)
+            spent = np.cumsum(np.take_along_axis(values, order, axis=1), axis=1)
+            cards = (spent <= gap[countered, None]).sum(axis=1) + 1
+            discard = np.zeros(values.shape, dtype=bool)
+            np.put_along_axis(discard, order, np.arange(size) < cards[:, None], axis=1)
+            self.used[c_rows, opp] |= discard
+
+        self.take_life(h_rows[~countered], opp)
+
+
+class BatchCombatSimulator:
+    """
+    Vectorized combat simulator that advances many games one phase at a time
+
+    Every game is a row in the state arrays. All rows share the turn counter;
+    games that have finished are dropped from the arrays so later phases
+    only touch live games.
+    """
+
+    MAX_TURNS = CombatSimulator.MAX_TURNS
+    CHARACTER_ATTACK_LEADER_CHANCE = CombatSimulator.CHARACTER_ATTACK_LEADER_CHANCE
+    DON_POWER = CombatSimulator.DON_POWER
+    HAND_SIZE = 5
+    MAX_DON = 10
+
+    def simulate_games(self, deck1: Union[Dict, CompiledDeck], deck2: Union[Dict, CompiledDeck],
+                       num_games: int, seed: RandomSource = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simulate num_games games between two decks
+
+        Args:
+            deck1: First deck with leader and main_deck, or a compiled deck
+            deck2: Second deck with leader and main_deck, or a compiled deck
+            num_games: Number of games to play in lockstep
+            seed: Seed or NumPy Generator driving the games, or a random.Random
+                  to draw the seed from (random if omitted)
+
+        Returns:
+            Tuple of (winners, turn_counts) arrays where winners are 1 or 2
+        """
+        if not isinstance(deck1, CompiledDeck):
+            deck1 = compile_deck(deck1)
+        if not isinstance(deck2, CompiledDeck):
+            deck2 = compile_deck(deck2)
+
+        if seed is not None and not isinstance(seed, np.random.Generator):
+            seed = make_seed(seed)
+        rng = np.random.default_rng(seed)
+        tables = _DeckTables(deck1, deck2, self.HAND_SIZE)
+        size = tables.size
+        games = _GameArrays(tables, num_games, rng)
+
+        winners = np.zeros(num_games, dtype=np.int64)
+        turns = np.full(num_games, self.MAX_TURNS, dtype=np.int64)
+        attack_character_chance = 1.0 - self.CHARACTER_ATTACK_LEADER_CHANCE
+
+        for turn in range(1, self.MAX_TURNS + 1):
+            me = 0 if turn % 2 == 1 else 1
+            opp = 1 - me
+            rows = np.arange(len(games.game_ids))
+            me_deck = games.seat_deck[:, me]
+            opp_deck = games.seat_deck[:, opp]
+            my_board = games.board[:, me]
+            opp_board = games.board[:, opp]
+            don = np.full(len(rows), min(turn, self.MAX_DON), dtype=np.int64)
+
+            # Draw phase
+            games.cursor[:, me] += games.cursor[:, me] < tables.length[me_deck]
+
+            # Main phase - play affordable characters, highest cost first
+            cost_me = tables.cost[me_deck]
+            candidates = (games.hand(rows, me) & tables.is_character[me_deck]
+                          & (cost_me <= don[:, None]))
+            # Stable ordering by cost, ties broken by hand (draw) order
+            sort_key = np.where(candidates, -cost_me * (size + 1) + games.pos[:, me], INT_MAX)
+            order = np.argsort(sort_key, axis=1)
+            num_candidates = candidates.sum(axis=1)
+
+            for column in range(int(num_candidates.max(initial=0))):
+                slot = order[:, column]
+                cost = cost_me[rows, slot]
+                plays = (column < num_candidates) & (cost <= don)
+                idx = np.flatnonzero(plays)
+                if not len(idx):
+                    continue
+                played_slot = slot[idx]
+                don[idx] -= cost[idx]
+                games.used[idx, me, played_slot] = True
+                games.put_on_board(idx, me, played_slot)
+
+                effect = tables.on_play[me_deck[idx], played_slot]
+                value = tables.on_play_value[me_deck[idx], played_slot]
+
+                damage = effect == OnPlayEffect.DAMAGE
+                for point in range(int(value[damage].max(initial=0))):
+                    games.take_life(idx[damage & (value > point)], opp)
+
+                ko = effect == OnPlayEffect.KO
+                if ko.any():
+                    games.ko_first(idx[ko], opp, value[ko])
+
+            # Attack phase - every character on board attacks once, in random order
+            num_attackers = my_board.sum(axis=1)
+            attack_order = np.argsort(np.where(my_board, rng.random(my_board.shape), 2.0), axis=1)
+            attack_power = tables.attack_power[me_deck]
+
+            for column in range(int(num_attackers.max(initial=0))):
+                slot = attack_order[:, column]
+                # Skip attackers that were KO'd earlier in the turn
+                idx = np.flatnonzero((column < num_attackers) & my_board[rows, slot])
+                if not len(idx):
+                    continue
+                attacker = slot[idx]
+
+                defenders = opp_board[idx]
+                blockers = defenders & tables.blocker[opp_deck[idx]]
+                has_blocker = blockers.any(axis=1)
+                has_character = defenders.any(axis=1)
+                at_character = (~has_blocker & has_character
+                                & (rng.random(len(idx)) < attack_character_chance))
+                battle = has_blocker | at_character
+                # Pick a uniformly random defender from the pool
+                pool = np.where(has_blocker[:, None], blockers, defenders)
+                defender = np.where(pool, rng.random(pool.shape), -1.0).argmax(axis=1)
+                defender = np.where(battle, defender, -1)
+
+                games.resolve_attacks(idx, me, attack_power[idx, attacker], attacker, defender,
+                                      don, self.DON_POWER)
+
+            # The leader attacks last, at a random blocker if there is one
+            blockers = opp_board & tables.blocker[opp_deck]
+            defender = np.where(blockers, rng.random(blockers.shape), -1.0).argmax(axis=1)
+            defender = np.where(blockers.any(axis=1), defender, -1)
+            games.resolve_attacks(rows, me, tables.leader_power[me_deck], np.full(len(rows), -1),
+                                  defender, don, self.DON_POWER)
+
+            # Check win condition (player 1 is checked first, as in the scalar engine)
+            deck1_life = games.life[rows, games.first]
+            deck2_life = games.life[rows, 1 - games.first]
+            p1_dead = deck1_life <= 0
+            p2_dead = ~p1_dead & (deck2_life <= 0)
+            finished = p1_dead | p2_dead
+            winners[games.game_ids[p1_dead]] = 2
+            winners[games.game_ids[p2_dead]] = 1
+            turns[games.game_ids[finished]] = turn
+
+            # Drop finished games from the state arrays
+            if finished.any():
+                games.keep(~finished)
+                if not len(games.game_ids):
+                    break
+
+        # Games that reach max turns: player with more life wins, ties are random
+        if len(games.game_ids):
+            rows = np.arange(len(games.game_ids))
+            deck1_life = games.life[rows, games.first]
+            deck2_life = games.life[rows, 1 - games.first]
+            coin = rng.integers(1, 3, size=len(rows))
+            winners[games.game_ids] = np.where(deck1_life > deck2_life, 1,
+                                               np.where(deck2_life > deck1_life, 2, coin))
+
+        return winners, turns
+
+
+def simulate_batch_shard(deck1: CompiledDeck, deck2: CompiledDeck, num_games: int, seed: int) -> Dict:
+    """
+    Simulate one shard of games with the batch engine
+
+    Returns the same summable counts as the scalar shard function.
+    """
+    winners, turns = BatchCombatSimulator().simulate_games(deck1, deck2, num_games, seed)
+    won = winners == 1
+    return {
+        'games': num_games,
+        'wins': int(won.sum()),
+        'win_turns': int(turns[won].sum()),
+        'loss_turns': int(turns[~won].sum())
+    }
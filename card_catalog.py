@@ -0,0 +1,289 @@
+"""
+Card Catalog for One Piece TCG
+Immutable indexes over a card list (by type, color, color set, cost and
+name, plus the eligible pool of every leader and its statistics) built
+once per catalog version and shared by every deck builder working on the
+same cards
+"""
+import hashlib
+import json
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+# Number of catalogs kept in memory
+CATALOG_CACHE_SIZE = 8
+
+Cards = Tuple[Dict, ...]
+
+
+def _index(cards: Iterable[Dict], key) -> Mapping:
+    """Group cards by key(card) into a read-only mapping of tuples, in card order"""
+    groups: Dict = {}
+    for card in cards:
+        groups.setdefault(key(card), []).append(card)
+    return MappingProxyType({value: tuple(group) for value, group in groups.items()})
+
+
+@dataclass(frozen=True)
+class CardPool:
+    """
+    The non-leader cards sharing at least one color with a leader
+
+    Cards keep their catalog order so seeded choices over a pool pick the
+    same cards as a scan of the full card list would.
+    """
+    colors: FrozenSet[str]
+    cards: Cards
+    by_type: Mapping[str, Cards]
+    cost_histogram: Mapping[Optional[int], int]
+    _bands: Dict = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_cards(cls, colors: FrozenSet[str], cards: Cards) -> 'CardPool':
+        """Split a pool's cards by type and count them by cost"""
+        return cls(colors=colors, cards=cards, by_type=_index(cards, lambda c: c['type']),
+                   cost_histogram=MappingProxyType(dict(Counter(c.get('cost') for c in cards))))
+
+    @property
+    def size(self) -> int:
+        """Number of distinct cards in the pool"""
+        return len(self.cards)
+
+    @property
+    def type_counts(self) -> Dict[str, int]:
+        """Number of distinct cards of each type"""
+        return {card_type: len(cards) for card_type, cards in self.by_type.items()}
+
+    def of_type(self, card_type: str, min_cost: Optional[int] = None,
+                max_cost: Optional[int] = None) -> Cards:
+        """
+        Cards of one type, optionally within a cost band (bounds inclusive)
+
+        Cards without a cost are left out of cost bands. Each band is
+        computed the first time it is asked for.
+        """
+        if min_cost is None and max_cost is None:
+            return self.by_type.get(card_type, ())
+        key = (card_type, min_cost, max_cost)
+        band = self._bands.get(key)
+        if band is None:
+            band = tuple(
+                c for c in self.by_type.get(card_type, ())
+                if c.get('cost') is not None
+                and (min_cost is None or c['cost'] >= min_cost)
+                and (max_cost is None or c['cost'] <= max_cost)
+            )
+            self._bands[key] = band
+        return band
+
+
+@dataclass(frozen=True)
+class LeaderPoolStats:
+    """A leader's eligible pool and whether it can fill a deck"""
+    leader: Dict
+    pool_size: int
+    type_counts: Mapping[str, int]
+    cost_histogram: Mapping[Optional[int], int]
+    viable: bool  # At least min_unique_cards distinct cards in the pool
+
+
+@dataclass(frozen=True)
+class LeaderChoices:
+    """The leaders a builder picks from for one color and deck size"""
+    viable: Cards  # Leaders whose pool can fill a deck, in catalog order
+    largest_pool: Optional[Dict]  # First leader with the largest pool
+
+
+@dataclass(frozen=True)
+class CardCatalog:
+    """
+    Precomputed indexes over a card list
+
+    Catalogs are shared between builders: the indexes are tuples and
+    read-only mappings holding the original card dictionaries, which must
+    not be modified. Color and name keys are lower case for lookups; the
+    color set index is keyed by the exact colors printed on the cards.
+    """
+    version: str
+    cards: Cards
+    leaders: Cards
+    by_type: Mapping[str, Cards]
+    by_color: Mapping[str, Cards]
+    by_color_set: Mapping[FrozenSet[str], Cards]
+    by_cost: Mapping[Optional[int], Cards]
+    by_name: Mapping[str, Cards]
+    _leaders_by_color: Mapping[str, Cards] = field(repr=False, compare=False)
+    _pools: Dict[FrozenSet[str], CardPool] = field(default_factory=dict, repr=False, compare=False)
+    _leader_stats: Dict = field(default_factory=dict, repr=False, compare=False)
+    _leader_choices: Dict = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_cards(cls, cards: List[Dict], version: Optional[str] = None) -> 'CardCatalog':
+        """Index a card list, precomputing the pool of every leader's colors"""
+        cards = tuple(cards)
+        leaders = tuple(c for c in cards if c['type'] == 'Leader')
+        by_color: Dict[str, List[Dict]] = {}
+        leaders_by_color: Dict[str, List[Dict]] = {}
+        for card in cards:
+            for color in {c.lower() for c in card['colors']}:
+                by_color.setdefault(color, []).append(card)
+                if card['type'] == 'Leader':
+                    leaders_by_color.setdefault(color, []).append(card)
+
+        catalog = cls(
+            version=version or catalog_version(cards),
+            cards=cards,
+            leaders=leaders,
+            by_type=_index(cards, lambda c: c['type']),
+            by_color=MappingProxyType({k: tuple(v) for k, v in by_color.items()}),
+            by_color_set=_index(cards, lambda c: frozenset(c['colors'])),
+            by_cost=_index(cards, lambda c: c.get('cost')),
+            by_name=_index(cards, lambda c: c['name'].lower()),
+            _leaders_by_color=MappingProxyType({k: tuple(v) for k, v in leaders_by_color.items()})
+        )
+        for leader in leaders:
+            catalog.pool_for_leader(leader)
+        return catalog
+
+    def leader(self, name: str) -> Optional[Dict]:
+        """The first leader with this name (case-insensitive), or None"""
+        for card in self.by_name.get(name.lower(), ()):
+            if card['type'] == 'Leader':
+                return card
+        return None
+
+    def leaders_with_color(self, color: str) -> Cards:
+        """Leaders with this color (case-insensitive), in catalog order"""
+        return self._leaders_by_color.get(color.lower(), ())
+
+    def pool_for_colors(self, colors: Iterable[str]) -> CardPool:
+        """The non-leader cards sharing at least one of these colors"""
+        colors = frozenset(colors)
+        pool = self._pools.get(colors)
+        if pool is None:
+            cards = tuple(
+                c for c in self.cards
+                if c['type'] != 'Leader' and not colors.isdisjoint(c['colors'])
+            )
+            pool = CardPool.from_cards(colors, cards)
+            self._pools[colors] = pool
+        return pool
+
+    def pool_for_leader(self, leader: Dict) -> CardPool:
+        """The cards a deck led by this leader may contain"""
+        return self.pool_for_colors(leader['colors'])
+
+    def leader_stats(self, min_unique_cards: int) -> Tuple[LeaderPoolStats, ...]:
+        """
+        Pool statistics of every leader, in catalog order
+
+        Args:
+            min_unique_cards: Distinct cards a pool needs to fill a deck
+        """
+        stats = self._leader_stats.get(min_unique_cards)
+        if stats is None:
+            stats = []
+            for leader in self.leaders:
+                pool = self.pool_for_leader(leader)
+                stats.append(LeaderPoolStats(leader=leader, pool_size=pool.size,
+                                             type_counts=MappingProxyType(pool.type_counts),
+                                             cost_histogram=pool.cost_histogram,
+                                             viable=pool.size >= min_unique_cards))
+            stats = self._leader_stats[min_unique_cards] = tuple(stats)
+        return stats
+
+    def leader_choices(self, min_unique_cards: int, color: Optional[str] = None) -> LeaderChoices:
+        """
+        The viable leaders of a color and the largest-pool fallback
+
+        Args:
+            min_unique_cards: Distinct cards a pool needs to fill a deck
+            color: Leader color (case-insensitive), None for every leader
+        """
+        key = (min_unique_cards, color.lower() if color else None)
+        choices = self._leader_choices.get(key)
+        if choices is None:
+            stats = self.leader_stats(min_unique_cards)
+            if color:
+                colored = {id(leader) for leader in self.leaders_with_color(color)}
+                stats = [s for s in stats if id(s.leader) in colored]
+            choices = LeaderChoices(
+                viable=tuple(s.leader for s in stats if s.viable),
+                largest_pool=max(stats, key=lambda s: s.pool_size).leader if stats else None
+            )
+            self._leader_choices[key] = choices
+        return choices
+
+
+def catalog_version(cards: Iterable[Dict]) -> str:
+    """
+    Content hash of a card list, which identifies its catalog
+
+    Hashing serializes every card, which costs about as much as the lookups
+    a catalog saves. Card sources hash once per change, or keep a cheaper
+    version token of their own, and pass it to get_card_catalog().
+    """
+    payload = json.dumps(list(cards), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+_catalogs: 'OrderedDict[str, CardCatalog]' = OrderedDict()
+_catalogs_lock = threading.Lock()
+
+
+def get_card_catalog(cards: List[Dict], version: Optional[str] = None) -> CardCatalog:
+    """
+    Return the catalog of a card list, building it only the first time its
+    version is seen
+
+    Callers on a request path should pass the version of their card source
+    (see OnePieceDeckBuilder.get_catalog); without one every lookup hashes
+    the whole card list.
+
+    Args:
+        cards: Card dictionaries as loaded by the deck builders
+        version: Catalog version (defaults to a content hash of the cards)
+    """
+    key = version or catalog_version(cards)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is not None:
+            _catalogs.move_to_end(key)
+            return catalog
+
+    catalog = CardCatalog.from_cards(cards, version=key)
+    with _catalogs_lock:
+        _catalogs[key] = catalog
+        while len(_catalogs) > CATALOG_CACHE_SIZE:
+            _catalogs.popitem(last=False)
+    return catalog
+
+
+def cached_card_catalog(version: str) -> Optional[CardCatalog]:
+    """Return the cached catalog of a version, or None if it isn't cached"""
+    with _catalogs_lock:
+        catalog = _catalogs.get(version)
+        if catalog is not None:
+            _catalogs.move_to_end(version)
+        return catalog
+
+
+def clear_catalogs():
+    """Forget every cached catalog"""
+    with _catalogs_lock:
+        _catalogs.clear()
+
+
+def invalidate_card_catalogs():
+    """
+    Drop the cached catalogs after the card database changed
+
+    The database version token changes with every card change, so a builder
+    never reads a catalog of outdated cards; this frees the outdated
+    catalogs and their leader pool statistics right away instead of when
+    they age out of the cache.
+    """
+    clear_catalogs()
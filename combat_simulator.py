@@ -3,21 +3,141 @@ Combat Simulator for One Piece TCG
 Simulates actual One Piece TCG combat following official game rules
 """
 import random
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-from copy import deepcopy
+from operator import attrgetter
+from time import perf_counter_ns
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass, field
 
-@dataclass
+from compiled_deck import (
+    CompiledCard, CompiledDeck, OnPlayEffect, TriggerEffect,
+    compile_deck, parse_attack_boost, parse_on_play_effect
+)
+from deck_profile import get_deck_profile
+from random_source import RandomSource, make_rng, make_seed
+from simulation_cache import SimulationCache, make_cache_key
+from simulation_policies import GreedyPolicy, PlayerPolicy
+from simulation_profile import (
+    PHASE_BATTLE, PHASE_BLOCKER_SCAN, PHASE_DRAW, PHASE_ON_PLAY, PHASE_PLAY,
+    SimulationProfile, summarize_profile
+)
+from simulation_core import (
+    ADAPTIVE_CHUNK_SIZE, MIN_ADAPTIVE_SIMULATIONS, SimulationRun, play_games, summarize_counts
+)
+from simulation_replay import ReplayRecorder
+from simulation_runner import derive_shard_seed, new_base_seed, run_jobs
+
+@dataclass(slots=True)
+class PlayerState:
+    """
+    One player's zones in a simulated game
+    
+    The library is a permutation of deck slot indices that is drawn through
+    a cursor, so drawing never shifts a list. It is shuffled lazily: every
+    card dealt or drawn is one Fisher-Yates step that swaps a uniformly
+    chosen undrawn slot to the cursor, so a game only pays for the cards it
+    sees. Hand, board and life cards hold the compiled card records
+    themselves, which compare by identity, and hand_counter keeps the total
+    counter value in hand. The buffers are reused across games by reset().
+    """
+    deck: CompiledDeck
+    order: List[int]  # Deck slot indices, drawn up to the cursor (the library)
+    cursor: int  # Position in order of the next card to draw
+    life: int
+    don: int  # Available DON!! cards
+    hand: List[CompiledCard]
+    board: List[CompiledCard]  # Characters on board
+    life_cards: List[CompiledCard] = field(default_factory=list)  # Face-down life, top last
+    hand_counter: int = 0  # Sum of the counter values of the cards in hand
+    draw_random: Optional[Callable[[], float]] = None  # The game RNG's random(), for draws
+    
+    @classmethod
+    def for_deck(cls, deck: CompiledDeck) -> 'PlayerState':
+        """Allocate the zones for a compiled deck"""
+        return cls(deck=deck, order=list(range(len(deck.cards))), cursor=0,
+                   life=deck.leader_life, don=0, hand=[], board=[])
+    
+    def reset(self, rng: random.Random, hand_size: int = 5):
+        """Start a new game: draw an opening hand and deal the life cards from a fresh shuffle"""
+        order = self.order
+        size = len(order)
+        hand_size = min(hand_size, size)
+        self.life = self.deck.leader_life
+        self.cursor = hand_size + min(self.life, size - hand_size)
+        
+        # Shuffle only the dealt positions; the rest is shuffled as it is drawn.
+        # Life cards are dealt from the top of the library after the opening hand.
+        random_ = self.draw_random = rng.random
+        cards = self.deck.cards
+        hand = self.hand
+        life_cards = self.life_cards
+        hand.clear()
+        life_cards.clear()
+        counter = 0
+        for position in range(self.cursor):
+            pick = position + int(random_() * (size - position))
+            slot = order[pick]
+            order[pick] = order[position]
+            order[position] = slot
+            card = cards[slot]
+            if position < hand_size:
+                hand.append(card)
+                counter += card.counter
+            else:
+                life_cards.append(card)
+        self.hand_counter = counter
+        self.board.clear()
+        self.don = 0
+    
+    def draw(self):
+        """Draw a random card from the library into the hand, if any remain"""
+        order = self.order
+        cursor = self.cursor
+        size = len(order)
+        if cursor < size:
+            # One Fisher-Yates step: swap a random undrawn slot to the cursor
+            pick = cursor + int(self.draw_random() * (size - cursor))
+            slot = order[pick]
+            order[pick] = order[cursor]
+            order[cursor] = slot
+            self.cursor = cursor + 1
+            card = self.deck.cards[slot]
+            self.hand.append(card)
+            self.hand_counter += card.counter
+    
+    def copy_from(self, other: 'PlayerState'):
+        """Overwrite this player's zones with another's, reusing the buffers"""
+        self.deck = other.deck
+        self.order[:] = other.order
+        self.cursor = other.cursor
+        self.life = other.life
+        self.don = other.don
+        self.hand[:] = other.hand
+        self.board[:] = other.board
+        self.life_cards[:] = other.life_cards
+        self.hand_counter = other.hand_counter
+        self.draw_random = other.draw_random
+
+
+@dataclass(slots=True)
 class GameState:
     """Represents the state of a One Piece TCG game"""
-    player1_life: int
-    player2_life: int
-    player1_don: int  # Available DON!! cards
-    player2_don: int
-    player1_board: List[Dict]  # Characters on board
-    player2_board: List[Dict]
+    player1: PlayerState
+    player2: PlayerState
     turn_count: int
     active_player: int  # 1 or 2
+    
+    @classmethod
+    def for_decks(cls, deck1: CompiledDeck, deck2: CompiledDeck) -> 'GameState':
+        """Allocate a reusable game state for two compiled decks"""
+        return cls(player1=PlayerState.for_deck(deck1), player2=PlayerState.for_deck(deck2),
+                   turn_count=0, active_player=1)
+    
+    def copy_from(self, other: 'GameState'):
+        """Overwrite this state with another, reusing the buffers (for rollouts)"""
+        self.player1.copy_from(other.player1)
+        self.player2.copy_from(other.player2)
+        self.turn_count = other.turn_count
+        self.active_player = other.active_player
 
 @dataclass
 class TournamentMatch:
@@ -74,157 +194,502 @@ class CombatSimulator:
     MAX_TURNS = 30  # Maximum turns before game ends in a draw
     CHARACTER_ATTACK_LEADER_CHANCE = 0.7  # 70% chance to attack leader when no blockers
     
+    # Adaptive early stopping (see simulation_core.py)
+    ADAPTIVE_CHUNK_SIZE = ADAPTIVE_CHUNK_SIZE
+    MIN_ADAPTIVE_SIMULATIONS = MIN_ADAPTIVE_SIMULATIONS
+    
+    DON_POWER = 1000  # Power each attached DON!! card adds
+    
+    # Bump whenever a rule change alters simulation results, so cached results expire
+    RULES_VERSION = 2
+    
     def __init__(self):
         """Initialize the combat simulator with tournament learning data"""
         self.tournament_data = TOURNAMENT_DATA
-        
-    def simulate_combat(self, deck1: Dict, deck2: Dict, num_simulations: int = 1000) -> Dict:
+        # Feature matrix of the tournament history, built on first use (see matchup_model.py)
+        self._matchup_model = None
+        self._matchup_source = None  # tournament_data list the model was built from
+        # Phase timings collected by the game loop when set (see simulation_profile.py)
+        self.profile: Optional[SimulationProfile] = None
+        # Recorder for sampled games when set (see simulation_replay.py)
+        self.replay: Optional[ReplayRecorder] = None
+        self._game_replay: Optional[ReplayRecorder] = None  # Set while a sampled game is played
+        # Decision policies of player 1 and player 2, None for the built-in greedy play
+        self.policy1: Optional[PlayerPolicy] = None
+        self.policy2: Optional[PlayerPolicy] = None
+        
+    def simulate_combat(self, deck1: Dict, deck2: Dict, num_simulations: int = 1000,
+                        workers: int = 1, chunk_size: Optional[int] = None,
+                        seed: RandomSource = None, engine: str = 'scalar',
+                        ci_half_width: Optional[float] = None,
+                        confidence: float = 0.95,
+                        cache: Optional[SimulationCache] = None,
+                        profile: bool = False,
+                        replay_every: Optional[int] = None,
+                        policies: Optional[Tuple[Optional[PlayerPolicy], Optional[PlayerPolicy]]] = None) -> Dict:
         """
         Simulate combat between two decks using One Piece TCG rules
         
+        Games are split into shards of chunk_size games, each with its own RNG
+        stream derived from the seed, so a seeded run reports the same
+        statistics whether its shards run serially or across worker processes.
+        
+        With ci_half_width set, num_simulations becomes an upper bound: the run
+        stops after the first shard at which the win rate confidence interval
+        is at most ci_half_width percentage points wide on either side.
+        
+        With a cache, results are stored under a hash of both decklists, the
+        rules version and every parameter that changes the games played. An
+        unseeded cached run uses a seed derived from that hash, so repeating a
+        request returns the same result instead of replaying the games.
+        
+        With profile set, every game records the time spent in each phase of
+        the turn (draw, play, on_play, blocker_scan, battle) and per-game
+        counts, returned under 'profile'. Profiled runs bypass the cache and
+        need the scalar engine.
+        
+        With replay_every set, one game in every replay_every is recorded as a
+        compact event buffer (see simulation_replay.py) and returned under
+        'replays'. Like profiling, this bypasses the cache and needs the
+        scalar engine.
+        
+        policies sets the decision policy of each deck (see
+        simulation_policies.py); None keeps the built-in greedy play. Other
+        policies need the scalar engine and are part of the cache key.
+        
         Args:
             deck1: First deck with leader and main_deck
             deck2: Second deck with leader and main_deck
             num_simulations: Number of simulations to run (default 1000)
+            workers: Number of worker processes (default 1 runs in-process)
+            chunk_size: Number of games per shard (default 250, 100 when adaptive)
+            seed: Base seed for reproducible results, or a random.Random /
+                  NumPy Generator to draw it from (random if omitted)
+            engine: 'scalar' plays games one by one, 'batch' plays each shard
+                    in lockstep with NumPy (see batch_simulator.py)
+            ci_half_width: Target half-width of the win rate interval in
+                           percentage points (enables early stopping)
+            confidence: Confidence level of the reported interval (default 0.95)
+            cache: Result cache to read from and write to (optional)
+            profile: Collect per-phase timings and per-game counts (default False)
+            replay_every: Record one game in this many (default None records none)
+            policies: (deck1 policy, deck2 policy) tuple (default greedy for both)
         
         Returns:
             Dictionary containing simulation results and statistics
         """
-        # Extract deck characteristics
-        deck1_stats = self._extract_deck_stats(deck1)
-        deck2_stats = self._extract_deck_stats(deck2)
+        for event in self.iter_simulate_combat(
+                deck1, deck2, num_simulations=num_simulations, workers=workers,
+                chunk_size=chunk_size, seed=seed, engine=engine,
+                ci_half_width=ci_half_width, confidence=confidence, cache=cache,
+                profile=profile, replay_every=replay_every, policies=policies):
+            if event['event'] == 'result':
+                return event['results']
+    
+    def iter_simulate_combat(self, deck1: Dict, deck2: Dict, num_simulations: int = 1000,
+                             workers: int = 1, chunk_size: Optional[int] = None,
+                             seed: RandomSource = None, engine: str = 'scalar',
+                             ci_half_width: Optional[float] = None,
+                             confidence: float = 0.95,
+                             cache: Optional[SimulationCache] = None,
+                             profile: bool = False,
+                             replay_every: Optional[int] = None,
+                             policies: Optional[Tuple[Optional[PlayerPolicy], Optional[PlayerPolicy]]] = None
+                             ) -> Iterator[Dict]:
+        """
+        Simulate combat like simulate_combat, reporting progress as shards finish
         
-        # Run actual game simulations following One Piece TCG rules
-        wins = 0
-        win_turns = []
-        loss_turns = []
+        Closing the generator stops the run and cancels shards that are still
+        queued in the worker pool.
         
-        for _ in range(num_simulations):
-            # Simulate an actual game with One Piece TCG rules
-            winner, turn_count = self.simulate_game_with_rules(deck1, deck2)
-            
-            if winner == 1:
-                wins += 1
-                win_turns.append(turn_count)
-            else:
-                loss_turns.append(turn_count)
+        Yields:
+            {'event': 'progress', 'progress': {...}} after every shard, with the
+            running win rate, interval and turn averages, then one
+            {'event': 'result', 'results': {...}} with the simulate_combat result
+            (only the result for a cache hit)
+        """
+        # The inline greedy play is identical to GreedyPolicy and faster
+        policies = tuple(None if policy is None or type(policy) is GreedyPolicy else policy
+                         for policy in (policies or (None, None)))
+        instrumented = profile or bool(replay_every)
+        if (instrumented or any(policies)) and engine != 'scalar':
+            raise ValueError('Profiling, replays and policies are only supported by the scalar engine')
+        
+        if seed is not None:
+            seed = make_seed(seed)
+        
+        # Deck statistics, computed once per decklist (see deck_profile.py)
+        profile1 = get_deck_profile(deck1)
+        profile2 = get_deck_profile(deck2)
+        
+        cache_key = None
+        if cache is not None and not instrumented:
+            key_params = {}
+            if any(policies):
+                key_params['policies'] = [policy.describe() if policy else None for policy in policies]
+            cache_key = make_cache_key(
+                profile1.deck_hash, profile2.deck_hash, self.RULES_VERSION,
+                num_simulations=num_simulations, seed=seed, engine=engine,
+                chunk_size=chunk_size, ci_half_width=ci_half_width, confidence=confidence,
+                **key_params
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                yield {'event': 'result', 'results': dict(cached, cached=True)}
+                return
+            if seed is None:
+                seed = int(cache_key[:16], 16)
+        
+        deck1_stats = profile1.stats()
+        deck2_stats = profile2.stats()
+        
+        # Compile both decks once so the game loop never parses card text
+        compiled1 = compile_deck(deck1)
+        compiled2 = compile_deck(deck2)
+        
+        # Run actual game simulations following One Piece TCG rules
+        if engine == 'batch':
+            from batch_simulator import simulate_batch_shard as shard_fn
+        else:
+            shard_fn = _simulate_shard
+        shard_args = (compiled1, compiled2)
+        if instrumented or any(policies):
+            shard_fn = _simulate_configured_shard
+            shard_args = (compiled1, compiled2, {
+                'profile': profile,
+                'replay_every': replay_every or 0,
+                'policies': policies
+            })
+        
+        run = SimulationRun(shard_fn, shard_args, num_simulations,
+                            seed if seed is not None else new_base_seed(),
+                            workers=workers, chunk_size=chunk_size,
+                            ci_half_width=ci_half_width, confidence=confidence,
+                            adaptive_chunk_size=self.ADAPTIVE_CHUNK_SIZE,
+                            min_simulations=self.MIN_ADAPTIVE_SIMULATIONS)
+        for progress in run:
+            yield {'event': 'progress', 'progress': progress}
+        totals = run.totals
         
         # Calculate statistics
-        win_rate = (wins / num_simulations) * 100
-        avg_win_turns = sum(win_turns) / len(win_turns) if win_turns else 0
-        avg_loss_turns = sum(loss_turns) / len(loss_turns) if loss_turns else 0
+        win_rate = (totals['wins'] / totals['games']) * 100 if totals['games'] else 0
         
         # Generate insights
         insights = self._generate_insights(deck1_stats, deck2_stats, win_rate)
         
         # Key matchup analysis
-        key_cards = self._identify_key_cards(deck1, deck2)
+        key_cards = profile1.key_card_lists()
         
-        return {
-            'win_rate': round(win_rate, 2),
-            'wins': wins,
-            'losses': num_simulations - wins,
-            'simulations_run': num_simulations,
-            'avg_win_turns': round(avg_win_turns, 1),
-            'avg_loss_turns': round(avg_loss_turns, 1),
+        results = run.summary()
+        results.update({
             'insights': insights,
             'key_cards': key_cards,
             'deck1_stats': deck1_stats,
             'deck2_stats': deck2_stats,
-            'matchup_type': self._get_matchup_type(deck1_stats, deck2_stats)
+            'matchup_type': self._get_matchup_type(deck1_stats, deck2_stats),
+            'cached': False
+        })
+        if profile:
+            results['profile'] = summarize_profile(totals)
+        if replay_every:
+            results['replays'] = totals.get('replays', [])
+        
+        if cache_key is not None:
+            cache.set(cache_key, results)
+        
+        yield {'event': 'result', 'results': results}
+    
+    def simulate_matchup_matrix(self, decks: List[Dict], opponents: Optional[List[Dict]] = None,
+                                num_simulations: int = 1000, workers: int = 1,
+                                chunk_size: Optional[int] = None, seed: RandomSource = None,
+                                engine: str = 'scalar', confidence: float = 0.95) -> Dict:
+        """
+        Simulate every deck against every opponent in one job
+        
+        Each deck is compiled once and the shards of all pairings share one
+        worker pool. Pairing (i, j) uses a seed derived from the base seed and
+        its position in the grid, so a seeded matrix is reproducible.
+        
+        Args:
+            decks: Row decks with leader and main_deck
+            opponents: Column decks (defaults to decks, giving an N x N grid)
+            num_simulations: Number of games per pairing (default 1000)
+            workers: Number of worker processes (default 1 runs in-process)
+            chunk_size: Number of games per shard (default 250)
+            seed: Base seed or generator for reproducible results (random if omitted)
+            engine: 'scalar' or 'batch' (see simulate_combat)
+            confidence: Confidence level of the reported intervals (default 0.95)
+        
+        Returns:
+            Dictionary with a 'matrix' of per-pairing results (rows are decks,
+            columns are opponents) and each row's average win rate
+        """
+        if opponents is None:
+            opponents = decks
+        
+        compiled_rows = [compile_deck(deck) for deck in decks]
+        compiled_columns = compiled_rows if opponents is decks else [compile_deck(deck) for deck in opponents]
+        
+        base_seed = make_seed(seed)
+        pairings = []
+        for row, compiled1 in enumerate(compiled_rows):
+            for column, compiled2 in enumerate(compiled_columns):
+                pairing_seed = derive_shard_seed(base_seed, row * len(compiled_columns) + column)
+                pairings.append((compiled1, compiled2, pairing_seed))
+        
+        counts = self.simulate_pairings(pairings, num_simulations=num_simulations, workers=workers,
+                                        chunk_size=chunk_size, engine=engine)
+        
+        matrix = [
+            [self._summarize_counts(counts[row * len(compiled_columns) + column], confidence)
+             for column in range(len(compiled_columns))]
+            for row in range(len(compiled_rows))
+        ]
+        row_averages = [
+            round(sum(cell['win_rate'] for cell in cells) / len(cells), 2) if cells else 0
+            for cells in matrix
+        ]
+        
+        return {
+            'matrix': matrix,
+            'row_average_win_rates': row_averages,
+            'simulations_per_pairing': num_simulations,
+            'confidence': confidence
         }
     
-    def simulate_game_with_rules(self, deck1: Dict, deck2: Dict) -> Tuple[int, int]:
+    def simulate_pairings(self, pairings: List[Tuple[CompiledDeck, CompiledDeck, int]],
+                          num_simulations: int = 1000, workers: int = 1,
+                          chunk_size: Optional[int] = None, engine: str = 'scalar') -> List[Dict]:
+        """
+        Simulate independent pairings of compiled decks, sharing one worker pool
+        
+        Args:
+            pairings: List of (deck1, deck2, seed) tuples
+            num_simulations: Number of games per pairing (default 1000)
+            workers: Number of worker processes (default 1 runs in-process)
+            chunk_size: Number of games per shard (default 250)
+            engine: 'scalar' or 'batch' (see simulate_combat)
+        
+        Returns:
+            Merged counts (games, wins, win_turns, loss_turns) of every
+            pairing, in order; wins are deck1's
+        """
+        if engine == 'batch':
+            from batch_simulator import simulate_batch_shard as shard_fn
+        else:
+            shard_fn = _simulate_shard
+        
+        jobs = [((deck1, deck2), num_simulations, seed) for deck1, deck2, seed in pairings]
+        return run_jobs(shard_fn, jobs, workers=workers, chunk_size=chunk_size)
+    
+    def _summarize_counts(self, totals: Dict, confidence: float) -> Dict:
+        """Turn merged shard counts into win rate, interval and turn statistics"""
+        return summarize_counts(totals, confidence)
+    
+    def simulate_game_with_rules(self, deck1: Union[Dict, CompiledDeck],
+                                 deck2: Union[Dict, CompiledDeck],
+                                 rng: RandomSource = None) -> Tuple[int, int]:
         """
         Simulate a single game following One Piece TCG rules
         
         Args:
-            deck1: First deck with leader and main_deck
-            deck2: Second deck with leader and main_deck
+            deck1: First deck with leader and main_deck, or a compiled deck
+            deck2: Second deck with leader and main_deck, or a compiled deck
+            rng: Seed, random.Random or NumPy Generator driving the game
+                 (freshly seeded if omitted)
             
         Returns:
             Tuple of (winner, turn_count) where winner is 1 or 2
         """
-        # Initialize game state
-        leader1 = deck1.get('leader', {})
-        leader2 = deck2.get('leader', {})
+        rng = make_rng(rng)
+        if not isinstance(deck1, CompiledDeck):
+            deck1 = compile_deck(deck1)
+        if not isinstance(deck2, CompiledDeck):
+            deck2 = compile_deck(deck2)
+        
+        return self._play_game(GameState.for_decks(deck1, deck2), rng)
+    
+    def _play_game(self, state: GameState, rng: random.Random) -> Tuple[int, int]:
+        """
+        Play one game on a (possibly reused) game state
         
+        Returns:
+            Tuple of (winner, turn_count) where winner is 1 or 2
+        """
         # Randomize who goes first for balance
-        starting_player = random.choice([1, 2])
-        
-        state = GameState(
-            player1_life=leader1.get('life', 5),
-            player2_life=leader2.get('life', 5),
-            player1_don=0,
-            player2_don=0,
-            player1_board=[],
-            player2_board=[],
-            turn_count=0,
-            active_player=starting_player
-        )
-        
-        # Create shuffled decks (simplified - using indices)
-        deck1_cards = deepcopy(deck1.get('main_deck', []))
-        deck2_cards = deepcopy(deck2.get('main_deck', []))
-        random.shuffle(deck1_cards)
-        random.shuffle(deck2_cards)
-        
-        # Initial hands
-        hand1 = deck1_cards[:5] if len(deck1_cards) >= 5 else deck1_cards[:]
-        hand2 = deck2_cards[:5] if len(deck2_cards) >= 5 else deck2_cards[:]
-        deck1_cards = deck1_cards[5:]
-        deck2_cards = deck2_cards[5:]
+        state.active_player = rng.choice([1, 2])
+        state.turn_count = 0
+        
+        # Shuffle libraries and draw initial hands
+        state.player1.reset(rng)
+        state.player2.reset(rng)
+        
+        replay = self.replay
+        if replay is not None and not replay.begin_game(state):
+            replay = None
+        self._game_replay = replay
+        
+        winner = self._run_turns(state, rng)
+        
+        profile = self.profile
+        if profile is not None:
+            profile.games += 1
+            profile.turns += state.turn_count
+        if replay is not None:
+            replay.end_game(winner, state.turn_count)
+            self._game_replay = None
+        return (winner, state.turn_count)
+    
+    def _run_turns(self, state: GameState, rng: random.Random) -> int:
+        """
+        Play turns from the state's active player until the game ends
+        
+        Used both for whole games and to finish policy rollouts from the
+        middle of a game.
+        
+        Returns:
+            The winner, 1 or 2
+        """
+        player1 = state.player1
+        player2 = state.player2
+        profile = self.profile
+        replay = self._game_replay
+        winner = 0
         
         while state.turn_count < self.MAX_TURNS:
             state.turn_count += 1
+            is_player1 = state.active_player == 1
+            me = player1 if is_player1 else player2
             
             # DON!! phase - gain DON!! cards (up to turn number, max 10)
-            if state.active_player == 1:
-                state.player1_don = min(state.turn_count, 10)
-            else:
-                state.player2_don = min(state.turn_count, 10)
+            me.don = state.turn_count if state.turn_count < 10 else 10
             
             # Draw phase
-            if state.active_player == 1 and deck1_cards:
-                hand1.append(deck1_cards.pop(0))
-            elif state.active_player == 2 and deck2_cards:
-                hand2.append(deck2_cards.pop(0))
+            if replay is not None:
+                replay.turn(state.active_player, state.turn_count)
+                cursor = me.cursor
+            if profile is None:
+                me.draw()
+            else:
+                started = perf_counter_ns()
+                me.draw()
+                profile.record(PHASE_DRAW, started)
+            if replay is not None and me.cursor > cursor:
+                replay.draw(state.active_player, me.hand[-1])
             
             # Main phase - play characters and attack
-            if state.active_player == 1:
-                self._play_turn(state, hand1, deck1_cards, leader1, leader2, True)
-            else:
-                self._play_turn(state, hand2, deck2_cards, leader2, leader1, False)
+            self._play_turn(state, is_player1, rng)
             
             # Check win condition
-            if state.player1_life <= 0:
-                return (2, state.turn_count)
-            if state.player2_life <= 0:
-                return (1, state.turn_count)
+            if player1.life <= 0:
+                winner = 2
+                break
+            if player2.life <= 0:
+                winner = 1
+                break
             
             # Switch active player
-            state.active_player = 2 if state.active_player == 1 else 1
+            state.active_player = 2 if is_player1 else 1
         
         # If game goes to max turns, player with more life wins
-        if state.player1_life > state.player2_life:
-            return (1, state.turn_count)
-        elif state.player2_life > state.player1_life:
-            return (2, state.turn_count)
-        else:
-            return (random.choice([1, 2]), state.turn_count)
+        if not winner:
+            if player1.life > player2.life:
+                winner = 1
+            elif player2.life > player1.life:
+                winner = 2
+            else:
+                winner = rng.choice([1, 2])
+        return winner
     
     def _deal_damage_to_opponent(self, state: GameState, is_player1: bool, damage: int = 1):
-        """Deal damage to the opponent's leader"""
-        if is_player1:
-            state.player2_life -= damage
+        """
+        Deal damage to the opponent's leader
+        
+        Every point of damage takes the opponent's top life card: a card with
+        a [Trigger] activates it, any other card goes to their hand.
+        """
+        opp = state.player2 if is_player1 else state.player1
+        replay = self._game_replay
+        opponent = 2 if is_player1 else 1
+        if replay is not None:
+            replay.damage(opponent, damage)
+        
+        for _ in range(damage):
+            opp.life -= 1
+            if not opp.life_cards:
+                continue
+            card = opp.life_cards.pop()
+            if card.trigger:
+                self._resolve_trigger(state, is_player1, card)
+            else:
+                opp.hand.append(card)
+                opp.hand_counter += card.counter
+                if replay is not None:
+                    replay.life(opponent, card)
+    
+    def _resolve_trigger(self, state: GameState, is_player1: bool, card: CompiledCard):
+        """
+        Activate the [Trigger] of a life card taken from the opponent
+        
+        is_player1 is the attacking side; the card belongs to their opponent.
+        Draw and KO triggers trash the card afterwards.
+        """
+        me = state.player1 if is_player1 else state.player2
+        opp = state.player2 if is_player1 else state.player1
+        replay = self._game_replay
+        player = 1 if is_player1 else 2
+        opponent = 3 - player
+        if replay is not None:
+            replay.trigger(opponent, card)
+        
+        trigger = card.trigger
+        if trigger == TriggerEffect.DRAW:
+            cursor = opp.cursor
+            opp.draw()
+            if replay is not None and opp.cursor > cursor:
+                replay.draw(opponent, opp.hand[-1])
+        elif trigger == TriggerEffect.PLAY:
+            opp.board.append(card)
+        elif trigger == TriggerEffect.KO:
+            for target in me.board:
+                if target.cost <= card.trigger_value:
+                    me.board.remove(target)
+                    if self.profile is not None:
+                        self.profile.kos += 1
+                    if replay is not None:
+                        replay.ko(player, target)
+                    break
         else:
-            state.player1_life -= damage
+            # Triggers the simulator does not model just add the card to hand
+            opp.hand.append(card)
+            opp.hand_counter += card.counter
+    
+    def _use_counters(self, defender: PlayerState, player: int, gap: int):
+        """
+        Discard counter cards from hand until their total exceeds gap
+        
+        Higher counters are used first, so as few cards as possible are
+        spent. The caller checks that the hand holds enough counter value.
+        """
+        replay = self._game_replay
+        hand = defender.hand
+        spent = 0
+        while spent <= gap:
+            # The first card in hand order with the highest counter
+            card = max(hand, key=_card_counter)
+            hand.remove(card)
+            spent += card.counter
+            if replay is not None:
+                replay.counter(player, card)
+        defender.hand_counter -= spent
     
-    def _resolve_battle(self, attacker: Dict, attacker_power: int, defender: Dict, 
-                       defender_power: int, my_board: List[Dict], opp_board: List[Dict]):
+    def _resolve_battle(self, attacker: Optional[CompiledCard], attacker_power: int,
+                       defender: CompiledCard, defender_power: int,
+                       my_board: List[CompiledCard], opp_board: List[CompiledCard]):
         """
         Resolve battle between two characters based on power comparison
         Higher power wins, equal power results in both being KO'd
+        (an attacking leader, None, is never KO'd)
         """
         if attacker_power > defender_power:
             # Attacker wins - defender is KO'd
@@ -246,49 +711,24 @@ class CombatSimulator:
         Parse and return power boost from 'When attacking' effects
         Returns the power boost value (0 if no boost)
         """
-        effect = card.get('effect', '').lower()
-        if 'when attacking' not in effect:
-            return 0
-        
-        # Check for specific power boosts (check higher values first)
-        if '+3000 power' in effect:
-            return 3000
-        elif '+2000 power' in effect:
-            return 2000
-        elif '+1000 power' in effect:
-            return 1000
-        
-        return 0
+        return int(parse_attack_boost(card.get('effect') or ''))
     
     def _parse_on_play_effect(self, card: Dict) -> dict:
         """
         Parse 'On Play' effects into structured data
         Returns dict with effect type and parameters
         """
-        effect = card.get('effect', '').lower()
+        kind, value = parse_on_play_effect(card.get('effect') or '')
         
-        if 'on play' not in effect:
+        if kind == OnPlayEffect.NONE:
             return {'type': None}
-        
-        # Check for damage effect
-        if 'deal 1 damage' in effect:
-            return {'type': 'damage', 'amount': 1, 'target': 'leader'}
-        elif 'deal 2 damage' in effect:
-            return {'type': 'damage', 'amount': 2, 'target': 'leader'}
-        
-        # Check for KO effect
-        if 'ko' in effect:
-            if 'cost of 3 or less' in effect:
-                return {'type': 'ko', 'max_cost': 3}
-            elif 'cost of 4 or less' in effect:
-                return {'type': 'ko', 'max_cost': 4}
-            elif 'cost of 5 or less' in effect:
-                return {'type': 'ko', 'max_cost': 5}
-        
+        if kind == OnPlayEffect.DAMAGE:
+            return {'type': 'damage', 'amount': value, 'target': 'leader'}
+        if kind == OnPlayEffect.KO:
+            return {'type': 'ko', 'max_cost': value}
         return {'type': 'other'}
     
-    def _play_turn(self, state: GameState, hand: List[Dict], deck: List[Dict], 
-                   my_leader: Dict, opp_leader: Dict, is_player1: bool):
+    def _play_turn(self, state: GameState, is_player1: bool, rng: random.Random):
         """
         Simulate a player's turn following One Piece TCG rules
         
@@ -298,165 +738,259 @@ class CombatSimulator:
         - Power determines battle outcomes
         - Characters can attack leader directly or battle opponent's characters
         """
-        my_board = state.player1_board if is_player1 else state.player2_board
-        opp_board = state.player2_board if is_player1 else state.player1_board
-        my_don = state.player1_don if is_player1 else state.player2_don
-        
-        # Play characters from hand (simplified AI - play highest cost affordable card)
-        characters_to_play = []
-        for card in hand[:]:  # Iterate over a copy
-            if card.get('type') == 'Character' and card.get('cost', 0) <= my_don:
-                characters_to_play.append(card)
-        
-        # Sort by cost (play higher cost first for more power)
-        characters_to_play.sort(key=lambda x: x.get('cost', 0), reverse=True)
+        me = state.player1 if is_player1 else state.player2
+        opp = state.player2 if is_player1 else state.player1
+        hand = me.hand
+        my_board = me.board
+        opp_board = opp.board
+        my_don = me.don
+        profile = self.profile
+        if profile is not None:
+            started = perf_counter_ns()
+            effect_nanos = 0
+        replay = self._game_replay
+        player = 1 if is_player1 else 2
+        # None plays the built-in greedy policy inline (see simulation_policies.py)
+        policy = self.policy1 if is_player1 else self.policy2
+        
+        if policy is None:
+            # Play characters from hand (simplified AI - play highest cost affordable card)
+            characters_to_play = []
+            for card in hand:
+                if card.is_character and card.cost <= my_don:
+                    characters_to_play.append(card)
+            
+            # Sort by cost (play higher cost first for more power)
+            if len(characters_to_play) > 1:
+                characters_to_play.sort(key=_card_cost, reverse=True)
+        else:
+            characters_to_play = policy.choose_plays(self, state, is_player1, rng)
         
         played_cards = []  # Track cards to remove from hand
         for card in characters_to_play:
-            if card.get('cost', 0) <= my_don:
-                my_board.append(deepcopy(card))
+            if card.cost <= my_don:
+                my_board.append(card)
                 played_cards.append(card)
-                my_don -= card.get('cost', 0)
+                my_don -= card.cost
+                if replay is not None:
+                    replay.play(player, card)
                 
-                # Handle "On Play" effects using structured parser
-                on_play = self._parse_on_play_effect(card)
-                if on_play['type'] == 'damage':
-                    self._deal_damage_to_opponent(state, is_player1, on_play['amount'])
-                elif on_play['type'] == 'ko' and opp_board:
-                    # Find and KO a character matching the cost restriction
-                    targets = [c for c in opp_board if c.get('cost', 0) <= on_play['max_cost']]
-                    if targets:
-                        opp_board.remove(targets[0])
+                # Handle "On Play" effects precompiled into the card record
+                if card.on_play:
+                    if profile is not None:
+                        effect_started = perf_counter_ns()
+                    if card.on_play == OnPlayEffect.DAMAGE:
+                        self._deal_damage_to_opponent(state, is_player1, card.on_play_value)
+                    elif card.on_play == OnPlayEffect.KO and opp_board:
+                        # Find and KO a character matching the cost restriction
+                        for target in opp_board:
+                            if target.cost <= card.on_play_value:
+                                opp_board.remove(target)
+                                if profile is not None:
+                                    profile.kos += 1
+                                if replay is not None:
+                                    replay.ko(3 - player, target)
+                                break
+                    if profile is not None:
+                        effect_nanos += profile.record(PHASE_ON_PLAY, effect_started) - effect_started
         
         # Remove played cards from hand
         for card in played_cards:
-            if card in hand:
-                hand.remove(card)
+            hand.remove(card)
+            me.hand_counter -= card.counter
         
         # Update DON!!
-        if is_player1:
-            state.player1_don = my_don
-        else:
-            state.player2_don = my_don
+        me.don = my_don
+        
+        if profile is not None:
+            # Effect time is reported under on_play, not play
+            profile.record(PHASE_PLAY, started + effect_nanos)
+            profile.cards_played += len(played_cards)
         
         # Attack phase - characters can attack
         # In real One Piece TCG, only rested (untapped) characters can attack
         # and they become active (tapped) after attacking
-        # For simplicity, we'll allow each character to attack once per turn
+        # For simplicity, we'll allow each character to attack once per turn.
+        # DON!! left over from playing characters is attached during attacks.
         
+        # Randomize attack order (Fisher-Yates on random(), cheaper than rng.shuffle)
         attackers = my_board[:]
-        random.shuffle(attackers)  # Randomize attack order
+        random_ = rng.random
+        for i in range(len(attackers) - 1, 0, -1):
+            j = int(random_() * (i + 1))
+            attackers[i], attackers[j] = attackers[j], attackers[i]
+        attack_character_chance = 1.0 - self.CHARACTER_ATTACK_LEADER_CHANCE
         
         for attacker in attackers:
             # Skip if attacker was already KO'd earlier in the turn
             if attacker not in my_board:
                 continue
-            attacker_power = attacker.get('power', 0)
-            
-            # Apply power boosts from leader ability
-            if 'gain +1000 power' in my_leader.get('effect', '').lower():
-                attacker_power += 1000
-            
-            # Apply attacker's own power boost effects
-            attacker_power += self._get_attack_power_boost(attacker)
             
             # Check for blockers on opponent's board
-            blockers = [c for c in opp_board if 'blocker' in c.get('effect', '').lower()]
+            if profile is not None:
+                started = perf_counter_ns()
+            blockers = [c for c in opp_board if c.blocker] if opp_board else _NO_BLOCKERS
+            if profile is not None:
+                started = profile.record(PHASE_BLOCKER_SCAN, started)
+                board_size = len(my_board) + len(opp_board)
             
             # Decision: attack blocker, character, or leader
             # Blockers must be attacked first if present
-            if blockers:
+            if policy is not None:
+                remaining = attackers[attackers.index(attacker) + 1:]
+                defender = policy.choose_target(self, state, is_player1, attacker, blockers,
+                                                remaining, rng)
+            elif blockers:
                 # Must attack a blocker
-                defender = random.choice(blockers)
-                defender_power = defender.get('power', 0)
-                
-                # Battle resolution - use helper method
-                self._resolve_battle(attacker, attacker_power, defender, defender_power, 
-                                    my_board, opp_board)
+                defender = blockers[int(random_() * len(blockers))]
+            elif opp_board and random_() < attack_character_chance:
+                # No blockers - use configured chance to attack a character instead of the leader
+                defender = opp_board[int(random_() * len(opp_board))]
             else:
-                # No blockers - can attack leader directly or other characters
-                # Use configured chance to attack leader vs characters
-                attack_character_chance = 1.0 - self.CHARACTER_ATTACK_LEADER_CHANCE
-                if opp_board and random.random() < attack_character_chance:
-                    # Attack a character
-                    defender = random.choice(opp_board)
-                    defender_power = defender.get('power', 0)
-                    
-                    # Battle resolution - use helper method
-                    self._resolve_battle(attacker, attacker_power, defender, defender_power,
-                                        my_board, opp_board)
-                else:
-                    # Attack leader directly - deals 1 life damage
-                    self._deal_damage_to_opponent(state, is_player1, 1)
+                defender = None
+            
+            if replay is not None:
+                replay.attack(player, attacker, defender)
+                if blockers:
+                    replay.block(3 - player, defender)
+            
+            self._resolve_attack(state, is_player1, attacker, defender)
+            
+            if profile is not None:
+                profile.record(PHASE_BATTLE, started)
+                profile.attacks += 1
+                if defender is not None:
+                    # Leader hits count their trigger KOs themselves
+                    profile.kos += board_size - len(my_board) - len(opp_board)
+            if replay is not None and defender is not None:
+                self._record_battle(replay, player, attacker, defender, my_board, opp_board)
+        
+        self._attack_with_leader(state, is_player1, rng)
     
-    def _extract_deck_stats(self, deck: Dict) -> Dict:
-        """Extract relevant statistics from a deck"""
-        main_deck = deck.get('main_deck', [])
-        strategy = deck.get('strategy', 'balanced')
-        
-        if not main_deck:
-            return {
-                'strategy': strategy,
-                'color': 'any',
-                'avg_cost': 4.0,
-                'character_ratio': 0.65,
-                'total_cards': 0
-            }
-        
-        # Calculate average cost
-        total_cost = sum(card.get('cost', 0) for card in main_deck)
-        avg_cost = total_cost / len(main_deck) if main_deck else 4.0
-        
-        # Calculate character ratio
-        character_count = sum(1 for card in main_deck if card.get('type') == 'Character')
-        character_ratio = character_count / len(main_deck) if main_deck else 0.65
-        
-        # Determine primary color
-        color_counts = {}
-        for card in main_deck:
-            for color in card.get('colors', []):
-                color_counts[color] = color_counts.get(color, 0) + 1
+    def _attack_with_leader(self, state: GameState, is_player1: bool, rng: random.Random):
+        """
+        Attack with the leader after the characters (also used by policy rollouts)
         
-        primary_color = max(color_counts.items(), key=lambda x: x[1])[0] if color_counts else 'any'
+        The leader uses the DON!! the characters left. It attacks a random
+        opposing blocker if there is one, otherwise the opponent's leader, and
+        is never KO'd in battle.
+        """
+        opp_board = state.player2.board if is_player1 else state.player1.board
+        profile = self.profile
+        if profile is not None:
+            started = perf_counter_ns()
+            board_size = len(opp_board)
+        blockers = [c for c in opp_board if c.blocker] if opp_board else _NO_BLOCKERS
+        if profile is not None:
+            started = profile.record(PHASE_BLOCKER_SCAN, started)
+        defender = blockers[int(rng.random() * len(blockers))] if blockers else None
+        
+        replay = self._game_replay
+        player = 1 if is_player1 else 2
+        if replay is not None:
+            replay.attack(player, None, defender)
+            if defender is not None:
+                replay.block(3 - player, defender)
+        
+        self._resolve_attack(state, is_player1, None, defender)
+        
+        if profile is not None:
+            profile.record(PHASE_BATTLE, started)
+            profile.attacks += 1
+            if defender is not None:
+                profile.kos += board_size - len(opp_board)
+        if replay is not None and defender is not None and defender not in opp_board:
+            replay.ko(3 - player, defender)
+    
+    def _resolve_attack(self, state: GameState, is_player1: bool,
+                        attacker: Optional[CompiledCard], defender: Optional[CompiledCard]):
+        """
+        Resolve one attack (also used by policy rollouts)
+        
+        An attacker of None is the leader, a defender of None the opponent's
+        leader. The attacker first attaches the fewest of its player's
+        remaining DON!! (DON_POWER each) that lets it at least match the
+        defender's power. A leader takes 1 damage if the attack reaches its
+        power, unless its player discards counters from hand to stay ahead of
+        the attacker.
+        """
+        me = state.player1 if is_player1 else state.player2
+        opp = state.player2 if is_player1 else state.player1
+        if attacker is None:
+            power = me.deck.leader_power
+        else:
+            power = attacker.power + me.deck.leader_power_boost + attacker.attack_boost
+        defense = opp.deck.leader_power if defender is None else defender.power
+        
+        if power < defense and me.don:
+            needed = -((power - defense) // self.DON_POWER)
+            if needed <= me.don:
+                me.don -= needed
+                power += needed * self.DON_POWER
+                if self._game_replay is not None:
+                    self._game_replay.attach(1 if is_player1 else 2, attacker, needed)
+        
+        if defender is not None:
+            self._resolve_battle(attacker, power, defender, defender.power, me.board, opp.board)
+        elif power >= defense:
+            if opp.hand_counter > power - defense:
+                self._use_counters(opp, 2 if is_player1 else 1, power - defense)
+            else:
+                self._deal_damage_to_opponent(state, is_player1, 1)
+    
+    def _record_battle(self, replay: ReplayRecorder, player: int, attacker: CompiledCard,
+                       defender: CompiledCard, my_board: List[CompiledCard],
+                       opp_board: List[CompiledCard]):
+        """Record the KOs of a resolved battle in a sampled game"""
+        if defender not in opp_board:
+            replay.ko(3 - player, defender)
+        if attacker not in my_board:
+            replay.ko(player, attacker)
+    
+    def _extract_deck_stats(self, deck: Dict) -> Dict:
+        """Extract relevant statistics from a deck (from its memoized DeckProfile)"""
+        return get_deck_profile(deck).stats()
+    
+    @property
+    def matchup_model(self):
+        """Tournament history as a MatchupModel, rebuilt when tournament_data is replaced"""
+        if self._matchup_model is None or self._matchup_source is not self.tournament_data:
+            from matchup_model import MatchupModel
+            self._matchup_model = MatchupModel.from_matches(self.tournament_data)
+            self._matchup_source = self.tournament_data
+        return self._matchup_model
+    
+    def load_tournament_history(self, path: str, replace: bool = False) -> int:
+        """
+        Import tournament matches from a CSV or Parquet file
         
-        return {
-            'strategy': strategy,
-            'color': primary_color,
-            'avg_cost': avg_cost,
-            'character_ratio': character_ratio,
-            'total_cards': len(main_deck)
-        }
+        Args:
+            path: File with one match per row, columns named like the
+                TournamentMatch fields (see matchup_model.load_matchup_history)
+            replace: Use only the imported matches instead of adding them to
+                the built-in tournament data
+            
+        Returns:
+            Number of matches in the history after the import
+        """
+        from matchup_model import load_matchup_history
+        imported = load_matchup_history(path)
+        self._matchup_model = imported if replace else self.matchup_model.concat(imported)
+        self._matchup_source = self.tournament_data
+        return len(self._matchup_model)
     
     def _calculate_win_probability(self, deck1_stats: Dict, deck2_stats: Dict) -> float:
         """
         Calculate win probability using AI learning from tournament data
-        """
-        # Find similar matchups in tournament data
-        similar_matches = []
-        
-        for match in self.tournament_data:
-            similarity_score = self._calculate_matchup_similarity(
-                deck1_stats, deck2_stats, match
-            )
-            if similarity_score > 0.5:  # Only consider reasonably similar matches
-                similar_matches.append((match, similarity_score))
         
-        if not similar_matches:
+        Every tournament match is scored in one vectorized pass over the
+        matchup model; only matches with a similarity above 0.5 count.
+        """
+        learned_probability = self.matchup_model.learned_probability(deck1_stats, deck2_stats)
+        if learned_probability is None:
             # No similar matches found, use base probability
             return self._calculate_base_probability(deck1_stats, deck2_stats)
         
-        # Weight tournament results by similarity
-        weighted_wins = 0
-        total_weight = 0
-        
-        for match, similarity in similar_matches:
-            weight = similarity
-            total_weight += weight
-            if match.deck1_wins:
-                weighted_wins += weight
-        
-        learned_probability = weighted_wins / total_weight if total_weight > 0 else 0.5
-        
         # Blend learned probability with base calculation (70% learned, 30% base)
         base_probability = self._calculate_base_probability(deck1_stats, deck2_stats)
         final_probability = (learned_probability * 0.7) + (base_probability * 0.3)
@@ -465,7 +999,12 @@ class CombatSimulator:
     
     def _calculate_matchup_similarity(self, deck1_stats: Dict, deck2_stats: Dict, 
                                      match: TournamentMatch) -> float:
-        """Calculate how similar a tournament match is to the current matchup"""
+        """
+        Calculate how similar a tournament match is to the current matchup
+        
+        Scalar reference for MatchupModel.similarity, which applies the same
+        weights to the whole tournament history at once.
+        """
         similarity = 0.0
         
         # Strategy similarity (40% weight)
@@ -523,7 +1062,7 @@ class CombatSimulator:
         return max(0.1, min(0.9, final_prob))
     
     def _estimate_turn_count(self, deck1_stats: Dict, deck2_stats: Dict, 
-                            deck1_wins: bool) -> int:
+                            deck1_wins: bool, rng: RandomSource = None) -> int:
         """Estimate how many turns a match would take"""
         base_turns = 10
         
@@ -538,7 +1077,7 @@ class CombatSimulator:
             base_turns += 3
         
         # Add some randomness
-        variance = random.randint(-2, 2)
+        variance = make_rng(rng).randint(-2, 2)
         return max(5, base_turns + variance)
     
     def _generate_insights(self, deck1_stats: Dict, deck2_stats: Dict, 
@@ -582,33 +1121,14 @@ class CombatSimulator:
         return insights
     
     def _identify_key_cards(self, deck1: Dict, deck2: Dict) -> Dict:
-        """Identify key cards that will impact the matchup"""
-        main_deck = deck1.get('main_deck', [])
-        
-        # Find high-impact cards
-        key_cards = {
-            'high_power': [],
-            'low_cost': [],
-            'events': []
-        }
-        
-        for card in main_deck:
-            # High power characters (7000+)
-            if card.get('type') == 'Character' and card.get('power', 0) >= 7000:
-                if len(key_cards['high_power']) < 3:
-                    key_cards['high_power'].append(card['name'])
-            
-            # Low cost threats (cost <= 2)
-            if card.get('cost', 999) <= 2 and card.get('power', 0) >= 4000:
-                if len(key_cards['low_cost']) < 3:
-                    key_cards['low_cost'].append(card['name'])
-            
-            # Event cards
-            if card.get('type') == 'Event':
-                if len(key_cards['events']) < 3:
-                    key_cards['events'].append(card['name'])
+        """
+        Identify key cards that will impact the matchup
         
-        return key_cards
+        Up to three distinct names each of high power characters (7000+),
+        low cost threats (cost 2 or less, 4000+ power) and events, from deck1's
+        DeckProfile.
+        """
+        return get_deck_profile(deck1).key_card_lists()
     
     def _get_matchup_type(self, deck1_stats: Dict, deck2_stats: Dict) -> str:
         """Determine the type of matchup"""
@@ -670,3 +1190,59 @@ class CombatSimulator:
                 'win_rate': 59.2
             }
         ]
+
+
+_NO_BLOCKERS = ()  # Shared blocker list of an empty board
+
+
+# Key for compiled cards by counter value (attrgetter keeps max() in C)
+_card_counter = attrgetter('counter')
+
+
+def _card_cost(card: CompiledCard) -> int:
+    """Sort key for compiled cards by cost"""
+    return card.cost
+
+
+def _simulate_shard(deck1: CompiledDeck, deck2: CompiledDeck, num_games: int, seed: int) -> Dict:
+    """
+    Simulate one shard of games with its own RNG stream
+    
+    Defined at module level so it can be pickled into worker processes.
+    
+    Returns:
+        Dictionary of counts that can be summed across shards
+    """
+    return _play_shard(CombatSimulator(), deck1, deck2, num_games, seed)
+
+
+def _simulate_configured_shard(deck1: CompiledDeck, deck2: CompiledDeck, options: Dict,
+                               num_games: int, seed: int) -> Dict:
+    """
+    Simulate one shard like _simulate_shard with player policies, adding
+    profile counts and sampled replays when requested
+    
+    Args:
+        options: Dictionary with profile, replay_every and policies
+    """
+    profile = options.get('profile')
+    replay_every = options.get('replay_every')
+    simulator = CombatSimulator()
+    simulator.policy1, simulator.policy2 = options.get('policies') or (None, None)
+    if profile:
+        simulator.profile = SimulationProfile()
+    if replay_every:
+        simulator.replay = ReplayRecorder(replay_every)
+    
+    counts = _play_shard(simulator, deck1, deck2, num_games, seed)
+    if profile:
+        counts.update(simulator.profile.to_counts())
+    if replay_every:
+        counts['replays'] = simulator.replay.replays
+    return counts
+
+
+def _play_shard(simulator: CombatSimulator, deck1: CompiledDeck, deck2: CompiledDeck,
+                num_games: int, seed: int) -> Dict:
+    """Play num_games games on one reused game state and count the results"""
+    return play_games(simulator._play_game, GameState.for_decks(deck1, deck2), num_games, seed)
@@ -0,0 +1,212 @@
+"""
+Compiled deck representation for the One Piece TCG combat simulator
+Card dictionaries are parsed once into compact, immutable records so the
+game loop only touches integers, booleans and enums
+"""
+import re
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, Tuple
+
+# Leader power when the leader card does not print one
+DEFAULT_LEADER_POWER = 5000
+
+# Counter value of characters without a printed one: most characters up to
+# this power carry a +1000 counter, stronger ones usually have none
+DEFAULT_COUNTER_MAX_POWER = 5000
+DEFAULT_COUNTER = 1000
+
+
+class OnPlayEffect(IntEnum):
+    """Kind of 'On Play' effect a card triggers when played"""
+    NONE = 0
+    DAMAGE = 1  # Deal damage to the opponent's leader
+    KO = 2  # KO an opposing character up to a maximum cost
+    OTHER = 3  # Has an 'On Play' effect the simulator does not model
+
+
+class TriggerEffect(IntEnum):
+    """Kind of [Trigger] effect a card activates when it is taken from life"""
+    NONE = 0
+    DRAW = 1  # Draw a card
+    PLAY = 2  # Play this character for free
+    KO = 3  # KO an opposing character up to a maximum cost
+    OTHER = 4  # Has a trigger the simulator does not model (the card goes to hand)
+
+
+class AttackBoost(IntEnum):
+    """Power gained from a 'When attacking' effect"""
+    NONE = 0
+    PLUS_1000 = 1000
+    PLUS_2000 = 2000
+    PLUS_3000 = 3000
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class CompiledCard:
+    """
+    A single deck slot compiled for simulation
+
+    Records compare by identity, so two copies of the same card in a deck
+    are always distinguishable on the board.
+    """
+    name: str
+    cost: int
+    power: int
+    is_character: bool
+    blocker: bool
+    rush: bool
+    on_play: OnPlayEffect
+    on_play_value: int  # Damage amount for DAMAGE, maximum cost for KO
+    attack_boost: AttackBoost
+    counter: int = 0  # Power added to the defending leader when discarded from hand
+    trigger: TriggerEffect = TriggerEffect.NONE
+    trigger_value: int = 0  # Maximum cost for KO triggers
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class CompiledDeck:
+    """A deck compiled for simulation: leader values plus compiled main deck"""
+    leader_life: int
+    leader_power_boost: int  # Power added to every attacker by the leader ability
+    cards: Tuple[CompiledCard, ...]
+    leader_power: int = DEFAULT_LEADER_POWER  # Power an attack on the leader must reach
+
+
+def parse_attack_boost(effect: str) -> AttackBoost:
+    """
+    Parse the power boost from a 'When attacking' effect
+    Higher values are checked first
+    """
+    effect = effect.lower()
+    if 'when attacking' not in effect:
+        return AttackBoost.NONE
+
+    if '+3000 power' in effect:
+        return AttackBoost.PLUS_3000
+    elif '+2000 power' in effect:
+        return AttackBoost.PLUS_2000
+    elif '+1000 power' in effect:
+        return AttackBoost.PLUS_1000
+
+    return AttackBoost.NONE
+
+
+def parse_on_play_effect(effect: str) -> Tuple[OnPlayEffect, int]:
+    """
+    Parse an 'On Play' effect into its kind and parameter
+
+    Returns:
+        Tuple of (effect kind, value) where value is the damage amount for
+        DAMAGE effects, the maximum cost for KO effects and 0 otherwise
+    """
+    effect = effect.lower()
+
+    if 'on play' not in effect:
+        return OnPlayEffect.NONE, 0
+
+    # Check for damage effect
+    if 'deal 1 damage' in effect:
+        return OnPlayEffect.DAMAGE, 1
+    elif 'deal 2 damage' in effect:
+        return OnPlayEffect.DAMAGE, 2
+
+    # Check for KO effect
+    if 'ko' in effect:
+        if 'cost of 3 or less' in effect:
+            return OnPlayEffect.KO, 3
+        elif 'cost of 4 or less' in effect:
+            return OnPlayEffect.KO, 4
+        elif 'cost of 5 or less' in effect:
+            return OnPlayEffect.KO, 5
+
+    return OnPlayEffect.OTHER, 0
+
+
+def parse_counter(card: Dict) -> int:
+    """
+    Counter value of a card: the printed 'counter' field, a 'Counter +N'
+    in the effect text, or the default for characters without either
+    """
+    counter = card.get('counter')
+    if counter is not None:
+        match = re.search(r'\d+', str(counter))
+        return int(match.group()) if match else 0
+
+    match = re.search(r'counter\]?:?\s*\+(\d+)', (card.get('effect') or '').lower())
+    if match:
+        return int(match.group(1))
+
+    if card.get('type') == 'Character' and int(card.get('power') or 0) <= DEFAULT_COUNTER_MAX_POWER:
+        return DEFAULT_COUNTER
+    return 0
+
+
+def parse_trigger_effect(card: Dict) -> Tuple[TriggerEffect, int]:
+    """
+    Parse a card's [Trigger] effect, from its 'trigger' field or the part
+    of the effect text after '[Trigger]' / 'Trigger:'
+
+    Returns:
+        Tuple of (trigger kind, value) where value is the maximum cost for
+        KO triggers and 0 otherwise
+    """
+    trigger = (card.get('trigger') or '').lower()
+    if not trigger:
+        effect = (card.get('effect') or '').lower()
+        match = re.search(r'\[trigger\]|trigger:', effect)
+        if not match:
+            return TriggerEffect.NONE, 0
+        trigger = effect[match.end():]
+
+    if 'play this card' in trigger:
+        if card.get('type') == 'Character':
+            return TriggerEffect.PLAY, 0
+        return TriggerEffect.OTHER, 0
+    if 'draw' in trigger:
+        return TriggerEffect.DRAW, 0
+    if 'ko' in trigger or 'k.o.' in trigger:
+        match = re.search(r'cost of (\d+) or less', trigger)
+        if match:
+            return TriggerEffect.KO, int(match.group(1))
+    return TriggerEffect.OTHER, 0
+
+
+def compile_card(card: Dict) -> CompiledCard:
+    """Compile a card dictionary into a simulation record"""
+    effect = card.get('effect') or ''
+    effect_lower = effect.lower()
+    on_play, on_play_value = parse_on_play_effect(effect)
+    trigger, trigger_value = parse_trigger_effect(card)
+
+    return CompiledCard(
+        name=card.get('name', ''),
+        cost=int(card.get('cost') or 0),
+        power=int(card.get('power') or 0),
+        is_character=card.get('type') == 'Character',
+        blocker='blocker' in effect_lower,
+        rush='rush' in effect_lower,
+        on_play=on_play,
+        on_play_value=on_play_value,
+        attack_boost=parse_attack_boost(effect),
+        counter=parse_counter(card),
+        trigger=trigger,
+        trigger_value=trigger_value
+    )
+
+
+def compile_deck(deck: Dict) -> CompiledDeck:
+    """
+    Compile a deck dictionary (leader and main_deck) for simulation
+
+    Every main deck slot gets its own record, even for repeated cards.
+    """
+    leader = deck.get('leader') or {}
+    leader_effect = (leader.get('effect') or '').lower()
+
+    return CompiledDeck(
+        leader_life=leader.get('life') or 5,
+        leader_power_boost=1000 if 'gain +1000 power' in leader_effect else 0,
+        cards=tuple(compile_card(card) for card in deck.get('main_deck', [])),
+        leader_power=leader.get('power') or DEFAULT_LEADER_POWER
+    )
@@ -0,0 +1,41 @@
+"""
+Deck Accumulator for TCG deck builders
+Tracks the copies of every card name and the cards of every type while a
+deck is built, so checking the copy limit never rescans the deck
+"""
+from collections import Counter
+from typing import Dict, Iterable, List
+
+
+class DeckAccumulator:
+    """A deck under construction with a copy limit per card name"""
+
+    def __init__(self, max_copies: int, cards: Iterable[Dict] = ()):
+        """
+        Args:
+            max_copies: Maximum copies of a card name
+            cards: Cards already in the deck (optional)
+        """
+        self.max_copies = max_copies
+        self.cards: List[Dict] = []
+        self.counts: Counter = Counter()  # Card name -> copies
+        self.type_counts: Counter = Counter()  # Card type -> cards
+        for card in cards:
+            self.add(card)
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def copies(self, card: Dict) -> int:
+        """Number of copies of a card's name in the deck"""
+        return self.counts[card['name']]
+
+    def can_add(self, card: Dict) -> bool:
+        """Whether another copy of a card stays within the copy limit"""
+        return self.counts[card['name']] < self.max_copies
+
+    def add(self, card: Dict):
+        """Add a card, updating the counts"""
+        self.cards.append(card)
+        self.counts[card['name']] += 1
+        self.type_counts[card.get('type')] += 1
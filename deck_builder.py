@@ -3,21 +3,38 @@ One Piece TCG Deck Builder AI Logic
 This module contains the core deck building logic using AI
 """
 import json
-import random
-from typing import List, Dict, Optional
+import math
+from functools import lru_cache
+from typing import Iterator, List, Dict, Optional, Sequence
+from card_catalog import CardCatalog, CardPool, cached_card_catalog, catalog_version, get_card_catalog
 from cards_data import CARD_TYPES, COLORS
+from deck_accumulator import DeckAccumulator
+from deck_sampler import CardWeight, sample_cards
+from deck_profile import get_cards_profile
+from random_source import RandomSource, make_rng, make_seed
+from simulation_runner import derive_shard_seed, iter_tasks
+
+# Decks built by one worker task in build_decks
+BUILD_DECKS_CHUNK_SIZE = 8
 
 class OnePieceDeckBuilder:
     """AI-powered deck builder for One Piece TCG"""
     
-    def __init__(self, db_session=None):
-        """Initialize the deck builder with card database"""
+    def __init__(self, db_session=None, seed: RandomSource = None):
+        """
+        Initialize the deck builder with card database
+        
+        Args:
+            db_session: Database session to load cards from (optional)
+            seed: Seed, random.Random or NumPy Generator for card choices (optional)
+        """
         self.db = db_session
+        self.rng = make_rng(seed)
         self.cards = None  # Will be loaded from database
+        self.cards_version = None  # Catalog version of self.cards, see _load_cards_version()
+        self.catalog = None  # Indexes over self.cards, see get_catalog()
         self.deck_size = 50  # Standard One Piece TCG deck size
         self.max_copies = 4  # Maximum copies of a card (except for leaders)
-        self.max_deck_build_attempts = 1000  # Maximum attempts to build a complete deck
-        self.max_improvement_attempts = 200  # Maximum attempts to build improvement variations
     
     def _load_cards_from_db(self) -> List[Dict]:
         """Load all cards from the database"""
@@ -30,15 +47,38 @@ class OnePieceDeckBuilder:
         cards = Card.query.all()
         return [card.to_dict() for card in cards]
     
+    def _load_cards_version(self) -> str:
+        """
+        Catalog version of the cards _load_cards_from_db() returns
+        
+        The database version is a cheap token (see CardRevision), so a
+        catalog lookup never reads or hashes the cards.
+        """
+        if self.db is None:
+            return _builtin_cards_version()
+        from src.models import CardRevision
+        return CardRevision.catalog_version()
+    
     def get_all_cards(self) -> List[Dict]:
         """Return all available cards"""
         if self.cards is None:
+            # Read the version first: a change made while the cards load
+            # then only costs a rebuild on the next lookup
+            self.cards_version = self._load_cards_version()
             self.cards = self._load_cards_from_db()
         return self.cards
     
+    def get_catalog(self) -> CardCatalog:
+        """Return the indexed catalog of all available cards"""
+        if self.catalog is None:
+            cards = self.get_all_cards()
+            self.catalog = get_card_catalog(cards, self.cards_version)
+        return self.catalog
+    
     def build_deck(self, strategy: str = 'balanced', 
                    color: str = 'any', 
-                   leader: Optional[str] = None) -> Dict:
+                   leader: Optional[str] = None,
+                   seed: RandomSource = None) -> Dict:
         """
         Build a deck based on strategy and color preferences
         
@@ -46,10 +86,14 @@ class OnePieceDeckBuilder:
             strategy: Deck strategy ('aggressive', 'balanced', 'control')
             color: Primary color ('red', 'blue', 'green', 'purple', 'black', 'yellow', 'any')
             leader: Specific leader card name (optional)
+            seed: Seed or generator to reseed the builder with (optional)
         
         Returns:
             Dictionary containing the built deck
         """
+        if seed is not None:
+            self.rng = make_rng(seed)
+        
         deck = {
             'leader': None,
             'main_deck': [],
@@ -67,47 +111,77 @@ class OnePieceDeckBuilder:
         
         return deck
     
+    def build_decks(self, n: int, specs: Optional[List[Dict]] = None,
+                    seed: RandomSource = None, workers: int = 1,
+                    chunk_size: int = BUILD_DECKS_CHUNK_SIZE) -> List[Dict]:
+        """Build a batch of decks (see iter_build_decks)"""
+        return list(self.iter_build_decks(n, specs, seed=seed, workers=workers,
+                                          chunk_size=chunk_size))
+    
+    def iter_build_decks(self, n: int, specs: Optional[List[Dict]] = None,
+                         seed: RandomSource = None, workers: int = 1,
+                         chunk_size: int = BUILD_DECKS_CHUNK_SIZE) -> Iterator[Dict]:
+        """
+        Build a batch of decks, yielding them in order as they are built
+        
+        Deck i follows specs[i % len(specs)] and is built from its own seed
+        derived from the batch seed, so a seeded batch gives the same decks
+        with any number of workers. Every deck is drawn from one catalog.
+        
+        Args:
+            n: Number of decks to build
+            specs: build_deck arguments ('strategy', 'color', 'leader') cycled
+                through the batch (default: one balanced deck of any color)
+            seed: Seed or generator for the batch (defaults to a draw from the builder)
+            workers: Number of worker processes (1 builds every deck in-process)
+            chunk_size: Number of decks per worker task
+        """
+        specs = list(specs) if specs else [{}]
+        base_seed = make_seed(self.rng if seed is None else seed)
+        catalog = self.get_catalog()
+        chunk_size = max(1, chunk_size)
+        starts = range(0, max(0, n), chunk_size)
+        if workers <= 1:
+            for start in starts:
+                yield from _build_deck_range(catalog, specs, base_seed, start, min(chunk_size, n - start))
+            return
+        
+        # The cards go to each worker once; tasks only name the catalog version
+        tasks = [
+            (catalog.version, specs, base_seed, start, min(chunk_size, n - start))
+            for start in starts
+        ]
+        for decks in iter_tasks(_build_deck_chunk, tasks, workers=workers,
+                                initializer=_init_build_decks_worker,
+                                initargs=(list(catalog.cards), catalog.version)):
+            yield from decks
+    
     def _select_leader(self, color: str, leader_name: Optional[str]) -> Dict:
         """Select a leader card"""
-        cards = self.get_all_cards()
-        leaders = [c for c in cards if c['type'] == 'Leader']
+        catalog = self.get_catalog()
         
         if leader_name:
             # Find specific leader
-            for leader in leaders:
-                if leader['name'].lower() == leader_name.lower():
-                    return leader
+            leader = catalog.leader(leader_name)
+            if leader is not None:
+                return leader
         
         # Filter by color if specified
-        if color != 'any':
-            color_leaders = [l for l in leaders if color.lower() in [c.lower() for c in l['colors']]]
-            if color_leaders:
-                leaders = color_leaders
+        if color == 'any' or not catalog.leaders_with_color(color):
+            color = None
         
-        # Calculate the card pool size for each leader
+        # Pool sizes are computed once per catalog version (see card_catalog.py)
         # To build a 50-card deck, we need at least 13 unique cards (13 * 4 = 52)
         min_unique_cards_needed = (self.deck_size + self.max_copies - 1) // self.max_copies  # Ceiling division
-        
-        leaders_with_pool_size = []
-        for leader in leaders:
-            available_cards = [
-                c for c in cards
-                if c['type'] != 'Leader' and
-                any(lc in c['colors'] for lc in leader['colors'])
-            ]
-            pool_size = len(available_cards)
-            leaders_with_pool_size.append((leader, pool_size))
+        choices = catalog.leader_choices(min_unique_cards_needed, color)
         
         # Prefer leaders that have enough cards for a full 50-card deck
-        viable_leaders = [l for l, size in leaders_with_pool_size if size >= min_unique_cards_needed]
-        
-        if viable_leaders:
+        if choices.viable:
             # Choose randomly from viable leaders
-            return random.choice(viable_leaders)
+            return self.rng.choice(choices.viable)
         else:
             # Fall back to leader with the largest card pool
-            leaders_with_pool_size.sort(key=lambda x: x[1], reverse=True)
-            return leaders_with_pool_size[0][0] if leaders_with_pool_size else leaders[0]
+            return choices.largest_pool
     
     def _build_main_deck(self, strategy: str, color: str, leader: Dict) -> List[Dict]:
         """Build the main deck based on strategy"""
@@ -115,174 +189,93 @@ class OnePieceDeckBuilder:
         
         # Filter cards by color (matching leader's colors)
         # According to One Piece TCG rules, cards must share at least one color with the leader
-        cards = self.get_all_cards()
-        available_cards = [
-            c for c in cards 
-            if c['type'] != 'Leader' and 
-            any(lc in c['colors'] for lc in leader['colors'])
-        ]
+        pool = self.get_catalog().pool_for_leader(leader)
+        available_cards = pool.cards
         
         # Strategy-based card selection
         if strategy == 'aggressive':
-            main_deck = self._build_aggressive_deck(available_cards)
+            main_deck = self._build_aggressive_deck(pool)
         elif strategy == 'control':
-            main_deck = self._build_control_deck(available_cards)
+            main_deck = self._build_control_deck(pool)
         else:  # balanced
-            main_deck = self._build_balanced_deck(available_cards)
+            main_deck = self._build_balanced_deck(pool)
         
         # Ensure deck is exactly 50 cards
         # Only use cards that match the leader's colors (One Piece TCG rule)
-        while len(main_deck) < self.deck_size:
-            # Get cards that can still be added (not at max copies)
-            addable_cards = [
-                c for c in available_cards
-                if self._count_card_copies(main_deck, c) < self.max_copies
-            ]
-            
-            if not addable_cards:
-                # No more cards can be added while respecting the 4-copy limit
-                # This happens when the card database is too small for the color combination
-                break
-            
-            # Add a random card from the available pool
-            card = random.choice(addable_cards)
-            main_deck.append(card)
-        
-        return main_deck[:self.deck_size]
+        # The deck stays short only when the card database is too small for the
+        # color combination to respect the 4-copy limit
+        deck = DeckAccumulator(self.max_copies, main_deck)
+        self._fill(deck, available_cards, self.deck_size)
+        
+        return deck.cards[:self.deck_size]
     
-    def _build_aggressive_deck(self, cards: List[Dict]) -> List[Dict]:
+    def _fill(self, deck: DeckAccumulator, candidates: Sequence[Dict], size: int,
+              weight: Optional[CardWeight] = None):
+        """Add cards drawn from candidates until the deck holds size cards or none fit"""
+        sample_cards(deck, candidates, size - len(deck), self.rng, weight)
+    
+    def _build_aggressive_deck(self, pool: CardPool) -> List[Dict]:
         """Build an aggressive deck focusing on low-cost, high-power characters"""
-        deck = []
+        deck = DeckAccumulator(self.max_copies)
+        cards = pool.cards
         
         # Prioritize characters with cost <= 5 and high power
-        characters = [c for c in cards if c['type'] == 'Character' and c['cost'] <= 5]
-        events = [c for c in cards if c['type'] == 'Event']
+        characters = pool.of_type('Character', max_cost=5)
+        events = pool.of_type('Event')
         
         # Add characters (70% of deck, target 35 cards)
-        while len(deck) < 35:
-            addable_chars = [
-                c for c in characters
-                if self._count_card_copies(deck, c) < self.max_copies
-            ]
-            if not addable_chars:
-                break
-            deck.append(random.choice(addable_chars))
+        self._fill(deck, characters, 35)
         
         # Add events (fill remaining towards 50)
-        while len(deck) < 50:
-            addable_events = [
-                c for c in events
-                if self._count_card_copies(deck, c) < self.max_copies
-            ]
-            if not addable_events:
-                break
-            deck.append(random.choice(addable_events))
+        self._fill(deck, events, 50)
         
         # If we haven't reached 50, add any remaining cards
-        while len(deck) < 50:
-            addable_any = [
-                c for c in cards
-                if self._count_card_copies(deck, c) < self.max_copies
-            ]
-            if not addable_any:
-                break
-            deck.append(random.choice(addable_any))
+        self._fill(deck, cards, 50)
         
-        return deck
+        return deck.cards
     
-    def _build_control_deck(self, cards: List[Dict]) -> List[Dict]:
+    def _build_control_deck(self, pool: CardPool) -> List[Dict]:
         """Build a control deck focusing on removal and high-cost characters"""
-        deck = []
+        deck = DeckAccumulator(self.max_copies)
+        cards = pool.cards
         
         # Prioritize events and high-cost characters
-        events = [c for c in cards if c['type'] == 'Event']
-        characters = [c for c in cards if c['type'] == 'Character' and c['cost'] >= 4]
+        events = pool.of_type('Event')
+        characters = pool.of_type('Character', min_cost=4)
         
         # Add events (40% of deck, target 20 cards)
-        while len(deck) < 20:
-            addable_events = [
-                c for c in events
-                if self._count_card_copies(deck, c) < self.max_copies
-            ]
-            if not addable_events:
-                break
-            deck.append(random.choice(addable_events))
+        self._fill(deck, events, 20)
         
         # Add characters (fill remaining towards 50)
-        while len(deck) < 50:
-            addable_chars = [
-                c for c in characters
-                if self._count_card_copies(deck, c) < self.max_copies
-            ]
-            if not addable_chars:
-                break
-            deck.append(random.choice(addable_chars))
+        self._fill(deck, characters, 50)
         
         # If we haven't reached 50, add any remaining cards
-        while len(deck) < 50:
-            addable_any = [
-                c for c in cards
-                if self._count_card_copies(deck, c) < self.max_copies
-            ]
-            if not addable_any:
-                break
-            deck.append(random.choice(addable_any))
+        self._fill(deck, cards, 50)
         
-        return deck
+        return deck.cards
     
-    def _build_balanced_deck(self, cards: List[Dict]) -> List[Dict]:
+    def _build_balanced_deck(self, pool: CardPool) -> List[Dict]:
         """Build a balanced deck with good mix of characters and events"""
-        deck = []
+        deck = DeckAccumulator(self.max_copies)
+        cards = pool.cards
         
-        characters = [c for c in cards if c['type'] == 'Character']
-        events = [c for c in cards if c['type'] == 'Event']
-        stages = [c for c in cards if c['type'] == 'Stage']
+        characters = pool.of_type('Character')
+        events = pool.of_type('Event')
+        stages = pool.of_type('Stage')
         
         # Add characters (65% of deck, target 32 cards)
-        while len(deck) < 32:
-            addable_chars = [
-                c for c in characters
-                if self._count_card_copies(deck, c) < self.max_copies
-            ]
-            if not addable_chars:
-                break
-            deck.append(random.choice(addable_chars))
+        self._fill(deck, characters, 32)
         
         # Add events (30% of deck, target 47 total)
-        while len(deck) < 47:
-            addable_events = [
-                c for c in events
-                if self._count_card_copies(deck, c) < self.max_copies
-            ]
-            if not addable_events:
-                break
-            deck.append(random.choice(addable_events))
+        self._fill(deck, events, 47)
         
         # Add stages (5% of deck, fill towards 50)
-        while len(deck) < 50:
-            addable_stages = [
-                c for c in stages
-                if self._count_card_copies(deck, c) < self.max_copies
-            ]
-            if not addable_stages:
-                break
-            deck.append(random.choice(addable_stages))
+        self._fill(deck, stages, 50)
         
         # If we haven't reached 50, add any remaining cards
-        while len(deck) < 50:
-            addable_any = [
-                c for c in cards
-                if self._count_card_copies(deck, c) < self.max_copies
-            ]
-            if not addable_any:
-                break
-            deck.append(random.choice(addable_any))
+        self._fill(deck, cards, 50)
         
-        return deck
-    
-    def _count_card_copies(self, deck: List[Dict], card: Dict) -> int:
-        """Count how many copies of a card are in the deck"""
-        return sum(1 for c in deck if c['name'] == card['name'])
+        return deck.cards
     
     def analyze_deck(self, deck: List[Dict]) -> Dict:
         """
@@ -294,68 +287,44 @@ class OnePieceDeckBuilder:
         Returns:
             Dictionary containing analysis and suggestions
         """
+        # Statistics are memoized per decklist (see deck_profile.py)
+        profile = get_cards_profile(deck)
         analysis = {
-            'total_cards': len(deck),
-            'curve': self._analyze_cost_curve(deck),
-            'type_distribution': self._analyze_type_distribution(deck),
-            'color_distribution': self._analyze_color_distribution(deck),
+            'total_cards': profile.total_cards,
+            'curve': dict(profile.cost_histogram),
+            'type_distribution': dict(profile.type_counts),
+            'color_distribution': dict(profile.color_counts),
             'suggestions': []
         }
         
         # Generate suggestions based on analysis
-        if len(deck) != self.deck_size:
+        if profile.total_cards != self.deck_size:
             analysis['suggestions'].append(
-                f"Deck should have exactly {self.deck_size} cards. Current: {len(deck)}"
+                f"Deck should have exactly {self.deck_size} cards. Current: {profile.total_cards}"
             )
         
         # Check cost curve
-        avg_cost = sum(c.get('cost', 0) for c in deck) / len(deck) if deck else 0
-        if avg_cost > 5:
+        if profile.avg_cost > 5:
             analysis['suggestions'].append(
                 "Average cost is high. Consider adding more low-cost cards for better tempo."
             )
-        elif avg_cost < 3:
+        elif profile.avg_cost < 3:
             analysis['suggestions'].append(
                 "Average cost is low. Consider adding some high-impact cards."
             )
         
         # Check type distribution
-        type_dist = analysis['type_distribution']
-        character_ratio = type_dist.get('Character', 0) / len(deck) if deck else 0
-        if character_ratio < 0.5:
+        if profile.character_ratio < 0.5:
             analysis['suggestions'].append(
                 "Low character count. Consider adding more characters to maintain board presence."
             )
         
         return analysis
     
-    def _analyze_cost_curve(self, deck: List[Dict]) -> Dict:
-        """Analyze the cost distribution"""
-        curve = {}
-        for card in deck:
-            cost = card.get('cost', 0)
-            curve[cost] = curve.get(cost, 0) + 1
-        return curve
-    
-    def _analyze_type_distribution(self, deck: List[Dict]) -> Dict:
-        """Analyze card type distribution"""
-        distribution = {}
-        for card in deck:
-            card_type = card.get('type', 'Unknown')
-            distribution[card_type] = distribution.get(card_type, 0) + 1
-        return distribution
-    
-    def _analyze_color_distribution(self, deck: List[Dict]) -> Dict:
-        """Analyze color distribution"""
-        distribution = {}
-        for card in deck:
-            for color in card.get('colors', []):
-                distribution[color] = distribution.get(color, 0) + 1
-        return distribution
-    
     def build_deck_from_collection(self, strategy: str = 'balanced', 
                                    color: str = 'any',
-                                   owned_cards: Dict[str, int] = None) -> Dict:
+                                   owned_cards: Dict[str, int] = None,
+                                   seed: RandomSource = None) -> Dict:
         """
         Build a deck prioritizing cards from user's collection
         
@@ -363,6 +332,7 @@ class OnePieceDeckBuilder:
             strategy: Deck strategy ('aggressive', 'balanced', 'control')
             color: Primary color
             owned_cards: Dictionary mapping card names to quantities owned
+            seed: Seed or generator to reseed the builder with (optional)
         
         Returns:
             Dictionary containing the built deck with collection info
@@ -371,7 +341,7 @@ class OnePieceDeckBuilder:
             owned_cards = {}
         
         # First, build a standard deck
-        deck = self.build_deck(strategy=strategy, color=color)
+        deck = self.build_deck(strategy=strategy, color=color, seed=seed)
         
         # Analyze collection usage
         collection_stats = self._analyze_collection_usage(
@@ -424,7 +394,8 @@ class OnePieceDeckBuilder:
             'coverage_percentage': round(coverage_percentage, 2)
         }
     
-    def suggest_improvements(self, deck: Dict, owned_cards: Dict[str, int] = None) -> Dict:
+    def suggest_improvements(self, deck: Dict, owned_cards: Dict[str, int] = None,
+                             seed: RandomSource = None) -> Dict:
         """
         Suggest improvements for an existing deck
         Provides three alternatives: balanced, aggressive, and tournament-competitive
@@ -432,10 +403,14 @@ class OnePieceDeckBuilder:
         Args:
             deck: Current deck with 'leader', 'main_deck', 'strategy', 'color'
             owned_cards: Optional dictionary of owned card names to quantities
+            seed: Seed or generator to reseed the builder with (optional)
         
         Returns:
             Dictionary containing three improved deck variations
         """
+        if seed is not None:
+            self.rng = make_rng(seed)
+        
         if owned_cards is None:
             owned_cards = {}
         
@@ -448,23 +423,18 @@ class OnePieceDeckBuilder:
         current_analysis = self.analyze_deck(main_deck)
         
         # Get available cards that match the leader's colors
-        cards = self.get_all_cards()
-        available_cards = [
-            c for c in cards 
-            if c['type'] != 'Leader' and 
-            any(lc in c['colors'] for lc in leader['colors'])
-        ]
+        pool = self.get_catalog().pool_for_leader(leader)
         
         # Generate three improvement suggestions
         improvements = {
             'balanced': self._suggest_balanced_improvement(
-                leader, available_cards, main_deck, current_analysis, owned_cards
+                leader, pool, main_deck, current_analysis, owned_cards
             ),
             'aggressive': self._suggest_aggressive_improvement(
-                leader, available_cards, main_deck, current_analysis, owned_cards
+                leader, pool, main_deck, current_analysis, owned_cards
             ),
             'tournament': self._suggest_tournament_improvement(
-                leader, available_cards, main_deck, current_analysis, owned_cards
+                leader, pool, main_deck, current_analysis, owned_cards
             )
         }
         
@@ -479,7 +449,7 @@ class OnePieceDeckBuilder:
         
         return improvements
     
-    def _suggest_balanced_improvement(self, leader: Dict, available_cards: List[Dict], 
+    def _suggest_balanced_improvement(self, leader: Dict, pool: CardPool, 
                                      current_deck: List[Dict], analysis: Dict,
                                      owned_cards: Dict[str, int]) -> Dict:
         """Generate a more balanced version of the deck"""
@@ -493,100 +463,46 @@ class OnePieceDeckBuilder:
         type_dist = analysis.get('type_distribution', {})
         
         # Build improved balanced deck
-        new_deck = []
+        new_deck = DeckAccumulator(self.max_copies)
         
         # Separate available cards by type
-        characters = [c for c in available_cards if c['type'] == 'Character']
-        events = [c for c in available_cards if c['type'] == 'Event']
-        stages = [c for c in available_cards if c['type'] == 'Stage']
+        available_cards = pool.cards
+        characters = pool.of_type('Character')
+        events = pool.of_type('Event')
+        stages = pool.of_type('Stage')
         
         # Prioritize owned cards when building
-        def sort_by_ownership(cards):
-            return sorted(cards, key=lambda c: owned_cards.get(c['name'], 0), reverse=True)
-        
-        characters = sort_by_ownership(characters)
-        events = sort_by_ownership(events)
-        stages = sort_by_ownership(stages)
+        def ownership_weight(card):
+            return self._ownership_weight(card, owned_cards)
         
         # Add characters (65% = ~32 cards)
-        attempts = 0
-        while len(new_deck) < int(self.deck_size * target_character_ratio) and attempts < self.max_improvement_attempts:
-            if characters:
-                card = characters[attempts % len(characters)]
-                if self._count_card_copies(new_deck, card) < self.max_copies:
-                    new_deck.append(card)
-            attempts += 1
+        self._fill(new_deck, characters, int(self.deck_size * target_character_ratio), ownership_weight)
         
         # Add events (30% = ~15 cards)
-        attempts = 0
-        while len(new_deck) < int(self.deck_size * (target_character_ratio + target_event_ratio)) and attempts < self.max_improvement_attempts:
-            if events:
-                card = events[attempts % len(events)]
-                if self._count_card_copies(new_deck, card) < self.max_copies:
-                    new_deck.append(card)
-            attempts += 1
+        self._fill(new_deck, events, int(self.deck_size * (target_character_ratio + target_event_ratio)),
+                   ownership_weight)
         
         # Add stages (5% = ~3 cards)
-        attempts = 0
-        while len(new_deck) < self.deck_size and attempts < self.max_improvement_attempts:
-            if stages:
-                card = stages[attempts % len(stages)]
-                if self._count_card_copies(new_deck, card) < self.max_copies:
-                    new_deck.append(card)
-            attempts += 1
+        self._fill(new_deck, stages, self.deck_size, ownership_weight)
         
         # Fill to exactly 50 if needed, maintaining balanced distribution
-        attempts = 0
-        while len(new_deck) < self.deck_size and attempts < self.max_improvement_attempts:
-            # Try to maintain the target ratios when filling
-            current_chars = sum(1 for c in new_deck if c['type'] == 'Character')
-            current_events = sum(1 for c in new_deck if c['type'] == 'Event')
-            current_stages = sum(1 for c in new_deck if c['type'] == 'Stage')
-            
-            # Determine what type to add based on current ratios
-            char_deficit = (self.deck_size * target_character_ratio) - current_chars
-            event_deficit = (self.deck_size * target_event_ratio) - current_events
-            stage_deficit = (self.deck_size * target_stage_ratio) - current_stages
-            
-            if char_deficit > 0 and characters:
-                addable = [c for c in characters if self._count_card_copies(new_deck, c) < self.max_copies]
-                if addable:
-                    new_deck.append(random.choice(addable))
-                    attempts += 1
-                    continue
-            if event_deficit > 0 and events:
-                addable = [c for c in events if self._count_card_copies(new_deck, c) < self.max_copies]
-                if addable:
-                    new_deck.append(random.choice(addable))
-                    attempts += 1
-                    continue
-            if stage_deficit > 0 and stages:
-                addable = [c for c in stages if self._count_card_copies(new_deck, c) < self.max_copies]
-                if addable:
-                    new_deck.append(random.choice(addable))
-                    attempts += 1
-                    continue
-            
-            # Fall back to any available card
-            addable_any = [
-                c for c in available_cards
-                if self._count_card_copies(new_deck, c) < self.max_copies
-            ]
-            if not addable_any:
-                break
-            new_deck.append(random.choice(addable_any))
-            attempts += 1
+        self._fill_type_deficits(new_deck, [
+            (characters, 'Character', target_character_ratio),
+            (events, 'Event', target_event_ratio),
+            (stages, 'Stage', target_stage_ratio)
+        ], ownership_weight)
+        self._fill(new_deck, available_cards, self.deck_size, ownership_weight)
         
         return {
             'leader': leader,
-            'main_deck': new_deck[:self.deck_size],
+            'main_deck': new_deck.cards[:self.deck_size],
             'strategy': 'balanced',
             'color': ', '.join(leader['colors']),
             'description': 'Optimized for balanced gameplay with 65% characters, 30% events, and 5% stages. Good mix of offensive and defensive capabilities.',
             'improvement_type': 'balanced'
         }
     
-    def _suggest_aggressive_improvement(self, leader: Dict, available_cards: List[Dict],
+    def _suggest_aggressive_improvement(self, leader: Dict, pool: CardPool,
                                        current_deck: List[Dict], analysis: Dict,
                                        owned_cards: Dict[str, int]) -> Dict:
         """Generate a more aggressive version of the deck"""
@@ -594,78 +510,39 @@ class OnePieceDeckBuilder:
         target_character_ratio = 0.75
         target_avg_cost = 3.5
         
-        new_deck = []
+        new_deck = DeckAccumulator(self.max_copies)
         
         # Prioritize low-cost, high-power characters
-        characters = [
-            c for c in available_cards 
-            if c['type'] == 'Character' and c.get('cost', 10) <= 5
-        ]
-        events = [
-            c for c in available_cards 
-            if c['type'] == 'Event' and c.get('cost', 10) <= 4
-        ]
+        available_cards = pool.cards
+        characters = pool.of_type('Character', max_cost=5)
+        events = pool.of_type('Event', max_cost=4)
         
-        # Sort by cost (lower first) and ownership
-        def sort_aggressive(cards):
-            return sorted(
-                cards, 
-                key=lambda c: (c.get('cost', 10), -owned_cards.get(c['name'], 0))
-            )
-        
-        characters = sort_aggressive(characters)
-        events = sort_aggressive(events)
+        # Weight by cost (lower first) and ownership
+        def aggressive_weight(card):
+            return self._ownership_weight(card, owned_cards) / (1 + card.get('cost', 10))
         
         # Add low-cost characters (75% = ~37 cards)
-        attempts = 0
-        while len(new_deck) < int(self.deck_size * target_character_ratio) and attempts < self.max_improvement_attempts:
-            if characters:
-                card = characters[attempts % len(characters)]
-                if self._count_card_copies(new_deck, card) < self.max_copies:
-                    new_deck.append(card)
-            attempts += 1
+        self._fill(new_deck, characters, int(self.deck_size * target_character_ratio), aggressive_weight)
         
         # Add low-cost events (25% = ~13 cards)
-        attempts = 0
-        while len(new_deck) < self.deck_size and attempts < self.max_improvement_attempts:
-            if events:
-                card = events[attempts % len(events)]
-                if self._count_card_copies(new_deck, card) < self.max_copies:
-                    new_deck.append(card)
-            attempts += 1
+        self._fill(new_deck, events, self.deck_size, aggressive_weight)
         
         # Fill to exactly 50 if needed, preferring characters to maintain aggressive style
-        attempts = 0
-        while len(new_deck) < self.deck_size and attempts < self.max_improvement_attempts:
-            # First try to add any character (not just low-cost)
-            all_characters = [c for c in available_cards if c['type'] == 'Character']
-            addable_chars = [
-                c for c in all_characters
-                if self._count_card_copies(new_deck, c) < self.max_copies
-            ]
-            if addable_chars:
-                new_deck.append(random.choice(addable_chars))
-            else:
-                # Fall back to any card if no characters available
-                addable_any = [
-                    c for c in available_cards
-                    if self._count_card_copies(new_deck, c) < self.max_copies
-                ]
-                if not addable_any:
-                    break
-                new_deck.append(random.choice(addable_any))
-            attempts += 1
+        # First try to add any character (not just low-cost)
+        self._fill(new_deck, pool.of_type('Character'), self.deck_size, aggressive_weight)
+        # Fall back to any card if no characters available
+        self._fill(new_deck, available_cards, self.deck_size, aggressive_weight)
         
         return {
             'leader': leader,
-            'main_deck': new_deck[:self.deck_size],
+            'main_deck': new_deck.cards[:self.deck_size],
             'strategy': 'aggressive',
             'color': ', '.join(leader['colors']),
             'description': 'Optimized for aggressive gameplay with 75% low-cost characters for early board pressure. Focuses on ending games quickly.',
             'improvement_type': 'aggressive'
         }
     
-    def _suggest_tournament_improvement(self, leader: Dict, available_cards: List[Dict],
+    def _suggest_tournament_improvement(self, leader: Dict, pool: CardPool,
                                        current_deck: List[Dict], analysis: Dict,
                                        owned_cards: Dict[str, int]) -> Dict:
         """Generate a tournament-competitive version based on winning patterns"""
@@ -675,115 +552,64 @@ class OnePieceDeckBuilder:
         # - Strategic use of high-impact events
         # - Optimal ratios proven in competitive play
         
-        new_deck = []
+        new_deck = DeckAccumulator(self.max_copies)
         
         # Get tournament-viable cards (cost 2-6 for good curve)
-        characters = [
-            c for c in available_cards 
-            if c['type'] == 'Character' and 2 <= c.get('cost', 10) <= 6
-        ]
-        events = [
-            c for c in available_cards 
-            if c['type'] == 'Event'
-        ]
-        stages = [
-            c for c in available_cards 
-            if c['type'] == 'Stage'
-        ]
-        
-        # Sort by tournament viability (balanced cost, ownership)
-        def sort_tournament(cards):
-            return sorted(
-                cards,
-                key=lambda c: (
-                    abs(c.get('cost', 5) - 4.0),  # Prefer cost around 4
-                    -owned_cards.get(c['name'], 0)
-                )
-            )
+        available_cards = pool.cards
+        characters = pool.of_type('Character', min_cost=2, max_cost=6)
+        events = pool.of_type('Event')
+        stages = pool.of_type('Stage')
         
-        characters = sort_tournament(characters)
-        events = sort_tournament(events)
-        stages = sort_tournament(stages)
+        # Weight by tournament viability (balanced cost, ownership)
+        def tournament_weight(card):
+            # Prefer cost around 4
+            return self._ownership_weight(card, owned_cards) / (1 + abs(card.get('cost', 5) - 4.0))
         
         # Add characters with good cost curve (65% = ~32 cards)
-        attempts = 0
         target_chars = int(self.deck_size * 0.65)  # 65% = ~32 cards
-        while len(new_deck) < target_chars and attempts < self.max_improvement_attempts:
-            if characters:
-                card = characters[attempts % len(characters)]
-                if self._count_card_copies(new_deck, card) < self.max_copies:
-                    new_deck.append(card)
-            attempts += 1
+        self._fill(new_deck, characters, target_chars, tournament_weight)
         
         # Add high-impact events (30% = ~15 cards)
-        attempts = 0
         target_events = target_chars + int(self.deck_size * 0.30)  # Add 30% more = ~47 total
-        while len(new_deck) < target_events and attempts < self.max_improvement_attempts:
-            if events:
-                card = events[attempts % len(events)]
-                if self._count_card_copies(new_deck, card) < self.max_copies:
-                    new_deck.append(card)
-            attempts += 1
+        self._fill(new_deck, events, target_events, tournament_weight)
         
         # Add stages (5% = ~3 cards)
-        attempts = 0
-        while len(new_deck) < self.deck_size and attempts < self.max_improvement_attempts:
-            if stages:
-                card = stages[attempts % len(stages)]
-                if self._count_card_copies(new_deck, card) < self.max_copies:
-                    new_deck.append(card)
-            attempts += 1
+        self._fill(new_deck, stages, self.deck_size, tournament_weight)
         
         # Fill to exactly 50 if needed, maintaining tournament-viable distribution
-        attempts = 0
-        while len(new_deck) < self.deck_size and attempts < self.max_improvement_attempts:
-            # Try to maintain 65/30/5 distribution
-            current_chars = sum(1 for c in new_deck if c['type'] == 'Character')
-            current_events = sum(1 for c in new_deck if c['type'] == 'Event')
-            current_stages = sum(1 for c in new_deck if c['type'] == 'Stage')
-            
-            char_deficit = (self.deck_size * 0.65) - current_chars
-            event_deficit = (self.deck_size * 0.30) - current_events
-            stage_deficit = (self.deck_size * 0.05) - current_stages
-            
-            if char_deficit > 0 and characters:
-                addable = [c for c in characters if self._count_card_copies(new_deck, c) < self.max_copies]
-                if addable:
-                    new_deck.append(random.choice(addable))
-                    attempts += 1
-                    continue
-            if event_deficit > 0 and events:
-                addable = [c for c in events if self._count_card_copies(new_deck, c) < self.max_copies]
-                if addable:
-                    new_deck.append(random.choice(addable))
-                    attempts += 1
-                    continue
-            if stage_deficit > 0 and stages:
-                addable = [c for c in stages if self._count_card_copies(new_deck, c) < self.max_copies]
-                if addable:
-                    new_deck.append(random.choice(addable))
-                    attempts += 1
-                    continue
-            
-            # Fall back to any available card
-            addable_any = [
-                c for c in available_cards
-                if self._count_card_copies(new_deck, c) < self.max_copies
-            ]
-            if not addable_any:
-                break
-            new_deck.append(random.choice(addable_any))
-            attempts += 1
+        self._fill_type_deficits(new_deck, [
+            (characters, 'Character', 0.65),
+            (events, 'Event', 0.30),
+            (stages, 'Stage', 0.05)
+        ], tournament_weight)
+        self._fill(new_deck, available_cards, self.deck_size, tournament_weight)
         
         return {
             'leader': leader,
-            'main_deck': new_deck[:self.deck_size],
+            'main_deck': new_deck.cards[:self.deck_size],
             'strategy': 'tournament',
             'color': ', '.join(leader['colors']),
             'description': 'Optimized based on competitive tournament patterns. Features a balanced cost curve (avg 4.0-4.5) with 65% characters and strategic event selection proven in competitive play.',
             'improvement_type': 'tournament'
         }
     
+    def _ownership_weight(self, card: Dict, owned_cards: Dict[str, int]) -> float:
+        """Sampling weight that favors cards the user owns more copies of"""
+        return 1 + min(owned_cards.get(card['name'], 0), self.max_copies)
+    
+    def _fill_type_deficits(self, deck: DeckAccumulator, targets: List, weight: CardWeight):
+        """
+        Add cards of each type still short of its target ratio of the deck
+        
+        Args:
+            deck: Deck being built
+            targets: (candidates, card type, target ratio) for each type, in order
+            weight: Sampling weight of a card
+        """
+        for candidates, card_type, ratio in targets:
+            deficit = math.ceil(self.deck_size * ratio) - deck.type_counts[card_type]
+            self._fill(deck, candidates, min(self.deck_size, len(deck) + deficit), weight)
+    
     def _calculate_deck_changes(self, old_deck: List[Dict], new_deck: List[Dict]) -> Dict:
         """Calculate the differences between two decks"""
         # Count cards in each deck
@@ -829,3 +655,47 @@ class OnePieceDeckBuilder:
             'total_changes': total_changes,
             'similarity_percentage': round(similarity_percentage, 2)
         }
+
+
+@lru_cache(maxsize=1)
+def _builtin_cards_version() -> str:
+    """Catalog version of the built-in cards, hashed once per process"""
+    from cards_data import ONEPIECE_CARDS
+    return catalog_version(ONEPIECE_CARDS)
+
+
+def _init_build_decks_worker(cards: List[Dict], version: str):
+    """Index the cards of a deck batch once in a worker process (see iter_build_decks)"""
+    get_card_catalog(cards, version)
+
+
+def _build_deck_chunk(version: str, specs: List[Dict], base_seed: int,
+                      start: int, count: int) -> List[Dict]:
+    """
+    Build decks start to start + count - 1 of a batch in a worker process
+    
+    Module-level so worker processes can run it; the catalog was built by
+    _init_build_decks_worker when the worker started.
+    """
+    catalog = cached_card_catalog(version)
+    if catalog is None:
+        raise RuntimeError(f"Card catalog {version} is not loaded in this worker")
+    return _build_deck_range(catalog, specs, base_seed, start, count)
+
+
+def _build_deck_range(catalog: CardCatalog, specs: List[Dict], base_seed: int,
+                      start: int, count: int) -> List[Dict]:
+    """Build decks start to start + count - 1 of a batch from its catalog"""
+    builder = OnePieceDeckBuilder()
+    builder.cards = list(catalog.cards)
+    builder.catalog = catalog
+    decks = []
+    for index in range(start, start + count):
+        spec = specs[index % len(specs)]
+        decks.append(builder.build_deck(
+            strategy=spec.get('strategy', 'balanced'),
+            color=spec.get('color', 'any'),
+            leader=spec.get('leader'),
+            seed=derive_shard_seed(base_seed, index)
+        ))
+    return decks
@@ -0,0 +1,171 @@
+"""
+Deck Profiles for One Piece TCG
+Statistics of a deck (cost histogram, type and color counts, key cards,
+average cost, character ratio) computed once per canonical deck hash and
+shared by the combat simulator, its insights and deck analysis
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from simulation_cache import SIMULATION_CARD_FIELDS, canonical_deck, canonical_hash
+
+# Number of profiles kept in memory
+PROFILE_CACHE_SIZE = 1024
+
+# Key card rules: at most this many distinct names per list
+KEY_CARDS_PER_LIST = 3
+HIGH_POWER_MIN = 7000  # Characters with at least this power
+LOW_COST_MAX = 2  # Cards at or below this cost...
+LOW_COST_MIN_POWER = 4000  # ...with at least this power
+
+# Positions of the fields in a canonical card tuple
+_NAME, _TYPE, _COST, _POWER, _COLORS = (
+    SIMULATION_CARD_FIELDS.index(field) for field in ('name', 'type', 'cost', 'power', 'colors')
+)
+
+
+@dataclass(frozen=True)
+class DeckProfile:
+    """
+    Precomputed statistics of a deck's main deck
+
+    Profiles are shared between callers: treat the dictionaries as read-only
+    and use stats() or key_card_lists() for copies.
+    """
+    deck_hash: str
+    strategy: str
+    total_cards: int
+    cost_histogram: Dict[int, int]
+    type_counts: Dict[str, int]
+    color_counts: Dict[str, int]
+    avg_cost: float  # 0 for an empty deck
+    character_ratio: float  # 0 for an empty deck
+    primary_color: str  # Most common color, 'any' without colored cards
+    key_cards: Dict[str, Tuple[str, ...]]  # 'high_power', 'low_cost' and 'events'
+
+    def stats(self) -> Dict:
+        """
+        Deck statistics in the form the combat simulator uses
+
+        An empty deck gets the simulator's neutral defaults (average cost 4,
+        character ratio 0.65).
+        """
+        if not self.total_cards:
+            return {
+                'strategy': self.strategy,
+                'color': 'any',
+                'avg_cost': 4.0,
+                'character_ratio': 0.65,
+                'total_cards': 0
+            }
+        return {
+            'strategy': self.strategy,
+            'color': self.primary_color,
+            'avg_cost': self.avg_cost,
+            'character_ratio': self.character_ratio,
+            'total_cards': self.total_cards
+        }
+
+    def key_card_lists(self) -> Dict[str, List[str]]:
+        """Key card names as lists, as returned in simulation results"""
+        return {kind: list(names) for kind, names in self.key_cards.items()}
+
+
+_profiles: 'OrderedDict[str, DeckProfile]' = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def get_deck_profile(deck: Dict) -> DeckProfile:
+    """
+    Return the profile of a deck (leader, main_deck and strategy), computing
+    it only the first time its canonical form is seen
+
+    Decks with the same leader, strategy and multiset of cards share one
+    profile regardless of card order.
+    """
+    canonical = canonical_deck(deck)
+    key = canonical_hash(canonical)
+    with _profiles_lock:
+        profile = _profiles.get(key)
+        if profile is not None:
+            _profiles.move_to_end(key)
+            return profile
+
+    profile = _build_profile(key, canonical)
+    with _profiles_lock:
+        _profiles[key] = profile
+        while len(_profiles) > PROFILE_CACHE_SIZE:
+            _profiles.popitem(last=False)
+    return profile
+
+
+def get_cards_profile(cards: List[Dict], strategy: Optional[str] = None) -> DeckProfile:
+    """Profile of a bare list of main deck cards (no leader)"""
+    deck = {'main_deck': cards}
+    if strategy is not None:
+        deck['strategy'] = strategy
+    return get_deck_profile(deck)
+
+
+def clear_profiles():
+    """Forget every memoized profile"""
+    with _profiles_lock:
+        _profiles.clear()
+
+
+def _build_profile(key: str, canonical: Dict) -> DeckProfile:
+    """Compute a profile from a canonical deck (cards in canonical order)"""
+    cards = canonical['main_deck']
+    total = len(cards)
+
+    cost_histogram: Dict[int, int] = {}
+    type_counts: Dict[str, int] = {}
+    color_counts: Dict[str, int] = {}
+    total_cost = 0
+    high_power: List[str] = []
+    low_cost: List[str] = []
+    events: List[str] = []
+
+    for card in cards:
+        cost = card[_COST] or 0
+        power = card[_POWER] or 0
+        card_type = card[_TYPE] or 'Unknown'
+        name = card[_NAME]
+
+        total_cost += cost
+        cost_histogram[cost] = cost_histogram.get(cost, 0) + 1
+        type_counts[card_type] = type_counts.get(card_type, 0) + 1
+        for color in card[_COLORS]:
+            color_counts[color] = color_counts.get(color, 0) + 1
+
+        if card_type == 'Character' and power >= HIGH_POWER_MIN:
+            _add_key_card(high_power, name)
+        if cost <= LOW_COST_MAX and power >= LOW_COST_MIN_POWER:
+            _add_key_card(low_cost, name)
+        if card_type == 'Event':
+            _add_key_card(events, name)
+
+    return DeckProfile(
+        deck_hash=key,
+        strategy=canonical['strategy'],
+        total_cards=total,
+        cost_histogram=cost_histogram,
+        type_counts=type_counts,
+        color_counts=color_counts,
+        avg_cost=total_cost / total if total else 0,
+        character_ratio=type_counts.get('Character', 0) / total if total else 0,
+        primary_color=max(color_counts.items(), key=lambda x: x[1])[0] if color_counts else 'any',
+        key_cards={
+            'high_power': tuple(high_power),
+            'low_cost': tuple(low_cost),
+            'events': tuple(events)
+        }
+    )
+
+
+def _add_key_card(names: List[str], name: str):
+    """Add a distinct card name to a key card list that is not yet full"""
+    if len(names) < KEY_CARDS_PER_LIST and name not in names:
+        names.append(name)
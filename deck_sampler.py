@@ -0,0 +1,60 @@
+"""
+Weighted Card Sampling for TCG deck builders
+Draws a quota of cards in one pass by weighted sampling without replacement
+over (card, copy slot) pairs, so the builders never pick a card, find it at
+its copy limit and retry
+"""
+import heapq
+import random
+from typing import Callable, Dict, Optional, Sequence
+
+from deck_accumulator import DeckAccumulator
+
+CardWeight = Callable[[Dict], float]
+
+
+def sample_cards(deck: DeckAccumulator, candidates: Sequence[Dict], count: int,
+                 rng: random.Random, weight: Optional[CardWeight] = None) -> int:
+    """
+    Add up to count cards from candidates to a deck
+
+    Every copy a card may still have in the deck is a slot with the card's
+    weight. Slots get Efraimidis-Spirakis keys (an exponential variate with
+    the weight as rate, smallest first) and are taken in key order, which
+    samples them without replacement proportionally to weight. Slots whose
+    name filled up through another printing are skipped, so the deck only
+    comes up short when the candidates run out of copies.
+
+    Args:
+        deck: Deck to add the cards to
+        candidates: Cards to draw from (in a fixed order for seeded draws)
+        count: Number of cards to add
+        rng: Random number generator
+        weight: Weight of a card (default 1); cards weighted 0 are never drawn
+
+    Returns:
+        Number of cards added
+    """
+    if count <= 0:
+        return 0
+
+    keys = []
+    for index, card in enumerate(candidates):
+        slots = deck.max_copies - deck.copies(card)
+        if slots <= 0:
+            continue
+        rate = 1.0 if weight is None else weight(card)
+        if rate <= 0:
+            continue
+        for _ in range(slots):
+            keys.append((rng.expovariate(rate), index))
+    heapq.heapify(keys)
+
+    added = 0
+    while keys and added < count:
+        _, index = heapq.heappop(keys)
+        card = candidates[index]
+        if deck.can_add(card):
+            deck.add(card)
+            added += 1
+    return added
@@ -0,0 +1,140 @@
+"""
+Draw Probabilities for One Piece TCG
+Exact chances of having seen cards of a cost, type or name by each turn,
+computed from hypergeometric distributions over the deck's composition
+instead of simulated games
+"""
+from functools import lru_cache
+from math import comb
+from typing import Dict, List, Optional, Sequence
+
+from deck_profile import get_cards_profile
+
+OPENING_HAND_SIZE = 5
+DEFAULT_TURNS = 5
+MAX_TURNS = 20
+
+# Card filters a query can combine
+QUERY_FILTERS = ('cost', 'min_cost', 'max_cost', 'type', 'name', 'color')
+
+
+def cards_seen(turn: int, going_first: bool, opening_hand: int = OPENING_HAND_SIZE) -> int:
+    """
+    Cards a player has seen in their main phase of their `turn`-th turn
+
+    The opening hand plus one draw per turn; the first player skips the
+    draw of their first turn. Face-down life cards are not seen.
+    """
+    return opening_hand + turn - (1 if going_first else 0)
+
+
+@lru_cache(maxsize=4096)
+def probability_at_least(deck_size: int, copies: int, draws: int, at_least: int = 1) -> float:
+    """
+    Probability that `draws` cards taken from a deck of `deck_size` include
+    at least `at_least` of its `copies` matching cards (hypergeometric tail)
+    """
+    draws = min(draws, deck_size)
+    if at_least <= 0:
+        return 1.0
+    if copies < at_least or draws < at_least:
+        return 0.0
+    total = comb(deck_size, draws)
+    misses = sum(comb(copies, hits) * comb(deck_size - copies, draws - hits)
+                 for hits in range(at_least))
+    return (total - misses) / total
+
+
+def draw_probabilities(cards: List[Dict], turns: int = DEFAULT_TURNS,
+                       queries: Optional[Sequence[Dict]] = None) -> Dict:
+    """
+    Chances of having seen matching cards by each of a player's turns
+
+    Every curve holds one probability per turn for 'going_first' and
+    'going_second'. Mulligans are not modelled.
+
+    Args:
+        cards: Main deck cards
+        turns: Number of turns to cover (1 to MAX_TURNS)
+        queries: Optional custom card groups, each a dict of filters
+            (cost, min_cost, max_cost, type, name, color) plus `at_least`
+            (default 1), e.g. {'type': 'Character', 'cost': 2}
+
+    Returns:
+        Dictionary with the cards seen per turn and the curves for every
+        cost, every type, every card name and each query
+
+    Raises:
+        ValueError: If turns or a query is invalid
+    """
+    if isinstance(turns, bool) or not isinstance(turns, int) or not 1 <= turns <= MAX_TURNS:
+        raise ValueError(f"turns must be an integer from 1 to {MAX_TURNS}")
+    queries = [_normalize_query(query) for query in (queries or [])]
+
+    # Statistics are memoized per decklist (see deck_profile.py)
+    profile = get_cards_profile(cards)
+    deck_size = profile.total_cards
+    seen = {
+        'going_first': [cards_seen(turn, True) for turn in range(1, turns + 1)],
+        'going_second': [cards_seen(turn, False) for turn in range(1, turns + 1)]
+    }
+
+    def curve(copies: int, at_least: int = 1) -> Dict[str, List[float]]:
+        return {order: [probability_at_least(deck_size, copies, draws, at_least) for draws in counts]
+                for order, counts in seen.items()}
+
+    name_counts: Dict[str, int] = {}
+    for card in cards:
+        name = card.get('name') or 'Unknown'
+        name_counts[name] = name_counts.get(name, 0) + 1
+
+    query_results = []
+    for query in queries:
+        copies = sum(1 for card in cards if _matches(card, query))
+        query_results.append(dict(query, copies=copies,
+                                  probabilities=curve(copies, query['at_least'])))
+
+    return {
+        'deck_size': deck_size,
+        'turns': turns,
+        'cards_seen': seen,
+        'by_cost': {cost: curve(count) for cost, count in sorted(profile.cost_histogram.items())},
+        'by_type': {card_type: curve(count) for card_type, count in profile.type_counts.items()},
+        'by_card': {name: curve(count) for name, count in name_counts.items()},
+        'queries': query_results
+    }
+
+
+def _normalize_query(query: Dict) -> Dict:
+    """Validate a query and fill in `at_least`"""
+    if not isinstance(query, dict):
+        raise ValueError("Each query must be an object of card filters")
+    unknown = set(query) - set(QUERY_FILTERS) - {'at_least'}
+    if unknown:
+        raise ValueError(f"Unknown query fields: {', '.join(sorted(unknown))}")
+    for field in ('cost', 'min_cost', 'max_cost', 'at_least'):
+        value = query.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            raise ValueError(f"Query field '{field}' must be a non-negative integer")
+    normalized = {field: query[field] for field in QUERY_FILTERS if query.get(field) is not None}
+    at_least = query.get('at_least')
+    normalized['at_least'] = 1 if at_least is None else at_least
+    return normalized
+
+
+def _matches(card: Dict, query: Dict) -> bool:
+    """Whether a card passes every filter of a query"""
+    cost = card.get('cost') or 0
+    if 'cost' in query and cost != query['cost']:
+        return False
+    if 'min_cost' in query and cost < query['min_cost']:
+        return False
+    if 'max_cost' in query and cost > query['max_cost']:
+        return False
+    if 'type' in query and (card.get('type') or '').lower() != str(query['type']).lower():
+        return False
+    if 'name' in query and card.get('name') != query['name']:
+        return False
+    if 'color' in query and query['color'] not in (card.get('colors') or ()):
+        return False
+    return True
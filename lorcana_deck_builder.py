@@ -3,9 +3,9 @@ Disney Lorcana TCG Deck Builder AI Logic
 This module contains the core deck building logic for Disney Lorcana
 """
 import json
-import random
 from typing import List, Dict, Optional
 from base_deck_builder import BaseDeckBuilder
+from random_source import RandomSource, make_rng
 
 
 class LorcanaDeckBuilder(BaseDeckBuilder):
@@ -124,6 +124,7 @@ class LorcanaDeckBuilder(BaseDeckBuilder):
     
     def build_deck(self, strategy: str = 'balanced', 
                    colors: List[str] = None, 
+                   seed: RandomSource = None,
                    **kwargs) -> Dict:
         """
         Build a Lorcana deck based on strategy and color preferences
@@ -131,15 +132,19 @@ class LorcanaDeckBuilder(BaseDeckBuilder):
         Args:
             strategy: Deck strategy ('aggressive', 'balanced', 'control')
             colors: List of exactly 2 ink colors for the deck (Lorcana rule)
+            seed: Seed or generator to reseed the builder with (optional)
             **kwargs: Additional parameters (unused for Lorcana)
         
         Returns:
             Dictionary containing the built deck
         """
+        if seed is not None:
+            self.rng = make_rng(seed)
+        
         # Validate colors parameter
         if colors is None:
             # Default to two random colors if not specified
-            colors = random.sample(self.colors, 2)
+            colors = self.rng.sample(self.colors, 2)
         elif len(colors) != 2:
             raise ValueError("Lorcana decks must have exactly 2 ink colors")
         
@@ -192,7 +197,8 @@ class LorcanaDeckBuilder(BaseDeckBuilder):
     
     def build_deck_from_collection(self, strategy: str = 'balanced',
                                   colors: List[str] = None,
-                                  owned_cards: Dict[str, int] = None) -> Dict:
+                                  owned_cards: Dict[str, int] = None,
+                                  seed: RandomSource = None) -> Dict:
         """
         Build a Lorcana deck prioritizing cards from the user's collection
         
@@ -200,6 +206,7 @@ class LorcanaDeckBuilder(BaseDeckBuilder):
             strategy: Deck strategy
             colors: List of exactly 2 ink colors
             owned_cards: Dictionary mapping card names to quantities owned
+            seed: Seed or generator to reseed the builder with (optional)
         
         Returns:
             Dictionary containing the built deck with collection info
@@ -208,7 +215,7 @@ class LorcanaDeckBuilder(BaseDeckBuilder):
             owned_cards = {}
         
         # Build deck normally
-        deck = self.build_deck(strategy, colors)
+        deck = self.build_deck(strategy, colors, seed=seed)
         
         # Calculate which cards the user owns
         owned_count = 0
@@ -230,17 +237,22 @@ class LorcanaDeckBuilder(BaseDeckBuilder):
         
         return deck
     
-    def suggest_improvements(self, deck: Dict, owned_cards: Dict[str, int] = None) -> Dict:
+    def suggest_improvements(self, deck: Dict, owned_cards: Dict[str, int] = None,
+                             seed: RandomSource = None) -> Dict:
         """
         Suggest improvements for an existing Lorcana deck
         
         Args:
             deck: Current deck
             owned_cards: Dictionary of cards owned by user
+            seed: Seed or generator to reseed the builder with (optional)
         
         Returns:
             Dictionary with improvement suggestions
         """
+        if seed is not None:
+            self.rng = make_rng(seed)
+        
         if owned_cards is None:
             owned_cards = {}
         
@@ -0,0 +1,462 @@
+"""
+Combat Simulator for Disney Lorcana TCG
+Simulates Lorcana games (ink, questing for lore, challenges) between two
+decks on the game-agnostic simulation core shared with the One Piece
+simulator: compiled card records, seeded shard RNG streams, the parallel
+runner and adaptive early stopping
+"""
+import random
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from deck_profile import get_deck_profile
+from random_source import RandomSource, make_rng, make_seed
+from simulation_cache import SimulationCache, make_cache_key
+from simulation_core import (
+    ADAPTIVE_CHUNK_SIZE, MIN_ADAPTIVE_SIMULATIONS, SimulationRun, play_games
+)
+from simulation_runner import new_base_seed
+
+OPENING_HAND_SIZE = 7
+LORE_TO_WIN = 20
+
+_CHALLENGER = re.compile(r'challenger\s*\+(\d+)')
+_DRAW = re.compile(r'draw (\d+|a|an) cards?')
+_DAMAGE = re.compile(r'deal (\d+) damage')
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class LorcanaCard:
+    """
+    A single Lorcana deck slot compiled for simulation
+
+    Records compare by identity, so two copies of the same card in a deck
+    are always distinguishable.
+    """
+    name: str
+    cost: int
+    inkable: bool
+    is_character: bool
+    strength: int
+    willpower: int
+    lore: int  # Lore gained when the character quests
+    evasive: bool  # Only evasive characters can challenge it
+    bodyguard: bool  # Exerted, it must be challenged before other characters
+    rush: bool  # Can challenge the turn it is played
+    challenger: int  # Strength added when this character challenges
+    draw: int  # Cards drawn when the action or item is played
+    damage: int  # Damage the action deals to an opposing character
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class LorcanaDeck:
+    """A Lorcana deck compiled for simulation"""
+    cards: Tuple[LorcanaCard, ...]
+
+
+def default_lore(cost: int) -> int:
+    """Lore of a character without a printed value: 1 up to cost 3, 2 up to 6, then 3"""
+    return 1 + max(0, cost - 1) // 3
+
+
+def compile_lorcana_card(card: Dict) -> LorcanaCard:
+    """
+    Compile a Lorcana card dictionary into a simulation record
+
+    The built-in sample cards only print cost and strength (as 'power'), so
+    a character without a willpower gets strength + 1 and one without lore
+    gets default_lore(cost). Actions always resolve their draw or damage
+    text; items only their "when you play this item" draw.
+    """
+    effect = (card.get('effect') or '').lower()
+    cost = int(card.get('cost') or 0)
+    is_character = card.get('type') == 'Character'
+    strength = int(card.get('strength') or card.get('power') or 0)
+
+    draw = damage = 0
+    if not is_character and (card.get('type') == 'Action' or 'when you play this item' in effect):
+        match = _DRAW.search(effect)
+        if match:
+            draw = int(match.group(1)) if match.group(1).isdigit() else 1
+        match = _DAMAGE.search(effect)
+        if match and card.get('type') == 'Action':
+            damage = int(match.group(1))
+
+    challenger = _CHALLENGER.search(effect)
+    return LorcanaCard(
+        name=card.get('name', ''),
+        cost=cost,
+        inkable=card.get('inkable', True) is not False,
+        is_character=is_character,
+        strength=strength,
+        willpower=int(card.get('willpower') or strength + 1) if is_character else 0,
+        lore=int(card.get('lore') or default_lore(cost)) if is_character else 0,
+        evasive='evasive' in effect,
+        bodyguard='bodyguard' in effect,
+        rush='rush' in effect,
+        challenger=int(challenger.group(1)) if challenger else 0,
+        draw=draw,
+        damage=damage
+    )
+
+
+def compile_lorcana_deck(deck: Dict) -> LorcanaDeck:
+    """Compile a Lorcana deck dictionary (main_deck) for simulation"""
+    return LorcanaDeck(cards=tuple(compile_lorcana_card(card) for card in deck.get('main_deck', [])))
+
+
+@dataclass(slots=True, eq=False)
+class InPlayCharacter:
+    """A character in play with its damage and readiness"""
+    card: LorcanaCard
+    damage: int = 0
+    exerted: bool = False
+    dry: bool = False  # In play since the start of its owner's turn (may quest)
+
+
+@dataclass(slots=True)
+class LorcanaPlayerState:
+    """
+    One player's zones in a simulated Lorcana game
+
+    Like the One Piece PlayerState, the library is a lazily shuffled
+    permutation of deck slot indices drawn through a cursor, and the
+    buffers are reused across games by reset().
+    """
+    deck: LorcanaDeck
+    order: List[int]
+    cursor: int
+    lore: int
+    ink: int  # Cards in the inkwell, all ready at the start of the turn
+    hand: List[LorcanaCard]
+    board: List[InPlayCharacter]
+    draw_random: Optional[Callable[[], float]] = None  # The game RNG's random(), for draws
+
+    @classmethod
+    def for_deck(cls, deck: LorcanaDeck) -> 'LorcanaPlayerState':
+        """Allocate the zones for a compiled deck"""
+        return cls(deck=deck, order=list(range(len(deck.cards))), cursor=0,
+                   lore=0, ink=0, hand=[], board=[])
+
+    def reset(self, rng: random.Random, hand_size: int = OPENING_HAND_SIZE):
+        """Start a new game with an opening hand from a fresh shuffle"""
+        self.draw_random = rng.random
+        self.cursor = 0
+        self.lore = 0
+        self.ink = 0
+        self.hand.clear()
+        self.board.clear()
+        for _ in range(hand_size):
+            self.draw()
+
+    def draw(self) -> bool:
+        """Draw a random card from the library; False if the library is empty"""
+        order = self.order
+        cursor = self.cursor
+        size = len(order)
+        if cursor >= size:
+            return False
+        # One Fisher-Yates step: swap a random undrawn slot to the cursor
+        pick = cursor + int(self.draw_random() * (size - cursor))
+        slot = order[pick]
+        order[pick] = order[cursor]
+        order[cursor] = slot
+        self.cursor = cursor + 1
+        self.hand.append(self.deck.cards[slot])
+        return True
+
+
+@dataclass(slots=True)
+class LorcanaGameState:
+    """Represents the state of a Lorcana game"""
+    player1: LorcanaPlayerState
+    player2: LorcanaPlayerState
+    turn_count: int
+    active_player: int  # 1 or 2
+
+    @classmethod
+    def for_decks(cls, deck1: LorcanaDeck, deck2: LorcanaDeck) -> 'LorcanaGameState':
+        """Allocate a reusable game state for two compiled decks"""
+        return cls(player1=LorcanaPlayerState.for_deck(deck1),
+                   player2=LorcanaPlayerState.for_deck(deck2), turn_count=0, active_player=1)
+
+
+class LorcanaSimulator:
+    """Combat simulator following simplified Disney Lorcana rules"""
+
+    MAX_TURNS = 50  # Turns of both players before the game is decided on lore
+
+    # Adaptive early stopping (see simulation_core.py)
+    ADAPTIVE_CHUNK_SIZE = ADAPTIVE_CHUNK_SIZE
+    MIN_ADAPTIVE_SIMULATIONS = MIN_ADAPTIVE_SIMULATIONS
+
+    # Bump whenever a rule change alters simulation results, so cached results expire
+    RULES_VERSION = 1
+
+    def simulate_combat(self, deck1: Dict, deck2: Dict, num_simulations: int = 1000,
+                        workers: int = 1, chunk_size: Optional[int] = None,
+                        seed: RandomSource = None, ci_half_width: Optional[float] = None,
+                        confidence: float = 0.95,
+                        cache: Optional[SimulationCache] = None) -> Dict:
+        """
+        Simulate games between two Lorcana decks
+
+        Sharding, seeding, early stopping and caching work as in
+        CombatSimulator.simulate_combat.
+
+        Args:
+            deck1: First deck with main_deck
+            deck2: Second deck with main_deck
+            num_simulations: Number of simulations to run (default 1000)
+            workers: Number of worker processes (default 1 runs in-process)
+            chunk_size: Number of games per shard (default 250, 100 when adaptive)
+            seed: Base seed for reproducible results, or a random.Random /
+                  NumPy Generator to draw it from (random if omitted)
+            ci_half_width: Target half-width of the win rate interval in
+                           percentage points (enables early stopping)
+            confidence: Confidence level of the reported interval (default 0.95)
+            cache: Result cache to read from and write to (optional)
+
+        Returns:
+            Dictionary containing simulation results and statistics
+        """
+        for event in self.iter_simulate_combat(
+                deck1, deck2, num_simulations=num_simulations, workers=workers,
+                chunk_size=chunk_size, seed=seed, ci_half_width=ci_half_width,
+                confidence=confidence, cache=cache):
+            if event['event'] == 'result':
+                return event['results']
+
+    def iter_simulate_combat(self, deck1: Dict, deck2: Dict, num_simulations: int = 1000,
+                             workers: int = 1, chunk_size: Optional[int] = None,
+                             seed: RandomSource = None, ci_half_width: Optional[float] = None,
+                             confidence: float = 0.95,
+                             cache: Optional[SimulationCache] = None) -> Iterator[Dict]:
+        """
+        Simulate games like simulate_combat, reporting progress as shards finish
+
+        Yields:
+            {'event': 'progress', 'progress': {...}} after every shard, then one
+            {'event': 'result', 'results': {...}} (only the result for a cache hit)
+        """
+        if seed is not None:
+            seed = make_seed(seed)
+
+        profile1 = get_deck_profile(deck1)
+        profile2 = get_deck_profile(deck2)
+
+        cache_key = None
+        if cache is not None:
+            cache_key = make_cache_key(
+                profile1.deck_hash, profile2.deck_hash, self.RULES_VERSION, game='lorcana',
+                num_simulations=num_simulations, seed=seed, chunk_size=chunk_size,
+                ci_half_width=ci_half_width, confidence=confidence
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                yield {'event': 'result', 'results': dict(cached, cached=True)}
+                return
+            if seed is None:
+                seed = int(cache_key[:16], 16)
+
+        run = SimulationRun(_simulate_lorcana_shard,
+                            (compile_lorcana_deck(deck1), compile_lorcana_deck(deck2)),
+                            num_simulations, seed if seed is not None else new_base_seed(),
+                            workers=workers, chunk_size=chunk_size,
+                            ci_half_width=ci_half_width, confidence=confidence,
+                            adaptive_chunk_size=self.ADAPTIVE_CHUNK_SIZE,
+                            min_simulations=self.MIN_ADAPTIVE_SIMULATIONS)
+        for progress in run:
+            yield {'event': 'progress', 'progress': progress}
+
+        deck1_stats = profile1.stats()
+        deck2_stats = profile2.stats()
+        results = run.summary()
+        results.update({
+            'game': 'Disney Lorcana',
+            'deck1_stats': deck1_stats,
+            'deck2_stats': deck2_stats,
+            'matchup_type': f"{deck1_stats['strategy'].title()} vs {deck2_stats['strategy'].title()}",
+            'cached': False
+        })
+
+        if cache_key is not None:
+            cache.set(cache_key, results)
+
+        yield {'event': 'result', 'results': results}
+
+    def simulate_game(self, deck1: Union[Dict, LorcanaDeck], deck2: Union[Dict, LorcanaDeck],
+                      rng: RandomSource = None) -> Tuple[int, int]:
+        """
+        Simulate a single Lorcana game
+
+        Returns:
+            Tuple of (winner, turn_count) where winner is 1 or 2
+        """
+        if not isinstance(deck1, LorcanaDeck):
+            deck1 = compile_lorcana_deck(deck1)
+        if not isinstance(deck2, LorcanaDeck):
+            deck2 = compile_lorcana_deck(deck2)
+        return self._play_game(LorcanaGameState.for_decks(deck1, deck2), make_rng(rng))
+
+    def _play_game(self, state: LorcanaGameState, rng: random.Random) -> Tuple[int, int]:
+        """Play one game on a (possibly reused) game state"""
+        state.active_player = 1 if rng.random() < 0.5 else 2
+        state.turn_count = 0
+        state.player1.reset(rng)
+        state.player2.reset(rng)
+
+        winner = 0
+        while not winner and state.turn_count < self.MAX_TURNS:
+            state.turn_count += 1
+            winner = self._play_turn(state, state.active_player == 1)
+            state.active_player = 3 - state.active_player
+
+        if not winner:
+            # Out of turns: the player with more lore wins, ties by coin flip
+            lore1, lore2 = state.player1.lore, state.player2.lore
+            if lore1 != lore2:
+                winner = 1 if lore1 > lore2 else 2
+            else:
+                winner = 1 if rng.random() < 0.5 else 2
+        return (winner, state.turn_count)
+
+    def _play_turn(self, state: LorcanaGameState, is_player1: bool) -> int:
+        """
+        Play one turn: ready, draw, ink, play cards, then quest or challenge
+
+        Returns:
+            The winner (1 or 2) if the game ended this turn, otherwise 0
+        """
+        me = state.player1 if is_player1 else state.player2
+        opp = state.player2 if is_player1 else state.player1
+        player = 1 if is_player1 else 2
+        board = me.board
+
+        # Ready phase: ready every character; last turn's characters are now dry
+        for character in board:
+            character.exerted = False
+            character.dry = True
+
+        # Draw phase (the first player skips it on the first turn); a player
+        # who cannot draw loses
+        if state.turn_count > 1 and not me.draw():
+            return 3 - player
+
+        # Ink one card: a card far out of reach, otherwise the cheapest
+        hand = me.hand
+        inkable = [card for card in hand if card.inkable]
+        if inkable:
+            card = max(inkable, key=_card_cost)
+            if card.cost <= me.ink + 2:
+                card = min(inkable, key=_card_cost)
+            hand.remove(card)
+            me.ink += 1
+
+        # Play the most expensive cards first; actions and items without a
+        # modelled effect are kept
+        ink = me.ink
+        playable = [card for card in hand
+                    if card.cost <= ink and (card.is_character or card.draw or card.damage)]
+        if len(playable) > 1:
+            playable.sort(key=_card_cost, reverse=True)
+        for card in playable:
+            if card.cost > ink:
+                continue
+            ink -= card.cost
+            hand.remove(card)
+            if card.is_character:
+                board.append(InPlayCharacter(card))
+                continue
+            if card.damage:
+                self._damage_character(opp.board, card.damage)
+            for _ in range(card.draw):
+                me.draw()
+
+        # Quest or challenge with every ready character
+        for character in board[:]:
+            card = character.card
+            if character.exerted or not (character.dry or card.rush) or character not in board:
+                continue
+            target = self._choose_challenge(character, opp.board)
+            if target is not None:
+                character.exerted = True
+                target.damage += card.strength + card.challenger
+                character.damage += target.card.strength
+                if target.damage >= target.card.willpower:
+                    opp.board.remove(target)
+                if character.damage >= card.willpower:
+                    board.remove(character)
+            elif character.dry:
+                character.exerted = True
+                me.lore += card.lore
+                if me.lore >= LORE_TO_WIN:
+                    return player
+        return 0
+
+    def _choose_challenge(self, character: InPlayCharacter,
+                          opp_board: List[InPlayCharacter]) -> Optional[InPlayCharacter]:
+        """
+        Pick the exerted opposing character to challenge, or None to quest
+
+        A challenge must banish its target. It is taken when the target
+        quests for at least as much lore as the challenger, or for more
+        when the challenger is banished too. Exerted bodyguards must be
+        challenged first and evasive characters only by evasive ones.
+        """
+        card = character.card
+        strength = card.strength + card.challenger
+        targets = [target for target in opp_board
+                   if target.exerted and (card.evasive or not target.card.evasive)]
+        if not targets or strength <= 0:
+            return None
+        guards = [target for target in targets if target.card.bodyguard]
+        if guards:
+            targets = guards
+
+        best = None
+        for target in targets:
+            target_card = target.card
+            if target.damage + strength < target_card.willpower:
+                continue
+            survives = character.damage + target_card.strength < card.willpower
+            if target_card.lore < card.lore or (not survives and target_card.lore == card.lore):
+                continue
+            if best is None or target_card.lore > best.card.lore:
+                best = target
+        return best
+
+    def _damage_character(self, opp_board: List[InPlayCharacter], amount: int):
+        """
+        Deal action damage to the opposing character with the most lore it
+        banishes, otherwise to the one with the most lore
+        """
+        if not opp_board:
+            return
+        banishable = [target for target in opp_board
+                      if target.damage + amount >= target.card.willpower]
+        target = max(banishable or opp_board, key=_in_play_lore)
+        target.damage += amount
+        if target.damage >= target.card.willpower:
+            opp_board.remove(target)
+
+
+def _card_cost(card: LorcanaCard) -> int:
+    """Sort key for compiled cards by cost"""
+    return card.cost
+
+
+def _in_play_lore(character: InPlayCharacter) -> int:
+    return character.card.lore
+
+
+def _simulate_lorcana_shard(deck1: LorcanaDeck, deck2: LorcanaDeck, num_games: int,
+                            seed: int) -> Dict:
+    """
+    Simulate one shard of Lorcana games with its own RNG stream
+
+    Defined at module level so it can be pickled into worker processes.
+    """
+    return play_games(LorcanaSimulator()._play_game, LorcanaGameState.for_decks(deck1, deck2),
+                      num_games, seed)
@@ -0,0 +1,207 @@
+"""
+Matchup Model for One Piece TCG
+Holds tournament match history as NumPy feature arrays and scores every
+recorded match against a matchup in one vectorized pass, following the same
+similarity rules as CombatSimulator._calculate_matchup_similarity
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+
+# Matches at or below this similarity are ignored
+SIMILARITY_THRESHOLD = 0.5
+
+# Columns of an imported match history (the TournamentMatch field names);
+# match_duration is optional
+HISTORY_COLUMNS = (
+    'deck1_strategy', 'deck1_color', 'deck1_avg_cost', 'deck1_character_ratio',
+    'deck2_strategy', 'deck2_color', 'deck2_avg_cost', 'deck2_character_ratio',
+    'deck1_wins',
+)
+
+_TRUE_VALUES = {'true', '1', 'yes', 'y', 't'}
+
+
+class MatchupModel:
+    """
+    Tournament match history as a feature matrix
+
+    Strategies and colors are stored as integer codes, average costs and
+    character ratios as (n, 2) float arrays (deck 1, deck 2), so scoring a
+    matchup costs a handful of array operations however many matches are
+    loaded.
+    """
+
+    def __init__(self, strategies, colors, avg_costs, character_ratios, deck1_wins,
+                 durations=None):
+        """
+        Args:
+            strategies: (n, 2) strategy names of deck 1 and deck 2
+            colors: (n, 2) primary colors of deck 1 and deck 2
+            avg_costs: (n, 2) average costs
+            character_ratios: (n, 2) character ratios
+            deck1_wins: (n,) whether deck 1 won
+            durations: (n,) match lengths in turns (optional)
+        """
+        self.strategy_codes, self.strategies = _encode(strategies)
+        self.color_codes, self.colors = _encode(colors)
+        self.avg_costs = np.asarray(avg_costs, dtype=np.float64).reshape(-1, 2)
+        self.character_ratios = np.asarray(character_ratios, dtype=np.float64).reshape(-1, 2)
+        self.deck1_wins = np.asarray(deck1_wins, dtype=bool).reshape(-1)
+        if durations is None:
+            durations = np.zeros(len(self.deck1_wins), dtype=np.int64)
+        self.durations = np.asarray(durations, dtype=np.int64).reshape(-1)
+
+        size = len(self.deck1_wins)
+        for name in ('strategy_codes', 'color_codes', 'avg_costs', 'character_ratios', 'durations'):
+            if len(getattr(self, name)) != size:
+                raise ValueError(f"Match history column '{name}' has {len(getattr(self, name))} "
+                                 f"rows, expected {size}")
+
+    def __len__(self) -> int:
+        return len(self.deck1_wins)
+
+    @classmethod
+    def from_matches(cls, matches: Iterable) -> 'MatchupModel':
+        """Build the model from TournamentMatch records"""
+        matches = list(matches)
+        return cls(
+            strategies=[(m.deck1_strategy, m.deck2_strategy) for m in matches],
+            colors=[(m.deck1_color, m.deck2_color) for m in matches],
+            avg_costs=[(m.deck1_avg_cost, m.deck2_avg_cost) for m in matches],
+            character_ratios=[(m.deck1_character_ratio, m.deck2_character_ratio) for m in matches],
+            deck1_wins=[m.deck1_wins for m in matches],
+            durations=[m.match_duration for m in matches],
+        )
+
+    @classmethod
+    def from_frame(cls, frame) -> 'MatchupModel':
+        """
+        Build the model from a pandas DataFrame with the HISTORY_COLUMNS
+
+        Raises:
+            ValueError: If a required column is missing
+        """
+        missing = [column for column in HISTORY_COLUMNS if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Match history is missing columns: {', '.join(missing)}")
+
+        durations = None
+        if 'match_duration' in frame.columns:
+            durations = frame['match_duration'].fillna(0).to_numpy()
+        return cls(
+            strategies=frame[['deck1_strategy', 'deck2_strategy']].astype(str).to_numpy(),
+            colors=frame[['deck1_color', 'deck2_color']].astype(str).to_numpy(),
+            avg_costs=frame[['deck1_avg_cost', 'deck2_avg_cost']].to_numpy(dtype=np.float64),
+            character_ratios=frame[['deck1_character_ratio', 'deck2_character_ratio']]
+            .to_numpy(dtype=np.float64),
+            deck1_wins=_parse_wins(frame['deck1_wins'].to_numpy()),
+            durations=durations,
+        )
+
+    def concat(self, other: 'MatchupModel') -> 'MatchupModel':
+        """Return a model holding this history followed by another"""
+        return MatchupModel(
+            strategies=np.concatenate([self.strategies[self.strategy_codes],
+                                       other.strategies[other.strategy_codes]]),
+            colors=np.concatenate([self.colors[self.color_codes],
+                                   other.colors[other.color_codes]]),
+            avg_costs=np.concatenate([self.avg_costs, other.avg_costs]),
+            character_ratios=np.concatenate([self.character_ratios, other.character_ratios]),
+            deck1_wins=np.concatenate([self.deck1_wins, other.deck1_wins]),
+            durations=np.concatenate([self.durations, other.durations]),
+        )
+
+    def similarity(self, deck1_stats: Dict, deck2_stats: Dict) -> np.ndarray:
+        """
+        Similarity of every recorded match to a matchup (0 to 1)
+
+        Uses the weights of CombatSimulator._calculate_matchup_similarity and
+        adds the terms in the same order, so the scores are identical.
+        """
+        strategy1 = _lookup(self.strategies, deck1_stats['strategy'])
+        strategy2 = _lookup(self.strategies, deck2_stats['strategy'])
+        color1 = _lookup(self.colors, deck1_stats['color'])
+        color2 = _lookup(self.colors, deck2_stats['color'])
+
+        # Strategy similarity (40% weight)
+        similarity = np.where(self.strategy_codes[:, 0] == strategy1, 0.2, 0.0)
+        similarity += np.where(self.strategy_codes[:, 1] == strategy2, 0.2, 0.0)
+
+        # Cost curve similarity (30% weight)
+        cost_diff = np.abs(self.avg_costs - (deck1_stats['avg_cost'], deck2_stats['avg_cost']))
+        cost_similarity = np.maximum(0.0, 1 - (cost_diff[:, 0] + cost_diff[:, 1]) / 6.0)
+        similarity += cost_similarity * 0.3
+
+        # Character ratio similarity (20% weight)
+        ratio_diff = np.abs(self.character_ratios - (deck1_stats['character_ratio'],
+                                                     deck2_stats['character_ratio']))
+        ratio_similarity = np.maximum(0.0, 1 - (ratio_diff[:, 0] + ratio_diff[:, 1]) / 0.4)
+        similarity += ratio_similarity * 0.2
+
+        # Color similarity (10% weight)
+        similarity += np.where(self.color_codes[:, 0] == color1, 0.05, 0.0)
+        similarity += np.where(self.color_codes[:, 1] == color2, 0.05, 0.0)
+        return similarity
+
+    def learned_probability(self, deck1_stats: Dict, deck2_stats: Dict) -> Optional[float]:
+        """
+        Deck 1's win rate over similar matches, weighted by similarity
+
+        Returns:
+            The weighted win rate, or None when no match is similar enough
+        """
+        similarity = self.similarity(deck1_stats, deck2_stats)
+        weights = np.where(similarity > SIMILARITY_THRESHOLD, similarity, 0.0)
+        total_weight = weights.sum()
+        if not total_weight > 0:
+            return None
+        return float(weights[self.deck1_wins].sum() / total_weight)
+
+
+def load_matchup_history(path: Union[str, Path]) -> MatchupModel:
+    """
+    Load a match history from a CSV or Parquet file
+
+    The file needs one row per match with the HISTORY_COLUMNS (the
+    TournamentMatch field names). Parquet files need a pandas Parquet engine
+    such as pyarrow.
+
+    Raises:
+        ValueError: If the file type is not supported or a column is missing
+    """
+    import pandas as pd
+
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        frame = pd.read_csv(path)
+    elif suffix in ('.parquet', '.pq'):
+        frame = pd.read_parquet(path)
+    else:
+        raise ValueError(f"Unsupported match history file '{path.name}' (use .csv or .parquet)")
+    return MatchupModel.from_frame(frame)
+
+
+def _encode(values):
+    """Integer codes for a 2D array of labels, with the sorted unique labels"""
+    values = np.asarray(values, dtype=str).reshape(-1, 2)
+    labels, codes = np.unique(values, return_inverse=True)
+    return codes.reshape(values.shape), labels
+
+
+def _lookup(labels: np.ndarray, value) -> int:
+    """Code of a label, or -1 (matches nothing) if it never occurs"""
+    value = str(value)
+    index = int(np.searchsorted(labels, value))
+    if index < len(labels) and labels[index] == value:
+        return index
+    return -1
+
+
+def _parse_wins(values: np.ndarray) -> np.ndarray:
+    """Booleans from a bool, numeric or text ('True', 'false', 'yes') column"""
+    if values.dtype == object:
+        return np.array([str(value).strip().lower() in _TRUE_VALUES for value in values], dtype=bool)
+    return values.astype(bool)
@@ -0,0 +1,44 @@
+"""
+Random sources for simulations and deck building
+Normalizes a seed, a random.Random or a NumPy Generator into the generator
+or seed an engine needs, so identical inputs give identical outputs
+"""
+import random
+from typing import Any, Optional, Union
+
+# A seed (int), a random.Random, a numpy.random.Generator, or None for fresh entropy
+RandomSource = Optional[Union[int, random.Random, Any]]
+
+
+def _is_numpy_generator(source: Any) -> bool:
+    """Check for a numpy.random.Generator without importing NumPy"""
+    return hasattr(source, 'bit_generator') and hasattr(source, 'integers')
+
+
+def make_seed(source: RandomSource = None) -> int:
+    """
+    Turn a random source into a 64-bit integer seed
+
+    Integer seeds are returned unchanged; generators are advanced by one draw.
+    """
+    if source is None:
+        return random.SystemRandom().getrandbits(64)
+    if isinstance(source, random.Random):
+        return source.getrandbits(64)
+    if _is_numpy_generator(source):
+        return int(source.integers(0, 2 ** 63))
+    return int(source)
+
+
+def make_rng(source: RandomSource = None) -> random.Random:
+    """
+    Turn a random source into a random.Random
+
+    A random.Random is used as-is so callers can share one stream across
+    several entry points; anything else seeds a new generator.
+    """
+    if isinstance(source, random.Random):
+        return source
+    if source is None:
+        return random.Random()
+    return random.Random(make_seed(source))
@@ -0,0 +1,372 @@
+#!/usr/bin/env python
+"""
+Combat Simulator Benchmark
+Times CombatSimulator.simulate_combat over a fixed set of decks and seeds and
+compares the numbers against a saved JSON baseline, so a change that slows
+the game loop is caught before it ships
+
+Usage:
+    python simulation_benchmark.py run --output benchmarks/simulator_baseline.json
+    python simulation_benchmark.py compare --baseline benchmarks/simulator_baseline.json
+"""
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+from cards_data import ONEPIECE_CARDS
+from combat_simulator import CombatSimulator, GameState
+from compiled_deck import compile_deck
+from deck_builder import OnePieceDeckBuilder
+from simulation_runner import derive_shard_seed
+from structure_decks import build_combat_deck, get_all_structure_decks
+
+# Bump when the deck set, matchups or measurements change, so old baselines
+# are not compared against incompatible numbers
+BENCHMARK_VERSION = 1
+
+DEFAULT_BASELINE_PATH = 'benchmarks/simulator_baseline.json'
+DEFAULT_SEED = 20240601
+DEFAULT_GAMES = 200  # Games per simulate_combat call
+DEFAULT_REPEATS = 5  # simulate_combat calls per matchup
+DEFAULT_TOLERANCE = 0.2  # Allowed relative slowdown before compare fails
+
+# Generated decks: (strategy, color) built with a fixed builder seed
+GENERATED_DECKS = [
+    ('aggressive', 'Red'),
+    ('balanced', 'Green'),
+    ('control', 'Blue'),
+]
+
+
+def load_benchmark_decks(seed: int = DEFAULT_SEED) -> List[Tuple[str, Dict]]:
+    """
+    Build the fixed benchmark deck set
+
+    Structure decks whose leader is missing from the built-in card list are
+    skipped. Generated decks use a builder seeded from the benchmark seed.
+
+    Returns:
+        List of (deck name, deck) tuples in a stable order
+    """
+    decks = []
+    for structure_deck in get_all_structure_decks():
+        deck = build_combat_deck(structure_deck['code'], ONEPIECE_CARDS)
+        if deck and deck['main_deck']:
+            decks.append((structure_deck['code'], deck))
+
+    builder = OnePieceDeckBuilder(seed=seed)
+    for strategy, color in GENERATED_DECKS:
+        deck = builder.build_deck(strategy=strategy, color=color)
+        decks.append((f'generated-{strategy}-{color.lower()}', deck))
+
+    return decks
+
+
+def plan_matchups(decks: List[Tuple[str, Dict]]) -> List[Tuple[int, int]]:
+    """
+    Pair every deck with the next one in the list (wrapping around)
+
+    This plays every deck once on each side without the quadratic cost of
+    a full matrix.
+    """
+    if len(decks) < 2:
+        return []
+    return [(index, (index + 1) % len(decks)) for index in range(len(decks))]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure_memory(deck1: Dict, deck2: Dict, num_games: int, seed: int) -> Dict:
+    """
+    Measure the memory a game needs, with tracemalloc
+
+    CPython release builds do not count allocations, so the peak traced
+    memory of a single game stands in for allocations per game. Blocks
+    still allocated after all games catch state that leaks across games.
+
+    Returns:
+        Dictionary with peak_kib_per_game and retained_blocks_per_game
+    """
+    simulator = CombatSimulator()
+    state = GameState.for_decks(compile_deck(deck1), compile_deck(deck2))
+    rng = random.Random(seed)
+    simulator._play_game(state, rng)  # Warm up buffers before tracing
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+        peak_total = 0
+        for _ in range(num_games):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            simulator._play_game(state, rng)
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - current
+        gc.collect()
+        end_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'peak_kib_per_game': peak_total / 1024 / num_games if num_games else 0.0,
+        # The snapshot itself is traced, so a small constant is always left over
+        'retained_blocks_per_game': max(0, end_blocks - start_blocks) / num_games if num_games else 0.0
+    }
+
+
+def run_benchmark(games: int = DEFAULT_GAMES, repeats: int = DEFAULT_REPEATS,
+                  seed: int = DEFAULT_SEED, engine: str = 'scalar',
+                  memory_games: int = 50, max_matchups: Optional[int] = None) -> Dict:
+    """
+    Run the benchmark and return its report
+
+    Every simulate_combat call is single-process with a seed derived from
+    the benchmark seed, so two runs play exactly the same games. The total
+    wins per matchup are recorded as a fingerprint: if they change between
+    runs, the rules changed and the timings are not directly comparable.
+
+    Args:
+        games: Games per simulate_combat call
+        repeats: simulate_combat calls per matchup
+        seed: Benchmark seed (decks, games)
+        engine: Simulation engine passed to simulate_combat
+        memory_games: Games per matchup traced for memory (0 skips memory)
+        max_matchups: Only run the first N matchups (for quick checks)
+
+    Returns:
+        Dictionary with overall metrics and a per-matchup breakdown
+    """
+    decks = load_benchmark_decks(seed)
+    matchups = plan_matchups(decks)
+    if max_matchups is not None:
+        matchups = matchups[:max_matchups]
+
+    simulator = CombatSimulator()
+    call_times: List[float] = []
+    memory_peaks: List[float] = []
+    retained: List[float] = []
+    per_matchup = {}
+    total_games = 0
+    total_time = 0.0
+
+    for matchup_index, (row, column) in enumerate(matchups):
+        name1, deck1 = decks[row]
+        name2, deck2 = decks[column]
+        matchup_times = []
+        wins = 0
+
+        for repeat in range(repeats):
+            call_seed = derive_shard_seed(seed, matchup_index * repeats + repeat)
+            start = time.perf_counter()
+            results = simulator.simulate_combat(deck1, deck2, num_simulations=games,
+                                                seed=call_seed, engine=engine)
+            elapsed = time.perf_counter() - start
+            matchup_times.append(elapsed)
+            wins += results['wins']
+
+        call_times.extend(matchup_times)
+        total_games += games * repeats
+        total_time += sum(matchup_times)
+
+        entry = {
+            'games_per_second': round(games * repeats / sum(matchup_times), 1) if sum(matchup_times) else 0.0,
+            'p50_ms': round(percentile(matchup_times, 0.5) * 1000, 3),
+            'wins': wins
+        }
+        if memory_games:
+            memory = measure_memory(deck1, deck2, memory_games,
+                                    derive_shard_seed(seed, -1 - matchup_index))
+            memory_peaks.append(memory['peak_kib_per_game'])
+            retained.append(memory['retained_blocks_per_game'])
+            entry['peak_kib_per_game'] = round(memory['peak_kib_per_game'], 2)
+        per_matchup[f'{name1} vs {name2}'] = entry
+
+    metrics = {
+        'games_per_second': round(total_games / total_time, 1) if total_time else 0.0,
+        'p50_ms': round(percentile(call_times, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(call_times, 0.99) * 1000, 3)
+    }
+    if memory_peaks:
+        metrics['peak_kib_per_game'] = round(sum(memory_peaks) / len(memory_peaks), 2)
+        metrics['retained_blocks_per_game'] = round(sum(retained) / len(retained), 3)
+
+    return {
+        'benchmark_version': BENCHMARK_VERSION,
+        'rules_version': CombatSimulator.RULES_VERSION,
+        'settings': {
+            'games': games,
+            'repeats': repeats,
+            'seed': seed,
+            'engine': engine,
+            'memory_games': memory_games,
+            'matchups': len(matchups)
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine()
+        },
+        'metrics': metrics,
+        'matchups': per_matchup
+    }
+
+
+# Metric name -> True if a higher value is better
+METRIC_DIRECTIONS = {
+    'games_per_second': True,
+    'p50_ms': False,
+    'p99_ms': False,
+    'peak_kib_per_game': False,
+    'retained_blocks_per_game': False,
+}
+
+
+def compare_reports(baseline: Dict, current: Dict, tolerance: float = DEFAULT_TOLERANCE) -> Dict:
+    """
+    Compare a benchmark report against a baseline
+
+    A metric regresses when it is worse than the baseline by more than the
+    tolerance (a fraction, 0.2 allows 20%). Retained blocks are compared with
+    an absolute slack of one block per game since they are near zero.
+
+    Returns:
+        Dictionary with ok, per-metric comparisons, regressions, warnings
+        (settings or results that differ from the baseline)
+    """
+    warnings = []
+    if baseline.get('benchmark_version') != current.get('benchmark_version'):
+        warnings.append('Benchmark version differs from the baseline; record a new baseline')
+    if baseline.get('settings') != current.get('settings'):
+        warnings.append('Benchmark settings differ from the baseline')
+    if baseline.get('rules_version') != current.get('rules_version'):
+        warnings.append('Rules version differs from the baseline')
+
+    changed = [
+        name for name, entry in current.get('matchups', {}).items()
+        if name in baseline.get('matchups', {}) and baseline['matchups'][name].get('wins') != entry.get('wins')
+    ]
+    if changed:
+        warnings.append(f'Game results changed for {len(changed)} matchup(s); '
+                        'the simulation rules or random streams differ from the baseline')
+
+    comparisons = {}
+    regressions = []
+    for metric, higher_is_better in METRIC_DIRECTIONS.items():
+        old = baseline.get('metrics', {}).get(metric)
+        new = current.get('metrics', {}).get(metric)
+        if old is None or new is None:
+            continue
+
+        change = (new - old) / old if old else 0.0
+        if metric == 'retained_blocks_per_game':
+            regressed = new > old + 1
+        elif higher_is_better:
+            regressed = new < old * (1 - tolerance)
+        else:
+            regressed = new > old * (1 + tolerance)
+
+        comparisons[metric] = {'baseline': old, 'current': new,
+                               'change': round(change, 4), 'regressed': regressed}
+        if regressed:
+            regressions.append(metric)
+
+    return {
+        'ok': not regressions,
+        'tolerance': tolerance,
+        'comparisons': comparisons,
+        'regressions': regressions,
+        'warnings': warnings
+    }
+
+
+def _print_report(report: Dict):
+    """Print the overall metrics of a report"""
+    settings = report['settings']
+    print(f"Benchmark: {settings['matchups']} matchups x {settings['repeats']} calls "
+          f"x {settings['games']} games ({settings['engine']} engine)")
+    for metric, value in report['metrics'].items():
+        print(f"  {metric:<26} {value}")
+
+
+def _print_comparison(comparison: Dict):
+    """Print a baseline comparison"""
+    for warning in comparison['warnings']:
+        print(f"⚠️  {warning}")
+    for metric, entry in comparison['comparisons'].items():
+        mark = '✗' if entry['regressed'] else '✓'
+        print(f"  {mark} {metric:<26} {entry['baseline']} -> {entry['current']} "
+              f"({entry['change'] * 100:+.1f}%)")
+    if comparison['ok']:
+        print(f"✓ No regression beyond {comparison['tolerance'] * 100:.0f}%")
+    else:
+        print(f"✗ Regressed: {', '.join(comparison['regressions'])}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark the One Piece TCG combat simulator')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('run', 'Run the benchmark and optionally save it as a baseline'),
+                            ('compare', 'Run the benchmark and compare it against a baseline')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--games', type=int, default=DEFAULT_GAMES, help='Games per simulate_combat call')
+        sub.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help='Calls per matchup')
+        sub.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Benchmark seed')
+        sub.add_argument('--engine', default='scalar', choices=['scalar', 'batch'])
+        sub.add_argument('--memory-games', type=int, default=50,
+                         help='Games per matchup traced for memory (0 to skip)')
+        sub.add_argument('--max-matchups', type=int, default=None)
+
+    subparsers.choices['run'].add_argument('--output', help='Write the report to this JSON file')
+    compare_parser = subparsers.choices['compare']
+    compare_parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH)
+    compare_parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                                help='Allowed relative regression (default 0.2)')
+    compare_parser.add_argument('--output', help='Also write the new report to this JSON file')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        # Use the baseline's settings unless they were overridden on the command line
+        for key in ('games', 'repeats', 'seed', 'engine', 'memory_games'):
+            if getattr(args, key) == compare_parser.get_default(key):
+                setattr(args, key, baseline.get('settings', {}).get(key, getattr(args, key)))
+
+    report = run_benchmark(games=args.games, repeats=args.repeats, seed=args.seed,
+                           engine=args.engine, memory_games=args.memory_games,
+                           max_matchups=args.max_matchups)
+    _print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"Report written to {args.output}")
+
+    if args.command == 'compare':
+        comparison = compare_reports(baseline, report, args.tolerance)
+        _print_comparison(comparison)
+        return 0 if comparison['ok'] else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
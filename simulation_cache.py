@@ -0,0 +1,300 @@
+"""
+Result cache for combat simulations
+Simulation results are stored under a content hash of both decklists and the
+simulation parameters, in a pluggable backend with size and TTL eviction
+"""
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+# Card fields that influence a simulation result (One Piece and Lorcana)
+SIMULATION_CARD_FIELDS = ('name', 'type', 'cost', 'power', 'life', 'effect', 'colors', 'counter', 'trigger',
+                          'inkable', 'strength', 'willpower', 'lore')
+
+
+def _canonical_card(card: Dict) -> Tuple:
+    """Reduce a card to the fields the simulator reads, in a fixed order"""
+    return tuple(
+        tuple(card.get(field) or ()) if field == 'colors' else card.get(field)
+        for field in SIMULATION_CARD_FIELDS
+    )
+
+
+def canonical_deck(deck: Dict) -> Dict:
+    """
+    Canonical, order-independent form of a deck
+
+    Two decks with the same leader, strategy and multiset of cards produce the
+    same canonical form regardless of card order or unrelated fields.
+    """
+    return {
+        'leader': _canonical_card(deck.get('leader') or {}),
+        'strategy': deck.get('strategy', 'balanced'),
+        'main_deck': sorted((_canonical_card(card) for card in deck.get('main_deck', [])),
+                            key=repr)
+    }
+
+
+def canonical_hash(canonical: Dict) -> str:
+    """Content hash of a canonical deck (see canonical_deck)"""
+    payload = json.dumps(canonical, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def deck_hash(deck: Dict) -> str:
+    """Content hash of a deck's canonical form"""
+    return canonical_hash(canonical_deck(deck))
+
+
+def make_cache_key(deck1: Union[Dict, str], deck2: Union[Dict, str], rules_version: int,
+                   **params: Any) -> str:
+    """
+    Build the cache key for one simulation request
+
+    Args:
+        deck1: First deck, or its deck_hash
+        deck2: Second deck, or its deck_hash
+        rules_version: Version of the simulator rules that produced the result
+        **params: Remaining inputs that change the result (simulation count, seed, ...)
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = json.dumps({
+        'deck1': deck1 if isinstance(deck1, str) else deck_hash(deck1),
+        'deck2': deck2 if isinstance(deck2, str) else deck_hash(deck2),
+        'rules_version': rules_version,
+        'params': params
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CacheBackend(ABC):
+    """Interface for cache storage backends"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored value, or None if missing or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value, evicting old entries if needed"""
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Remove every entry and reset the counters"""
+        pass
+
+    @abstractmethod
+    def record(self, hit: bool):
+        """Count a cache hit or miss"""
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        """Return entry count and hit/miss counters"""
+        pass
+
+
+class MemoryLRUBackend(CacheBackend):
+    """In-process least-recently-used cache with optional TTL"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl and time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self._hits, 'misses': self._misses}
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    On-disk cache shared by every process that opens the same file
+
+    Entries and hit/miss counters live in SQLite, so all gunicorn workers see
+    the same cache and the same statistics.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl: Optional[float] = 86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS simulation_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_simulation_cache_accessed '
+                         'ON simulation_cache (accessed_at)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS simulation_cache_stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            ''')
+            conn.execute("INSERT OR IGNORE INTO simulation_cache_stats VALUES ('hits', 0), ('misses', 0)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, commit on success and always close it"""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute('SELECT value, stored_at FROM simulation_cache WHERE key = ?',
+                               (key,)).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if self.ttl and now - stored_at > self.ttl:
+                conn.execute('DELETE FROM simulation_cache WHERE key = ?', (key,))
+                return None
+            conn.execute('UPDATE simulation_cache SET accessed_at = ? WHERE key = ?', (now, key))
+        return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO simulation_cache VALUES (?, ?, ?, ?)',
+                         (key, json.dumps(value), now, now))
+            if self.ttl:
+                conn.execute('DELETE FROM simulation_cache WHERE stored_at < ?', (now - self.ttl,))
+            conn.execute('''
+                DELETE FROM simulation_cache WHERE key IN (
+                    SELECT key FROM simulation_cache
+                    ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM simulation_cache')
+            conn.execute('UPDATE simulation_cache_stats SET value = 0')
+
+    def record(self, hit: bool):
+        with self._connect() as conn:
+            conn.execute('UPDATE simulation_cache_stats SET value = value + 1 WHERE name = ?',
+                         ('hits' if hit else 'misses',))
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            entries = conn.execute('SELECT COUNT(*) FROM simulation_cache').fetchone()[0]
+            counters = dict(conn.execute('SELECT name, value FROM simulation_cache_stats').fetchall())
+        return {'entries': entries, 'hits': counters.get('hits', 0), 'misses': counters.get('misses', 0)}
+
+
+class SimulationCache:
+    """Content-addressed simulation result cache on top of a backend"""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    def get(self, key: str, record: bool = True) -> Optional[Any]:
+        """Look up a key, counting the hit or miss unless record is False"""
+        value = self.backend.get(key)
+        if record:
+            self.backend.record(value is not None)
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store a value under a key"""
+        self.backend.set(key, value)
+
+    def clear(self):
+        """Remove every entry and reset the counters"""
+        self.backend.clear()
+
+    def stats(self) -> Dict:
+        """Return backend name, entry count, hit/miss counters and hit rate"""
+        stats = self.backend.stats()
+        lookups = stats['hits'] + stats['misses']
+        stats['backend'] = getattr(self.backend, 'name', type(self.backend).__name__)
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def create_simulation_cache(backend: str = 'memory', path: Optional[str] = None,
+                            max_entries: int = 1024,
+                            ttl: Optional[float] = 3600) -> Optional[SimulationCache]:
+    """
+    Create a simulation cache from configuration values
+
+    Args:
+        backend: 'memory', 'sqlite' or 'none'
+        path: SQLite file path (sqlite backend only)
+        max_entries: Maximum number of stored results
+        ttl: Seconds before an entry expires (0 or None keeps entries until evicted)
+
+    Returns:
+        SimulationCache, or None when caching is disabled
+    """
+    if backend == 'none':
+        return None
+    if backend == 'sqlite':
+        return SimulationCache(SQLiteBackend(path or 'simulation_cache.sqlite3',
+                                             max_entries=max_entries, ttl=ttl or None))
+    return SimulationCache(MemoryLRUBackend(max_entries=max_entries, ttl=ttl or None))
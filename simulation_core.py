@@ -0,0 +1,151 @@
+"""
+Game-agnostic Simulation Core
+Plays shards of games for any TCG engine through the shared runner, with a
+seeded RNG stream per shard, adaptive early stopping on the win rate
+interval and the running statistics every simulator reports
+"""
+import random
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from simulation_runner import iter_shards, merge_counts, wilson_interval
+
+# Adaptive early stopping
+ADAPTIVE_CHUNK_SIZE = 100  # Games between interval checks
+MIN_ADAPTIVE_SIMULATIONS = 100  # Never stop before this many games
+
+
+def play_games(play_game: Callable[[Any, random.Random], Tuple[int, int]], state: Any,
+               num_games: int, seed: int) -> Dict:
+    """
+    Play one shard of games on a reused game state and count the results
+
+    Args:
+        play_game: Called as play_game(state, rng) for every game, returning
+            (winner, turn_count) with winner 1 or 2
+        state: Game state the engine resets at the start of every game
+        num_games: Number of games to play
+        seed: Seed of the shard's RNG stream
+
+    Returns:
+        Dictionary of counts that can be summed across shards (wins are
+        player 1's)
+    """
+    rng = random.Random(seed)
+    wins = 0
+    win_turns = 0
+    loss_turns = 0
+
+    for _ in range(num_games):
+        winner, turn_count = play_game(state, rng)
+        if winner == 1:
+            wins += 1
+            win_turns += turn_count
+        else:
+            loss_turns += turn_count
+
+    return {
+        'games': num_games,
+        'wins': wins,
+        'win_turns': win_turns,
+        'loss_turns': loss_turns
+    }
+
+
+def summarize_counts(totals: Dict, confidence: float) -> Dict:
+    """Turn merged shard counts into win rate, interval and turn statistics"""
+    games = totals.get('games', 0)
+    wins = totals.get('wins', 0)
+    losses = games - wins
+
+    win_rate = (wins / games) * 100 if games else 0
+    avg_win_turns = totals.get('win_turns', 0) / wins if wins else 0
+    avg_loss_turns = totals.get('loss_turns', 0) / losses if losses else 0
+    low, high = wilson_interval(wins, games, confidence)
+
+    return {
+        'win_rate': round(win_rate, 2),
+        'wins': wins,
+        'losses': losses,
+        'simulations_run': games,
+        'confidence_interval': {
+            'low': round(low * 100, 2),
+            'high': round(high * 100, 2),
+            'confidence': confidence
+        },
+        'avg_win_turns': round(avg_win_turns, 1),
+        'avg_loss_turns': round(avg_loss_turns, 1)
+    }
+
+
+class SimulationRun:
+    """
+    A simulation split into shards, with optional adaptive early stopping
+
+    Iterating runs the shards and yields the running statistics after each
+    one (summarize_counts plus 'simulations_requested'). Afterwards `totals`
+    holds the merged counts and `stopped_early` tells whether the interval
+    target ended the run before num_simulations games. Closing the iterator
+    cancels shards still queued in the worker pool.
+
+    With ci_half_width set, the run stops after the first shard at which the
+    win rate interval is at most ci_half_width percentage points wide on
+    either side, once min_simulations games have been played.
+    """
+
+    def __init__(self, shard_fn: Callable[..., Dict], shard_args: Tuple, num_simulations: int,
+                 base_seed: int, workers: int = 1, chunk_size: Optional[int] = None,
+                 ci_half_width: Optional[float] = None, confidence: float = 0.95,
+                 adaptive_chunk_size: int = ADAPTIVE_CHUNK_SIZE,
+                 min_simulations: int = MIN_ADAPTIVE_SIMULATIONS):
+        """
+        Args:
+            shard_fn: Module-level function called as shard_fn(*shard_args, games, seed)
+            shard_args: Leading positional arguments passed to every shard
+            num_simulations: Number of games to play (an upper bound when adaptive)
+            base_seed: Seed from which every shard seed is derived
+            workers: Number of worker processes (1 runs every shard in-process)
+            chunk_size: Number of games per shard (adaptive_chunk_size when adaptive)
+            ci_half_width: Target interval half-width in percentage points (optional)
+            confidence: Confidence level of the interval
+        """
+        self.shard_fn = shard_fn
+        self.shard_args = shard_args
+        self.num_simulations = num_simulations
+        self.base_seed = base_seed
+        self.workers = workers
+        self.ci_half_width = ci_half_width
+        self.confidence = confidence
+        self.min_simulations = min_simulations
+        if ci_half_width is not None and chunk_size is None:
+            chunk_size = adaptive_chunk_size
+        self.chunk_size = chunk_size
+        self.totals: Dict[str, Any] = {'games': 0, 'wins': 0, 'win_turns': 0, 'loss_turns': 0}
+        self.stopped_early = False
+
+    def __iter__(self) -> Iterator[Dict]:
+        totals = self.totals
+        for partial in iter_shards(self.shard_fn, self.shard_args, self.num_simulations,
+                                   self.base_seed, workers=self.workers,
+                                   chunk_size=self.chunk_size):
+            for replay in partial.get('replays', ()):
+                # Number games across the whole run instead of within the shard
+                replay['game'] += totals['games']
+            totals = self.totals = merge_counts([totals, partial])
+            progress = summarize_counts(totals, self.confidence)
+            progress['simulations_requested'] = self.num_simulations
+            yield progress
+            if self.ci_half_width is not None and totals['games'] < self.num_simulations and \
+                    totals['games'] >= self.min_simulations:
+                low, high = wilson_interval(totals['wins'], totals['games'], self.confidence)
+                if (high - low) * 50 <= self.ci_half_width:
+                    self.stopped_early = True
+                    return
+
+    def summary(self) -> Dict:
+        """Final statistics of the shards run so far"""
+        results = summarize_counts(self.totals, self.confidence)
+        results.update({
+            'simulations_requested': self.num_simulations,
+            'stopped_early': self.stopped_early
+        })
+        return results
@@ -0,0 +1,255 @@
+"""
+Asynchronous simulation jobs
+A SQLite-backed job queue drained by a small pool of local worker threads,
+so long simulations run outside the request that started them
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job states
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+# Error stored on running jobs whose worker stopped sending heartbeats
+STALE_JOB_ERROR = 'Simulation worker stopped before the job finished'
+
+# Runs one job: called with the job parameters and a progress callback,
+# returns the JSON-serializable result
+JobRunner = Callable[[Dict, Callable[[Dict], None]], Any]
+
+
+class SimulationJobStore:
+    """
+    Persistent job records in a SQLite file
+
+    Any process that opens the same file sees the same jobs, so a job queued
+    by one gunicorn worker can be run and polled through any other. Running
+    jobs are kept alive by heartbeats; a job whose worker crashed or was
+    restarted stops getting them and is failed after stale_after seconds.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = 86400,
+                 stale_after: Optional[float] = 600):
+        self.path = path
+        self.ttl = ttl
+        self.stale_after = stale_after
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS simulation_jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    progress TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_simulation_jobs_status '
+                         'ON simulation_jobs (status, created_at)')
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, commit on success and always close it"""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, params: Dict) -> str:
+        """Queue a job and return its id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('INSERT INTO simulation_jobs (id, status, params, created_at, updated_at) '
+                         'VALUES (?, ?, ?, ?, ?)',
+                         (job_id, STATUS_QUEUED, json.dumps(params), now, now))
+            if self.ttl:
+                # Drop finished jobs nobody has collected in time
+                conn.execute('DELETE FROM simulation_jobs WHERE status IN (?, ?) AND updated_at < ?',
+                             (STATUS_DONE, STATUS_FAILED, now - self.ttl))
+        return job_id
+
+    def claim(self) -> Optional[Dict]:
+        """
+        Atomically move the oldest queued job to running and return it
+
+        Running jobs without a heartbeat for stale_after seconds are failed
+        first, so clients polling them get an answer.
+        """
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            if self.stale_after:
+                now = time.time()
+                conn.execute('UPDATE simulation_jobs SET status = ?, error = ?, updated_at = ? '
+                             'WHERE status = ? AND updated_at < ?',
+                             (STATUS_FAILED, STALE_JOB_ERROR, now, STATUS_RUNNING, now - self.stale_after))
+            row = conn.execute('SELECT id, params FROM simulation_jobs WHERE status = ? '
+                               'ORDER BY created_at LIMIT 1', (STATUS_QUEUED,)).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE simulation_jobs SET status = ?, updated_at = ? WHERE id = ?',
+                         (STATUS_RUNNING, time.time(), row[0]))
+        return {'id': row[0], 'params': json.loads(row[1])}
+
+    def heartbeat(self, job_id: str):
+        """Record that a running job's worker is still alive"""
+        with self._connect() as conn:
+            conn.execute('UPDATE simulation_jobs SET updated_at = ? WHERE id = ? AND status = ?',
+                         (time.time(), job_id, STATUS_RUNNING))
+
+    def update_progress(self, job_id: str, progress: Dict):
+        """Store the latest partial results of a running job"""
+        with self._connect() as conn:
+            conn.execute('UPDATE simulation_jobs SET progress = ?, updated_at = ? WHERE id = ?',
+                         (json.dumps(progress), time.time(), job_id))
+
+    def finish(self, job_id: str, result: Any):
+        """Mark a job as done with its result"""
+        with self._connect() as conn:
+            conn.execute('UPDATE simulation_jobs SET status = ?, result = ?, updated_at = ? WHERE id = ?',
+                         (STATUS_DONE, json.dumps(result), time.time(), job_id))
+
+    def fail(self, job_id: str, error: str):
+        """Mark a job as failed"""
+        with self._connect() as conn:
+            conn.execute('UPDATE simulation_jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?',
+                         (STATUS_FAILED, error, time.time(), job_id))
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a job record, or None if it does not exist"""
+        with self._connect() as conn:
+            row = conn.execute('SELECT id, status, progress, result, error, created_at, updated_at '
+                               'FROM simulation_jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row[0],
+            'status': row[1],
+            'progress': json.loads(row[2]) if row[2] else None,
+            'result': json.loads(row[3]) if row[3] else None,
+            'error': row[4],
+            'created_at': row[5],
+            'updated_at': row[6]
+        }
+
+
+class SimulationJobQueue:
+    """
+    Local worker threads that drain a SimulationJobStore
+
+    Workers wake up when a job is submitted in this process and otherwise
+    poll the store, so jobs queued by other processes are picked up too.
+    """
+
+    def __init__(self, store: SimulationJobStore, runner: JobRunner,
+                 workers: int = 1, poll_interval: float = 1.0):
+        self.store = store
+        self.runner = runner
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, params: Dict) -> str:
+        """Queue a job, start the workers if needed and return the job id"""
+        job_id = self.store.create(params)
+        self.start()
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a job record, or None if it does not exist"""
+        return self.store.get(job_id)
+
+    def start(self):
+        """Start the worker threads (once per process)"""
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name='simulation-job-worker', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the worker threads once they finish their current job"""
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping.clear()
+
+    def run_next(self) -> bool:
+        """
+        Claim and run one queued job in the calling thread
+
+        Returns:
+            True if a job was run, False if the queue was empty
+        """
+        job = self.store.claim()
+        if job is None:
+            return False
+
+        job_id = job['id']
+        heartbeat = self._start_heartbeat(job_id)
+        try:
+            result = self.runner(job['params'], lambda progress: self.store.update_progress(job_id, progress))
+            self.store.finish(job_id, result)
+        except Exception as e:
+            logger.error(f"Simulation job {job_id} failed: {e}", exc_info=True)
+            self.store.fail(job_id, str(e))
+        finally:
+            heartbeat.set()
+        return True
+
+    def _start_heartbeat(self, job_id: str) -> threading.Event:
+        """
+        Send heartbeats for a running job until the returned event is set
+
+        Heartbeats go out four times per stale_after interval, so a job is
+        only failed as stale after several missed beats.
+        """
+        done = threading.Event()
+        if not self.store.stale_after:
+            return done
+
+        def beat():
+            while not done.wait(self.store.stale_after / 4):
+                try:
+                    self.store.heartbeat(job_id)
+                except sqlite3.Error as e:
+                    logger.warning(f"Simulation job heartbeat failed: {e}")
+
+        threading.Thread(target=beat, name='simulation-job-heartbeat', daemon=True).start()
+        return done
+
+    def _work(self):
+        """Worker thread loop"""
+        while not self._stopping.is_set():
+            try:
+                if self.run_next():
+                    continue
+            except sqlite3.Error as e:
+                logger.warning(f"Simulation job store unavailable: {e}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
@@ -0,0 +1,314 @@
+"""
+Player Policies for the One Piece TCG combat simulator
+Decide which characters a simulated player plays and what each attacker
+targets. The greedy policy is the simulator's built-in play; the Monte Carlo
+policy searches each decision with rollouts on a copy of the game state
+"""
+import math
+from abc import ABC, abstractmethod
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence
+
+from compiled_deck import CompiledCard
+
+
+class PlayerPolicy(ABC):
+    """Interface for the decisions a simulated player makes on their turn"""
+
+    name = 'policy'
+
+    @abstractmethod
+    def choose_plays(self, simulator, state, is_player1: bool, rng) -> List[CompiledCard]:
+        """
+        Choose the characters to play from hand this turn
+
+        Returns:
+            Hand cards in play order; a card that is no longer affordable
+            when its turn comes is skipped
+        """
+        pass
+
+    @abstractmethod
+    def choose_target(self, simulator, state, is_player1: bool, attacker: CompiledCard,
+                      blockers: List[CompiledCard], remaining: Sequence[CompiledCard],
+                      rng) -> Optional[CompiledCard]:
+        """
+        Choose what an attacker attacks
+
+        Args:
+            blockers: Opposing blockers; when there are any the target must be one of them
+            remaining: Attackers that will attack after this one this turn
+
+        Returns:
+            The opposing character to attack, or None to attack the leader
+        """
+        pass
+
+    def describe(self) -> Dict:
+        """Name and settings that change the games played (used in cache keys)"""
+        return {'name': self.name}
+
+
+def greedy_plays(hand: Sequence[CompiledCard], don: int) -> List[CompiledCard]:
+    """Affordable characters in hand, highest cost first"""
+    plays = [card for card in hand if card.is_character and card.cost <= don]
+    plays.sort(key=_card_cost, reverse=True)
+    return plays
+
+
+class GreedyPolicy(PlayerPolicy):
+    """
+    The simulator's built-in play: highest cost characters first, random
+    attack order, blockers first, otherwise the leader with a fixed chance
+
+    CombatSimulator runs this policy inline when a player has no policy set;
+    the class exists so other policies can fall back on it.
+    """
+
+    name = 'greedy'
+
+    def choose_plays(self, simulator, state, is_player1, rng):
+        me = state.player1 if is_player1 else state.player2
+        return greedy_plays(me.hand, me.don)
+
+    def choose_target(self, simulator, state, is_player1, attacker, blockers, remaining, rng):
+        # Same random draws as the inline play, so seeded games match it
+        if blockers:
+            return blockers[int(rng.random() * len(blockers))]
+        opp_board = state.player2.board if is_player1 else state.player1.board
+        if opp_board and rng.random() < 1.0 - simulator.CHARACTER_ATTACK_LEADER_CHANCE:
+            return opp_board[int(rng.random() * len(opp_board))]
+        return None
+
+
+class _ScriptedPlays(GreedyPolicy):
+    """Greedy policy that plays a fixed list of cards (first turn of a rollout)"""
+
+    def __init__(self, plays: List[CompiledCard]):
+        self.plays = plays
+
+    def choose_plays(self, simulator, state, is_player1, rng):
+        return self.plays
+
+
+class MonteCarloPolicy(PlayerPolicy):
+    """
+    Chooses plays and attack targets by Monte Carlo search with a budget
+
+    Each decision is a bandit over its candidate actions (UCB1): every
+    rollout copies the game state into a reused scratch state, draws
+    unseen cards at random (never in the real game's order), applies the
+    action and plays the game out with the greedy policy. The action with the best win rate is chosen. Only the
+    root decision is searched; the opponent's hand is treated as known.
+
+    A decision stops after `rollouts` rollouts or, if set, once
+    `time_budget_ms` has elapsed, whichever comes first. With only a rollout
+    budget a seeded simulation stays reproducible.
+    """
+
+    name = 'mcts'
+
+    def __init__(self, rollouts: int = 32, time_budget_ms: Optional[float] = None,
+                 exploration: float = 1.4):
+        """
+        Args:
+            rollouts: Maximum rollouts per decision
+            time_budget_ms: Maximum time per decision in milliseconds (optional)
+            exploration: UCB1 exploration constant
+        """
+        self.rollouts = max(1, rollouts)
+        self.time_budget_ms = time_budget_ms
+        self.exploration = exploration
+        self._greedy = GreedyPolicy()
+        self._scratch = None  # GameState reused by every rollout
+        self._simulator = None  # Simulator without policies that plays rollouts out
+
+    def __getstate__(self):
+        # Scratch buffers are rebuilt in each worker process
+        state = self.__dict__.copy()
+        state['_scratch'] = None
+        state['_simulator'] = None
+        return state
+
+    def describe(self) -> Dict:
+        return {'name': self.name, 'rollouts': self.rollouts,
+                'time_budget_ms': self.time_budget_ms, 'exploration': self.exploration}
+
+    def choose_plays(self, simulator, state, is_player1, rng):
+        me = state.player1 if is_player1 else state.player2
+        plans = self._play_plans(me.hand, me.don)
+        if len(plans) <= 1:
+            return plans[0] if plans else []
+
+        rollout_simulator = self._rollout_simulator(simulator)
+        scripted = _ScriptedPlays([])
+
+        def rollout(plan: List[CompiledCard]) -> int:
+            scratch = self._prepare_scratch(state, rng)
+            scripted.plays = plan
+            if is_player1:
+                rollout_simulator.policy1 = scripted
+            else:
+                rollout_simulator.policy2 = scripted
+            try:
+                rollout_simulator._play_turn(scratch, is_player1, rng)
+            finally:
+                rollout_simulator.policy1 = rollout_simulator.policy2 = None
+            return self._finish_rollout(rollout_simulator, scratch, is_player1, rng)
+
+        return plans[self._search(plans, rollout)]
+
+    def choose_target(self, simulator, state, is_player1, attacker, blockers, remaining, rng):
+        if blockers:
+            targets = list(blockers)
+        else:
+            opp_board = state.player2.board if is_player1 else state.player1.board
+            targets = [None] + opp_board
+        if len(targets) == 1:
+            return targets[0]
+
+        rollout_simulator = self._rollout_simulator(simulator)
+        greedy = self._greedy
+
+        def rollout(target: Optional[CompiledCard]) -> int:
+            scratch = self._prepare_scratch(state, rng)
+            rollout_simulator._resolve_attack(scratch, is_player1, attacker, target)
+            me = scratch.player1 if is_player1 else scratch.player2
+            opp = scratch.player2 if is_player1 else scratch.player1
+            # The rest of this turn's attackers, then the leader, attack greedily
+            for other in remaining:
+                if other in me.board:
+                    other_blockers = [c for c in opp.board if c.blocker]
+                    other_target = greedy.choose_target(rollout_simulator, scratch, is_player1,
+                                                        other, other_blockers, (), rng)
+                    rollout_simulator._resolve_attack(scratch, is_player1, other, other_target)
+            rollout_simulator._attack_with_leader(scratch, is_player1, rng)
+            return self._finish_rollout(rollout_simulator, scratch, is_player1, rng)
+
+        return targets[self._search(targets, rollout)]
+
+    def _play_plans(self, hand: Sequence[CompiledCard], don: int) -> List[List[CompiledCard]]:
+        """
+        Candidate sets of characters to play: highest cost first, cheapest
+        first, and the set that spends the most DON!!
+        """
+        affordable = [card for card in hand if card.is_character and card.cost <= don]
+        if not affordable:
+            return []
+
+        plans = [greedy_plays(affordable, don), sorted(affordable, key=_card_cost)]
+
+        # Subset sum over DON!! (at most 10), preferring more power on ties
+        best: Dict[int, List[CompiledCard]] = {0: []}
+        for card in affordable:
+            for spent, cards in list(best.items()):
+                total = spent + card.cost
+                if total > don:
+                    continue
+                candidate = cards + [card]
+                current = best.get(total)
+                if current is None or _total_power(candidate) > _total_power(current):
+                    best[total] = candidate
+        plans.append(sorted(best[max(best)], key=_card_cost, reverse=True))
+
+        unique = []
+        seen = set()
+        for plan in plans:
+            key = tuple(id(card) for card in _affordable_prefix(plan, don))
+            if key not in seen:
+                seen.add(key)
+                unique.append(plan)
+        return unique
+
+    def _search(self, actions: Sequence, rollout: Callable[..., int]) -> int:
+        """Run the rollout budget over the actions (UCB1) and return the best index"""
+        count = len(actions)
+        wins = [0] * count
+        visits = [0] * count
+        deadline = None
+        if self.time_budget_ms:
+            deadline = perf_counter() + self.time_budget_ms / 1000
+
+        for step in range(self.rollouts):
+            if step < count:
+                arm = step
+            else:
+                log_step = math.log(step)
+                arm = max(range(count), key=lambda a: wins[a] / visits[a]
+                          + self.exploration * math.sqrt(log_step / visits[a]))
+            wins[arm] += rollout(actions[arm])
+            visits[arm] += 1
+            if deadline is not None and perf_counter() >= deadline:
+                break
+
+        return max(range(count), key=lambda a: (wins[a] / visits[a] if visits[a] else -1.0, visits[a]))
+
+    def _rollout_simulator(self, simulator):
+        """Simulator without policies, profiling or replays for playing rollouts out"""
+        if self._simulator is None or type(self._simulator) is not type(simulator):
+            self._simulator = type(simulator)()
+        return self._simulator
+
+    def _prepare_scratch(self, state, rng):
+        """Copy the state into the scratch state, drawing unseen cards with rng"""
+        if self._scratch is None or self._scratch.player1.deck is not state.player1.deck \
+                or self._scratch.player2.deck is not state.player2.deck:
+            self._scratch = type(state).for_decks(state.player1.deck, state.player2.deck)
+        scratch = self._scratch
+        scratch.copy_from(state)
+        # Libraries are shuffled lazily as cards are drawn, so the undrawn
+        # order is not decided yet; rollouts draw with the rollout rng
+        scratch.player1.draw_random = scratch.player2.draw_random = rng.random
+        return scratch
+
+    def _finish_rollout(self, simulator, scratch, is_player1: bool, rng) -> int:
+        """Play the game out after the deciding player's turn; 1 if they win"""
+        if scratch.player1.life <= 0:
+            winner = 2
+        elif scratch.player2.life <= 0:
+            winner = 1
+        else:
+            scratch.active_player = 2 if is_player1 else 1
+            winner = simulator._run_turns(scratch, rng)
+        return 1 if winner == (1 if is_player1 else 2) else 0
+
+
+POLICIES = {
+    'greedy': GreedyPolicy,
+    'mcts': MonteCarloPolicy,
+}
+
+
+def make_policy(name: str, **options) -> PlayerPolicy:
+    """
+    Create a policy by name ('greedy' or 'mcts')
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    policy_class = POLICIES.get((name or '').lower())
+    if policy_class is None:
+        raise ValueError(f"Unknown policy '{name}'. Choose from: {', '.join(POLICIES)}")
+    if policy_class is GreedyPolicy:
+        # The greedy policy has no settings
+        return GreedyPolicy()
+    return policy_class(**options)
+
+
+def _card_cost(card: CompiledCard) -> int:
+    """Sort key for compiled cards by cost"""
+    return card.cost
+
+
+def _total_power(cards: Sequence[CompiledCard]) -> int:
+    return sum(card.power for card in cards)
+
+
+def _affordable_prefix(plan: Sequence[CompiledCard], don: int) -> List[CompiledCard]:
+    """Cards of a plan that are actually played with the given DON!!"""
+    played = []
+    for card in plan:
+        if card.cost <= don:
+            played.append(card)
+            don -= card.cost
+    return played
@@ -0,0 +1,99 @@
+"""
+Simulation Profile
+Per-phase timing and per-game statistics collected by CombatSimulator when
+profiling is enabled. Counts are kept as flat integers so shard results can
+be summed across worker processes like the other simulation counts
+"""
+from time import perf_counter_ns
+from typing import Any, Dict, List
+
+# Phases of a turn, in the order they run
+PHASE_DRAW = 0
+PHASE_PLAY = 1  # Choosing and playing characters, excluding their effects
+PHASE_ON_PLAY = 2  # Resolving 'On Play' effects
+PHASE_BLOCKER_SCAN = 3  # Looking for blockers before each attack
+PHASE_BATTLE = 4  # Resolving each attack against a character or the leader
+
+PHASE_NAMES = ('draw', 'play', 'on_play', 'blocker_scan', 'battle')
+
+# Per-game statistics summed over all profiled games
+GAME_STATS = ('turns', 'cards_played', 'kos', 'attacks')
+
+
+class SimulationProfile:
+    """
+    Cumulative phase times and call counts for one simulator
+
+    The game loop calls record() at the end of each phase with the
+    perf_counter_ns() value taken at its start, and bumps the per-game
+    counters directly.
+    """
+
+    __slots__ = ('nanos', 'calls', 'games', 'turns', 'cards_played', 'kos', 'attacks')
+
+    def __init__(self):
+        self.nanos: List[int] = [0] * len(PHASE_NAMES)
+        self.calls: List[int] = [0] * len(PHASE_NAMES)
+        self.games = 0
+        self.turns = 0
+        self.cards_played = 0
+        self.kos = 0
+        self.attacks = 0
+
+    def record(self, phase: int, started: int) -> int:
+        """
+        Add the time since started to a phase
+
+        Returns:
+            The current clock value, so consecutive phases can chain timings
+        """
+        now = perf_counter_ns()
+        self.nanos[phase] += now - started
+        self.calls[phase] += 1
+        return now
+
+    def to_counts(self) -> Dict[str, int]:
+        """Flatten the profile into summable shard counts"""
+        counts = {'profile_games': self.games}
+        for index, name in enumerate(PHASE_NAMES):
+            counts[f'phase_{name}_ns'] = self.nanos[index]
+            counts[f'phase_{name}_calls'] = self.calls[index]
+        for name in GAME_STATS:
+            counts[f'profile_{name}'] = getattr(self, name)
+        return counts
+
+
+def summarize_profile(totals: Dict[str, Any]) -> Dict:
+    """
+    Turn merged profile counts into per-phase and per-game statistics
+
+    Returns:
+        Dictionary with 'phases' (total milliseconds, calls, mean microseconds
+        per call and share of the profiled time for each phase) and 'per_game'
+        averages of the game statistics
+    """
+    games = totals.get('profile_games', 0)
+    total_ns = sum(totals.get(f'phase_{name}_ns', 0) for name in PHASE_NAMES)
+
+    phases = {}
+    for name in PHASE_NAMES:
+        nanos = totals.get(f'phase_{name}_ns', 0)
+        calls = totals.get(f'phase_{name}_calls', 0)
+        phases[name] = {
+            'total_ms': round(nanos / 1e6, 3),
+            'calls': calls,
+            'mean_us': round(nanos / calls / 1e3, 3) if calls else 0.0,
+            'share': round(nanos / total_ns, 4) if total_ns else 0.0
+        }
+
+    per_game = {
+        name: round(totals.get(f'profile_{name}', 0) / games, 2) if games else 0.0
+        for name in GAME_STATS
+    }
+
+    return {
+        'games': games,
+        'total_ms': round(total_ns / 1e6, 3),
+        'phases': phases,
+        'per_game': per_game
+    }
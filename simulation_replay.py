@@ -0,0 +1,249 @@
+"""
+Simulation Replay
+Records sampled simulated games as compact varint-packed event buffers that
+reference compiled deck slot indices, and decodes them back into events
+for debugging
+"""
+import base64
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+from compiled_deck import CompiledDeck
+
+
+class ReplayEvent(IntEnum):
+    """Kind of event in a replay buffer, with the fields that follow its tag"""
+    START = 0  # first player
+    TURN = 1  # turn number
+    DRAW = 2  # slot
+    PLAY = 3  # slot
+    ATTACK = 4  # attacker slot, target (0 for the leader, slot + 1 for a character)
+    BLOCK = 5  # blocker slot (player is the blocker's owner)
+    KO = 6  # slot (player is the card's owner)
+    DAMAGE = 7  # amount (player is the damaged leader's owner)
+    END = 8  # winner, turn count
+    ATTACH = 9  # attacker (0 for the leader, slot + 1 for a character), DON!! attached
+    COUNTER = 10  # slot of a counter discarded from hand (player is the defender)
+    LIFE = 11  # slot of a life card added to hand (player is its owner)
+    TRIGGER = 12  # slot of a life card whose trigger activates (player is its owner)
+    LEADER_ATTACK = 13  # target (0 for the leader, slot + 1 for a character)
+
+
+# Number of varint fields after the tag of each event
+_FIELD_COUNTS = {
+    ReplayEvent.START: 1,
+    ReplayEvent.TURN: 1,
+    ReplayEvent.DRAW: 1,
+    ReplayEvent.PLAY: 1,
+    ReplayEvent.ATTACK: 2,
+    ReplayEvent.BLOCK: 1,
+    ReplayEvent.KO: 1,
+    ReplayEvent.DAMAGE: 1,
+    ReplayEvent.END: 2,
+    ReplayEvent.ATTACH: 2,
+    ReplayEvent.COUNTER: 1,
+    ReplayEvent.LIFE: 1,
+    ReplayEvent.TRIGGER: 1,
+    ReplayEvent.LEADER_ATTACK: 1,
+}
+
+
+def _write_varint(buffer: bytearray, value: int):
+    """Append a non-negative integer as an unsigned LEB128 varint"""
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """Read a varint at position, returning (value, next position)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+class ReplayRecorder:
+    """
+    Records one in every sample_every games played by a simulator
+
+    The game loop calls the event methods only for sampled games. Events are
+    written as a varint tag (event kind and player) followed by varint fields,
+    so a typical game takes around a hundred bytes.
+    """
+
+    def __init__(self, sample_every: int = 100):
+        """
+        Args:
+            sample_every: Record one game out of this many (1 records every game)
+        """
+        self.sample_every = max(1, sample_every)
+        self.games_seen = 0
+        self.replays: List[Dict] = []
+        self._buffer = bytearray()
+        self._slots: Dict[int, int] = {}
+        self._slot_decks: Tuple[Optional[CompiledDeck], Optional[CompiledDeck]] = (None, None)
+
+    def begin_game(self, state) -> bool:
+        """
+        Start a game on a freshly reset state
+
+        Returns:
+            True if this game is sampled; the event methods must only be
+            called for sampled games
+        """
+        index = self.games_seen
+        self.games_seen += 1
+        if index % self.sample_every:
+            return False
+
+        decks = (state.player1.deck, state.player2.deck)
+        if decks[0] is not self._slot_decks[0] or decks[1] is not self._slot_decks[1]:
+            # Map card records to their deck slot (records compare by identity)
+            self._slots = {}
+            for deck in decks:
+                for slot, card in enumerate(deck.cards):
+                    self._slots[id(card)] = slot
+            self._slot_decks = decks
+
+        self._buffer = bytearray()
+        self._write(ReplayEvent.START, 1, state.active_player)
+        for player, player_state in ((1, state.player1), (2, state.player2)):
+            for card in player_state.hand:
+                self._write(ReplayEvent.DRAW, player, self._slots[id(card)])
+        return True
+
+    def _write(self, event: ReplayEvent, player: int, *fields: int):
+        """Append one event to the current game's buffer"""
+        buffer = self._buffer
+        _write_varint(buffer, (event << 1) | (player - 1))
+        for value in fields:
+            _write_varint(buffer, value)
+
+    # Event methods, called by the game loop for sampled games only
+
+    def turn(self, player: int, turn: int):
+        self._write(ReplayEvent.TURN, player, turn)
+
+    def draw(self, player: int, card):
+        self._write(ReplayEvent.DRAW, player, self._slots[id(card)])
+
+    def play(self, player: int, card):
+        self._write(ReplayEvent.PLAY, player, self._slots[id(card)])
+
+    def attack(self, player: int, attacker, defender=None):
+        """Record an attack by a character or the leader (None) on the leader (None) or a character"""
+        target = 0 if defender is None else self._slots[id(defender)] + 1
+        if attacker is None:
+            self._write(ReplayEvent.LEADER_ATTACK, player, target)
+        else:
+            self._write(ReplayEvent.ATTACK, player, self._slots[id(attacker)], target)
+
+    def block(self, player: int, blocker):
+        self._write(ReplayEvent.BLOCK, player, self._slots[id(blocker)])
+
+    def ko(self, player: int, card):
+        self._write(ReplayEvent.KO, player, self._slots[id(card)])
+
+    def damage(self, player: int, amount: int):
+        self._write(ReplayEvent.DAMAGE, player, amount)
+
+    def attach(self, player: int, attacker, don: int):
+        """Record DON!! attached to an attacking character or the leader (None)"""
+        source = 0 if attacker is None else self._slots[id(attacker)] + 1
+        self._write(ReplayEvent.ATTACH, player, source, don)
+
+    def counter(self, player: int, card):
+        self._write(ReplayEvent.COUNTER, player, self._slots[id(card)])
+
+    def life(self, player: int, card):
+        self._write(ReplayEvent.LIFE, player, self._slots[id(card)])
+
+    def trigger(self, player: int, card):
+        self._write(ReplayEvent.TRIGGER, player, self._slots[id(card)])
+
+    def end_game(self, winner: int, turn_count: int):
+        """Finish the current sampled game and keep its buffer"""
+        self._write(ReplayEvent.END, 1, winner, turn_count)
+        self.replays.append({
+            'game': self.games_seen - 1,
+            'winner': winner,
+            'turns': turn_count,
+            'data': base64.b64encode(bytes(self._buffer)).decode('ascii')
+        })
+
+
+def decode_replay(data, deck1: Optional[CompiledDeck] = None,
+                  deck2: Optional[CompiledDeck] = None) -> List[Dict]:
+    """
+    Decode a replay buffer into a list of events
+
+    Args:
+        data: Replay bytes, or the base64 string stored in a replay
+        deck1: Compiled deck of player 1, to add card names (optional)
+        deck2: Compiled deck of player 2, to add card names (optional)
+
+    Returns:
+        List of event dictionaries with 'event', 'player' and the event's
+        fields ('slot', 'attacker', 'target', 'amount', 'don', ...). Card slots
+        get a matching name entry when the player's deck is given. For ATTACK
+        and LEADER_ATTACK the target is None for the leader, as is the
+        attacker of ATTACH for DON!! attached to the leader. The player of
+        BLOCK, KO, DAMAGE, COUNTER, LIFE and TRIGGER is the owner of the card
+        or leader affected.
+    """
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    decks = (deck1, deck2)
+
+    def add_name(entry: Dict, key: str, player: int, slot: Optional[int]):
+        deck = decks[player - 1]
+        if deck is not None and slot is not None:
+            entry[key] = deck.cards[slot].name
+
+    events = []
+    position = 0
+    while position < len(data):
+        tag, position = _read_varint(data, position)
+        event = ReplayEvent(tag >> 1)
+        player = (tag & 1) + 1
+        fields = []
+        for _ in range(_FIELD_COUNTS[event]):
+            value, position = _read_varint(data, position)
+            fields.append(value)
+
+        entry = {'event': event.name.lower(), 'player': player}
+        opponent = 2 if player == 1 else 1
+        if event == ReplayEvent.START:
+            entry = {'event': 'start', 'first_player': fields[0]}
+        elif event == ReplayEvent.TURN:
+            entry['turn'] = fields[0]
+        elif event in (ReplayEvent.DRAW, ReplayEvent.PLAY, ReplayEvent.BLOCK, ReplayEvent.KO,
+                       ReplayEvent.COUNTER, ReplayEvent.LIFE, ReplayEvent.TRIGGER):
+            entry['slot'] = fields[0]
+            add_name(entry, 'name', player, fields[0])
+        elif event == ReplayEvent.ATTACK:
+            entry['attacker'] = fields[0]
+            entry['target'] = fields[1] - 1 if fields[1] else None
+            add_name(entry, 'attacker_name', player, entry['attacker'])
+            add_name(entry, 'target_name', opponent, entry['target'])
+        elif event == ReplayEvent.LEADER_ATTACK:
+            entry['target'] = fields[0] - 1 if fields[0] else None
+            add_name(entry, 'target_name', opponent, entry['target'])
+        elif event == ReplayEvent.ATTACH:
+            entry['attacker'] = fields[0] - 1 if fields[0] else None
+            entry['don'] = fields[1]
+            add_name(entry, 'attacker_name', player, entry['attacker'])
+        elif event == ReplayEvent.DAMAGE:
+            entry['amount'] = fields[0]
+        elif event == ReplayEvent.END:
+            entry = {'event': 'end', 'winner': fields[0], 'turns': fields[1]}
+        events.append(entry)
+
+    return events
@@ -0,0 +1,250 @@
+"""
+Simulation Runner
+Shards Monte Carlo game simulations into chunks and runs them serially or
+across a process pool, giving every chunk its own reproducible RNG stream,
+plus the interval estimates used to stop a run early
+"""
+import hashlib
+import logging
+import math
+import os
+import random
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Number of games simulated by one shard when no chunk size is given
+DEFAULT_CHUNK_SIZE = 250
+
+# Process pool shared by every call in this process (recreated after a fork)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_pid = 0
+
+
+def new_base_seed() -> int:
+    """Draw a fresh 64-bit base seed from the operating system"""
+    return random.SystemRandom().getrandbits(64)
+
+
+def derive_shard_seed(base_seed: int, shard_index: int) -> int:
+    """
+    Derive the seed of one shard from the base seed
+
+    Hashing (base_seed, shard_index) gives every shard an independent stream
+    that only depends on its position, so the same base seed reproduces the
+    same games whether shards run serially or in parallel.
+    """
+    digest = hashlib.sha256(f'{base_seed}:{shard_index}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def plan_shards(num_games: int, chunk_size: Optional[int] = None) -> List[int]:
+    """Split num_games into shard sizes of at most chunk_size games"""
+    chunk_size = max(1, chunk_size or DEFAULT_CHUNK_SIZE)
+    full, remainder = divmod(max(0, num_games), chunk_size)
+    sizes = [chunk_size] * full
+    if remainder:
+        sizes.append(remainder)
+    return sizes
+
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use in this process"""
+    global _pool, _pool_workers, _pool_pid
+
+    if _pool is None or _pool_workers != workers or _pool_pid != os.getpid():
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=False)
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+        _pool_pid = os.getpid()
+    return _pool
+
+
+def iter_tasks(task_fn: Callable[..., Any], tasks: List[Tuple], workers: int = 1,
+               initializer: Optional[Callable[..., None]] = None,
+               initargs: Tuple = ()) -> Iterator[Any]:
+    """
+    Run task_fn(*args) for every args tuple, yielding results in task order
+
+    Tasks are computed lazily, so a caller can stop iterating as soon as it
+    has seen enough results. With several workers a bounded window of tasks
+    runs ahead in the process pool and is cancelled when iteration stops.
+
+    Data every task needs belongs in initargs rather than in each task:
+    with an initializer the tasks run in a pool private to this call, whose
+    workers receive initargs once, and serial runs call it once in-process.
+
+    Args:
+        task_fn: Module-level function called with each task's arguments
+        tasks: Positional arguments of every task
+        workers: Number of worker processes (1 runs every task in-process)
+        initializer: Module-level function called with initargs before the tasks (optional)
+        initargs: Arguments of the initializer
+
+    Yields:
+        Task results in task order
+    """
+    pending: Deque[Future] = deque()
+    next_index = 0
+    private_pool = None
+
+    if workers > 1 and len(tasks) > 1:
+        try:
+            if initializer is None:
+                pool = get_process_pool(workers)
+            else:
+                pool = private_pool = ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                                                          initargs=initargs)
+            while next_index < len(tasks) and len(pending) < workers * 2:
+                pending.append(pool.submit(task_fn, *tasks[next_index]))
+                next_index += 1
+        except (OSError, NotImplementedError) as e:
+            # Sandboxed hosts may not allow worker processes - run in-process instead
+            logger.warning(f"Process pool unavailable, running tasks serially: {e}")
+            for future in pending:
+                future.cancel()
+            pending.clear()
+            next_index = 0
+            if private_pool is not None:
+                private_pool.shutdown(wait=False)
+                private_pool = None
+
+    if not pending:
+        if initializer is not None:
+            initializer(*initargs)
+        for args in tasks:
+            yield task_fn(*args)
+        return
+
+    try:
+        while pending:
+            result = pending.popleft().result()
+            if next_index < len(tasks):
+                pending.append(pool.submit(task_fn, *tasks[next_index]))
+                next_index += 1
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        if private_pool is not None:
+            private_pool.shutdown(wait=False)
+
+
+def iter_shards(shard_fn: Callable[..., Dict], shard_args: Tuple, num_games: int,
+                base_seed: int, workers: int = 1,
+                chunk_size: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Run num_games simulations split into shards, yielding results in shard order
+
+    Shards run through iter_tasks, so they are computed lazily and cancelled
+    when iteration stops.
+
+    Args:
+        shard_fn: Module-level function called as shard_fn(*shard_args, games, seed)
+        shard_args: Leading positional arguments passed to every shard
+        num_games: Total number of games to simulate
+        base_seed: Seed from which every shard seed is derived
+        workers: Number of worker processes (1 runs every shard in-process)
+        chunk_size: Number of games per shard
+
+    Yields:
+        Shard results in shard order
+    """
+    tasks = [
+        (*shard_args, size, derive_shard_seed(base_seed, index))
+        for index, size in enumerate(plan_shards(num_games, chunk_size))
+    ]
+    yield from iter_tasks(shard_fn, tasks, workers=workers)
+
+
+def run_shards(shard_fn: Callable[..., Dict], shard_args: Tuple, num_games: int,
+               base_seed: int, workers: int = 1,
+               chunk_size: Optional[int] = None) -> List[Dict]:
+    """Run every shard (see iter_shards) and return the results in shard order"""
+    return list(iter_shards(shard_fn, shard_args, num_games, base_seed,
+                            workers=workers, chunk_size=chunk_size))
+
+
+def run_jobs(shard_fn: Callable[..., Dict], jobs: List[Tuple[Tuple, int, int]],
+             workers: int = 1, chunk_size: Optional[int] = None) -> List[Dict]:
+    """
+    Run several independent simulation jobs, sharing one pool between them
+
+    Every job is split into shards exactly as iter_shards would split it, so
+    a job returns the same counts here as when it is run on its own. With
+    several workers the shards of all jobs are queued together, so small jobs
+    do not leave workers idle.
+
+    Args:
+        shard_fn: Module-level function called as shard_fn(*shard_args, games, seed)
+        jobs: List of (shard_args, num_games, base_seed) tuples
+        workers: Number of worker processes (1 runs every shard in-process)
+        chunk_size: Number of games per shard
+
+    Returns:
+        Merged shard counts of every job, in job order
+    """
+    tasks = [
+        (job_index, shard_args, size, derive_shard_seed(base_seed, shard_index))
+        for job_index, (shard_args, num_games, base_seed) in enumerate(jobs)
+        for shard_index, size in enumerate(plan_shards(num_games, chunk_size))
+    ]
+    partials: List[List[Dict]] = [[] for _ in jobs]
+
+    if workers > 1 and len(tasks) > 1:
+        futures: List[Future] = []
+        try:
+            pool = get_process_pool(workers)
+            for _, shard_args, size, seed in tasks:
+                futures.append(pool.submit(shard_fn, *shard_args, size, seed))
+        except (OSError, NotImplementedError) as e:
+            # Sandboxed hosts may not allow worker processes - run in-process instead
+            logger.warning(f"Process pool unavailable, running shards serially: {e}")
+            for future in futures:
+                future.cancel()
+            futures = []
+
+        if futures:
+            try:
+                for (job_index, _, _, _), future in zip(tasks, futures):
+                    partials[job_index].append(future.result())
+            finally:
+                for future in futures:
+                    future.cancel()
+            return [merge_counts(job_partials) for job_partials in partials]
+
+    for job_index, shard_args, size, seed in tasks:
+        partials[job_index].append(shard_fn(*shard_args, size, seed))
+    return [merge_counts(job_partials) for job_partials in partials]
+
+
+def wilson_interval(successes: int, trials: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """
+    Wilson score confidence interval for a binomial proportion
+
+    Returns:
+        Tuple of (low, high) as fractions between 0 and 1
+    """
+    if trials <= 0:
+        return 0.0, 1.0
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def merge_counts(partials: List[Dict]) -> Dict[str, Any]:
+    """Sum the numeric fields of shard results (list fields are concatenated)"""
+    merged: Dict[str, Any] = {}
+    for partial in partials:
+        for key, value in partial.items():
+            merged[key] = merged[key] + value if key in merged else value
+    return merged
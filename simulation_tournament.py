@@ -0,0 +1,391 @@
+"""
+Tournament Simulation
+Plays simulated Swiss or round-robin tournaments over a pool of decks with
+CombatSimulator to estimate the metagame, caching every pairwise matchup and
+reporting standings after each round
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from combat_simulator import CombatSimulator
+from compiled_deck import CompiledDeck, compile_deck
+from deck_profile import get_deck_profile
+from random_source import RandomSource, make_rng, make_seed
+from simulation_cache import SimulationCache, make_cache_key
+from structure_decks import build_combat_deck, get_all_structure_decks
+
+FORMAT_SWISS = 'swiss'
+FORMAT_ROUND_ROBIN = 'round_robin'
+TOURNAMENT_FORMATS = (FORMAT_SWISS, FORMAT_ROUND_ROBIN)
+
+# Match points; a match is won by the deck that wins most of its simulated games
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+DEFAULT_GAMES_PER_MATCH = 100
+
+# A pairing of two entrant indices; the second is None for a bye
+Pairing = Tuple[int, Optional[int]]
+
+
+@dataclass
+class _Entrant:
+    """A deck in the tournament and its running record"""
+    index: int
+    name: str
+    strategy: str
+    deck_hash: str
+    compiled: CompiledDeck
+    points: int = 0
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    byes: int = 0
+    game_wins: int = 0
+    games: int = 0
+    opponents: List[int] = field(default_factory=list)
+
+    @property
+    def match_win_rate(self) -> float:
+        """Share of the available match points won, byes excluded"""
+        matches = self.wins + self.losses + self.draws - self.byes
+        return (self.points - self.byes * WIN_POINTS) / (matches * WIN_POINTS) if matches else 0.0
+
+    @property
+    def game_win_rate(self) -> float:
+        return self.game_wins / self.games if self.games else 0.0
+
+
+def structure_deck_pool(cards: Sequence[Dict]) -> List[Dict]:
+    """
+    Combat decks for every structure deck that resolves against a card list
+
+    Decks get a 'name' of the form 'ST-01 Straw Hat Crew'; decks whose leader
+    is missing or whose main deck is empty are skipped.
+    """
+    pool = []
+    for structure_deck in get_all_structure_decks():
+        deck = build_combat_deck(structure_deck['code'], cards)
+        if deck and deck['main_deck']:
+            deck['name'] = f"{structure_deck['code']} {structure_deck['name']}"
+            pool.append(deck)
+    return pool
+
+
+def round_robin_schedule(count: int) -> List[List[Pairing]]:
+    """
+    Rounds in which every entrant meets every other entrant once (circle method)
+
+    With an odd count every entrant sits out one round (paired with None).
+    """
+    players: List[Optional[int]] = list(range(count))
+    if count % 2:
+        players.append(None)
+    size = len(players)
+
+    rounds = []
+    for _ in range(size - 1):
+        pairings = []
+        for position in range(size // 2):
+            first, second = players[position], players[size - 1 - position]
+            if first is None:
+                first, second = second, first
+            pairings.append((first, second))
+        rounds.append(pairings)
+        # Keep the first player fixed and rotate the rest
+        players = [players[0], players[-1]] + players[1:-1]
+    return rounds
+
+
+def swiss_rounds(count: int) -> int:
+    """Default number of Swiss rounds for a field size (enough to find a single winner)"""
+    return max(1, math.ceil(math.log2(count))) if count > 1 else 0
+
+
+def tournament_rounds(count: int, tournament_format: str = FORMAT_SWISS,
+                      rounds: Optional[int] = None) -> int:
+    """
+    Number of rounds a tournament over count entrants plays
+
+    Args:
+        count: Number of entrants
+        tournament_format: 'swiss' or 'round_robin'
+        rounds: Requested rounds (Swiss default: swiss_rounds; cuts round robins short)
+    """
+    if tournament_format == FORMAT_ROUND_ROBIN:
+        # Length of round_robin_schedule(count): odd counts add a bye round
+        scheduled = count if count % 2 else max(0, count - 1)
+        return min(rounds, scheduled) if rounds else scheduled
+    return rounds or swiss_rounds(count)
+
+
+class TournamentRunner:
+    """
+    Runs simulated tournaments on top of CombatSimulator
+
+    Every pairing is decided by simulating games_per_match games between the
+    two decks. Matchup results are kept per pair of decklists (in memory and,
+    if given, in a SimulationCache), so a matchup that comes up again, in a
+    later Swiss round or another tournament, is not simulated twice. The
+    matchups of each round run together in the simulator's worker pool.
+    """
+
+    def __init__(self, simulator: Optional[CombatSimulator] = None,
+                 games_per_match: int = DEFAULT_GAMES_PER_MATCH, workers: int = 1,
+                 chunk_size: Optional[int] = None, engine: str = 'scalar',
+                 cache: Optional[SimulationCache] = None):
+        """
+        Args:
+            simulator: Simulator that plays the games (a new one if omitted)
+            games_per_match: Number of simulated games per matchup (default 100)
+            workers: Number of worker processes (default 1 runs in-process)
+            chunk_size: Number of games per shard (default 250)
+            engine: 'scalar' or 'batch' (see CombatSimulator.simulate_combat)
+            cache: Result cache shared with other runs (optional)
+        """
+        self.simulator = simulator or CombatSimulator()
+        self.games_per_match = max(1, games_per_match)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.engine = engine
+        self.cache = cache
+        # Matchup counts by key, with the wins of the deck with the lower hash
+        self._matchups: Dict[str, Dict] = {}
+        self.matchups_simulated = 0
+        self.matchups_reused = 0
+
+    def run(self, decks: List[Dict], tournament_format: str = FORMAT_SWISS,
+            rounds: Optional[int] = None, seed: RandomSource = None) -> Dict:
+        """Play a whole tournament and return the final result (see iter_run)"""
+        results = None
+        for event in self.iter_run(decks, tournament_format, rounds, seed):
+            if event['event'] == 'result':
+                results = event['results']
+        return results
+
+    def iter_run(self, decks: List[Dict], tournament_format: str = FORMAT_SWISS,
+                 rounds: Optional[int] = None, seed: RandomSource = None) -> Iterator[Dict]:
+        """
+        Play a tournament, yielding the standings after every round
+
+        Args:
+            decks: Decks with leader and main_deck (and optionally name and strategy)
+            tournament_format: 'swiss' or 'round_robin'
+            rounds: Number of rounds (Swiss default: ceil(log2(decks)); round
+                robin default: every deck meets every other deck)
+            seed: Base seed or generator for reproducible results (random if omitted)
+
+        Yields:
+            {'event': 'round', 'round': {...}} after every round with its
+            pairings and the standings so far, then one
+            {'event': 'result', 'results': {...}} with the final standings
+
+        Raises:
+            ValueError: If the format is unknown or fewer than two decks are given
+        """
+        if tournament_format not in TOURNAMENT_FORMATS:
+            raise ValueError(f"Unknown tournament format '{tournament_format}'. "
+                             f"Choose from: {', '.join(TOURNAMENT_FORMATS)}")
+        if len(decks) < 2:
+            raise ValueError('A tournament needs at least two decks')
+
+        base_seed = make_seed(seed)
+        rng = make_rng(base_seed)
+        entrants = self._make_entrants(decks)
+        simulated_before, reused_before = self.matchups_simulated, self.matchups_reused
+
+        schedule = round_robin_schedule(len(entrants)) if tournament_format == FORMAT_ROUND_ROBIN else None
+        total_rounds = tournament_rounds(len(entrants), tournament_format, rounds)
+
+        for number in range(1, total_rounds + 1):
+            if schedule is not None:
+                pairings = schedule[number - 1]
+            else:
+                pairings = self._swiss_pairings(entrants, rng, first_round=number == 1)
+            matches = self._play_round(entrants, pairings, base_seed,
+                                       byes_win=schedule is None)
+            yield {'event': 'round', 'round': {
+                'number': number,
+                'rounds': total_rounds,
+                'matches': matches,
+                'standings': self._standings(entrants)
+            }}
+
+        yield {'event': 'result', 'results': {
+            'format': tournament_format,
+            'rounds': total_rounds,
+            'decks': len(entrants),
+            'games_per_match': self.games_per_match,
+            'standings': self._standings(entrants),
+            'matchups_simulated': self.matchups_simulated - simulated_before,
+            'matchups_reused': self.matchups_reused - reused_before
+        }}
+
+    def _make_entrants(self, decks: List[Dict]) -> List[_Entrant]:
+        """Compile every deck once, sharing compiled decks between identical lists"""
+        compiled_by_hash: Dict[str, CompiledDeck] = {}
+        entrants = []
+        for index, deck in enumerate(decks):
+            profile = get_deck_profile(deck)
+            key = profile.deck_hash
+            if key not in compiled_by_hash:
+                compiled_by_hash[key] = compile_deck(deck)
+            leader = deck.get('leader') or {}
+            entrants.append(_Entrant(
+                index=index,
+                name=deck.get('name') or leader.get('name', f'Deck {index + 1}'),
+                strategy=profile.strategy,
+                deck_hash=key,
+                compiled=compiled_by_hash[key]
+            ))
+        return entrants
+
+    def _swiss_pairings(self, entrants: List[_Entrant], rng, first_round: bool) -> List[Pairing]:
+        """
+        Pair entrants with similar records, avoiding rematches where possible
+
+        The first round is paired at random. An odd entrant out gets a bye:
+        the lowest ranked entrant without one so far.
+        """
+        if first_round:
+            order = list(entrants)
+            rng.shuffle(order)
+        else:
+            order = sorted(entrants, key=_standing_key)
+
+        bye = None
+        if len(order) % 2:
+            bye = next((e for e in reversed(order) if not e.byes), order[-1])
+            order.remove(bye)
+
+        pairings: List[Pairing] = []
+        while order:
+            first = order.pop(0)
+            position = next((i for i, other in enumerate(order)
+                             if other.index not in first.opponents), 0)
+            second = order.pop(position)
+            pairings.append((first.index, second.index))
+        if bye is not None:
+            pairings.append((bye.index, None))
+        return pairings
+
+    def _play_round(self, entrants: List[_Entrant], pairings: List[Pairing],
+                    base_seed: int, byes_win: bool) -> List[Dict]:
+        """Simulate the round's new matchups together and record every result"""
+        keys = {}
+        missing = {}
+        for first, second in pairings:
+            if second is None:
+                continue
+            key, low, high = self._matchup_key(entrants[first], entrants[second], base_seed)
+            keys[(first, second)] = key
+            if key in self._matchups or key in missing:
+                self.matchups_reused += 1
+                continue
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                self._matchups[key] = cached
+                self.matchups_reused += 1
+            else:
+                missing[key] = (low.compiled, high.compiled, int(key[:16], 16))
+
+        if missing:
+            counts = self.simulator.simulate_pairings(
+                list(missing.values()), num_simulations=self.games_per_match,
+                workers=self.workers, chunk_size=self.chunk_size, engine=self.engine
+            )
+            for key, totals in zip(missing, counts):
+                self._matchups[key] = totals
+                if self.cache is not None:
+                    self.cache.set(key, totals)
+            self.matchups_simulated += len(missing)
+
+        matches = []
+        for first, second in pairings:
+            entrant = entrants[first]
+            if second is None:
+                entrant.byes += int(byes_win)
+                if byes_win:
+                    entrant.wins += 1
+                    entrant.points += WIN_POINTS
+                matches.append({'deck1': first, 'deck2': None, 'winner': first if byes_win else None})
+                continue
+
+            opponent = entrants[second]
+            totals = self._matchups[keys[(first, second)]]
+            games = totals['games']
+            wins = totals['wins'] if entrant.deck_hash <= opponent.deck_hash else games - totals['wins']
+            self._record(entrant, opponent, wins, games)
+            self._record(opponent, entrant, games - wins, games)
+            winner = first if wins * 2 > games else second if wins * 2 < games else None
+            matches.append({
+                'deck1': first,
+                'deck2': second,
+                'deck1_win_rate': round(wins / games * 100, 2) if games else 0,
+                'winner': winner
+            })
+        return matches
+
+    def _matchup_key(self, entrant1: _Entrant, entrant2: _Entrant,
+                     base_seed: int) -> Tuple[str, _Entrant, _Entrant]:
+        """
+        Cache key of a matchup, with the entrants ordered by deck hash
+
+        The key doubles as the matchup's seed, so a decklist pair gets the
+        same games whichever side it is on and in whichever round it meets.
+        """
+        low, high = sorted((entrant1, entrant2), key=lambda e: e.deck_hash)
+        key = make_cache_key(
+            low.deck_hash, high.deck_hash, self.simulator.RULES_VERSION,
+            tournament_games=self.games_per_match, seed=base_seed, engine=self.engine
+        )
+        return key, low, high
+
+    @staticmethod
+    def _record(entrant: _Entrant, opponent: _Entrant, wins: int, games: int):
+        """Add one match to an entrant's record"""
+        entrant.opponents.append(opponent.index)
+        entrant.game_wins += wins
+        entrant.games += games
+        if wins * 2 > games:
+            entrant.wins += 1
+            entrant.points += WIN_POINTS
+        elif wins * 2 < games:
+            entrant.losses += 1
+        else:
+            entrant.draws += 1
+            entrant.points += DRAW_POINTS
+
+    def _standings(self, entrants: List[_Entrant]) -> List[Dict]:
+        """
+        Entrants ranked by match points, then opponents' match win rate, then
+        game win rate
+        """
+        opponent_rates = {e.index: _opponent_match_win_rate(e, entrants) for e in entrants}
+        ranked = sorted(entrants, key=lambda e: (-e.points, -opponent_rates[e.index],
+                                                 -e.game_win_rate, e.index))
+        return [{
+            'rank': rank,
+            'deck': entrant.index,
+            'name': entrant.name,
+            'strategy': entrant.strategy,
+            'points': entrant.points,
+            'wins': entrant.wins,
+            'losses': entrant.losses,
+            'draws': entrant.draws,
+            'game_win_rate': round(entrant.game_win_rate * 100, 2),
+            'opponent_match_win_rate': round(opponent_rates[entrant.index] * 100, 2)
+        } for rank, entrant in enumerate(ranked, 1)]
+
+
+def _opponent_match_win_rate(entrant: _Entrant, entrants: List[_Entrant]) -> float:
+    """Average match win rate of an entrant's opponents (Swiss tie-breaker)"""
+    if not entrant.opponents:
+        return 0.0
+    return sum(entrants[index].match_win_rate for index in entrant.opponents) / len(entrant.opponents)
+
+
+def _standing_key(entrant: _Entrant) -> Tuple:
+    """Sort key for Swiss pairing: most points first, then game win rate"""
+    return (-entrant.points, -entrant.game_win_rate, entrant.index)
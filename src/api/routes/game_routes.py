@@ -2,16 +2,28 @@
 Game-related API routes
 Handles deck building, analysis, combat simulation, and structure decks
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_login import current_user
+import json
 import logging
+import os
 
 from deck_builder import OnePieceDeckBuilder
 from combat_simulator import CombatSimulator
-from structure_decks import get_all_structure_decks, get_structure_deck
-from ...services import CollectionService
+from draw_probability import DEFAULT_TURNS, draw_probabilities
+from simulation_cache import create_simulation_cache
+from simulation_policies import make_policy
+from simulation_tournament import (
+    TOURNAMENT_FORMATS, TournamentRunner, structure_deck_pool, tournament_rounds
+)
+from simulation_jobs import (
+    SimulationJobQueue, SimulationJobStore, STATUS_DONE, STATUS_FAILED, STATUS_QUEUED
+)
+from structure_decks import get_all_structure_decks, get_structure_deck, build_combat_deck
+from ...services import CollectionService, DeckService
 from ...models import db
 from ...core.constants import API_MESSAGES
+from ..utils import parse_early_stopping, parse_num_simulations, parse_seed
 
 game_bp = Blueprint('game', __name__)
 logger = logging.getLogger(__name__)
@@ -20,6 +32,187 @@ logger = logging.getLogger(__name__)
 combat_simulator = CombatSimulator()
 
 
+def get_simulation_cache():
+    """Return the app's simulation result cache, creating it on first use"""
+    if 'simulation_cache' not in current_app.extensions:
+        path = current_app.config.get('SIMULATION_CACHE_PATH', 'simulation_cache.sqlite3')
+        if not os.path.isabs(path):
+            path = os.path.join(current_app.instance_path, path)
+        current_app.extensions['simulation_cache'] = create_simulation_cache(
+            backend=current_app.config.get('SIMULATION_CACHE_BACKEND', 'memory'),
+            path=path,
+            max_entries=current_app.config.get('SIMULATION_CACHE_MAX_ENTRIES', 1024),
+            ttl=current_app.config.get('SIMULATION_CACHE_TTL', 3600)
+        )
+    return current_app.extensions['simulation_cache']
+
+
+def get_simulation_jobs():
+    """Return the app's asynchronous simulation job queue, creating it on first use"""
+    if 'simulation_jobs' not in current_app.extensions:
+        app = current_app._get_current_object()
+        path = current_app.config.get('SIMULATION_JOB_PATH', 'simulation_jobs.sqlite3')
+        if not os.path.isabs(path):
+            path = os.path.join(current_app.instance_path, path)
+        
+        def run_job(params, report_progress):
+            with app.app_context():
+                return _run_combat_simulation(params, report_progress)
+        
+        queue = SimulationJobQueue(
+            SimulationJobStore(path, ttl=current_app.config.get('SIMULATION_JOB_TTL', 86400) or None,
+                               stale_after=current_app.config.get('SIMULATION_JOB_STALE_AFTER', 600) or None),
+            run_job,
+            workers=current_app.config.get('SIMULATION_JOB_WORKERS', 1)
+        )
+        # Start draining right away so jobs left queued by other processes run too
+        queue.start()
+        current_app.extensions['simulation_jobs'] = queue
+    return current_app.extensions['simulation_jobs']
+
+
+def _run_combat_simulation(params, report_progress=None):
+    """
+    Simulate a player deck against a pre-built opponent
+    
+    Args:
+        params: Validated /simulate-combat parameters
+        report_progress: Called with the running statistics after every shard (optional)
+    
+    Returns:
+        Simulation results with the opponent info added
+    """
+    for event in _iter_combat_simulation(params):
+        if event['event'] == 'progress' and report_progress is not None:
+            report_progress(event['progress'])
+        elif event['event'] == 'result':
+            return event['results']
+
+
+def _iter_combat_simulation(params, chunk_size=None):
+    """
+    Simulate a player deck against a pre-built opponent, yielding progress
+    
+    Args:
+        params: Validated /simulate-combat parameters
+        chunk_size: Games per shard (defaults to SIMULATION_CHUNK_SIZE)
+    
+    Yields:
+        Progress events after every shard, then the result event with the
+        opponent info added (see CombatSimulator.iter_simulate_combat)
+    """
+    opponent_info = next(d for d in combat_simulator.get_available_opponent_decks()
+                         if d['id'] == params['opponent_deck_id'])
+    
+    # Build the actual opponent deck
+    cache = get_simulation_cache()
+    opponent_deck = _get_opponent_deck(opponent_info, cache, params['seed'])
+    
+    # Run simulation
+    for event in combat_simulator.iter_simulate_combat(
+            params['player_deck'],
+            opponent_deck,
+            num_simulations=params['num_simulations'],
+            workers=current_app.config.get('SIMULATION_WORKERS', 1),
+            chunk_size=chunk_size or current_app.config.get('SIMULATION_CHUNK_SIZE'),
+            seed=params['seed'],
+            ci_half_width=params['ci_half_width'],
+            confidence=params['confidence'],
+            cache=cache,
+            profile=params.get('profile', False),
+            replay_every=params.get('replay_every'),
+            policies=_make_policies(params.get('policies'))):
+        if event['event'] == 'result':
+            # Add opponent info to results
+            results = event['results']
+            if 'profile' in results:
+                # One JSON line per profiled run, picked up by the log shippers as metrics
+                logger.info(f"simulation_profile {json.dumps(results['profile'])}")
+            results['opponent_name'] = opponent_info['name']
+            results['opponent_description'] = opponent_info['description']
+            results['opponent_tournament_win_rate'] = opponent_info['win_rate']
+        yield event
+
+
+def _parse_policies(data):
+    """
+    Read the optional 'policies' and MCTS budget fields of a request body
+    
+    Returns:
+        JSON-serializable policy settings, or None for greedy play on both sides
+    
+    Raises:
+        ValueError: If a policy name or budget is invalid
+    """
+    names = data.get('policies') or {}
+    if not isinstance(names, dict):
+        raise ValueError(API_MESSAGES['INVALID_POLICY'])
+    settings = {
+        'player': names.get('player') or 'greedy',
+        'opponent': names.get('opponent') or 'greedy',
+        'options': {
+            'rollouts': data.get('mcts_rollouts',
+                                 current_app.config.get('SIMULATION_MCTS_ROLLOUTS', 32)),
+            'time_budget_ms': data.get('mcts_time_ms',
+                                       current_app.config.get('SIMULATION_MCTS_TIME_MS') or None)
+        }
+    }
+    if settings['player'] == settings['opponent'] == 'greedy':
+        return None
+    
+    # Store the converted budgets: the policies divide and count with them
+    options = settings['options']
+    rollouts = options['rollouts']
+    if isinstance(rollouts, bool) or isinstance(rollouts, float) and not rollouts.is_integer():
+        raise ValueError(API_MESSAGES['INVALID_POLICY'])
+    options['rollouts'] = int(rollouts)
+    if not 1 <= options['rollouts'] <= current_app.config.get('SIMULATION_MCTS_MAX_ROLLOUTS', 256):
+        raise ValueError(API_MESSAGES['INVALID_POLICY'])
+    time_budget_ms = options['time_budget_ms']
+    if time_budget_ms is not None:
+        if isinstance(time_budget_ms, bool):
+            raise ValueError(API_MESSAGES['INVALID_POLICY'])
+        options['time_budget_ms'] = float(time_budget_ms)
+        if not 0 <= options['time_budget_ms'] < float('inf'):
+            raise ValueError(API_MESSAGES['INVALID_POLICY'])
+    _make_policies(settings)  # Raises ValueError for unknown names
+    return settings
+
+
+def _make_policies(settings):
+    """Build the (player, opponent) policy objects from parsed settings"""
+    if not settings:
+        return None
+    options = settings.get('options', {})
+    return tuple(
+        None if name == 'greedy' else make_policy(name, **options)
+        for name in (settings['player'], settings['opponent'])
+    )
+
+
+def _get_opponent_deck(opponent_info, cache, seed=None):
+    """
+    Build the deck for an opponent entry, reusing the cached build if present
+    
+    Keeping the same opponent decklist between requests is what lets repeated
+    simulations against an opponent hit the result cache. A seeded request
+    builds (and caches) its own opponent decklist from that seed.
+    """
+    key = f"opponent:{opponent_info['id']}"
+    if seed is not None:
+        key = f"{key}:{seed}"
+    opponent_deck = cache.get(key, record=False) if cache is not None else None
+    if opponent_deck is None:
+        deck_builder = OnePieceDeckBuilder(db_session=db.session, seed=seed)
+        opponent_deck = deck_builder.build_deck(
+            strategy=opponent_info['strategy'],
+            color=opponent_info['color']
+        )
+        if cache is not None:
+            cache.set(key, opponent_deck)
+    return opponent_deck
+
+
 @game_bp.route('/cards', methods=['GET'])
 def get_cards():
     """Get all available One Piece TCG cards"""
@@ -36,7 +229,15 @@ def build_deck():
     leader = data.get('leader', None)
     
     try:
-        deck_builder = OnePieceDeckBuilder(db_session=db.session)
+        seed = parse_seed(data)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    try:
+        deck_builder = OnePieceDeckBuilder(db_session=db.session, seed=seed)
         deck = deck_builder.build_deck(strategy=strategy, color=color, leader=leader)
         return jsonify({
             'success': True,
@@ -50,6 +251,62 @@ def build_deck():
         }), 400
 
 
+@game_bp.route('/build-decks', methods=['POST'])
+def build_decks():
+    """
+    Build a batch of decks, streamed back as newline-delimited JSON
+    
+    The body holds 'count' decks to build and optional 'specs' (objects of
+    strategy, color and leader cycled through the batch) and 'seed'. Every
+    line is {"index": i, "deck": {...}} in deck order; a failure ends the
+    stream with an {"error": ...} line.
+    """
+    data = request.json or {}
+    count = data.get('count')
+    specs = data.get('specs') or [{}]
+    spec_fields = ('strategy', 'color', 'leader')
+    if not isinstance(count, int) or isinstance(count, bool) or \
+            not 1 <= count <= current_app.config.get('BUILD_DECKS_MAX', 200) or \
+            not isinstance(specs, list) or \
+            not all(isinstance(spec, dict) and set(spec) <= set(spec_fields) and
+                    all(isinstance(spec[field], str) for field in spec) for spec in specs):
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['INVALID_BUILD_DECKS']
+        }), 400
+    
+    try:
+        seed = parse_seed(data)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    # Load the cards while the request's database session is available
+    deck_builder = OnePieceDeckBuilder(db_session=db.session)
+    deck_builder.get_catalog()
+    
+    def generate():
+        decks = deck_builder.iter_build_decks(
+            count, specs, seed=seed,
+            workers=current_app.config.get('BUILD_DECKS_WORKERS', 1)
+        )
+        try:
+            for index, deck in enumerate(decks):
+                yield json.dumps({'index': index, 'deck': deck}) + '\n'
+        except Exception as e:
+            logger.error(f"Error building decks: {e}", exc_info=True)
+            yield json.dumps({'error': API_MESSAGES['BUILD_DECK_FAILED']}) + '\n'
+        finally:
+            decks.close()
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
 @game_bp.route('/analyze-deck', methods=['POST'])
 def analyze_deck():
     """Analyze a deck and provide AI-powered suggestions"""
@@ -71,6 +328,42 @@ def analyze_deck():
         }), 400
 
 
+@game_bp.route('/draw-probabilities', methods=['POST'])
+def calculate_draw_probabilities():
+    """Exact chances of drawing cards by cost, type, name or custom query by each turn"""
+    data = request.json or {}
+    deck = data.get('deck')
+    # Accept a bare card list (like /analyze-deck) or a full deck
+    if isinstance(deck, dict):
+        deck = deck.get('main_deck')
+    
+    if not deck or not isinstance(deck, list):
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['DECK_REQUIRED']
+        }), 400
+    
+    try:
+        probabilities = draw_probabilities(deck, turns=data.get('turns', DEFAULT_TURNS),
+                                           queries=data.get('queries'))
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['INVALID_DRAW_QUERY']
+        }), 400
+    except Exception as e:
+        logger.error(f"Error calculating draw probabilities: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['DRAW_PROBABILITIES_FAILED']
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'probabilities': probabilities
+    })
+
+
 @game_bp.route('/suggest-deck', methods=['POST'])
 def suggest_deck_from_collection():
     """Build a deck based on user's collection (requires authentication)"""
@@ -84,12 +377,20 @@ def suggest_deck_from_collection():
     strategy = data.get('strategy', 'balanced')
     color = data.get('color', 'any')
     
+    try:
+        seed = parse_seed(data)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
     # Get user's collection
     owned_cards = CollectionService.get_collection_as_dict(current_user.id)
     
     try:
         # Build deck with collection awareness
-        deck_builder = OnePieceDeckBuilder(db_session=db.session)
+        deck_builder = OnePieceDeckBuilder(db_session=db.session, seed=seed)
         deck = deck_builder.build_deck_from_collection(
             strategy=strategy,
             color=color,
@@ -126,6 +427,14 @@ def suggest_deck_improvements():
             'error': API_MESSAGES['DECK_STRUCTURE_INVALID']
         }), 400
     
+    try:
+        seed = parse_seed(data)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
     try:
         # Get user's collection if authenticated
         owned_cards = {}
@@ -133,7 +442,7 @@ def suggest_deck_improvements():
             owned_cards = CollectionService.get_collection_as_dict(current_user.id)
         
         # Generate improvement suggestions
-        deck_builder = OnePieceDeckBuilder(db_session=db.session)
+        deck_builder = OnePieceDeckBuilder(db_session=db.session, seed=seed)
         improvements = deck_builder.suggest_improvements(deck, owned_cards)
         
         return jsonify({
@@ -209,42 +518,15 @@ def convert_structure_deck_to_combat_format(deck_code):
         
         # Initialize deck builder to access card database
         deck_builder = OnePieceDeckBuilder(db_session=db.session)
-        all_cards = deck_builder.get_all_cards()
-        
-        # Create a map of card names to card objects
-        card_map = {card['name']: card for card in all_cards}
+        combat_deck = build_combat_deck(deck_code, deck_builder.get_all_cards())
         
-        # Find the leader card
-        leader_name = structure_deck['leader']
-        leader_card = card_map.get(leader_name)
-        
-        if not leader_card:
+        if not combat_deck:
+            leader_name = structure_deck['leader']
             return jsonify({
                 'success': False,
                 'error': f'Leader card "{leader_name}" not found in database'
             }), 404
         
-        # Build the main deck from card list
-        main_deck = []
-        for card_name, quantity in structure_deck['cards'].items():
-            # Skip the leader (it's already set)
-            if card_name == leader_name:
-                continue
-            
-            card = card_map.get(card_name)
-            if card:
-                # Add the card 'quantity' times to the deck
-                for _ in range(quantity):
-                    main_deck.append(card)
-        
-        # Create the deck in combat format
-        combat_deck = {
-            'leader': leader_card,
-            'main_deck': main_deck,
-            'strategy': 'balanced',  # Default strategy for structure decks
-            'color': structure_deck['color']
-        }
-        
         return jsonify({
             'success': True,
             'deck': combat_deck
@@ -274,63 +556,456 @@ def get_opponent_decks():
         }), 500
 
 
-@game_bp.route('/simulate-combat', methods=['POST'])
-def simulate_combat():
-    """Simulate combat between player's deck and an opponent deck"""
-    data = request.json
+def _parse_combat_request(data):
+    """
+    Validate a /simulate-combat request body
+    
+    Returns:
+        Tuple of (params, None) on success or (None, error response) on failure
+    """
     player_deck = data.get('player_deck')
     opponent_deck_id = data.get('opponent_deck_id')
-    num_simulations = data.get('num_simulations', 1000)
     
     if not player_deck:
-        return jsonify({
+        return None, (jsonify({
             'success': False,
             'error': API_MESSAGES['PLAYER_DECK_REQUIRED']
-        }), 400
+        }), 400)
     
     if not opponent_deck_id:
-        return jsonify({
+        return None, (jsonify({
             'success': False,
             'error': API_MESSAGES['OPPONENT_DECK_REQUIRED']
+        }), 400)
+    
+    try:
+        seed = parse_seed(data)
+        num_simulations = parse_num_simulations(
+            data, current_app.config.get('SIMULATION_MAX_GAMES', 100000))
+        ci_half_width, confidence = parse_early_stopping(
+            data, current_app.config.get('SIMULATION_CI_HALF_WIDTH'))
+    except ValueError as e:
+        return None, (jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400)
+    
+    replay_every = data.get('replay_every', current_app.config.get('SIMULATION_REPLAY_EVERY'))
+    if replay_every is not None and (not isinstance(replay_every, int) or isinstance(replay_every, bool)
+                                     or replay_every < 0):
+        return None, (jsonify({
+            'success': False,
+            'error': API_MESSAGES['INVALID_REPLAY_EVERY']
+        }), 400)
+    
+    try:
+        policies = _parse_policies(data)
+    except (TypeError, ValueError):
+        return None, (jsonify({
+            'success': False,
+            'error': API_MESSAGES['INVALID_POLICY']
+        }), 400)
+    
+    opponent_decks_info = combat_simulator.get_available_opponent_decks()
+    if not any(d['id'] == opponent_deck_id for d in opponent_decks_info):
+        return None, (jsonify({
+            'success': False,
+            'error': API_MESSAGES['INVALID_OPPONENT_DECK']
+        }), 400)
+    
+    return {
+        'player_deck': player_deck,
+        'opponent_deck_id': opponent_deck_id,
+        'num_simulations': num_simulations,
+        'seed': seed,
+        'ci_half_width': ci_half_width,
+        'confidence': confidence,
+        'profile': bool(data.get('profile') or current_app.config.get('SIMULATION_PROFILE')),
+        'replay_every': replay_every or None,
+        'policies': policies
+    }, None
+
+
+@game_bp.route('/simulate-combat', methods=['POST'])
+def simulate_combat():
+    """Simulate combat between player's deck and an opponent deck"""
+    data = request.json
+    params, error = _parse_combat_request(data)
+    if error:
+        return error
+    
+    if data.get('async'):
+        # Queue the simulation and let the client poll for progress
+        job_id = get_simulation_jobs().submit(params)
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': STATUS_QUEUED,
+            'status_url': f'/api/simulation-jobs/{job_id}',
+            'result_url': f'/api/simulation-jobs/{job_id}/result'
+        }), 202
+    
+    try:
+        results = _run_combat_simulation(params)
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+    except Exception as e:
+        logger.error(f"Error simulating combat: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['COMBAT_SIMULATION_FAILED']
         }), 400
+
+
+@game_bp.route('/simulate-combat/stream', methods=['POST'])
+def simulate_combat_stream():
+    """
+    Simulate combat, streaming progress as Server-Sent Events
+    
+    Sends a 'progress' event with the running win rate, interval and turn
+    averages after every shard and a final 'result' event. Closing the
+    connection cancels the remaining shards.
+    """
+    data = request.json
+    params, error = _parse_combat_request(data)
+    if error:
+        return error
+    
+    chunk_size = current_app.config.get('SIMULATION_STREAM_CHUNK_SIZE')
+    
+    def generate():
+        events = _iter_combat_simulation(params, chunk_size=chunk_size)
+        try:
+            for event in events:
+                payload = event['progress'] if event['event'] == 'progress' else event['results']
+                yield f"event: {event['event']}\ndata: {json.dumps(payload)}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming combat simulation: {e}", exc_info=True)
+            payload = {'error': API_MESSAGES['COMBAT_SIMULATION_FAILED']}
+            yield f"event: error\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            # Runs on client disconnect too, cancelling queued shards
+            events.close()
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@game_bp.route('/simulation-jobs/<job_id>', methods=['GET'])
+def get_simulation_job(job_id):
+    """Get the status and partial results of an asynchronous simulation"""
+    job = get_simulation_jobs().get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['SIMULATION_JOB_NOT_FOUND']
+        }), 404
+    
+    response = {
+        'success': True,
+        'job_id': job['id'],
+        'status': job['status'],
+        'progress': job['progress']
+    }
+    if job['status'] == STATUS_FAILED:
+        response['error'] = API_MESSAGES['COMBAT_SIMULATION_FAILED']
+    return jsonify(response)
+
+
+@game_bp.route('/simulation-jobs/<job_id>/result', methods=['GET'])
+def get_simulation_job_result(job_id):
+    """Get the final results of an asynchronous simulation"""
+    job = get_simulation_jobs().get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['SIMULATION_JOB_NOT_FOUND']
+        }), 404
+    
+    if job['status'] == STATUS_FAILED:
+        return jsonify({
+            'success': False,
+            'status': job['status'],
+            'error': API_MESSAGES['COMBAT_SIMULATION_FAILED']
+        }), 500
+    
+    if job['status'] != STATUS_DONE:
+        # Not finished yet - report progress so far
+        return jsonify({
+            'success': True,
+            'status': job['status'],
+            'progress': job['progress']
+        }), 202
+    
+    return jsonify({
+        'success': True,
+        'status': job['status'],
+        'results': job['result']
+    })
+
+
+@game_bp.route('/simulate-matchups', methods=['POST'])
+def simulate_matchups():
+    """
+    Simulate decks against several opponents in one job
+    
+    Accepts either a player_deck with a list of opponent_deck_ids (all
+    pre-built opponents when omitted), or an N x M grid of 'decks' against
+    'opponents' (decks against themselves when opponents is omitted).
+    """
+    data = request.json
     
     try:
-        # Build opponent deck based on selection
-        opponent_decks_info = combat_simulator.get_available_opponent_decks()
-        opponent_info = next((d for d in opponent_decks_info if d['id'] == opponent_deck_id), None)
-        
-        if not opponent_info:
+        seed = parse_seed(data)
+        num_simulations = parse_num_simulations(
+            data, current_app.config.get('SIMULATION_MAX_GAMES', 100000))
+        # Matrices play every pairing in full, only the confidence applies
+        _, confidence = parse_early_stopping(data)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    opponent_infos = None
+    if data.get('decks'):
+        decks = data['decks']
+        opponents = data.get('opponents') or None
+    elif data.get('player_deck'):
+        decks = [data['player_deck']]
+        opponents = None
+        available = combat_simulator.get_available_opponent_decks()
+        opponent_ids = data.get('opponent_deck_ids') or [d['id'] for d in available]
+        opponent_infos = [next((d for d in available if d['id'] == opponent_id), None)
+                          for opponent_id in opponent_ids]
+        if not all(opponent_infos):
             return jsonify({
                 'success': False,
                 'error': API_MESSAGES['INVALID_OPPONENT_DECK']
             }), 400
+    else:
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['MATCHUP_DECKS_REQUIRED']
+        }), 400
+    
+    num_columns = len(opponent_infos if opponent_infos is not None else (opponents or decks))
+    if len(decks) * num_columns > current_app.config.get('SIMULATION_MAX_PAIRINGS', 100):
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['TOO_MANY_PAIRINGS']
+        }), 400
+    
+    if len(decks) * num_columns * num_simulations > \
+            current_app.config.get('SIMULATION_MAX_TOTAL_GAMES', 1000000):
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['TOO_MANY_GAMES']
+        }), 400
+    
+    try:
+        if opponent_infos is not None:
+            cache = get_simulation_cache()
+            opponents = [_get_opponent_deck(info, cache, seed) for info in opponent_infos]
         
-        # Build the actual opponent deck
-        deck_builder = OnePieceDeckBuilder(db_session=db.session)
-        opponent_deck = deck_builder.build_deck(
-            strategy=opponent_info['strategy'],
-            color=opponent_info['color']
-        )
-        
-        # Run simulation
-        results = combat_simulator.simulate_combat(
-            player_deck,
-            opponent_deck,
-            num_simulations=num_simulations
+        results = combat_simulator.simulate_matchup_matrix(
+            decks,
+            opponents,
+            num_simulations=num_simulations,
+            workers=current_app.config.get('SIMULATION_WORKERS', 1),
+            chunk_size=current_app.config.get('SIMULATION_CHUNK_SIZE'),
+            seed=seed,
+            confidence=confidence
         )
         
-        # Add opponent info to results
-        results['opponent_name'] = opponent_info['name']
-        results['opponent_description'] = opponent_info['description']
-        results['opponent_tournament_win_rate'] = opponent_info['win_rate']
+        results['rows'] = [_deck_label(deck) for deck in decks]
+        if opponent_infos is not None:
+            results['columns'] = [{
+                'id': info['id'],
+                'name': info['name'],
+                'description': info['description'],
+                'tournament_win_rate': info['win_rate']
+            } for info in opponent_infos]
+        else:
+            results['columns'] = [_deck_label(deck) for deck in (opponents or decks)]
         
         return jsonify({
             'success': True,
             'results': results
         })
     except Exception as e:
-        logger.error(f"Error simulating combat: {e}", exc_info=True)
+        logger.error(f"Error simulating matchups: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['COMBAT_SIMULATION_FAILED']
+        }), 400
+
+
+def _deck_label(deck):
+    """Short label for a deck in a matchup matrix"""
+    leader = deck.get('leader') or {}
+    return {
+        'name': deck.get('name') or leader.get('name', 'Unknown'),
+        'strategy': deck.get('strategy', 'balanced')
+    }
+
+
+def _parse_tournament_request(data):
+    """
+    Validate a /simulate-tournament request body and assemble the deck pool
+    
+    The pool is the structure decks (unless include_structure_decks is
+    false), the signed-in user's saved decks (unless include_saved_decks is
+    false) and any 'decks' sent with the request.
+    
+    Returns:
+        Tuple of (params, None) on success or (None, error response) on failure
+    """
+    data = data or {}
+    tournament_format = data.get('format', 'swiss')
+    rounds = data.get('rounds')
+    games_per_match = data.get('games_per_match',
+                               current_app.config.get('SIMULATION_TOURNAMENT_GAMES', 100))
+    max_rounds = current_app.config.get('SIMULATION_TOURNAMENT_MAX_ROUNDS', 20)
+    if tournament_format not in TOURNAMENT_FORMATS or (
+            rounds is not None and (not isinstance(rounds, int) or isinstance(rounds, bool)
+                                    or not 1 <= rounds <= max_rounds)) or \
+            not isinstance(games_per_match, int) or isinstance(games_per_match, bool) or \
+            not 1 <= games_per_match <= current_app.config.get('SIMULATION_MAX_GAMES', 100000):
+        return None, (jsonify({
+            'success': False,
+            'error': API_MESSAGES['INVALID_TOURNAMENT']
+        }), 400)
+    
+    try:
+        seed = parse_seed(data)
+    except ValueError as e:
+        return None, (jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400)
+    
+    decks = []
+    if data.get('include_structure_decks', True):
+        deck_builder = OnePieceDeckBuilder(db_session=db.session)
+        decks.extend(structure_deck_pool(deck_builder.get_all_cards()))
+    if data.get('include_saved_decks', True) and current_user.is_authenticated:
+        decks.extend(deck for deck in DeckService.get_user_decks(current_user.id)
+                     if deck.get('leader') and deck.get('main_deck'))
+    decks.extend(data.get('decks') or [])
+    
+    if not 2 <= len(decks) <= current_app.config.get('SIMULATION_TOURNAMENT_MAX_DECKS', 128):
+        return None, (jsonify({
+            'success': False,
+            'error': API_MESSAGES['TOURNAMENT_DECK_COUNT']
+        }), 400)
+    
+    # Every round pairs all decks but a possible bye
+    matches = tournament_rounds(len(decks), tournament_format, rounds) * (len(decks) // 2)
+    if matches * games_per_match > current_app.config.get('SIMULATION_MAX_TOTAL_GAMES', 1000000):
+        return None, (jsonify({
+            'success': False,
+            'error': API_MESSAGES['TOO_MANY_GAMES']
+        }), 400)
+    
+    return {
+        'decks': decks,
+        'format': tournament_format,
+        'rounds': rounds,
+        'games_per_match': games_per_match,
+        'seed': seed
+    }, None
+
+
+def _iter_tournament(params):
+    """Run a validated tournament request, yielding round and result events"""
+    runner = TournamentRunner(
+        combat_simulator,
+        games_per_match=params['games_per_match'],
+        workers=current_app.config.get('SIMULATION_WORKERS', 1),
+        chunk_size=current_app.config.get('SIMULATION_CHUNK_SIZE'),
+        cache=get_simulation_cache()
+    )
+    for event in runner.iter_run(params['decks'], params['format'],
+                                 rounds=params['rounds'], seed=params['seed']):
+        if event['event'] == 'result':
+            event['results']['deck_labels'] = [_deck_label(deck) for deck in params['decks']]
+        yield event
+
+
+@game_bp.route('/simulate-tournament', methods=['POST'])
+def simulate_tournament():
+    """
+    Simulate a Swiss or round-robin tournament over a pool of decks
+    
+    Returns the final standings; use /simulate-tournament/stream to get the
+    standings after every round.
+    """
+    params, error = _parse_tournament_request(request.json)
+    if error:
+        return error
+    
+    try:
+        results = None
+        for event in _iter_tournament(params):
+            if event['event'] == 'result':
+                results = event['results']
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+    except Exception as e:
+        logger.error(f"Error simulating tournament: {e}", exc_info=True)
         return jsonify({
             'success': False,
             'error': API_MESSAGES['COMBAT_SIMULATION_FAILED']
         }), 400
+
+
+@game_bp.route('/simulate-tournament/stream', methods=['POST'])
+def simulate_tournament_stream():
+    """
+    Simulate a tournament, streaming standings as Server-Sent Events
+    
+    Sends a 'round' event with the matches and standings after every round
+    and a final 'result' event. Closing the connection stops the tournament.
+    """
+    params, error = _parse_tournament_request(request.json)
+    if error:
+        return error
+    
+    def generate():
+        events = _iter_tournament(params)
+        try:
+            for event in events:
+                payload = event['round'] if event['event'] == 'round' else event['results']
+                yield f"event: {event['event']}\ndata: {json.dumps(payload)}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming tournament: {e}", exc_info=True)
+            payload = {'error': API_MESSAGES['COMBAT_SIMULATION_FAILED']}
+            yield f"event: error\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            events.close()
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@game_bp.route('/simulation-cache/stats', methods=['GET'])
+def get_simulation_cache_stats():
+    """Get hit/miss counters and size of the combat simulation cache"""
+    cache = get_simulation_cache()
+    if cache is None:
+        return jsonify({'success': True, 'enabled': False})
+    
+    return jsonify({
+        'success': True,
+        'enabled': True,
+        'stats': cache.stats()
+    })
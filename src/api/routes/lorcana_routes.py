@@ -2,7 +2,7 @@
 Lorcana-specific API routes
 Handles deck building, analysis, and Lorcana-specific operations
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_login import current_user
 import logging
 import sys
@@ -11,14 +11,19 @@ import os
 # Add parent directory to path to import lorcana_deck_builder
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 from lorcana_deck_builder import LorcanaDeckBuilder
+from lorcana_simulator import LorcanaSimulator
 
 from ...services import CollectionService
 from ...models import db
 from ...core.constants import API_MESSAGES
+from ..utils import parse_early_stopping, parse_num_simulations, parse_seed
+from .game_routes import get_simulation_cache
 
 lorcana_bp = Blueprint('lorcana', __name__)
 logger = logging.getLogger(__name__)
 
+lorcana_simulator = LorcanaSimulator()
+
 
 @lorcana_bp.route('/cards', methods=['GET'])
 def get_lorcana_cards():
@@ -42,7 +47,15 @@ def build_lorcana_deck():
         }), 400
     
     try:
-        deck_builder = LorcanaDeckBuilder(db_session=db.session)
+        seed = parse_seed(data)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    try:
+        deck_builder = LorcanaDeckBuilder(db_session=db.session, seed=seed)
         deck = deck_builder.build_deck(strategy=strategy, colors=colors)
         return jsonify({
             'success': True,
@@ -105,12 +118,20 @@ def suggest_lorcana_deck_from_collection():
             'error': 'Lorcana decks require exactly 2 ink colors'
         }), 400
     
+    try:
+        seed = parse_seed(data)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
     # Get user's collection
     owned_cards = CollectionService.get_collection_as_dict(current_user.id)
     
     try:
         # Build deck with collection awareness
-        deck_builder = LorcanaDeckBuilder(db_session=db.session)
+        deck_builder = LorcanaDeckBuilder(db_session=db.session, seed=seed)
         deck = deck_builder.build_deck_from_collection(
             strategy=strategy,
             colors=colors,
@@ -155,6 +176,14 @@ def suggest_lorcana_deck_improvements():
             'error': 'Invalid deck structure'
         }), 400
     
+    try:
+        seed = parse_seed(data)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
     try:
         # Get user's collection if authenticated
         owned_cards = {}
@@ -162,7 +191,7 @@ def suggest_lorcana_deck_improvements():
             owned_cards = CollectionService.get_collection_as_dict(current_user.id)
         
         # Generate improvement suggestions
-        deck_builder = LorcanaDeckBuilder(db_session=db.session)
+        deck_builder = LorcanaDeckBuilder(db_session=db.session, seed=seed)
         improvements = deck_builder.suggest_improvements(deck, owned_cards)
         
         return jsonify({
@@ -175,3 +204,81 @@ def suggest_lorcana_deck_improvements():
             'success': False,
             'error': 'Failed to suggest improvements'
         }), 400
+
+
+@lorcana_bp.route('/simulate-combat', methods=['POST'])
+def simulate_lorcana_combat():
+    """
+    Simulate games between the player's Lorcana deck and an opponent
+    
+    The opponent is either a full deck ('opponent_deck') or one built from
+    'opponent_strategy' and 'opponent_colors' with the request seed.
+    """
+    data = request.json or {}
+    player_deck = data.get('player_deck')
+    opponent_deck = data.get('opponent_deck')
+    
+    if not player_deck:
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['PLAYER_DECK_REQUIRED']
+        }), 400
+    
+    for deck in (player_deck, opponent_deck):
+        if deck is not None and (not isinstance(deck, dict)
+                                 or not isinstance(deck.get('main_deck'), list)):
+            return jsonify({
+                'success': False,
+                'error': API_MESSAGES['LORCANA_DECK_INVALID']
+            }), 400
+    
+    try:
+        seed = parse_seed(data)
+        num_simulations = parse_num_simulations(
+            data, current_app.config.get('SIMULATION_MAX_GAMES', 100000))
+        ci_half_width, confidence = parse_early_stopping(
+            data, current_app.config.get('SIMULATION_CI_HALF_WIDTH'))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    try:
+        if opponent_deck is None:
+            deck_builder = LorcanaDeckBuilder(db_session=db.session, seed=seed)
+            opponent_deck = deck_builder.build_deck(
+                strategy=data.get('opponent_strategy', 'balanced'),
+                colors=data.get('opponent_colors')
+            )
+    except ValueError as e:
+        logger.error(f"Validation error building Lorcana opponent: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'error': 'Lorcana decks require exactly 2 different ink colors'
+        }), 400
+    
+    try:
+        results = lorcana_simulator.simulate_combat(
+            player_deck,
+            opponent_deck,
+            num_simulations=num_simulations,
+            workers=current_app.config.get('SIMULATION_WORKERS', 1),
+            chunk_size=current_app.config.get('SIMULATION_CHUNK_SIZE'),
+            seed=seed,
+            ci_half_width=ci_half_width,
+            confidence=confidence,
+            cache=get_simulation_cache()
+        )
+        results['opponent_strategy'] = opponent_deck.get('strategy', 'balanced')
+        results['opponent_colors'] = opponent_deck.get('colors', [])
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+    except Exception as e:
+        logger.error(f"Error simulating Lorcana combat: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'error': API_MESSAGES['COMBAT_SIMULATION_FAILED']
+        }), 400
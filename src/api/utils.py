@@ -3,11 +3,13 @@ API utilities
 Common decorators and helpers for API routes
 """
 from functools import wraps
+from typing import Dict, Optional, Tuple
+import math
 from flask import jsonify
 from flask_login import current_user
 import logging
 
-from ..core.constants import API_MESSAGES, is_safe_error_message
+from ..core.constants import API_MESSAGES, DEFAULT_SIMULATIONS, is_safe_error_message
 
 logger = logging.getLogger(__name__)
 
@@ -51,3 +53,88 @@ def safe_error_response(error: str, default_message: str, status_code: int = 500
             'success': False,
             'error': default_message
         }), status_code
+
+
+def parse_seed(data: Optional[Dict]) -> Optional[int]:
+    """
+    Read the optional 'seed' field of a request body
+    
+    Args:
+        data: Parsed JSON request body
+        
+    Returns:
+        The seed as an integer, or None when no seed was sent
+        
+    Raises:
+        ValueError: If the seed is not a non-negative integer
+    """
+    seed = (data or {}).get('seed')
+    if seed is None or seed == '':
+        return None
+    if isinstance(seed, bool):
+        raise ValueError(API_MESSAGES['INVALID_SEED'])
+    try:
+        seed = int(seed)
+    except (TypeError, ValueError):
+        raise ValueError(API_MESSAGES['INVALID_SEED'])
+    if seed < 0:
+        raise ValueError(API_MESSAGES['INVALID_SEED'])
+    return seed
+
+
+def parse_num_simulations(data: Optional[Dict], max_simulations: int) -> int:
+    """
+    Read the optional 'num_simulations' field of a request body
+    
+    Args:
+        data: Parsed JSON request body
+        max_simulations: Largest number of games a request may ask for
+        
+    Returns:
+        The number of games, DEFAULT_SIMULATIONS when none was sent
+        
+    Raises:
+        ValueError: If the value is not an integer from 1 to max_simulations
+    """
+    num_simulations = (data or {}).get('num_simulations', DEFAULT_SIMULATIONS)
+    if not isinstance(num_simulations, int) or isinstance(num_simulations, bool) or \
+            not 1 <= num_simulations <= max_simulations:
+        raise ValueError(API_MESSAGES['INVALID_NUM_SIMULATIONS'])
+    return num_simulations
+
+
+def parse_early_stopping(data: Optional[Dict],
+                         default_ci_half_width: Optional[float] = None) -> Tuple[Optional[float], float]:
+    """
+    Read the optional 'ci_half_width' and 'confidence' fields of a request body
+    
+    Args:
+        data: Parsed JSON request body
+        default_ci_half_width: Half-width used when none (or 0) was sent
+        
+    Returns:
+        Tuple of (ci_half_width or None to run every game, confidence)
+        
+    Raises:
+        ValueError: If ci_half_width is negative or confidence not between 0 and 1
+    """
+    data = data or {}
+    values = []
+    for field, default in (('ci_half_width', 0), ('confidence', 0.95)):
+        value = data.get(field)
+        if value is None:
+            value = default
+        if isinstance(value, bool):
+            raise ValueError(API_MESSAGES['INVALID_EARLY_STOPPING'])
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(API_MESSAGES['INVALID_EARLY_STOPPING'])
+        if not math.isfinite(value):
+            raise ValueError(API_MESSAGES['INVALID_EARLY_STOPPING'])
+        values.append(value)
+    
+    ci_half_width, confidence = values
+    if ci_half_width < 0 or not 0 < confidence < 1:
+        raise ValueError(API_MESSAGES['INVALID_EARLY_STOPPING'])
+    return ci_half_width or default_ci_half_width or None, confidence
@@ -24,10 +24,58 @@ class Config:
     # Game constants
     DECK_SIZE = 50
     MAX_CARD_COPIES = 4
-    MAX_DECK_BUILD_ATTEMPTS = 1000
-    MAX_IMPROVEMENT_ATTEMPTS = 200
     MAX_COMBAT_TURNS = 30
     
+    # Batch deck generation (/api/build-decks): maximum decks per request and worker
+    # processes, 1 builds every deck in the request's process
+    BUILD_DECKS_MAX = int(os.environ.get('BUILD_DECKS_MAX', '200'))
+    BUILD_DECKS_WORKERS = int(os.environ.get('BUILD_DECKS_WORKERS', '1'))
+    
+    # Combat simulation execution
+    SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', '1'))
+    # Largest num_simulations a request may ask for, and most games over all the
+    # pairings or matches of one matchup matrix or tournament request
+    SIMULATION_MAX_GAMES = int(os.environ.get('SIMULATION_MAX_GAMES', '100000'))
+    SIMULATION_MAX_TOTAL_GAMES = int(os.environ.get('SIMULATION_MAX_TOTAL_GAMES', '1000000'))
+    # Games per shard, 0 uses the simulator default
+    SIMULATION_CHUNK_SIZE = int(os.environ.get('SIMULATION_CHUNK_SIZE', '0')) or None
+    # Default win rate interval half-width (percentage points) for early stopping, 0 disables it
+    SIMULATION_CI_HALF_WIDTH = float(os.environ.get('SIMULATION_CI_HALF_WIDTH', '0'))
+    # Games per progress event on /api/simulate-combat/stream
+    SIMULATION_STREAM_CHUNK_SIZE = int(os.environ.get('SIMULATION_STREAM_CHUNK_SIZE', '100'))
+    # Collect per-phase timings for every /simulate-combat request (also enabled per request with "profile": true)
+    SIMULATION_PROFILE = os.environ.get('SIMULATION_PROFILE', 'false').lower() == 'true'
+    # Record one game in this many as a replay in /simulate-combat results, 0 disables replays
+    SIMULATION_REPLAY_EVERY = int(os.environ.get('SIMULATION_REPLAY_EVERY', '0'))
+    # Monte Carlo policy budget per decision ("policies": {"player": "mcts"}): rollouts and
+    # an optional time limit in milliseconds (0 for none); requests may ask for up to the maximum
+    SIMULATION_MCTS_ROLLOUTS = int(os.environ.get('SIMULATION_MCTS_ROLLOUTS', '32'))
+    SIMULATION_MCTS_TIME_MS = float(os.environ.get('SIMULATION_MCTS_TIME_MS', '0'))
+    SIMULATION_MCTS_MAX_ROLLOUTS = int(os.environ.get('SIMULATION_MCTS_MAX_ROLLOUTS', '256'))
+    # Maximum number of deck pairings in one matchup matrix request
+    SIMULATION_MAX_PAIRINGS = int(os.environ.get('SIMULATION_MAX_PAIRINGS', '100'))
+    # Simulated games per matchup, maximum deck pool size and maximum requested rounds
+    # for /simulate-tournament (games_per_match is also capped by SIMULATION_MAX_GAMES)
+    SIMULATION_TOURNAMENT_GAMES = int(os.environ.get('SIMULATION_TOURNAMENT_GAMES', '100'))
+    SIMULATION_TOURNAMENT_MAX_DECKS = int(os.environ.get('SIMULATION_TOURNAMENT_MAX_DECKS', '128'))
+    SIMULATION_TOURNAMENT_MAX_ROUNDS = int(os.environ.get('SIMULATION_TOURNAMENT_MAX_ROUNDS', '20'))
+
+    # Combat simulation result cache ('memory', 'sqlite' or 'none')
+    SIMULATION_CACHE_BACKEND = os.environ.get('SIMULATION_CACHE_BACKEND', 'memory')
+    # SQLite file shared by all workers (sqlite backend only), relative to the instance folder
+    SIMULATION_CACHE_PATH = os.environ.get('SIMULATION_CACHE_PATH', 'simulation_cache.sqlite3')
+    SIMULATION_CACHE_MAX_ENTRIES = int(os.environ.get('SIMULATION_CACHE_MAX_ENTRIES', '1024'))
+    # Seconds before a cached result expires, 0 keeps results until evicted
+    SIMULATION_CACHE_TTL = int(os.environ.get('SIMULATION_CACHE_TTL', '3600'))
+
+    # Asynchronous simulation jobs: SQLite queue relative to the instance folder,
+    # worker threads per process, seconds to keep finished jobs and seconds without
+    # a heartbeat before a running job is failed (0 never fails running jobs)
+    SIMULATION_JOB_PATH = os.environ.get('SIMULATION_JOB_PATH', 'simulation_jobs.sqlite3')
+    SIMULATION_JOB_WORKERS = int(os.environ.get('SIMULATION_JOB_WORKERS', '1'))
+    SIMULATION_JOB_TTL = int(os.environ.get('SIMULATION_JOB_TTL', '86400'))
+    SIMULATION_JOB_STALE_AFTER = int(os.environ.get('SIMULATION_JOB_STALE_AFTER', '600'))
+    
     # Pagination
     DEFAULT_PAGE_SIZE = 30
     MAX_PAGE_SIZE = 100
@@ -53,6 +101,7 @@ class TestConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    SIMULATION_CACHE_BACKEND = 'memory'
 
 
 def get_config():
@@ -79,10 +79,25 @@ API_MESSAGES = {
     'DECK_REQUIRED': 'Deck is required',
     'DECK_STRUCTURE_INVALID': 'Deck must include leader and main_deck',
     'BUILD_DECK_FAILED': 'Failed to build deck. Please try again.',
+    'INVALID_BUILD_DECKS': 'Invalid deck batch: count must be a positive integer up to the batch limit and specs a list of objects with strategy, color and leader strings',
     'ANALYZE_DECK_FAILED': 'Failed to analyze deck. Please try again.',
+    'DRAW_PROBABILITIES_FAILED': 'Failed to calculate draw probabilities. Please try again.',
     'SUGGEST_DECK_FAILED': 'Failed to suggest deck. Please try again.',
     'IMPROVEMENTS_FAILED': 'Failed to generate improvement suggestions. Please try again.',
     'COMBAT_SIMULATION_FAILED': 'Failed to simulate combat. Please try again.',
+    'LORCANA_DECK_INVALID': 'Lorcana decks must include a main_deck list',
+    'INVALID_SEED': 'Invalid seed: must be a non-negative integer',
+    'INVALID_NUM_SIMULATIONS': 'Invalid num_simulations: must be a positive integer up to the simulation limit',
+    'INVALID_EARLY_STOPPING': 'Invalid early stopping: ci_half_width must be a non-negative number and confidence between 0 and 1',
+    'INVALID_REPLAY_EVERY': 'Invalid replay_every: must be a non-negative integer',
+    'INVALID_POLICY': "Invalid policies: use 'greedy' or 'mcts' within the allowed rollout budget",
+    'MATCHUP_DECKS_REQUIRED': 'A player deck or a list of decks is required',
+    'TOO_MANY_PAIRINGS': 'Too many pairings requested for one matchup matrix',
+    'TOO_MANY_GAMES': 'Too many games requested: lower num_simulations or the number of decks',
+    'SIMULATION_JOB_NOT_FOUND': 'Simulation job not found',
+    'INVALID_TOURNAMENT': "Invalid tournament: format must be 'swiss' or 'round_robin', rounds and games_per_match positive integers within the server limits",
+    'TOURNAMENT_DECK_COUNT': 'Too few or too many decks for a tournament',
+    'INVALID_DRAW_QUERY': 'Invalid draw query: turns must be 1 to 20 and queries objects of cost, min_cost, max_cost, type, name, color and at_least filters',
 }
 
 # Safe validation error prefixes (these are user-facing validation errors, safe to expose)
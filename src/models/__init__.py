@@ -1,4 +1,4 @@
 """Database models"""
-from .models import db, User, Deck, UserCollection, CardSet, Card
+from .models import db, User, Deck, UserCollection, CardSet, Card, CardRevision
 
-__all__ = ['db', 'User', 'Deck', 'UserCollection', 'CardSet', 'Card']
+__all__ = ['db', 'User', 'Deck', 'UserCollection', 'CardSet', 'Card', 'CardRevision']
@@ -178,3 +178,38 @@ class Card(db.Model):
     
     def __repr__(self):
         return f'<Card {self.name} ({self.card_set.code if self.card_set else "?"}-{self.card_number})>'
+
+class CardRevision(db.Model):
+    """Counter of changes made to the cards table
+    
+    Bumped in the same transaction as every card change made through
+    CardService, so every worker process sees it. Together with the card
+    count and highest id (which also catch bulk imports) it versions the
+    deck builders' cached card catalogs without reading the cards.
+    """
+    __tablename__ = 'card_revisions'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    revision = db.Column(db.Integer, nullable=False, default=0)
+    
+    @staticmethod
+    def bump():
+        """Count a card change in the current transaction"""
+        updated = CardRevision.query.filter_by(id=1).update(
+            {CardRevision.revision: CardRevision.revision + 1})
+        if not updated:
+            db.session.add(CardRevision(id=1, revision=1))
+    
+    @staticmethod
+    def catalog_version() -> str:
+        """Version token of the cards table for the card catalog cache"""
+        count, last_id, revision = db.session.execute(_CARD_VERSION_QUERY).one()
+        return f'cards:{count}:{last_id}:{revision or 0}'
+
+
+# One prebuilt round trip without ORM rows: it runs on every deck builder request
+_CARD_VERSION_QUERY = db.select(
+    db.select(db.func.count(Card.id)).scalar_subquery(),
+    db.select(db.func.max(Card.id)).scalar_subquery(),
+    db.select(CardRevision.revision).where(CardRevision.id == 1).scalar_subquery()
+)
@@ -5,7 +5,8 @@ Handles card database operations
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
-from ..models import db, Card, CardSet
+from card_catalog import invalidate_card_catalogs
+from ..models import db, Card, CardRevision, CardSet
 
 
 class CardService:
@@ -97,7 +98,9 @@ class CardService:
             card.set_colors(colors)
             
             db.session.add(card)
+            CardRevision.bump()
             db.session.commit()
+            invalidate_card_catalogs()
             
             return True, card, None
         except Exception as e:
@@ -143,7 +146,9 @@ class CardService:
                 if card_set:
                     card.set_id = card_set.id
             
+            CardRevision.bump()
             db.session.commit()
+            invalidate_card_catalogs()
             return True, None
         except Exception as e:
             db.session.rollback()
@@ -159,7 +164,9 @@ class CardService:
         """
         try:
             db.session.delete(card)
+            CardRevision.bump()
             db.session.commit()
+            invalidate_card_catalogs()
             return True, None
         except Exception as e:
             db.session.rollback()
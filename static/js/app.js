@@ -903,12 +903,23 @@ async function loadOpponentDecks() {
     }
 }
 
+// Aborts the running simulation stream, if any
+let simulationAbortController = null;
+
 async function selectOpponentDeck(opponentDeckId) {
     const listDiv = document.getElementById('opponent-decks-list');
-    listDiv.innerHTML = '<div class="loading">Running simulation... This may take a moment.</div>';
+    listDiv.innerHTML = `
+        <div class="simulation-progress">
+            <div class="loading">Running simulation...</div>
+            <div id="simulation-progress-stats" class="simulation-progress-stats"></div>
+            <button class="btn btn-secondary btn-small" onclick="cancelSimulation()">Cancel</button>
+        </div>
+    `;
+    
+    simulationAbortController = new AbortController();
     
     try {
-        const response = await fetch('/api/simulate-combat', {
+        const response = await fetch('/api/simulate-combat/stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -916,25 +927,94 @@ async function selectOpponentDeck(opponentDeckId) {
             body: JSON.stringify({
                 player_deck: currentDeck,
                 opponent_deck_id: opponentDeckId,
-                num_simulations: 1000
-            })
+                num_simulations: 1000,
+                ci_half_width: 2.5
+            }),
+            signal: simulationAbortController.signal
         });
         
-        const data = await response.json();
+        if (!response.ok) {
+            const data = await response.json();
+            showErrorMessage(data.error || 'Failed to run simulation');
+            await loadOpponentDecks();
+            return;
+        }
         
-        if (data.success) {
-            displaySimulationResults(data.results);
+        // Read Server-Sent Events as they arrive
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let results = null;
+        
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const message = parseServerSentEvent(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+                
+                if (message.event === 'progress') {
+                    displaySimulationProgress(message.data);
+                } else if (message.event === 'result') {
+                    results = message.data;
+                } else if (message.event === 'error') {
+                    throw new Error(message.data.error);
+                }
+            }
+        }
+        
+        if (results) {
+            displaySimulationResults(results);
         } else {
-            showErrorMessage(data.error || 'Failed to run simulation');
+            showErrorMessage('Failed to run simulation');
             await loadOpponentDecks();
         }
     } catch (error) {
-        showErrorMessage('Failed to run simulation. Please try again.');
-        console.error('Error running simulation:', error);
+        if (error.name === 'AbortError') {
+            showSuccessMessage('Simulation cancelled');
+        } else {
+            showErrorMessage('Failed to run simulation. Please try again.');
+            console.error('Error running simulation:', error);
+        }
         await loadOpponentDecks();
+    } finally {
+        simulationAbortController = null;
     }
 }
 
+function cancelSimulation() {
+    if (simulationAbortController) {
+        simulationAbortController.abort();
+    }
+}
+
+function parseServerSentEvent(block) {
+    const message = { event: 'message', data: '' };
+    block.split('\n').forEach(line => {
+        if (line.startsWith('event:')) {
+            message.event = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+            message.data += line.slice(5).trim();
+        }
+    });
+    message.data = message.data ? JSON.parse(message.data) : null;
+    return message;
+}
+
+function displaySimulationProgress(progress) {
+    const progressDiv = document.getElementById('simulation-progress-stats');
+    if (!progressDiv) return;
+    
+    progressDiv.innerHTML = `
+        <div class="winrate-value">${progress.win_rate}%</div>
+        <div class="winrate-interval">${Math.round(progress.confidence_interval.confidence * 100)}% CI: ${progress.confidence_interval.low}% – ${progress.confidence_interval.high}%</div>
+        <p>${progress.simulations_run.toLocaleString()} / ${progress.simulations_requested.toLocaleString()} games · Avg win turns: ${progress.avg_win_turns} · Avg loss turns: ${progress.avg_loss_turns}</p>
+    `;
+}
+
 function displaySimulationResults(results) {
     // Hide opponent selection and show results
     document.getElementById('opponent-selection').style.display = 'none';
@@ -971,6 +1051,7 @@ function displaySimulationResults(results) {
         <div class="simulation-winrate winrate-${winRateClass}">
             <div class="winrate-label">Predicted Win Rate</div>
             <div class="winrate-value">${results.win_rate}%</div>
+            <div class="winrate-interval">${Math.round(results.confidence_interval.confidence * 100)}% CI: ${results.confidence_interval.low}% – ${results.confidence_interval.high}%</div>
             <div class="winrate-bar">
                 <div class="winrate-fill" style="width: ${results.win_rate}%"></div>
             </div>
@@ -684,3 +684,49 @@ def get_structure_deck_cards(deck_code):
     """
     deck = get_structure_deck(deck_code)
     return deck['cards'] if deck else None
+
+
+def build_combat_deck(deck_code, cards):
+    """
+    Convert a structure deck into the combat format (leader and main_deck)
+    
+    Args:
+        deck_code: The deck code (e.g., 'ST-01', 'ST-15')
+        cards: Available card dictionaries to look card names up in
+    
+    Returns:
+        Dictionary with leader, main_deck, strategy and color, or None if the
+        deck or its leader card is not found. Cards missing from the card
+        list are left out of the main deck.
+    """
+    structure_deck = get_structure_deck(deck_code)
+    if not structure_deck:
+        return None
+    
+    # Create a map of card names to card objects
+    card_map = {card['name']: card for card in cards}
+    
+    # Find the leader card
+    leader_name = structure_deck['leader']
+    leader_card = card_map.get(leader_name)
+    if not leader_card:
+        return None
+    
+    # Build the main deck from card list
+    main_deck = []
+    for card_name, quantity in structure_deck['cards'].items():
+        # Skip the leader (it's already set)
+        if card_name == leader_name:
+            continue
+        
+        card = card_map.get(card_name)
+        if card:
+            # Add the card 'quantity' times to the deck
+            main_deck.extend([card] * quantity)
+    
+    return {
+        'leader': leader_card,
+        'main_deck': main_deck,
+        'strategy': 'balanced',  # Default strategy for structure decks
+        'color': structure_deck['color']
+    }
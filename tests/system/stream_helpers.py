@@ -0,0 +1,13 @@
+"""
+Helpers for the streaming endpoint integration tests
+"""
+import json
+
+
+def parse_events(body):
+    """Split a text/event-stream body into (event, data) pairs"""
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
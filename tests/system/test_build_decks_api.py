@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Integration test for the batch deck generation endpoint
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import json
+from app import app
+from src.models import db, Card
+
+
+def test_build_decks_api():
+    """Test the /api/build-decks endpoint"""
+    print("=" * 60)
+    print("Batch Deck Generation API - Integration Test")
+    print("=" * 60)
+
+    with app.app_context():
+        db.create_all()
+        if Card.query.count() == 0:
+            from init_cards_db import init_card_sets, init_cards
+            init_cards(init_card_sets())
+
+    with app.test_client() as client:
+        app.config['TESTING'] = True
+
+        body = {'count': 6, 'seed': 11,
+                'specs': [{'strategy': 'aggressive', 'color': 'Red'}, {'strategy': 'control'}]}
+        response = client.post('/api/build-decks', data=json.dumps(body),
+                               content_type='application/json')
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [line['index'] for line in lines] == list(range(6))
+        assert [line['deck']['strategy'] for line in lines[:2]] == ['aggressive', 'control']
+        assert all(line['deck']['leader'] and line['deck']['main_deck'] for line in lines)
+        print(f"  ✓ Streamed {len(lines)} decks as NDJSON")
+
+        again = client.post('/api/build-decks', data=json.dumps(body),
+                            content_type='application/json')
+        assert again.get_data(as_text=True) == response.get_data(as_text=True)
+        print("  ✓ Seeded batches are reproducible")
+
+        for bad in ({}, {'count': 0}, {'count': 10 ** 6}, {'count': True},
+                    {'count': 2, 'specs': 'aggressive'}, {'count': 2, 'specs': [{'rarity': 'SR'}]},
+                    {'count': 2, 'specs': [{'strategy': 3}]}, {'count': 2, 'seed': -1}):
+            response = client.post('/api/build-decks', data=json.dumps(bad),
+                                   content_type='application/json')
+            assert response.status_code == 400, bad
+        print("  ✓ Invalid requests are rejected")
+
+
+if __name__ == '__main__':
+    test_build_decks_api()
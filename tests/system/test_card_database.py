@@ -10,8 +10,11 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
 
 from app import app
-from src.models import db, Card, CardSet
+from src.models import db, Card, CardRevision, CardSet
 from deck_builder import OnePieceDeckBuilder
+import card_catalog
+from card_catalog import catalog_version, get_card_catalog
+from src.services import CardService
 import json
 
 def test_card_database():
@@ -227,6 +230,54 @@ def test_card_database():
             db.session.rollback()
             print(f"✓ Unique constraint enforced - duplicate card rejected")
         
+        # Test 9: Card changes refresh the deck builder catalog
+        print("\n" + "-" * 60)
+        print("Test 9: Catalog Invalidation")
+        print("-" * 60)
+        
+        old_builder = OnePieceDeckBuilder(db_session=db.session)
+        old_catalog = old_builder.get_catalog()
+        assert old_catalog.leader('Test Blue Leader') is None
+        
+        def no_hashing(cards):
+            raise AssertionError("Cards serialized for a catalog lookup")
+        card_catalog.catalog_version = no_hashing
+        try:
+            assert OnePieceDeckBuilder(db_session=db.session).get_catalog() is old_catalog
+        finally:
+            card_catalog.catalog_version = catalog_version
+        print("✓ Repeated lookups find the catalog by version token")
+        
+        success, blue_leader, error = CardService.create_card(
+            name='Test Blue Leader', card_type='Leader', colors=['Blue'], cost=0,
+            set_code='TEST01', card_number='050', power=5000, life=5
+        )
+        assert success, error
+        assert get_card_catalog(old_builder.get_all_cards()) is not old_catalog, \
+            "Cached catalogs not dropped after a card was created"
+        catalog = OnePieceDeckBuilder(db_session=db.session).get_catalog()
+        stats = {s.leader['name']: s for s in catalog.leader_stats(13)}
+        assert stats['Test Blue Leader'].pool_size == 1  # The Red/Blue character
+        assert not stats['Test Blue Leader'].viable and stats['Test Leader'].viable
+        print(f"✓ New leader has a pool of {stats['Test Blue Leader'].pool_size} card(s)")
+        
+        version = CardRevision.catalog_version()
+        success, error = CardService.update_card(blue_leader, colors=['Red'])
+        assert success, error
+        # Other processes keep their caches, so the version must change with the edit
+        assert CardRevision.catalog_version() != version
+        catalog = OnePieceDeckBuilder(db_session=db.session).get_catalog()
+        stats = {s.leader['name']: s for s in catalog.leader_stats(13)}
+        assert stats['Test Blue Leader'].pool_size == stats['Test Leader'].pool_size
+        assert catalog.leader_choices(13, 'red').viable == catalog.leaders
+        print("✓ Updated leader colors refresh its pool statistics")
+        
+        success, error = CardService.delete_card(blue_leader)
+        assert success, error
+        catalog = OnePieceDeckBuilder(db_session=db.session).get_catalog()
+        assert catalog.leader('Test Blue Leader') is None
+        print("✓ Deleted leader leaves the catalog")
+        
         # Final Statistics
         print("\n" + "=" * 60)
         print("Test Summary")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Integration test for the draw probability endpoint
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import json
+from app import app
+from deck_builder import OnePieceDeckBuilder
+
+
+def test_draw_probability_api():
+    """Test the /api/draw-probabilities endpoint"""
+    print("=" * 60)
+    print("Draw Probability API - Integration Test")
+    print("=" * 60)
+
+    with app.test_client() as client:
+        app.config['TESTING'] = True
+
+        deck = OnePieceDeckBuilder(seed=5).build_deck(strategy='aggressive', color='Red')
+        response = client.post('/api/draw-probabilities',
+                               data=json.dumps({
+                                   'deck': deck['main_deck'],
+                                   'turns': 3,
+                                   'queries': [{'type': 'Character', 'cost': 2}]
+                               }),
+                               content_type='application/json')
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        probabilities = response.get_json()['probabilities']
+        assert probabilities['deck_size'] == 50
+        query = probabilities['queries'][0]
+        assert len(query['probabilities']['going_first']) == 3
+        print(f"  ✓ 2-cost character by turn 2 going first: "
+              f"{query['probabilities']['going_first'][1]:.1%} ({query['copies']} copies)")
+
+        # A full deck is accepted too
+        response = client.post('/api/draw-probabilities', data=json.dumps({'deck': deck}),
+                               content_type='application/json')
+        assert response.status_code == 200
+        assert response.get_json()['probabilities']['turns'] == 5
+        print("  ✓ Full decks use their main deck")
+
+        for body in ({}, {'deck': deck['main_deck'], 'turns': 50},
+                     {'deck': deck['main_deck'], 'queries': [{'rarity': 'SR'}]}):
+            response = client.post('/api/draw-probabilities', data=json.dumps(body),
+                                   content_type='application/json')
+            assert response.status_code == 400
+        print("  ✓ Invalid requests are rejected")
+
+
+if __name__ == '__main__':
+    test_draw_probability_api()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Integration test for the Lorcana combat simulation endpoint
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import json
+from app import app
+from src.models import db
+from lorcana_deck_builder import LorcanaDeckBuilder
+
+
+def test_lorcana_simulation_api():
+    """Test the /api/lorcana/simulate-combat endpoint"""
+    print("=" * 60)
+    print("Lorcana Combat Simulation API - Integration Test")
+    print("=" * 60)
+
+    with app.app_context():
+        db.create_all()
+
+    with app.test_client() as client:
+        app.config['TESTING'] = True
+
+        builder = LorcanaDeckBuilder(seed=3)
+        player = builder.build_deck(strategy='aggressive', colors=['Ruby', 'Steel'])
+        opponent = builder.build_deck(strategy='control', colors=['Sapphire', 'Amethyst'])
+
+        response = client.post('/api/lorcana/simulate-combat',
+                               data=json.dumps({'player_deck': player, 'opponent_deck': opponent,
+                                                'num_simulations': 200, 'seed': 5}),
+                               content_type='application/json')
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        results = response.get_json()['results']
+        assert results['simulations_run'] == 200 and results['game'] == 'Disney Lorcana'
+        assert results['opponent_strategy'] == 'control'
+        print(f"  ✓ Aggressive vs control: {results['win_rate']}% win rate")
+
+        response = client.post('/api/lorcana/simulate-combat',
+                               data=json.dumps({'player_deck': player, 'opponent_strategy': 'balanced',
+                                                'opponent_colors': ['Amber', 'Emerald'],
+                                                'num_simulations': 100, 'seed': 5}),
+                               content_type='application/json')
+        assert response.status_code == 200
+        results = response.get_json()['results']
+        assert results['opponent_colors'] == ['Amber', 'Emerald']
+        print("  ✓ Opponent built from strategy and colors")
+
+        for body in ({}, {'player_deck': {'cards': []}},
+                     {'player_deck': player, 'opponent_colors': ['Amber']},
+                     {'player_deck': player, 'seed': -1},
+                     {'player_deck': player, 'num_simulations': 0},
+                     {'player_deck': player, 'num_simulations': '200'},
+                     {'player_deck': player, 'num_simulations': 10 ** 9},
+                     {'player_deck': player, 'confidence': 1.5}):
+            response = client.post('/api/lorcana/simulate-combat', data=json.dumps(body),
+                                   content_type='application/json')
+            assert response.status_code == 400
+        print("  ✓ Invalid requests are rejected")
+
+
+if __name__ == '__main__':
+    test_lorcana_simulation_api()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Integration test for the streaming combat simulation endpoint
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import json
+from app import app
+from src.models import db, Card
+from deck_builder import OnePieceDeckBuilder
+from tests.system.stream_helpers import parse_events
+
+
+def test_simulation_stream_api():
+    """Test the /api/simulate-combat/stream endpoint"""
+    print("=" * 60)
+    print("Combat Simulation Stream API - Integration Test")
+    print("=" * 60)
+
+    with app.app_context():
+        # Opponent decks are built from the card database
+        db.create_all()
+        if Card.query.count() == 0:
+            from init_cards_db import init_card_sets, init_cards
+            init_cards(init_card_sets())
+
+    with app.test_client() as client:
+        app.config['TESTING'] = True
+        app.config['SIMULATION_STREAM_CHUNK_SIZE'] = 100
+
+        player_deck = OnePieceDeckBuilder(seed=3).build_deck(strategy='aggressive', color='Red')
+        response = client.post('/api/simulate-combat/stream',
+                               data=json.dumps({
+                                   'player_deck': player_deck,
+                                   'opponent_deck_id': 'opp_2',
+                                   'num_simulations': 350,
+                                   'seed': 11
+                               }),
+                               content_type='application/json')
+
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert response.mimetype == 'text/event-stream'
+        events = parse_events(response.get_data(as_text=True))
+
+        progress = [data for event, data in events if event == 'progress']
+        assert [p['simulations_run'] for p in progress] == [100, 200, 300, 350]
+        print(f"  ✓ {len(progress)} progress events with running win rates")
+
+        event, results = events[-1]
+        assert event == 'result'
+        assert results['simulations_run'] == 350
+        assert results['wins'] == progress[-1]['wins']
+        assert results['opponent_name'] == 'Blue Control Master'
+        print(f"  ✓ Final result: {results['win_rate']}% vs {results['opponent_name']}")
+
+        response = client.post('/api/simulate-combat/stream',
+                               data=json.dumps({'player_deck': player_deck}),
+                               content_type='application/json')
+        assert response.status_code == 400
+        for num_simulations in (0, -5, '1000', 2.5, True, 10 ** 9):
+            body = {'player_deck': player_deck, 'opponent_deck_id': 'opp_2',
+                    'num_simulations': num_simulations, 'async': True}
+            response = client.post('/api/simulate-combat', data=json.dumps(body),
+                                   content_type='application/json')
+            assert response.status_code == 400, num_simulations
+        for early_stopping in ({'ci_half_width': -1}, {'ci_half_width': 'wide'},
+                               {'confidence': 0}, {'confidence': 1}, {'confidence': 1.5},
+                               {'confidence': '95%'}, {'confidence': True}):
+            body = dict(player_deck=player_deck, opponent_deck_id='opp_2', **early_stopping)
+            response = client.post('/api/simulate-combat', data=json.dumps(body),
+                                   content_type='application/json')
+            assert response.status_code == 400, early_stopping
+        print("  ✓ Invalid requests are rejected before streaming")
+
+        # Budgets sent as strings are converted before they reach the policy
+        body = {'player_deck': player_deck, 'opponent_deck_id': 'opp_2', 'num_simulations': 2,
+                'seed': 4, 'policies': {'player': 'mcts'}, 'mcts_rollouts': '4', 'mcts_time_ms': '5'}
+        response = client.post('/api/simulate-combat', data=json.dumps(body),
+                               content_type='application/json')
+        assert response.status_code == 200 and response.get_json()['results']['simulations_run'] == 2
+        for budget in ({'mcts_rollouts': 2.5}, {'mcts_rollouts': 'many'}, {'mcts_time_ms': -1},
+                       {'mcts_time_ms': 'soon'}):
+            response = client.post('/api/simulate-combat', data=json.dumps(dict(body, **budget)),
+                                   content_type='application/json')
+            assert response.status_code == 400, budget
+        print("  ✓ MCTS budgets are converted and checked")
+
+        app.config['SIMULATION_MAX_TOTAL_GAMES'] = 1000
+        for matchup in ({'num_simulations': '100'}, {'num_simulations': 2.5},
+                        {'num_simulations': 10 ** 9}, {'confidence': 'high'},
+                        {'num_simulations': 600, 'opponent_deck_ids': ['opp_1', 'opp_2']}):
+            body = dict({'player_deck': player_deck, 'opponent_deck_ids': ['opp_2']}, **matchup)
+            response = client.post('/api/simulate-matchups', data=json.dumps(body),
+                                   content_type='application/json')
+            assert response.status_code == 400, matchup
+        response = client.post('/api/simulate-matchups',
+                               data=json.dumps({'player_deck': player_deck, 'opponent_deck_ids': ['opp_2'],
+                                                'num_simulations': 100, 'seed': 3}),
+                               content_type='application/json')
+        assert response.status_code == 200
+        app.config['SIMULATION_MAX_TOTAL_GAMES'] = 1000000
+        print("  ✓ Matchup matrices check num_simulations, confidence and total games")
+
+
+if __name__ == '__main__':
+    test_simulation_stream_api()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Integration test for the tournament simulation endpoints
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import json
+from app import app
+from src.models import db, Card
+from deck_builder import OnePieceDeckBuilder
+from tests.system.stream_helpers import parse_events
+
+
+def test_tournament_api():
+    """Test the /api/simulate-tournament and /api/simulate-tournament/stream endpoints"""
+    print("=" * 60)
+    print("Tournament Simulation API - Integration Test")
+    print("=" * 60)
+
+    with app.app_context():
+        # Structure decks are built from the card database
+        db.create_all()
+        if Card.query.count() == 0:
+            from init_cards_db import init_card_sets, init_cards
+            init_cards(init_card_sets())
+
+    with app.test_client() as client:
+        app.config['TESTING'] = True
+
+        builder = OnePieceDeckBuilder(seed=8)
+        decks = [builder.build_deck(strategy=strategy, color=color)
+                 for strategy, color in (('aggressive', 'Red'), ('balanced', 'Green'),
+                                         ('control', 'Blue'), ('aggressive', 'Yellow'))]
+        response = client.post('/api/simulate-tournament/stream',
+                               data=json.dumps({
+                                   'decks': decks,
+                                   'include_structure_decks': False,
+                                   'format': 'round_robin',
+                                   'games_per_match': 20,
+                                   'seed': 4
+                               }),
+                               content_type='application/json')
+
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert response.mimetype == 'text/event-stream'
+        events = parse_events(response.get_data(as_text=True))
+
+        rounds = [data for event, data in events if event == 'round']
+        assert [r['number'] for r in rounds] == [1, 2, 3]
+        assert all(len(r['standings']) == 4 for r in rounds)
+        print(f"  ✓ {len(rounds)} round events with standings")
+
+        event, results = events[-1]
+        assert event == 'result'
+        assert results['standings'] == rounds[-1]['standings']
+        assert len(results['deck_labels']) == 4
+        print(f"  ✓ Winner: {results['standings'][0]['name']}")
+
+        response = client.post('/api/simulate-tournament',
+                               data=json.dumps({'decks': decks, 'games_per_match': 20, 'seed': 4}),
+                               content_type='application/json')
+        assert response.status_code == 200
+        results = response.get_json()['results']
+        assert results['format'] == 'swiss'
+        assert results['decks'] == len(results['deck_labels']) > 4
+        print(f"  ✓ Swiss over {results['decks']} decks including the structure decks")
+
+        response = client.post('/api/simulate-tournament',
+                               data=json.dumps({'decks': decks, 'format': 'knockout'}),
+                               content_type='application/json')
+        assert response.status_code == 400
+        response = client.post('/api/simulate-tournament',
+                               data=json.dumps({'decks': decks[:1], 'include_structure_decks': False}),
+                               content_type='application/json')
+        assert response.status_code == 400
+        # A 4-deck round robin plays 6 matches: 6 x 200 games is over a 1000 game cap
+        app.config['SIMULATION_MAX_TOTAL_GAMES'] = 1000
+        for limits in ({'rounds': 21}, {'games_per_match': 10 ** 6},
+                       {'format': 'round_robin', 'games_per_match': 200}):
+            body = dict({'decks': decks, 'include_structure_decks': False}, **limits)
+            response = client.post('/api/simulate-tournament', data=json.dumps(body),
+                                   content_type='application/json')
+            assert response.status_code == 400, limits
+        app.config['SIMULATION_MAX_TOTAL_GAMES'] = 1000000
+        print("  ✓ Invalid requests are rejected")
+
+
+if __name__ == '__main__':
+    test_tournament_api()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Test script for batch deck generation
+Checks spec cycling, seeded reproducibility with and without workers and
+that a batch reuses one catalog
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from card_catalog import clear_catalogs
+from deck_builder import OnePieceDeckBuilder
+from simulation_runner import iter_tasks
+
+
+def _square(x):
+    return x * x
+
+
+_offset = 0
+
+
+def _set_offset(offset):
+    global _offset
+    _offset = offset
+
+
+def _add_offset(x):
+    return x + _offset
+
+
+def test_build_decks():
+    """Test that batches follow the specs and are reproducible"""
+    print("=" * 60)
+    print("Test: Batch Deck Generation")
+    print("=" * 60)
+
+    specs = [{'strategy': 'aggressive', 'color': 'Red'},
+             {'strategy': 'control', 'color': 'Blue'},
+             {'leader': 'Nami'}]
+    builder = OnePieceDeckBuilder()
+    decks = builder.build_decks(10, specs, seed=7, chunk_size=3)
+    assert len(decks) == 10
+    assert [d['strategy'] for d in decks[:4]] == ['aggressive', 'control', 'balanced', 'aggressive']
+    assert all('Red' in d['leader']['colors'] for d in decks[::3])
+    assert all(d['leader']['name'] == 'Nami' for d in decks[2::3])
+    assert all(len(d['main_deck']) == 50 for d in decks)
+    print(f"✓ {len(decks)} decks cycle through {len(specs)} specs")
+
+    assert builder.build_decks(10, specs, seed=7, chunk_size=4) == decks
+    assert builder.build_decks(10, specs, seed=7, workers=2, chunk_size=3) == decks
+    assert builder.build_decks(10, specs, seed=8) != decks
+    print("✓ Seeded batches match for any chunk size and number of workers")
+
+    assert OnePieceDeckBuilder(seed=3).build_decks(3) == OnePieceDeckBuilder(seed=3).build_decks(3)
+    assert builder.build_decks(0) == []
+    print("✓ Seeded builders give seeded batches; empty batches are empty")
+
+
+def test_batch_reuses_catalog():
+    """Test that one catalog serves the whole batch"""
+    print("\n" + "=" * 60)
+    print("Test: Batch Catalog Reuse")
+    print("=" * 60)
+
+    clear_catalogs()
+    builder = OnePieceDeckBuilder(seed=1)
+    catalog = builder.get_catalog()
+    decks = builder.iter_build_decks(20, [{'strategy': 'balanced'}], chunk_size=5)
+    for deck in decks:
+        pool = catalog.pool_for_leader(deck['leader'])
+        assert all(card in pool.cards for card in deck['main_deck'])
+    assert OnePieceDeckBuilder().get_catalog() is catalog
+    print("✓ Every deck is drawn from the builder's catalog")
+
+    assert list(iter_tasks(_square, [(i,) for i in range(6)], workers=2)) == [0, 1, 4, 9, 16, 25]
+    print("✓ Tasks run in order on the worker pool")
+
+    for workers in (1, 2):
+        results = iter_tasks(_add_offset, [(i,) for i in range(4)], workers=workers,
+                             initializer=_set_offset, initargs=(10,))
+        assert list(results) == [10, 11, 12, 13]
+    print("✓ The initializer runs before the tasks with and without workers")
+
+
+if __name__ == '__main__':
+    test_build_decks()
+    test_batch_reuses_catalog()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""
+Test script for the vectorized batch combat simulator
+Checks that the lockstep NumPy engine is statistically equivalent to the scalar engine
+"""
+import sys
+import os
+import math
+import random
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from batch_simulator import BatchCombatSimulator
+from combat_simulator import CombatSimulator
+from compiled_deck import compile_deck
+from deck_builder import OnePieceDeckBuilder
+
+
+def test_batch_results_are_valid():
+    """Test that every batched game ends with a winner and a legal turn count"""
+    print("=" * 60)
+    print("Test: Batch Results Are Valid")
+    print("=" * 60)
+    
+    builder = OnePieceDeckBuilder()
+    deck1 = builder.build_deck(strategy='aggressive', color='Red')
+    deck2 = builder.build_deck(strategy='control', color='Blue')
+    
+    winners, turns = BatchCombatSimulator().simulate_games(deck1, deck2, 500, seed=1)
+    assert set(winners.tolist()) <= {1, 2}, "Every game should have a winner"
+    assert turns.min() >= 1 and turns.max() <= BatchCombatSimulator.MAX_TURNS
+    print(f"✓ 500 games finished, turns between {turns.min()} and {turns.max()}")
+    
+    again, _ = BatchCombatSimulator().simulate_games(deck1, deck2, 500, seed=1)
+    assert (again == winners).all(), "Same seed should reproduce the same games"
+    print("✓ Seeded batches are reproducible")
+
+
+def test_statistical_equivalence():
+    """Test that batch and scalar engines agree within sampling error"""
+    print("\n" + "=" * 60)
+    print("Test: Statistical Equivalence With Scalar Engine")
+    print("=" * 60)
+    
+    builder = OnePieceDeckBuilder(seed=3)
+    simulator = CombatSimulator()
+    num_games = 3000
+    matchups = [
+        ('aggressive', 'Red', 'control', 'Blue'),
+        ('balanced', 'Green', 'balanced', 'Green'),
+        ('control', 'Purple', 'aggressive', 'Yellow'),
+    ]
+    
+    for strategy1, color1, strategy2, color2 in matchups:
+        deck1 = compile_deck(builder.build_deck(strategy=strategy1, color=color1))
+        deck2 = compile_deck(builder.build_deck(strategy=strategy2, color=color2))
+        
+        rng = random.Random(11)
+        scalar_wins = 0
+        scalar_turns = 0
+        for _ in range(num_games):
+            winner, turns = simulator.simulate_game_with_rules(deck1, deck2, rng)
+            scalar_wins += winner == 1
+            scalar_turns += turns
+        
+        winners, turns = BatchCombatSimulator().simulate_games(deck1, deck2, num_games, seed=11)
+        batch_wins = int((winners == 1).sum())
+        
+        p1 = scalar_wins / num_games
+        p2 = batch_wins / num_games
+        pooled = (p1 + p2) / 2
+        standard_error = math.sqrt(max(pooled * (1 - pooled), 1e-4) * 2 / num_games)
+        assert abs(p1 - p2) < 4 * standard_error, \
+            f"Win rates differ: scalar {p1:.3f} vs batch {p2:.3f}"
+        
+        mean_turns1 = scalar_turns / num_games
+        mean_turns2 = float(turns.mean())
+        assert abs(mean_turns1 - mean_turns2) < 0.3, \
+            f"Game lengths differ: scalar {mean_turns1:.2f} vs batch {mean_turns2:.2f}"
+        
+        print(f"✓ {strategy1} {color1} vs {strategy2} {color2}: "
+              f"scalar {p1:.1%} / batch {p2:.1%}, turns {mean_turns1:.2f} / {mean_turns2:.2f}")
+
+
+def _with_triggers(deck):
+    """Copy of a deck with triggers and printed counters spread over its cards"""
+    triggers = ['Play this card.', 'Draw 1 card.',
+                "K.O. up to 1 of your opponent's Characters with a cost of 4 or less.", None]
+    main_deck = []
+    for index, card in enumerate(deck['main_deck']):
+        card = dict(card)
+        trigger = triggers[index % len(triggers)]
+        if trigger:
+            card['trigger'] = trigger
+        if index % 3 == 0:
+            card['counter'] = 2000
+        main_deck.append(card)
+    return dict(deck, main_deck=main_deck)
+
+
+def test_statistical_equivalence_with_triggers():
+    """Test that both engines agree on decks full of triggers and counters"""
+    print("\n" + "=" * 60)
+    print("Test: Statistical Equivalence With Triggers")
+    print("=" * 60)
+    
+    builder = OnePieceDeckBuilder(seed=8)
+    deck1 = compile_deck(_with_triggers(builder.build_deck(strategy='aggressive', color='Red')))
+    deck2 = compile_deck(_with_triggers(builder.build_deck(strategy='control', color='Green')))
+    assert any(card.trigger for card in deck1.cards) and any(card.counter == 2000 for card in deck2.cards)
+    
+    num_games = 3000
+    simulator = CombatSimulator()
+    rng = random.Random(21)
+    scalar = [simulator.simulate_game_with_rules(deck1, deck2, rng) for _ in range(num_games)]
+    p1 = sum(winner == 1 for winner, _ in scalar) / num_games
+    mean_turns1 = sum(turns for _, turns in scalar) / num_games
+    
+    winners, turns = BatchCombatSimulator().simulate_games(deck1, deck2, num_games, seed=21)
+    p2 = float((winners == 1).mean())
+    pooled = (p1 + p2) / 2
+    standard_error = math.sqrt(max(pooled * (1 - pooled), 1e-4) * 2 / num_games)
+    assert abs(p1 - p2) < 4 * standard_error, f"Win rates differ: scalar {p1:.3f} vs batch {p2:.3f}"
+    assert abs(mean_turns1 - float(turns.mean())) < 0.3
+    print(f"✓ scalar {p1:.1%} / batch {p2:.1%}, turns {mean_turns1:.2f} / {turns.mean():.2f}")
+
+
+def test_simulate_combat_batch_engine():
+    """Test that simulate_combat can run its shards on the batch engine"""
+    print("\n" + "=" * 60)
+    print("Test: simulate_combat With Batch Engine")
+    print("=" * 60)
+    
+    builder = OnePieceDeckBuilder()
+    deck1 = builder.build_deck(strategy='balanced', color='Red')
+    deck2 = builder.build_deck(strategy='balanced', color='Blue')
+    
+    results = CombatSimulator().simulate_combat(deck1, deck2, num_simulations=400,
+                                                seed=5, engine='batch')
+    assert results['wins'] + results['losses'] == 400
+    assert 0 <= results['win_rate'] <= 100
+    print(f"✓ Batch engine win rate: {results['win_rate']}%")
+
+
+if __name__ == '__main__':
+    test_batch_results_are_valid()
+    test_statistical_equivalence()
+    test_statistical_equivalence_with_triggers()
+    test_simulate_combat_batch_engine()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Test script for the DON!!, counter and trigger rules of the combat simulator
+Sets up small game states by hand and checks how single attacks resolve
+"""
+import sys
+import os
+import random
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from combat_simulator import CombatSimulator, GameState
+from compiled_deck import compile_card, compile_deck
+
+
+def _character(name, power, cost=3, **extra):
+    card = {'name': name, 'type': 'Character', 'cost': cost, 'power': power, 'effect': ''}
+    card.update(extra)
+    return card
+
+
+def _state(main_deck1, main_deck2, seed=1):
+    """Game state with both opening hands, life cards and boards cleared"""
+    leader = {'name': 'Leader', 'type': 'Leader', 'power': 5000, 'life': 5, 'effect': ''}
+    state = GameState.for_decks(compile_deck({'leader': leader, 'main_deck': main_deck1}),
+                                compile_deck({'leader': leader, 'main_deck': main_deck2}))
+    rng = random.Random(seed)
+    for player in (state.player1, state.player2):
+        player.reset(rng)
+        player.hand.clear()
+        player.hand_counter = 0
+    return state
+
+
+def _add_to_hand(player, card):
+    player.hand.append(card)
+    player.hand_counter += card.counter
+
+
+def test_don_attachment():
+    """Test that attackers attach just enough DON!! to reach the defender"""
+    print("=" * 60)
+    print("Test: DON!! Attachment")
+    print("=" * 60)
+
+    simulator = CombatSimulator()
+    state = _state([_character('Filler', 4000)] * 20, [_character('Filler', 4000)] * 20)
+    attacker = compile_card(_character('Small', 3000))
+
+    state.player1.don = 3
+    simulator._resolve_attack(state, True, attacker, None)
+    assert state.player1.don == 1 and state.player2.life == 4
+    print("✓ A 3000 power attacker attaches 2 DON!! to hit a 5000 power leader")
+
+    simulator._resolve_attack(state, True, attacker, None)
+    assert state.player1.don == 1 and state.player2.life == 4
+    print("✓ Without enough DON!! the attack falls short and nothing is attached")
+
+    defender = compile_card(_character('Defender', 4000))
+    state.player2.board.append(defender)
+    state.player1.board.append(attacker)
+    state.player1.don = 1
+    simulator._resolve_attack(state, True, attacker, defender)
+    assert not state.player1.board and not state.player2.board and state.player1.don == 0
+    print("✓ Matching a character's power trades both characters")
+
+    state.player1.don = 2
+    state.player2.hand.clear()  # The earlier hit added a life card with a counter
+    state.player2.hand_counter = 0
+    life = state.player2.life
+    simulator._resolve_attack(state, True, None, None)
+    assert state.player2.life == life - 1 and state.player1.don == 2
+    print("✓ The leader hits the opposing leader at equal power without DON!!")
+
+
+def test_counters():
+    """Test that counters from hand stop leader hits with as few cards as possible"""
+    print("\n" + "=" * 60)
+    print("Test: Counters")
+    print("=" * 60)
+
+    simulator = CombatSimulator()
+    state = _state([_character('Filler', 4000)] * 20, [_character('Filler', 4000)] * 20)
+    defender = state.player2
+    small = compile_card(_character('Small Counter', 3000, counter=1000))
+    large = compile_card(_character('Large Counter', 2000, counter=2000))
+    none = compile_card(_character('No Counter', 7000))
+    for card in (small, none, large):
+        _add_to_hand(defender, card)
+    assert defender.hand_counter == 3000
+
+    attacker = compile_card(_character('Big', 6000))
+    simulator._resolve_attack(state, True, attacker, None)
+    assert defender.life == 5
+    assert defender.hand == [small, none] and defender.hand_counter == 1000
+    print("✓ The 2000 counter alone keeps the leader ahead of a 6000 power attack")
+
+    big = compile_card(_character('Huge', 7000))
+    simulator._resolve_attack(state, True, big, None)
+    assert defender.life == 4 and defender.hand[:2] == [small, none]
+    print("✓ Counters are kept when they cannot stop the hit")
+
+
+def test_life_cards_and_triggers():
+    """Test that damage takes life cards into hand or activates their triggers"""
+    print("\n" + "=" * 60)
+    print("Test: Life Cards and Triggers")
+    print("=" * 60)
+
+    simulator = CombatSimulator()
+    plain = _character('Plain', 4000)
+    state = _state([_character('Filler', 4000)] * 20, [plain] * 20)
+    defender = state.player2
+    top = defender.life_cards[-1]
+    simulator._deal_damage_to_opponent(state, True, 1)
+    assert defender.life == 4 and defender.hand == [top] and defender.hand_counter == top.counter
+    print("✓ A life card without a trigger goes to hand")
+
+    play = _character('Trigger Play', 6000, trigger='Play this card.')
+    state = _state([_character('Filler', 4000)] * 20, [play] * 20)
+    simulator._deal_damage_to_opponent(state, True, 2)
+    assert state.player2.life == 3 and len(state.player2.board) == 2 and not state.player2.hand
+    print("✓ Play triggers put the character onto the board")
+
+    ko = _character('Trigger KO', 4000, effect="[Trigger] K.O. up to 1 of your opponent's "
+                                                "Characters with a cost of 3 or less.")
+    state = _state([_character('Filler', 4000)] * 20, [ko] * 20)
+    cheap = compile_card(_character('Cheap', 5000, cost=2))
+    expensive = compile_card(_character('Expensive', 8000, cost=6))
+    state.player1.board.extend([expensive, cheap])
+    simulator._deal_damage_to_opponent(state, True, 1)
+    assert state.player1.board == [expensive] and not state.player2.hand
+    print("✓ KO triggers remove the attacker's first character within the cost limit")
+
+    draw = _character('Trigger Draw', 4000, trigger='Draw 1 card.')
+    state = _state([_character('Filler', 4000)] * 20, [draw] * 20)
+    cursor = state.player2.cursor
+    simulator._deal_damage_to_opponent(state, True, 1)
+    assert state.player2.cursor == cursor + 1 and len(state.player2.hand) == 1
+    print("✓ Draw triggers draw a card and trash the life card")
+
+
+if __name__ == '__main__':
+    test_don_attachment()
+    test_counters()
+    test_life_cards_and_triggers()
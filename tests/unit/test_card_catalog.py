@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Test script for the indexed card catalog
+Checks the indexes against scans of the card list and that the builder
+reuses one catalog per card list version
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import card_catalog
+from card_catalog import CardCatalog, catalog_version, clear_catalogs, get_card_catalog
+from cards_data import ONEPIECE_CARDS
+from deck_builder import OnePieceDeckBuilder
+
+
+def test_catalog_indexes():
+    """Test that every index matches a scan of the full card list"""
+    print("=" * 60)
+    print("Test: Card Catalog Indexes")
+    print("=" * 60)
+
+    catalog = CardCatalog.from_cards(ONEPIECE_CARDS)
+    assert catalog.leaders == tuple(c for c in ONEPIECE_CARDS if c['type'] == 'Leader')
+    for card_type, cards in catalog.by_type.items():
+        assert cards == tuple(c for c in ONEPIECE_CARDS if c['type'] == card_type)
+    for cost, cards in catalog.by_cost.items():
+        assert cards == tuple(c for c in ONEPIECE_CARDS if c.get('cost') == cost)
+    assert catalog.by_color['red'] == tuple(c for c in ONEPIECE_CARDS if 'Red' in c['colors'])
+    assert all(frozenset(c['colors']) == colors
+               for colors, cards in catalog.by_color_set.items() for c in cards)
+    print(f"✓ {len(catalog.cards)} cards: {len(catalog.by_type)} types, "
+          f"{len(catalog.by_color)} colors, {len(catalog.by_cost)} costs")
+
+    leader = catalog.leaders[0]
+    assert catalog.leader(leader['name'].upper()) is leader
+    assert catalog.leader('No Such Leader') is None
+    assert all('red' in [c.lower() for c in l['colors']] for l in catalog.leaders_with_color('RED'))
+    print("✓ Case-insensitive leader lookups by name and color")
+
+    for leader in catalog.leaders:
+        pool = catalog.pool_for_leader(leader)
+        expected = tuple(c for c in ONEPIECE_CARDS if c['type'] != 'Leader' and
+                         any(lc in c['colors'] for lc in leader['colors']))
+        assert pool.cards == expected
+        assert pool is catalog.pool_for_colors(reversed(leader['colors']))
+        assert pool.of_type('Character', max_cost=5) == tuple(
+            c for c in expected if c['type'] == 'Character' and c['cost'] <= 5)
+        assert pool.of_type('Character', max_cost=5) is pool.of_type('Character', max_cost=5)
+    print("✓ Leader pools and cost bands match scans, in card order")
+
+    try:
+        catalog.by_type['Leader'] = ()
+        assert False, "Indexes should be read-only"
+    except TypeError:
+        pass
+    print("✓ Indexes are read-only")
+
+
+def test_leader_pool_stats():
+    """Test the memoized leader pool statistics used to pick leaders"""
+    print("\n" + "=" * 60)
+    print("Test: Leader Pool Statistics")
+    print("=" * 60)
+
+    catalog = CardCatalog.from_cards(ONEPIECE_CARDS)
+    stats = catalog.leader_stats(13)
+    assert stats is catalog.leader_stats(13)
+    for leader_stats in stats:
+        pool = catalog.pool_for_leader(leader_stats.leader)
+        assert leader_stats.pool_size == len(pool.cards)
+        assert sum(leader_stats.type_counts.values()) == leader_stats.pool_size
+        assert sum(leader_stats.cost_histogram.values()) == leader_stats.pool_size
+        assert leader_stats.viable == (leader_stats.pool_size >= 13)
+    print(f"✓ {len(stats)} leaders, {sum(s.viable for s in stats)} with pools for a full deck")
+
+    choices = catalog.leader_choices(13, 'Red')
+    assert choices is catalog.leader_choices(13, 'red')
+    assert choices.viable == tuple(l for l in catalog.leaders_with_color('red')
+                                   if len(catalog.pool_for_leader(l).cards) >= 13)
+    strict = catalog.leader_choices(10 ** 6)
+    assert strict.viable == ()
+    assert strict.largest_pool is max(stats, key=lambda s: s.pool_size).leader
+    print("✓ Viable leaders per color and the largest-pool fallback")
+
+
+def test_catalog_reuse():
+    """Test that catalogs are built once per version and shared by builders"""
+    print("\n" + "=" * 60)
+    print("Test: Card Catalog Reuse")
+    print("=" * 60)
+
+    clear_catalogs()
+    first = OnePieceDeckBuilder(seed=1)
+    second = OnePieceDeckBuilder(seed=2)
+    first.build_deck(strategy='aggressive', color='Red')
+    second.build_deck(strategy='control', color='Blue')
+    assert first.get_catalog() is second.get_catalog()
+    assert first.get_catalog().version == catalog_version(ONEPIECE_CARDS)
+    print("✓ Builders over the same cards share one catalog")
+
+    def no_hashing(cards):
+        raise AssertionError("Built-in cards hashed again")
+    card_catalog.catalog_version = no_hashing
+    try:
+        assert OnePieceDeckBuilder(seed=3).get_catalog() is first.get_catalog()
+    finally:
+        card_catalog.catalog_version = catalog_version
+    print("✓ New builders find the catalog without hashing the cards")
+
+    changed = ONEPIECE_CARDS[:-1]
+    assert get_card_catalog(changed) is not first.get_catalog()
+    assert get_card_catalog(changed) is get_card_catalog(list(changed))
+    print("✓ A different card list gets its own catalog")
+
+    deck = OnePieceDeckBuilder(seed=4).build_deck(strategy='balanced', color='Purple')
+    assert deck == OnePieceDeckBuilder(seed=4).build_deck(strategy='balanced', color='Purple')
+    pool = first.get_catalog().pool_for_leader(deck['leader'])
+    assert all(card in pool.cards for card in deck['main_deck'])
+    print("✓ Seeded decks are drawn from the leader's pool")
+
+
+if __name__ == '__main__':
+    test_catalog_indexes()
+    test_leader_pool_stats()
+    test_catalog_reuse()
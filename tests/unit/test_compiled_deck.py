@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Test script for the compiled deck representation used by the combat simulator
+Verifies that card effects are parsed once into typed records
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import random
+
+from combat_simulator import CombatSimulator, GameState
+from compiled_deck import (
+    AttackBoost, DEFAULT_COUNTER, OnPlayEffect, TriggerEffect, compile_card, compile_deck
+)
+from deck_builder import OnePieceDeckBuilder
+
+
+def test_effect_parsing():
+    """Test that effect text is compiled into enums and integers"""
+    print("=" * 60)
+    print("Test: Effect Parsing")
+    print("=" * 60)
+    
+    card = compile_card({
+        'name': 'Test Blocker', 'type': 'Character', 'cost': 3, 'power': 4000,
+        'effect': '[Blocker] [On Play] KO up to 1 opponent Character with a cost of 4 or less'
+    })
+    assert card.is_character and card.blocker and not card.rush
+    assert card.on_play == OnPlayEffect.KO and card.on_play_value == 4
+    print("✓ Blocker and KO effect compiled")
+    
+    card = compile_card({
+        'name': 'Test Attacker', 'type': 'Character', 'cost': 2, 'power': 3000,
+        'effect': '[Rush] [When Attacking] This Character gains +2000 power'
+    })
+    assert card.rush and card.attack_boost == AttackBoost.PLUS_2000
+    assert card.on_play == OnPlayEffect.NONE
+    print("✓ Rush and attack boost compiled")
+    
+    card = compile_card({'name': 'Plain Event', 'type': 'Event', 'cost': 1, 'power': None})
+    assert not card.is_character and card.power == 0 and card.attack_boost == AttackBoost.NONE
+    assert card.counter == 0 and card.trigger == TriggerEffect.NONE
+    print("✓ Missing fields default to zero")
+    
+    card = compile_card({
+        'name': 'Test Trigger', 'type': 'Character', 'cost': 4, 'power': 6000, 'counter': '+2000',
+        'effect': "[Trigger] K.O. up to 1 of your opponent's Characters with a cost of 3 or less."
+    })
+    assert card.counter == 2000
+    assert card.trigger == TriggerEffect.KO and card.trigger_value == 3
+    card = compile_card({'name': 'Test Play', 'type': 'Character', 'cost': 3, 'power': 7000,
+                         'effect': '[Blocker]', 'trigger': 'Play this card.'})
+    assert card.trigger == TriggerEffect.PLAY and card.counter == 0
+    card = compile_card({'name': 'Small', 'type': 'Character', 'cost': 1, 'power': 2000})
+    assert card.counter == DEFAULT_COUNTER
+    print("✓ Counter values and triggers compiled")
+
+
+def test_compile_deck():
+    """Test that every deck slot gets its own identity-compared record"""
+    print("\n" + "=" * 60)
+    print("Test: Deck Compilation")
+    print("=" * 60)
+    
+    deck = OnePieceDeckBuilder().build_deck(strategy='balanced', color='Red')
+    compiled = compile_deck(deck)
+    
+    assert len(compiled.cards) == len(deck['main_deck'])
+    assert compiled.leader_life == deck['leader'].get('life', 5)
+    assert len({id(card) for card in compiled.cards}) == len(compiled.cards)
+    print(f"✓ Compiled {len(compiled.cards)} distinct card records")
+    
+    first = compiled.cards[0]
+    twin = next((c for c in compiled.cards[1:] if c.name == first.name), None)
+    if twin is not None:
+        assert first != twin, "Copies of the same card should not compare equal"
+        print("✓ Copies of the same card are distinguishable")
+
+
+def test_game_state_reuse():
+    """Test that one game state can be reset and replayed many times"""
+    print("\n" + "=" * 60)
+    print("Test: Reusable Game State")
+    print("=" * 60)
+    
+    builder = OnePieceDeckBuilder()
+    deck1 = compile_deck(builder.build_deck(strategy='aggressive', color='Red'))
+    deck2 = compile_deck(builder.build_deck(strategy='control', color='Blue'))
+    state = GameState.for_decks(deck1, deck2)
+    simulator = CombatSimulator()
+    rng = random.Random(99)
+    
+    for _ in range(20):
+        winner, turns = simulator._play_game(state, rng)
+        assert winner in (1, 2) and 1 <= turns <= simulator.MAX_TURNS
+    print("✓ Played 20 games on one reused state")
+    
+    player = state.player1
+    player.reset(rng)
+    library = [deck1.cards[i] for i in player.order[player.cursor:]]
+    assert len(player.life_cards) == deck1.leader_life
+    assert len(player.hand) + len(player.life_cards) + len(library) == len(deck1.cards)
+    assert not player.board and player.life == deck1.leader_life
+    assert player.hand_counter == sum(card.counter for card in player.hand)
+    assert sorted(player.order) == list(range(len(deck1.cards)))
+    print("✓ Reset restores a full library permutation, opening hand, life cards and empty board")
+    
+    top = player.life_cards[-1]
+    simulator._deal_damage_to_opponent(state, False, 1)
+    assert player.life == deck1.leader_life - 1
+    assert top in player.hand or top in player.board or top.trigger
+    print("✓ Damage takes the top life card")
+    
+    before = player.cursor
+    player.draw()
+    assert player.cursor == before + 1 and player.hand[-1] is deck1.cards[player.order[before]]
+    print("✓ Drawing advances the cursor without moving the library")
+
+
+if __name__ == '__main__':
+    test_effect_parsing()
+    test_compile_deck()
+    test_game_state_reuse()
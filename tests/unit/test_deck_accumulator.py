@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Test script for the deck accumulator
+Checks copy and type counts and that every builder produces legal decks
+through it
+"""
+import sys
+import os
+from collections import Counter
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from deck_accumulator import DeckAccumulator
+from deck_builder import OnePieceDeckBuilder
+from lorcana_deck_builder import LorcanaDeckBuilder
+
+
+def test_accumulator_counts():
+    """Test copy and type counts"""
+    print("=" * 60)
+    print("Test: Deck Accumulator Counts")
+    print("=" * 60)
+
+    luffy = {'name': 'Luffy', 'type': 'Character'}
+    luffy_alt = {'name': 'Luffy', 'type': 'Character', 'rarity': 'SEC'}
+    zoro = {'name': 'Zoro', 'type': 'Character'}
+    gum = {'name': 'Gum-Gum Pistol', 'type': 'Event'}
+
+    deck = DeckAccumulator(2, [luffy])
+    assert deck.can_add(luffy_alt) and deck.can_add(zoro)
+    deck.add(luffy_alt)
+    assert deck.copies(luffy) == 2 and not deck.can_add(luffy)
+    print("✓ Printings share the copy limit of their name")
+
+    deck.add(gum)
+    deck.add(gum)
+    assert not deck.can_add(gum) and deck.can_add(zoro) and len(deck) == 4
+    assert deck.type_counts == Counter({'Character': 2, 'Event': 2})
+    print("✓ Type counts")
+
+
+def test_builders_respect_copy_limit():
+    """Test that decks built through the accumulator stay legal"""
+    print("\n" + "=" * 60)
+    print("Test: Builders Use the Accumulator")
+    print("=" * 60)
+
+    builder = OnePieceDeckBuilder(seed=8)
+    for strategy in ('aggressive', 'control', 'balanced'):
+        deck = builder.build_deck(strategy=strategy, color='Green')
+        counts = Counter(c['name'] for c in deck['main_deck'])
+        assert len(deck['main_deck']) == 50 and max(counts.values()) <= 4
+        improvements = builder.suggest_improvements(deck)
+        for improvement in improvements.values():
+            counts = Counter(c['name'] for c in improvement['main_deck'])
+            assert max(counts.values()) <= 4
+    print("✓ One Piece decks and improvements keep at most 4 copies")
+
+    lorcana = LorcanaDeckBuilder(seed=8)
+    names = {c['name'] for c in lorcana.get_all_cards() if {'Amber', 'Steel'} & set(c['colors'])}
+    for strategy in ('aggressive', 'control', 'balanced'):
+        deck = lorcana.build_deck(strategy=strategy, colors=['Amber', 'Steel'])
+        counts = Counter(c['name'] for c in deck['main_deck'])
+        # Small pools fill every name up to the copy limit
+        assert len(deck['main_deck']) == min(60, 4 * len(names)) and max(counts.values()) <= 4
+    print("✓ Lorcana decks keep at most 4 copies")
+
+
+if __name__ == '__main__':
+    test_accumulator_counts()
+    test_builders_respect_copy_limit()
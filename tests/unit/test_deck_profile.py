@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Test script for memoized deck profiles
+Verifies the statistics, order independence and that the simulator and
+deck analysis read from the same profile
+"""
+import sys
+import os
+import random
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from combat_simulator import CombatSimulator
+from deck_builder import OnePieceDeckBuilder
+from deck_profile import clear_profiles, get_cards_profile, get_deck_profile
+from simulation_cache import deck_hash, make_cache_key
+
+
+def test_profile_statistics():
+    """Test that the profile holds the deck's histogram, counts and averages"""
+    print("=" * 60)
+    print("Test: Deck Profile Statistics")
+    print("=" * 60)
+
+    deck = OnePieceDeckBuilder(seed=12).build_deck(strategy='aggressive', color='Red')
+    main_deck = deck['main_deck']
+    profile = get_deck_profile(deck)
+
+    assert profile.deck_hash == deck_hash(deck)
+    assert profile.total_cards == len(main_deck)
+    assert sum(profile.cost_histogram.values()) == len(main_deck)
+    assert abs(profile.avg_cost - sum(c.get('cost', 0) for c in main_deck) / len(main_deck)) < 1e-12
+    characters = sum(1 for c in main_deck if c.get('type') == 'Character')
+    assert profile.character_ratio == characters / len(main_deck)
+    assert profile.type_counts.get('Character', 0) == characters
+    assert profile.primary_color == 'Red'
+    print(f"✓ {profile.total_cards} cards, avg cost {profile.avg_cost:.2f}, "
+          f"{profile.character_ratio:.0%} characters")
+
+    for kind, names in profile.key_cards.items():
+        assert len(names) == len(set(names)) <= 3
+    for name in profile.key_cards['high_power']:
+        card = next(c for c in main_deck if c['name'] == name)
+        assert card['type'] == 'Character' and card['power'] >= 7000
+    print(f"✓ Key cards: {profile.key_card_lists()}")
+
+    empty = get_deck_profile({'main_deck': [], 'strategy': 'control'}).stats()
+    assert empty == {'strategy': 'control', 'color': 'any', 'avg_cost': 4.0,
+                     'character_ratio': 0.65, 'total_cards': 0}
+    print("✓ Empty decks get the simulator's neutral defaults")
+
+
+def test_profile_is_memoized_per_canonical_deck():
+    """Test that reordered copies of a deck share one profile"""
+    print("\n" + "=" * 60)
+    print("Test: Memoized Profiles")
+    print("=" * 60)
+
+    clear_profiles()
+    deck = OnePieceDeckBuilder(seed=4).build_deck(strategy='control', color='Blue')
+    shuffled = dict(deck, main_deck=list(deck['main_deck']))
+    random.Random(1).shuffle(shuffled['main_deck'])
+
+    profile = get_deck_profile(deck)
+    assert get_deck_profile(shuffled) is profile
+    assert get_deck_profile(dict(deck, strategy='aggressive')) is not profile
+    print("✓ Card order does not matter, strategy does")
+
+    # The simulator and the cache key read the same profile and hash
+    simulator = CombatSimulator()
+    assert simulator._extract_deck_stats(shuffled) == profile.stats()
+    assert simulator._identify_key_cards(shuffled, deck) == profile.key_card_lists()
+    assert make_cache_key(profile.deck_hash, profile.deck_hash, 1, seed=1) == \
+        make_cache_key(deck, shuffled, 1, seed=1)
+    results = simulator.simulate_combat(shuffled, deck, num_simulations=20, seed=1)
+    assert results['deck1_stats'] == profile.stats()
+    assert results['key_cards'] == profile.key_card_lists()
+    print("✓ Simulator statistics, key cards and cache keys come from the profile")
+
+    analysis = OnePieceDeckBuilder().analyze_deck(deck['main_deck'])
+    cards_profile = get_cards_profile(deck['main_deck'])
+    assert analysis['curve'] == cards_profile.cost_histogram
+    assert analysis['type_distribution'] == cards_profile.type_counts
+    assert analysis['color_distribution'] == cards_profile.color_counts
+    # Results are copies, so callers cannot change the shared profile
+    analysis['curve'].clear()
+    assert cards_profile.cost_histogram
+    print("✓ analyze_deck reads the same memoized statistics")
+
+
+if __name__ == '__main__':
+    test_profile_statistics()
+    test_profile_is_memoized_per_canonical_deck()
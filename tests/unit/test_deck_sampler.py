@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Test script for weighted card sampling
+Checks exact quotas, the copy limit, weighting and that builders fill
+every deck their card pool allows without retry loops
+"""
+import sys
+import os
+import random
+from collections import Counter
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from deck_accumulator import DeckAccumulator
+from deck_builder import OnePieceDeckBuilder
+from deck_sampler import sample_cards
+
+
+def _cards(prefix, count, card_type='Character'):
+    return [{'name': f'{prefix} {i}', 'type': card_type, 'cost': i % 8} for i in range(count)]
+
+
+def test_quotas_and_copy_limit():
+    """Test that a quota is drawn exactly until the candidates run out"""
+    print("=" * 60)
+    print("Test: Sampling Quotas")
+    print("=" * 60)
+
+    rng = random.Random(1)
+    characters = _cards('Character', 10)
+    deck = DeckAccumulator(4)
+    assert sample_cards(deck, characters, 35, rng) == 35 and len(deck) == 35
+    assert max(deck.counts.values()) <= 4
+    assert sample_cards(deck, characters, 35, rng) == 5
+    assert len(deck) == 40 and set(deck.counts.values()) == {4}
+    assert sample_cards(deck, characters, 1, rng) == 0
+    print("✓ Exact quotas, then every remaining copy slot, then nothing")
+
+    printing = dict(characters[0], rarity='SEC')
+    deck = DeckAccumulator(4)
+    sample_cards(deck, [characters[0], printing], 8, rng)
+    assert len(deck) == 4
+    print("✓ Printings of one name share its copy limit")
+
+
+def test_weights():
+    """Test that draws follow the weights and skip zero-weight cards"""
+    print("\n" + "=" * 60)
+    print("Test: Sampling Weights")
+    print("=" * 60)
+
+    rng = random.Random(2)
+    heavy, light, banned = _cards('Card', 3)
+    weights = {heavy['name']: 3.0, light['name']: 1.0, banned['name']: 0.0}
+    first = Counter()
+    for _ in range(4000):
+        deck = DeckAccumulator(1)
+        sample_cards(deck, [heavy, light, banned], 2, rng, lambda c: weights[c['name']])
+        assert banned not in deck.cards and len(deck) == 2
+        first[deck.cards[0]['name']] += 1
+    share = first[heavy['name']] / 4000
+    assert 0.72 <= share <= 0.78, share
+    print(f"✓ A weight 3 card is drawn first {share:.1%} of the time against weight 1")
+
+
+def test_builders_fill_pools():
+    """Test that decks and improvements fill up to what the pool allows"""
+    print("\n" + "=" * 60)
+    print("Test: Builders Use the Sampler")
+    print("=" * 60)
+
+    # 13 names of 4 copies leave room for only two unused copies
+    tight = OnePieceDeckBuilder(seed=7)
+    tight.cards = [{'name': 'Tight Leader', 'type': 'Leader', 'colors': ['Red'], 'cost': 0}]
+    tight.cards += [{'name': f'Tight Character {cost}', 'type': 'Character', 'colors': ['Red'],
+                     'cost': cost} for cost in range(1, 10)]
+    tight.cards += [{'name': f'Tight Event {cost}', 'type': 'Event', 'colors': ['Red'], 'cost': cost}
+                    for cost in range(1, 4)]
+    tight.cards += [{'name': 'Tight Stage', 'type': 'Stage', 'colors': ['Red'], 'cost': 2}]
+    for strategy in ('aggressive', 'control', 'balanced'):
+        deck = tight.build_deck(strategy=strategy, color='Red')
+        counts = Counter(c['name'] for c in deck['main_deck'])
+        assert len(deck['main_deck']) == 50 and max(counts.values()) <= 4, (strategy, counts)
+        assert deck['leader']['name'] == 'Tight Leader'
+    print("✓ A pool with two spare copies still fills a legal 50-card deck")
+
+    builder = OnePieceDeckBuilder(seed=3)
+    for strategy in ('aggressive', 'control', 'balanced'):
+        deck = builder.build_deck(strategy=strategy, color='Red')
+        assert len(deck['main_deck']) == 50
+        pool = builder.get_catalog().pool_for_leader(deck['leader'])
+        limit = min(50, 4 * len({c['name'] for c in pool.cards}))
+        for improvement in builder.suggest_improvements(deck).values():
+            assert len(improvement['main_deck']) == limit
+    print("✓ Every deck and improvement is as full as its pool allows")
+
+    deck = builder.build_deck(strategy='aggressive', color='Red', seed=5)
+    owned = {card['name']: 4 for card in deck['main_deck'][:3]}
+    improvements = builder.suggest_improvements(deck, owned_cards=owned, seed=5)
+    assert improvements == builder.suggest_improvements(deck, owned_cards=owned, seed=5)
+    aggressive = improvements['aggressive']['main_deck']
+    characters = [c for c in aggressive if c['type'] == 'Character']
+    assert len(characters) / len(aggressive) >= 0.6
+    print("✓ Seeded, weighted improvements keep the aggressive character ratio")
+
+
+if __name__ == '__main__':
+    test_quotas_and_copy_limit()
+    test_weights()
+    test_builders_fill_pools()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Test script for the exact draw probability calculator
+Compares the hypergeometric results with brute-force enumeration and checks
+the per-turn curves of a built deck
+"""
+import sys
+import os
+from fractions import Fraction
+from itertools import combinations
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from deck_builder import OnePieceDeckBuilder
+from draw_probability import cards_seen, draw_probabilities, probability_at_least
+
+
+def test_probability_matches_enumeration():
+    """Test the hypergeometric tail against every possible hand of a small deck"""
+    print("=" * 60)
+    print("Test: Hypergeometric Probabilities")
+    print("=" * 60)
+
+    deck_size, copies = 12, 4
+    for draws in (1, 3, 5, 12):
+        hands = list(combinations(range(deck_size), draws))
+        for at_least in (1, 2, 3):
+            hits = sum(1 for hand in hands if sum(1 for card in hand if card < copies) >= at_least)
+            expected = Fraction(hits, len(hands))
+            assert abs(probability_at_least(deck_size, copies, draws, at_least) - expected) < 1e-12
+    print("✓ Matches enumeration of every hand of a 12 card deck")
+
+    assert probability_at_least(50, 0, 10) == 0.0
+    assert probability_at_least(50, 4, 60) == 1.0
+    assert probability_at_least(50, 4, 10, at_least=0) == 1.0
+    assert abs(probability_at_least(50, 4, 5) - (1 - Fraction(46 * 45 * 44 * 43 * 42, 50 * 49 * 48 * 47 * 46))) < 1e-12
+    print(f"✓ A 4-of in the opening hand: {probability_at_least(50, 4, 5):.2%}")
+
+
+def test_deck_curves():
+    """Test the curves by cost, type, card and query for a built deck"""
+    print("\n" + "=" * 60)
+    print("Test: Deck Draw Curves")
+    print("=" * 60)
+
+    assert cards_seen(1, going_first=True) == 5 and cards_seen(1, going_first=False) == 6
+    main_deck = OnePieceDeckBuilder(seed=3).build_deck(strategy='balanced', color='Green')['main_deck']
+    results = draw_probabilities(main_deck, turns=4, queries=[
+        {'type': 'Character', 'max_cost': 2},
+        {'type': 'character', 'max_cost': 2, 'at_least': 2}
+    ])
+
+    assert results['deck_size'] == len(main_deck)
+    assert results['cards_seen'] == {'going_first': [5, 6, 7, 8], 'going_second': [6, 7, 8, 9]}
+    for curves in (results['by_cost'], results['by_type'], results['by_card']):
+        for curve in curves.values():
+            for order in ('going_first', 'going_second'):
+                assert len(curve[order]) == 4
+                assert curve[order] == sorted(curve[order])
+            # Going second sees one card more on every turn
+            assert curve['going_second'][:-1] == curve['going_first'][1:]
+    assert sum(curve['going_first'][0] for curve in results['by_card'].values()) > 0
+    print(f"✓ {len(results['by_cost'])} cost, {len(results['by_type'])} type and "
+          f"{len(results['by_card'])} card curves rise turn by turn")
+
+    one, two = results['queries']
+    expected = sum(1 for card in main_deck if card['type'] == 'Character' and card['cost'] <= 2)
+    assert one['copies'] == two['copies'] == expected
+    assert all(b <= a for a, b in zip(one['probabilities']['going_first'], two['probabilities']['going_first']))
+    print(f"✓ {expected} characters costing 2 or less: "
+          f"{one['probabilities']['going_first'][1]:.1%} by turn 2 going first")
+
+    for bad in ({'turns': 0}, {'turns': 21}, {'queries': [{'rarity': 'SR'}]},
+                {'queries': [{'cost': -1}]}, {'queries': ['cost']}):
+        try:
+            draw_probabilities(main_deck, **bad)
+            assert False, bad
+        except ValueError:
+            pass
+    print("✓ Invalid turns and queries raise ValueError")
+
+
+if __name__ == '__main__':
+    test_probability_matches_enumeration()
+    test_deck_curves()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Test script for the Lorcana combat simulator
+Checks card compilation, single rules (ink, questing, challenges) and that
+simulations run on the shared core: seeded, sharded and early stopping
+"""
+import sys
+import os
+import random
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from lorcana_deck_builder import LorcanaDeckBuilder
+from lorcana_simulator import (
+    LORE_TO_WIN, InPlayCharacter, LorcanaGameState, LorcanaSimulator,
+    compile_lorcana_card, compile_lorcana_deck
+)
+from simulation_cache import MemoryLRUBackend, SimulationCache
+
+
+def _character(name, cost, strength, **extra):
+    card = {'name': name, 'type': 'Character', 'cost': cost, 'power': strength, 'effect': ''}
+    card.update(extra)
+    return card
+
+
+def test_compile_lorcana_cards():
+    """Test that card text and printed values compile into the records"""
+    print("=" * 60)
+    print("Test: Lorcana Card Compilation")
+    print("=" * 60)
+
+    simba = compile_lorcana_card(_character('Simba', 1, 1, effect='Challenger +2'))
+    assert simba.challenger == 2 and simba.willpower == 2 and simba.lore == 1 and simba.inkable
+    hook = compile_lorcana_card(_character('Hook', 4, 4, effect='Bodyguard', willpower=6, lore=1))
+    assert hook.bodyguard and hook.willpower == 6 and hook.lore == 1
+    heihei = compile_lorcana_card(_character('Heihei', 7, 2, effect='Evasive', inkable=False))
+    assert heihei.evasive and not heihei.inkable and heihei.lore == 3
+    print("✓ Keywords, printed stats and default willpower/lore")
+
+    draw = compile_lorcana_card({'name': 'Be Prepared', 'type': 'Action', 'cost': 2,
+                                 'effect': 'Draw 2 cards'})
+    damage = compile_lorcana_card({'name': 'Stampede', 'type': 'Action', 'cost': 3,
+                                   'effect': 'Deal 2 damage to chosen character'})
+    quill = compile_lorcana_card({'name': 'Quill', 'type': 'Item', 'cost': 1,
+                                  'effect': 'When you play this item, draw a card'})
+    workshop = compile_lorcana_card({'name': 'Workshop', 'type': 'Item', 'cost': 3,
+                                     'effect': 'Whenever you play a character, you may pay 1 ink to draw a card'})
+    assert (draw.draw, damage.damage, quill.draw, workshop.draw) == (2, 2, 1, 0)
+    print("✓ Action and item effects")
+
+
+def test_turn_rules():
+    """Test inking, questing to 20 lore and challenges on a hand-made state"""
+    print("\n" + "=" * 60)
+    print("Test: Lorcana Turn Rules")
+    print("=" * 60)
+
+    simulator = LorcanaSimulator()
+    filler = [_character('Filler', 9, 1)] * 20
+    deck = compile_lorcana_deck({'main_deck': filler})
+    state = LorcanaGameState.for_decks(deck, deck)
+    rng = random.Random(3)
+    state.player1.reset(rng)
+    state.player2.reset(rng)
+    state.turn_count = 1
+
+    me, opp = state.player1, state.player2
+    quester = InPlayCharacter(compile_lorcana_card(_character('Quester', 3, 1, lore=2)))
+    me.board.append(quester)
+    assert simulator._play_turn(state, True) == 0
+    assert me.ink == 1 and len(me.hand) == 6 and me.cursor == 7
+    assert me.lore == 2 and quester.exerted
+    print("✓ Inks one card a turn, the first player skips the draw and dry characters quest")
+
+    # An exerted quester is challenged when the challenger banishes it
+    challenger = InPlayCharacter(compile_lorcana_card(_character('Challenger', 3, 2, lore=1,
+                                                                  effect='Challenger +1')),
+                                 dry=True)
+    opp.board.append(challenger)
+    state.turn_count = 2
+    assert simulator._play_turn(state, False) == 0
+    assert quester not in me.board and challenger.damage == 1 and challenger.exerted
+    assert opp.lore == 0
+    print("✓ Challenges banish exerted characters worth at least as much lore")
+
+    me.lore = LORE_TO_WIN - 1
+    me.board.append(InPlayCharacter(compile_lorcana_card(_character('Closer', 2, 1)), dry=True))
+    state.turn_count = 3
+    assert simulator._play_turn(state, True) == 1
+    print(f"✓ Reaching {LORE_TO_WIN} lore wins the game")
+
+
+def test_lorcana_simulation():
+    """Test seeded, sharded and adaptive simulations between built decks"""
+    print("\n" + "=" * 60)
+    print("Test: Lorcana Simulation")
+    print("=" * 60)
+
+    builder = LorcanaDeckBuilder(seed=6)
+    aggro = builder.build_deck(strategy='aggressive', colors=['Ruby', 'Steel'])
+    control = builder.build_deck(strategy='control', colors=['Sapphire', 'Amethyst'])
+    simulator = LorcanaSimulator()
+
+    serial = simulator.simulate_combat(aggro, control, num_simulations=600, seed=9, chunk_size=100)
+    parallel = simulator.simulate_combat(aggro, control, num_simulations=600, seed=9,
+                                         chunk_size=100, workers=2)
+    assert serial['wins'] == parallel['wins'] and serial['avg_win_turns'] == parallel['avg_win_turns']
+    assert serial['simulations_run'] == 600 and serial['game'] == 'Disney Lorcana'
+    assert serial['deck1_stats']['strategy'] == 'aggressive'
+    print(f"✓ Aggressive vs control: {serial['win_rate']}% over {serial['simulations_run']} games, "
+          f"same with 2 workers")
+
+    mirror = simulator.simulate_combat(aggro, aggro, num_simulations=2000, seed=2)
+    assert 45 <= mirror['win_rate'] <= 55
+    print(f"✓ Mirror match is even ({mirror['win_rate']}%)")
+
+    adaptive = simulator.simulate_combat(aggro, control, num_simulations=5000, seed=9,
+                                         ci_half_width=5)
+    assert adaptive['stopped_early'] and adaptive['simulations_run'] < 5000
+    print(f"✓ Early stopping after {adaptive['simulations_run']} games")
+
+    cache = SimulationCache(MemoryLRUBackend(max_entries=10, ttl=None))
+    first = simulator.simulate_combat(aggro, control, num_simulations=200, seed=1, cache=cache)
+    second = simulator.simulate_combat(aggro, control, num_simulations=200, seed=1, cache=cache)
+    assert not first['cached'] and second['cached'] and second['wins'] == first['wins']
+    print("✓ Results are cached per decklist pair")
+
+
+if __name__ == '__main__':
+    test_compile_lorcana_cards()
+    test_turn_rules()
+    test_lorcana_simulation()
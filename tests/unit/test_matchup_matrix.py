@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Test script for matchup matrix simulation
+Verifies grid shape, per-pairing reproducibility and parallel scheduling
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from combat_simulator import CombatSimulator
+from deck_builder import OnePieceDeckBuilder
+from simulation_runner import derive_shard_seed
+
+
+def _build_decks():
+    builder = OnePieceDeckBuilder(seed=21)
+    return [
+        builder.build_deck(strategy='aggressive', color='Red'),
+        builder.build_deck(strategy='control', color='Blue'),
+        builder.build_deck(strategy='balanced', color='Green')
+    ]
+
+
+def test_matrix_shape():
+    """Test that one deck against several opponents gives one row of results"""
+    print("=" * 60)
+    print("Test: Matchup Matrix Shape")
+    print("=" * 60)
+
+    simulator = CombatSimulator()
+    decks = _build_decks()
+    results = simulator.simulate_matchup_matrix(decks[:1], decks, num_simulations=100, seed=3)
+
+    assert len(results['matrix']) == 1
+    assert len(results['matrix'][0]) == 3
+    for cell in results['matrix'][0]:
+        assert cell['simulations_run'] == 100
+        assert cell['confidence_interval']['low'] <= cell['win_rate'] <= cell['confidence_interval']['high']
+    print(f"✓ 1 x 3 matrix: {[cell['win_rate'] for cell in results['matrix'][0]]}")
+
+    grid = simulator.simulate_matchup_matrix(decks, num_simulations=50, seed=3)
+    assert len(grid['matrix']) == 3 and all(len(row) == 3 for row in grid['matrix'])
+    assert len(grid['row_average_win_rates']) == 3
+    print("✓ Omitting opponents gives an N x N grid")
+
+
+def test_matrix_matches_single_simulations():
+    """Test that every cell matches simulate_combat with the pairing's seed"""
+    print("\n" + "=" * 60)
+    print("Test: Matrix Cells Match Single Simulations")
+    print("=" * 60)
+
+    simulator = CombatSimulator()
+    decks = _build_decks()
+    results = simulator.simulate_matchup_matrix(decks[:2], decks, num_simulations=120,
+                                                chunk_size=50, seed=99)
+
+    for row in range(2):
+        for column in range(3):
+            single = simulator.simulate_combat(decks[row], decks[column], num_simulations=120,
+                                               chunk_size=50, seed=derive_shard_seed(99, row * 3 + column))
+            assert results['matrix'][row][column]['wins'] == single['wins']
+    print("✓ Every pairing reproduces its standalone simulation")
+
+    parallel = simulator.simulate_matchup_matrix(decks[:2], decks, num_simulations=120,
+                                                 chunk_size=50, seed=99, workers=2)
+    assert parallel['matrix'] == results['matrix']
+    print("✓ Parallel scheduling gives the same matrix")
+
+
+if __name__ == '__main__':
+    test_matrix_shape()
+    test_matrix_matches_single_simulations()
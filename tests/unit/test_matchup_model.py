@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+Test script for the vectorized matchup model
+Checks that it scores matches exactly like the scalar similarity and that
+match histories import from CSV
+"""
+import sys
+import os
+import random
+import tempfile
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import pandas as pd
+
+from combat_simulator import CombatSimulator, TOURNAMENT_DATA
+from matchup_model import MatchupModel, SIMILARITY_THRESHOLD, load_matchup_history
+
+STRATEGIES = ['aggressive', 'balanced', 'control']
+COLORS = ['Red', 'Green', 'Blue', 'Purple', 'Black', 'Yellow']
+
+
+def _random_stats(rng):
+    return {
+        'strategy': rng.choice(STRATEGIES + ['unknown']),
+        'color': rng.choice(COLORS),
+        'avg_cost': rng.uniform(2.5, 6.5),
+        'character_ratio': rng.uniform(0.5, 0.8),
+    }
+
+
+def _reference_probability(simulator, matches, deck1_stats, deck2_stats):
+    """Win probability with the scalar loop the model replaces"""
+    weighted_wins = 0
+    total_weight = 0
+    for match in matches:
+        similarity = simulator._calculate_matchup_similarity(deck1_stats, deck2_stats, match)
+        if similarity > SIMILARITY_THRESHOLD:
+            total_weight += similarity
+            if match.deck1_wins:
+                weighted_wins += similarity
+    if not total_weight:
+        return simulator._calculate_base_probability(deck1_stats, deck2_stats)
+    base = simulator._calculate_base_probability(deck1_stats, deck2_stats)
+    return max(0.1, min(0.9, weighted_wins / total_weight * 0.7 + base * 0.3))
+
+
+def test_model_matches_scalar_similarity():
+    """Test that vectorized scores and probabilities match the scalar reference"""
+    print("=" * 60)
+    print("Test: Vectorized Similarity Matches Scalar Loop")
+    print("=" * 60)
+
+    simulator = CombatSimulator()
+    model = MatchupModel.from_matches(TOURNAMENT_DATA)
+    assert len(model) == len(TOURNAMENT_DATA)
+
+    rng = random.Random(3)
+    for _ in range(200):
+        deck1_stats, deck2_stats = _random_stats(rng), _random_stats(rng)
+        scores = model.similarity(deck1_stats, deck2_stats)
+        expected = [simulator._calculate_matchup_similarity(deck1_stats, deck2_stats, match)
+                    for match in TOURNAMENT_DATA]
+        assert scores.tolist() == expected
+
+        probability = simulator._calculate_win_probability(deck1_stats, deck2_stats)
+        reference = _reference_probability(simulator, TOURNAMENT_DATA, deck1_stats, deck2_stats)
+        assert abs(probability - reference) < 1e-12
+    print("✓ 200 random matchups score identically to the scalar loop")
+
+
+def test_history_import():
+    """Test that a CSV history of thousands of matches is imported and used"""
+    print("\n" + "=" * 60)
+    print("Test: Match History Import")
+    print("=" * 60)
+
+    rng = random.Random(11)
+    rows = []
+    for _ in range(5000):
+        deck1, deck2 = _random_stats(rng), _random_stats(rng)
+        rows.append({
+            'deck1_strategy': deck1['strategy'], 'deck1_color': deck1['color'],
+            'deck1_avg_cost': deck1['avg_cost'], 'deck1_character_ratio': deck1['character_ratio'],
+            'deck2_strategy': deck2['strategy'], 'deck2_color': deck2['color'],
+            'deck2_avg_cost': deck2['avg_cost'], 'deck2_character_ratio': deck2['character_ratio'],
+            # Aggressive decks win every imported match, so the prior must move
+            'deck1_wins': deck1['strategy'] == 'aggressive',
+            'match_duration': rng.randint(5, 20),
+        })
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'history.csv')
+        pd.DataFrame(rows).to_csv(path, index=False)
+
+        imported = load_matchup_history(path)
+        assert len(imported) == 5000
+        assert imported.deck1_wins.sum() == sum(row['deck1_wins'] for row in rows)
+
+        simulator = CombatSimulator()
+        deck1_stats = {'strategy': 'aggressive', 'color': 'Red', 'avg_cost': 3.2, 'character_ratio': 0.7}
+        deck2_stats = {'strategy': 'control', 'color': 'Blue', 'avg_cost': 5.5, 'character_ratio': 0.6}
+        before = simulator._calculate_win_probability(deck1_stats, deck2_stats)
+        total = simulator.load_tournament_history(path)
+        assert total == len(TOURNAMENT_DATA) + 5000
+        after = simulator._calculate_win_probability(deck1_stats, deck2_stats)
+        assert after >= before
+        print(f"✓ Imported 5000 matches, aggressive vs control prior {before:.2%} -> {after:.2%}")
+
+        assert simulator.load_tournament_history(path, replace=True) == 5000
+
+        # Replacing tournament_data drops the import and rebuilds the model
+        simulator.tournament_data = TOURNAMENT_DATA[:4]
+        assert len(simulator.matchup_model) == 4
+        print("✓ History can replace the built-in data and is rebuilt when it changes")
+
+        bad_path = os.path.join(directory, 'history.txt')
+        open(bad_path, 'w').close()
+        try:
+            load_matchup_history(bad_path)
+            assert False, "Unsupported files should be rejected"
+        except ValueError:
+            print("✓ Unsupported file types are rejected")
+
+        pd.DataFrame(rows).drop(columns=['deck1_wins']).to_csv(path, index=False)
+        try:
+            load_matchup_history(path)
+            assert False, "Histories without results should be rejected"
+        except ValueError:
+            print("✓ Missing columns are rejected")
+
+
+if __name__ == '__main__':
+    test_model_matches_scalar_similarity()
+    test_history_import()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Test script for sharded and parallel combat simulation
+Verifies that seeded shards reproduce the same statistics serially and in parallel
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from combat_simulator import CombatSimulator
+from deck_builder import OnePieceDeckBuilder
+from simulation_runner import plan_shards, derive_shard_seed, wilson_interval
+
+
+def test_shard_planning():
+    """Test that games are split into bounded shards"""
+    print("=" * 60)
+    print("Test: Shard Planning")
+    print("=" * 60)
+    
+    assert plan_shards(1000, 250) == [250, 250, 250, 250]
+    assert plan_shards(1001, 250) == [250, 250, 250, 250, 1]
+    assert plan_shards(10, 250) == [10]
+    assert plan_shards(0, 250) == []
+    print("✓ Shard sizes add up to the requested number of games")
+    
+    seeds = {derive_shard_seed(42, i) for i in range(100)}
+    assert len(seeds) == 100, "Shard seeds should be distinct"
+    assert derive_shard_seed(42, 3) == derive_shard_seed(42, 3), "Shard seeds should be stable"
+    print("✓ Shard seeds are distinct and reproducible")
+
+
+def test_parallel_matches_serial():
+    """Test that a seeded parallel run matches the serial run exactly"""
+    print("\n" + "=" * 60)
+    print("Test: Parallel Results Match Serial Results")
+    print("=" * 60)
+    
+    simulator = CombatSimulator()
+    builder = OnePieceDeckBuilder()
+    deck1 = builder.build_deck(strategy='aggressive', color='Red')
+    deck2 = builder.build_deck(strategy='control', color='Blue')
+    
+    serial = simulator.simulate_combat(deck1, deck2, num_simulations=200,
+                                       chunk_size=50, seed=1234)
+    parallel = simulator.simulate_combat(deck1, deck2, num_simulations=200,
+                                         workers=2, chunk_size=50, seed=1234)
+    
+    for key in ('wins', 'losses', 'simulations_run', 'avg_win_turns', 'avg_loss_turns'):
+        assert serial[key] == parallel[key], f"{key} differs: {serial[key]} vs {parallel[key]}"
+    print(f"✓ Serial and parallel runs agree: {serial['wins']} wins / {serial['simulations_run']} games")
+    
+    assert serial['wins'] + serial['losses'] == 200
+    print("✓ Merged win/loss counts cover every game")
+
+
+def test_adaptive_early_stopping():
+    """Test that a lopsided matchup stops once the interval is tight enough"""
+    print("\n" + "=" * 60)
+    print("Test: Adaptive Early Stopping")
+    print("=" * 60)
+    
+    low, high = wilson_interval(50, 100)
+    assert 0.39 < low < 0.41 and 0.59 < high < 0.61
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    print(f"✓ Wilson interval for 50/100: {low:.3f} - {high:.3f}")
+    
+    simulator = CombatSimulator()
+    builder = OnePieceDeckBuilder()
+    deck1 = builder.build_deck(strategy='aggressive', color='Red')
+    deck2 = builder.build_deck(strategy='control', color='Blue')
+    
+    results = simulator.simulate_combat(deck1, deck2, num_simulations=5000,
+                                        seed=7, ci_half_width=5.0)
+    interval = results['confidence_interval']
+    assert results['simulations_run'] <= 5000
+    assert results['wins'] + results['losses'] == results['simulations_run']
+    assert interval['low'] <= results['win_rate'] <= interval['high']
+    if results['stopped_early']:
+        assert (interval['high'] - interval['low']) / 2 <= 5.0
+    print(f"✓ Stopped after {results['simulations_run']} of 5000 games: "
+          f"{results['win_rate']}% ({interval['low']}% - {interval['high']}%)")
+    
+    parallel = simulator.simulate_combat(deck1, deck2, num_simulations=5000, workers=2,
+                                         seed=7, ci_half_width=5.0)
+    assert parallel['simulations_run'] == results['simulations_run']
+    assert parallel['wins'] == results['wins']
+    print("✓ Parallel adaptive run stops at the same shard")
+
+
+if __name__ == '__main__':
+    test_shard_planning()
+    test_parallel_matches_serial()
+    test_adaptive_early_stopping()
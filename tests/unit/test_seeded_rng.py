@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Test script for seeded random number generation
+Verifies that deck builders and the combat simulator are reproducible from a seed
+"""
+import sys
+import os
+import random
+
+import numpy as np
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from combat_simulator import CombatSimulator
+from deck_builder import OnePieceDeckBuilder
+from lorcana_deck_builder import LorcanaDeckBuilder
+from random_source import make_rng, make_seed
+
+
+def _names(deck):
+    return [card['name'] for card in deck['main_deck']]
+
+
+def test_random_sources():
+    """Test that seeds, Random instances and NumPy generators are accepted"""
+    print("=" * 60)
+    print("Test: Random Sources")
+    print("=" * 60)
+
+    assert make_seed(42) == 42
+    assert make_seed(random.Random(1)) == make_seed(random.Random(1))
+    assert make_seed(np.random.default_rng(1)) == make_seed(np.random.default_rng(1))
+    print("✓ Seeds are derived reproducibly from every kind of source")
+
+    shared = random.Random(3)
+    assert make_rng(shared) is shared
+    assert make_rng(7).random() == make_rng(7).random()
+    print("✓ random.Random instances are shared, seeds create new generators")
+
+
+def test_deck_builders_are_reproducible():
+    """Test that the same seed builds the same decks"""
+    print("\n" + "=" * 60)
+    print("Test: Reproducible Deck Building")
+    print("=" * 60)
+
+    deck1 = OnePieceDeckBuilder(seed=11).build_deck(strategy='aggressive', color='any')
+    deck2 = OnePieceDeckBuilder().build_deck(strategy='aggressive', color='any', seed=11)
+    assert deck1['leader']['name'] == deck2['leader']['name']
+    assert _names(deck1) == _names(deck2)
+    print(f"✓ One Piece deck reproduced from seed ({deck1['leader']['name']})")
+
+    improvements1 = OnePieceDeckBuilder(seed=5).suggest_improvements(deck1)
+    improvements2 = OnePieceDeckBuilder(seed=5).suggest_improvements(deck1)
+    for variant in improvements1:
+        assert _names(improvements1[variant]) == _names(improvements2[variant])
+    print("✓ Improvement suggestions reproduced from seed")
+
+    lorcana1 = LorcanaDeckBuilder(seed=np.random.default_rng(9)).build_deck()
+    lorcana2 = LorcanaDeckBuilder(seed=np.random.default_rng(9)).build_deck()
+    assert lorcana1['colors'] == lorcana2['colors']
+    assert _names(lorcana1) == _names(lorcana2)
+    print(f"✓ Lorcana deck reproduced from a NumPy generator ({lorcana1['colors']})")
+
+
+def test_simulation_accepts_generators():
+    """Test that the simulator accepts Random instances and NumPy generators"""
+    print("\n" + "=" * 60)
+    print("Test: Seeded Combat Simulation")
+    print("=" * 60)
+
+    simulator = CombatSimulator()
+    deck1 = OnePieceDeckBuilder(seed=1).build_deck(strategy='aggressive', color='Red')
+    deck2 = OnePieceDeckBuilder(seed=2).build_deck(strategy='control', color='Blue')
+
+    by_random = simulator.simulate_combat(deck1, deck2, num_simulations=200, seed=random.Random(4))
+    again = simulator.simulate_combat(deck1, deck2, num_simulations=200, seed=random.Random(4))
+    assert by_random['wins'] == again['wins']
+    print(f"✓ random.Random seed reproduces {by_random['wins']} wins")
+
+    by_numpy = simulator.simulate_combat(deck1, deck2, num_simulations=200, engine='batch',
+                                         seed=np.random.default_rng(4))
+    again = simulator.simulate_combat(deck1, deck2, num_simulations=200, engine='batch',
+                                      seed=np.random.default_rng(4))
+    assert by_numpy['wins'] == again['wins']
+    print(f"✓ NumPy Generator seed reproduces {by_numpy['wins']} wins")
+
+    game1 = simulator.simulate_game_with_rules(deck1, deck2, rng=8)
+    game2 = simulator.simulate_game_with_rules(deck1, deck2, rng=random.Random(8))
+    assert game1 == game2
+    print("✓ Single games are reproducible from a seed")
+
+
+if __name__ == '__main__':
+    test_random_sources()
+    test_deck_builders_are_reproducible()
+    test_simulation_accepts_generators()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Test script for the combat simulator benchmark
+Verifies the fixed deck set, reproducible results and regression detection
+"""
+import sys
+import os
+import copy
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from simulation_benchmark import (
+    compare_reports, load_benchmark_decks, percentile, plan_matchups, run_benchmark
+)
+
+
+def test_benchmark_decks_and_matchups():
+    """Test that the deck set holds structure and generated decks in a stable order"""
+    print("=" * 60)
+    print("Test: Benchmark Deck Set")
+    print("=" * 60)
+
+    decks = load_benchmark_decks(seed=5)
+    names = [name for name, _ in decks]
+    assert any(name.startswith('ST-') for name in names)
+    for strategy in ('aggressive', 'balanced', 'control'):
+        assert any(name.startswith(f'generated-{strategy}') for name in names)
+    assert all(deck['main_deck'] for _, deck in decks)
+    assert names == [name for name, _ in load_benchmark_decks(seed=5)]
+    print(f"✓ {len(decks)} decks loaded")
+
+    matchups = plan_matchups(decks)
+    assert len(matchups) == len(decks)
+    assert sorted(row for row, _ in matchups) == sorted(column for _, column in matchups)
+    assert percentile([3.0, 1.0, 2.0, 4.0], 0.5) == 2.0
+    assert percentile([3.0, 1.0, 2.0, 4.0], 0.99) == 4.0
+    print("✓ Every deck plays once on each side")
+
+
+def test_benchmark_is_reproducible_and_catches_regressions():
+    """Test that two runs play the same games and that slowdowns fail the comparison"""
+    print("\n" + "=" * 60)
+    print("Test: Benchmark Comparison")
+    print("=" * 60)
+
+    first = run_benchmark(games=20, repeats=2, seed=7, memory_games=5, max_matchups=3)
+    second = run_benchmark(games=20, repeats=2, seed=7, memory_games=5, max_matchups=3)
+    assert first['metrics']['games_per_second'] > 0
+    assert first['metrics']['p50_ms'] <= first['metrics']['p99_ms']
+    assert 'peak_kib_per_game' in first['metrics']
+    assert [m['wins'] for m in first['matchups'].values()] == \
+        [m['wins'] for m in second['matchups'].values()]
+    print(f"✓ Same seed plays the same games: {first['metrics']}")
+
+    # Loose tolerance so timing noise cannot fail the comparison
+    comparison = compare_reports(first, second, tolerance=10.0)
+    assert comparison['ok'] and not comparison['warnings']
+    print("✓ Identical settings compare cleanly")
+
+    slower = copy.deepcopy(first)
+    slower['metrics']['games_per_second'] = first['metrics']['games_per_second'] * 0.5
+    slower['metrics']['p99_ms'] = first['metrics']['p99_ms'] * 2
+    comparison = compare_reports(first, slower, tolerance=0.2)
+    assert not comparison['ok']
+    assert set(comparison['regressions']) == {'games_per_second', 'p99_ms'}
+    print(f"✓ Slowdown detected: {comparison['regressions']}")
+
+    changed = copy.deepcopy(first)
+    next(iter(changed['matchups'].values()))['wins'] += 1
+    assert compare_reports(first, changed)['warnings']
+    print("✓ Changed game results are flagged")
+
+
+if __name__ == '__main__':
+    test_benchmark_decks_and_matchups()
+    test_benchmark_is_reproducible_and_catches_regressions()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Test script for the combat simulation result cache
+Verifies content-addressed keys, eviction and both storage backends
+"""
+import sys
+import os
+import tempfile
+import time
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from combat_simulator import CombatSimulator
+from deck_builder import OnePieceDeckBuilder
+from simulation_cache import (
+    CacheBackend, MemoryLRUBackend, SQLiteBackend, SimulationCache, deck_hash, make_cache_key
+)
+
+
+def test_cache_key_is_content_addressed():
+    """Test that keys depend on deck contents, not card order"""
+    print("=" * 60)
+    print("Test: Content-Addressed Cache Keys")
+    print("=" * 60)
+
+    builder = OnePieceDeckBuilder()
+    deck1 = builder.build_deck(strategy='aggressive', color='Red')
+    deck2 = builder.build_deck(strategy='control', color='Blue')
+
+    shuffled = dict(deck1, main_deck=list(reversed(deck1['main_deck'])))
+    assert deck_hash(deck1) == deck_hash(shuffled)
+    print("✓ Card order does not change the deck hash")
+
+    key = make_cache_key(deck1, deck2, 1, num_simulations=100, seed=1)
+    assert key == make_cache_key(shuffled, deck2, 1, num_simulations=100, seed=1)
+    assert key != make_cache_key(deck2, deck1, 1, num_simulations=100, seed=1)
+    assert key != make_cache_key(deck1, deck2, 2, num_simulations=100, seed=1)
+    assert key != make_cache_key(deck1, deck2, 1, num_simulations=200, seed=1)
+    assert key != make_cache_key(deck1, deck2, 1, num_simulations=100, seed=2)
+    print("✓ Deck order, rules version, simulation count and seed all change the key")
+
+
+def test_memory_backend_eviction():
+    """Test LRU size eviction and TTL expiry of the in-process backend"""
+    print("\n" + "=" * 60)
+    print("Test: Memory Backend Eviction")
+    print("=" * 60)
+
+    cache = SimulationCache(MemoryLRUBackend(max_entries=2, ttl=None))
+    cache.set('a', {'value': 1})
+    cache.set('b', {'value': 2})
+    assert cache.get('a') == {'value': 1}  # 'a' becomes most recently used
+    cache.set('c', {'value': 3})
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    print("✓ Least recently used entry is evicted first")
+
+    stats = cache.stats()
+    assert stats['hits'] == 3 and stats['misses'] == 1 and stats['entries'] == 2
+    assert stats['backend'] == 'memory'
+    print(f"✓ Counters tracked: {stats}")
+
+    cache = SimulationCache(MemoryLRUBackend(max_entries=10, ttl=0.05))
+    cache.set('a', {'value': 1})
+    time.sleep(0.1)
+    assert cache.get('a') is None
+    print("✓ Expired entries are not returned")
+
+    class GetOnlyBackend(CacheBackend):
+        def get(self, key):
+            return None
+
+    try:
+        GetOnlyBackend()
+        assert False, "A backend missing methods should not be created"
+    except TypeError:
+        print("✓ Backends must implement the whole interface")
+
+
+def test_sqlite_backend_shared():
+    """Test that two SQLite backends on the same file share entries and counters"""
+    print("\n" + "=" * 60)
+    print("Test: SQLite Backend")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.sqlite3')
+        writer = SimulationCache(SQLiteBackend(path, max_entries=2, ttl=None))
+        reader = SimulationCache(SQLiteBackend(path, max_entries=2, ttl=None))
+
+        writer.set('a', {'win_rate': 55.5})
+        assert reader.get('a') == {'win_rate': 55.5}
+        assert reader.get('missing') is None
+        print("✓ Entries written by one backend are read by another")
+
+        writer.set('b', {'win_rate': 1})
+        writer.set('c', {'win_rate': 2})
+        assert writer.stats()['entries'] == 2
+        print("✓ Size limit is enforced")
+
+        stats = writer.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        print(f"✓ Counters are shared through the database: {stats}")
+
+
+def test_simulate_combat_uses_cache():
+    """Test that repeated simulations are served from the cache"""
+    print("\n" + "=" * 60)
+    print("Test: Cached Combat Simulation")
+    print("=" * 60)
+
+    simulator = CombatSimulator()
+    builder = OnePieceDeckBuilder()
+    deck1 = builder.build_deck(strategy='aggressive', color='Red')
+    deck2 = builder.build_deck(strategy='control', color='Blue')
+    cache = SimulationCache(MemoryLRUBackend())
+
+    first = simulator.simulate_combat(deck1, deck2, num_simulations=200, cache=cache)
+    second = simulator.simulate_combat(deck1, deck2, num_simulations=200, cache=cache)
+    assert not first['cached'] and second['cached']
+    assert first['wins'] == second['wins']
+    print(f"✓ Second request served from cache ({second['wins']} wins)")
+
+    uncached = simulator.simulate_combat(deck1, deck2, num_simulations=200,
+                                         seed=int(make_cache_key(
+                                             deck1, deck2, simulator.RULES_VERSION,
+                                             num_simulations=200, seed=None, engine='scalar',
+                                             chunk_size=None, ci_half_width=None,
+                                             confidence=0.95)[:16], 16))
+    assert uncached['wins'] == first['wins']
+    print("✓ Unseeded cached runs use a seed derived from the cache key")
+
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    print(f"✓ Cache stats: {stats}")
+
+
+if __name__ == '__main__':
+    test_cache_key_is_content_addressed()
+    test_memory_backend_eviction()
+    test_sqlite_backend_shared()
+    test_simulate_combat_uses_cache()
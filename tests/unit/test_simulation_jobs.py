@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Test script for asynchronous simulation jobs
+Verifies the SQLite job store, progress reporting and the worker threads
+"""
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+import time
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from combat_simulator import CombatSimulator
+from deck_builder import OnePieceDeckBuilder
+from simulation_jobs import (
+    SimulationJobQueue, SimulationJobStore, STALE_JOB_ERROR, STATUS_DONE, STATUS_FAILED,
+    STATUS_QUEUED, STATUS_RUNNING
+)
+
+
+def _simulation_runner(params, report_progress):
+    """Run a seeded simulation, reporting progress after every shard"""
+    simulator = CombatSimulator()
+    builder = OnePieceDeckBuilder(seed=params['seed'])
+    deck1 = builder.build_deck(strategy='aggressive', color='Red')
+    deck2 = builder.build_deck(strategy='control', color='Blue')
+    results = None
+    for event in simulator.iter_simulate_combat(deck1, deck2, num_simulations=params['games'],
+                                                chunk_size=50, seed=params['seed']):
+        if event['event'] == 'progress':
+            report_progress(event['progress'])
+        else:
+            results = event['results']
+    return {'wins': results['wins'], 'simulations_run': results['simulations_run']}
+
+
+def test_job_lifecycle():
+    """Test that a queued job is claimed once, reports progress and stores its result"""
+    print("=" * 60)
+    print("Test: Job Lifecycle")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SimulationJobStore(os.path.join(directory, 'jobs.sqlite3'))
+        queue = SimulationJobQueue(store, _simulation_runner)
+
+        job_id = store.create({'seed': 5, 'games': 200})
+        assert store.get(job_id)['status'] == STATUS_QUEUED
+        print("✓ Job queued")
+
+        assert queue.run_next()
+        assert not queue.run_next(), "A job should only be claimed once"
+        job = store.get(job_id)
+        assert job['status'] == STATUS_DONE
+        assert job['result']['simulations_run'] == 200
+        assert job['progress']['simulations_run'] == 200
+        assert job['progress']['simulations_requested'] == 200
+        print(f"✓ Job finished with progress recorded: {job['result']}")
+
+        assert store.get('missing') is None
+        print("✓ Unknown job ids return None")
+
+
+def test_failed_job():
+    """Test that runner errors mark the job as failed"""
+    print("\n" + "=" * 60)
+    print("Test: Failed Job")
+    print("=" * 60)
+
+    def broken_runner(params, report_progress):
+        raise RuntimeError('boom')
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SimulationJobStore(os.path.join(directory, 'jobs.sqlite3'))
+        queue = SimulationJobQueue(store, broken_runner)
+        job_id = store.create({})
+        queue.run_next()
+        job = store.get(job_id)
+        assert job['status'] == STATUS_FAILED and job['error'] == 'boom'
+        print("✓ Failure recorded")
+
+
+def test_stale_running_job():
+    """Test that a job left running by a dead worker is failed, and live jobs are not"""
+    print("\n" + "=" * 60)
+    print("Test: Stale Running Job")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'jobs.sqlite3')
+        store = SimulationJobStore(path, stale_after=60)
+        stale_id = store.create({'seed': 1, 'games': 50})
+        assert store.claim()['id'] == stale_id
+        # The worker that claimed the job died ten minutes ago
+        with sqlite3.connect(path) as conn:
+            conn.execute('UPDATE simulation_jobs SET updated_at = ? WHERE id = ?',
+                         (time.time() - 600, stale_id))
+        live_id = store.create({'seed': 2, 'games': 50})
+        assert store.claim()['id'] == live_id
+
+        stale = store.get(stale_id)
+        assert stale['status'] == STATUS_FAILED and stale['error'] == STALE_JOB_ERROR
+        assert store.get(live_id)['status'] == STATUS_RUNNING
+        print("✓ Stale job failed on the next claim")
+
+        # A slow job outlives stale_after; the sweep in another claim must spare it
+        store.stale_after = 0.2
+        time.sleep(0.3)
+
+        def slow_runner(params, report_progress):
+            time.sleep(0.5)
+            assert store.claim() is None
+            return store.get(params['id'])['status']
+
+        job_id = store.create({})
+        with sqlite3.connect(path) as conn:
+            conn.execute('UPDATE simulation_jobs SET params = ? WHERE id = ?',
+                         (json.dumps({'id': job_id}), job_id))
+        assert SimulationJobQueue(store, slow_runner).run_next()
+        assert store.get(live_id)['status'] == STATUS_FAILED
+        job = store.get(job_id)
+        assert job['status'] == STATUS_DONE and job['result'] == STATUS_RUNNING
+        print("✓ Heartbeats keep running jobs alive")
+
+
+def test_worker_threads():
+    """Test that submitted jobs are run by the background workers"""
+    print("\n" + "=" * 60)
+    print("Test: Worker Threads")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SimulationJobStore(os.path.join(directory, 'jobs.sqlite3'))
+        queue = SimulationJobQueue(store, _simulation_runner, workers=2, poll_interval=0.05)
+        job_ids = [queue.submit({'seed': seed, 'games': 100}) for seed in (1, 2, 3)]
+
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            if all(store.get(job_id)['status'] == STATUS_DONE for job_id in job_ids):
+                break
+            time.sleep(0.05)
+        queue.stop()
+        assert all(store.get(job_id)['status'] == STATUS_DONE for job_id in job_ids)
+        print(f"✓ {len(job_ids)} jobs completed in the background")
+
+
+if __name__ == '__main__':
+    test_job_lifecycle()
+    test_failed_job()
+    test_stale_running_job()
+    test_worker_threads()
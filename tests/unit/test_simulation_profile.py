@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Test script for per-phase simulation profiling
+Verifies that profiling reports every phase without changing the games played
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from combat_simulator import CombatSimulator
+from deck_builder import OnePieceDeckBuilder
+from simulation_profile import PHASE_NAMES, SimulationProfile, summarize_profile
+
+
+def _build_decks():
+    builder = OnePieceDeckBuilder(seed=8)
+    return (builder.build_deck(strategy='aggressive', color='Red'),
+            builder.build_deck(strategy='control', color='Blue'))
+
+
+def test_profile_does_not_change_results():
+    """Test that a profiled run plays the same games and reports every phase"""
+    print("=" * 60)
+    print("Test: Profiled Simulation")
+    print("=" * 60)
+
+    simulator = CombatSimulator()
+    deck1, deck2 = _build_decks()
+    plain = simulator.simulate_combat(deck1, deck2, num_simulations=200, chunk_size=50, seed=17)
+    profiled = simulator.simulate_combat(deck1, deck2, num_simulations=200, chunk_size=50,
+                                         seed=17, profile=True)
+
+    assert 'profile' not in plain
+    assert profiled['wins'] == plain['wins']
+    assert profiled['avg_win_turns'] == plain['avg_win_turns']
+    print(f"✓ Same results with profiling ({profiled['wins']} wins)")
+
+    profile = profiled['profile']
+    assert profile['games'] == 200
+    assert set(profile['phases']) == set(PHASE_NAMES)
+    for name in ('draw', 'play', 'blocker_scan', 'battle'):
+        assert profile['phases'][name]['calls'] > 0, name
+    # One draw and one play phase per turn, one blocker scan per attack
+    assert profile['phases']['draw']['calls'] == profile['phases']['play']['calls']
+    assert abs(profile['phases']['draw']['calls'] / 200 - profile['per_game']['turns']) < 0.01
+    assert profile['phases']['blocker_scan']['calls'] == profile['phases']['battle']['calls']
+    assert abs(sum(p['share'] for p in profile['phases'].values()) - 1) < 0.01
+    assert profile['per_game']['cards_played'] > 0
+    print(f"✓ Phase shares: {({name: p['share'] for name, p in profile['phases'].items()})}")
+    print(f"✓ Per game: {profile['per_game']}")
+
+
+def test_profile_counts_merge_across_shards():
+    """Test that flattened profile counts sum like the other shard counts"""
+    print("\n" + "=" * 60)
+    print("Test: Profile Count Merging")
+    print("=" * 60)
+
+    first = SimulationProfile()
+    first.games, first.turns, first.kos = 2, 20, 3
+    first.nanos[0], first.calls[0] = 1000, 10
+    second = SimulationProfile()
+    second.games, second.turns, second.kos = 2, 10, 1
+    second.nanos[0], second.calls[0] = 3000, 10
+
+    totals = {}
+    for counts in (first.to_counts(), second.to_counts()):
+        for key, value in counts.items():
+            totals[key] = totals.get(key, 0) + value
+
+    summary = summarize_profile(totals)
+    assert summary['games'] == 4
+    assert summary['per_game']['turns'] == 7.5
+    assert summary['per_game']['kos'] == 1.0
+    assert summary['phases']['draw']['calls'] == 20
+    assert summary['phases']['draw']['mean_us'] == 0.2
+    print("✓ Shard profiles add up")
+
+    try:
+        CombatSimulator().simulate_combat(*_build_decks(), num_simulations=10,
+                                          engine='batch', profile=True)
+        assert False, "Profiling the batch engine should be rejected"
+    except ValueError:
+        print("✓ Batch engine rejects profiling")
+
+
+if __name__ == '__main__':
+    test_profile_does_not_change_results()
+    test_profile_counts_merge_across_shards()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Test script for compact game replays
+Verifies sampling, varint encoding and that decoded replays match the game
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from combat_simulator import CombatSimulator
+from compiled_deck import compile_deck
+from deck_builder import OnePieceDeckBuilder
+from simulation_replay import _read_varint, _write_varint, decode_replay
+
+
+def _build_decks():
+    builder = OnePieceDeckBuilder(seed=13)
+    return (builder.build_deck(strategy='aggressive', color='Red'),
+            builder.build_deck(strategy='balanced', color='Green'))
+
+
+def test_varint_round_trip():
+    """Test that varints round-trip small and large values"""
+    print("=" * 60)
+    print("Test: Varint Encoding")
+    print("=" * 60)
+
+    values = [0, 1, 127, 128, 300, 16384, 2 ** 40]
+    buffer = bytearray()
+    for value in values:
+        _write_varint(buffer, value)
+    assert len(buffer) < 8 * len(values)
+
+    position = 0
+    decoded = []
+    while position < len(buffer):
+        value, position = _read_varint(bytes(buffer), position)
+        decoded.append(value)
+    assert decoded == values
+    print(f"✓ {len(values)} values in {len(buffer)} bytes")
+
+
+def test_sampled_replays_match_results():
+    """Test that replays are sampled, leave results unchanged and decode consistently"""
+    print("\n" + "=" * 60)
+    print("Test: Sampled Replays")
+    print("=" * 60)
+
+    simulator = CombatSimulator()
+    deck1, deck2 = _build_decks()
+    plain = simulator.simulate_combat(deck1, deck2, num_simulations=300, chunk_size=100, seed=5)
+    recorded = simulator.simulate_combat(deck1, deck2, num_simulations=300, chunk_size=100,
+                                         seed=5, replay_every=50)
+
+    assert 'replays' not in plain
+    assert recorded['wins'] == plain['wins']
+    replays = recorded['replays']
+    assert [replay['game'] for replay in replays] == [0, 50, 100, 150, 200, 250]
+    print(f"✓ {len(replays)} of 300 games recorded, results unchanged")
+
+    compiled1, compiled2 = compile_deck(deck1), compile_deck(deck2)
+    for replay in replays:
+        events = decode_replay(replay['data'], compiled1, compiled2)
+        assert events[0]['event'] == 'start'
+        assert events[-1] == {'event': 'end', 'winner': replay['winner'], 'turns': replay['turns']}
+
+        turns = [event['turn'] for event in events if event['event'] == 'turn']
+        assert turns == list(range(1, replay['turns'] + 1))
+
+        # Opening hands plus one draw per turn while the library lasts
+        draws = [event for event in events if event['event'] == 'draw']
+        assert len(draws) >= 10
+        for event in events:
+            if event['event'] in ('draw', 'play', 'block', 'ko'):
+                deck = compiled1 if event['player'] == 1 else compiled2
+                assert event['name'] == deck.cards[event['slot']].name
+
+        # Leader damage decides the winner unless the game hit the turn limit
+        damage = {1: 0, 2: 0}
+        for event in events:
+            if event['event'] == 'damage':
+                damage[event['player']] += event['amount']
+        loser = 2 if replay['winner'] == 1 else 1
+        if replay['turns'] < CombatSimulator.MAX_TURNS:
+            life = compiled1.leader_life if loser == 1 else compiled2.leader_life
+            assert damage[loser] >= life
+    average = sum(len(replay['data']) for replay in replays) * 3 / 4 / len(replays)
+    print(f"✓ Replays decode to consistent games (~{average:.0f} bytes each)")
+
+    try:
+        simulator.simulate_combat(deck1, deck2, num_simulations=10, engine='batch', replay_every=5)
+        assert False, "Replays on the batch engine should be rejected"
+    except ValueError:
+        print("✓ Batch engine rejects replays")
+
+
+if __name__ == '__main__':
+    test_varint_round_trip()
+    test_sampled_replays_match_results()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Test script for simulated tournaments
+Verifies round-robin scheduling, Swiss pairing, standings and the
+pairwise matchup cache
+"""
+import sys
+import os
+
+# Add the project root directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from cards_data import ONEPIECE_CARDS
+from deck_builder import OnePieceDeckBuilder
+from simulation_cache import create_simulation_cache
+from simulation_tournament import (
+    TournamentRunner, WIN_POINTS, round_robin_schedule, structure_deck_pool, tournament_rounds
+)
+
+
+def _build_pool(count):
+    builder = OnePieceDeckBuilder(seed=17)
+    strategies = [('aggressive', 'Red'), ('balanced', 'Green'), ('control', 'Blue')]
+    decks = structure_deck_pool(ONEPIECE_CARDS)[:count]
+    while len(decks) < count:
+        strategy, color = strategies[len(decks) % len(strategies)]
+        decks.append(builder.build_deck(strategy=strategy, color=color))
+    return decks
+
+
+def test_round_robin_schedule():
+    """Test that every pair meets exactly once and odd fields get one bye each"""
+    print("=" * 60)
+    print("Test: Round-Robin Schedule")
+    print("=" * 60)
+
+    for count in (2, 7, 8, 64):
+        schedule = round_robin_schedule(count)
+        pairs = [tuple(sorted(p)) for round_ in schedule for p in round_ if p[1] is not None]
+        assert len(pairs) == len(set(pairs)) == count * (count - 1) // 2
+        for round_ in schedule:
+            players = [p for pair in round_ for p in pair if p is not None]
+            assert len(players) == len(set(players))
+        byes = [pair[0] for round_ in schedule for pair in round_ if pair[1] is None]
+        assert sorted(byes) == (list(range(count)) if count % 2 else [])
+        assert tournament_rounds(count, 'round_robin') == len(schedule)
+        assert tournament_rounds(count, 'round_robin', rounds=2) == min(2, len(schedule))
+        print(f"✓ {count} decks: {len(schedule)} rounds, {len(pairs)} matches")
+    assert tournament_rounds(0, 'round_robin') == len(round_robin_schedule(0)) == 0
+    assert tournament_rounds(9, 'swiss') == 4 and tournament_rounds(9, 'swiss', rounds=6) == 6
+
+
+def test_round_robin_tournament():
+    """Test standings of a round robin and that a rerun reuses every matchup"""
+    print("\n" + "=" * 60)
+    print("Test: Round-Robin Tournament")
+    print("=" * 60)
+
+    decks = _build_pool(8)
+    runner = TournamentRunner(games_per_match=40)
+    events = list(runner.iter_run(decks, 'round_robin', seed=5))
+    rounds = [event['round'] for event in events if event['event'] == 'round']
+    assert len(rounds) == 7
+    results = events[-1]['results']
+    assert events[-1]['event'] == 'result'
+
+    standings = results['standings']
+    assert [entry['rank'] for entry in standings] == list(range(1, 9))
+    assert all(entry['wins'] + entry['losses'] + entry['draws'] == 7 for entry in standings)
+    points = [entry['points'] for entry in standings]
+    assert points == sorted(points, reverse=True)
+    assert sum(entry['wins'] for entry in standings) == sum(entry['losses'] for entry in standings)
+    print(f"✓ Winner: {standings[0]['name']} with {standings[0]['points']} points")
+
+    rerun = runner.run(decks, 'round_robin', seed=5)
+    assert rerun['matchups_simulated'] == 0
+    assert rerun['matchups_reused'] == 28
+    assert rerun['standings'] == standings
+    print("✓ A rerun reuses all 28 matchups and gives the same standings")
+
+
+def test_swiss_tournament():
+    """Test Swiss pairings, byes and the shared result cache"""
+    print("\n" + "=" * 60)
+    print("Test: Swiss Tournament")
+    print("=" * 60)
+
+    decks = _build_pool(9)
+    cache = create_simulation_cache('memory')
+    results = TournamentRunner(games_per_match=30, cache=cache).run(decks, 'swiss', seed=2)
+    assert results['rounds'] == 4
+    standings = results['standings']
+    assert all(entry['wins'] + entry['losses'] + entry['draws'] == 4 for entry in standings)
+    assert all(entry['points'] == entry['wins'] * WIN_POINTS + entry['draws'] for entry in standings)
+    print(f"✓ 9 decks over {results['rounds']} rounds, leader has {standings[0]['points']} points")
+
+    # Byes go to a different deck every round and count as a win
+    runner = TournamentRunner(games_per_match=30, cache=cache)
+    byes = [match['deck1'] for event in runner.iter_run(decks, 'swiss', seed=2)
+            if event['event'] == 'round'
+            for match in event['round']['matches'] if match['deck2'] is None]
+    assert len(byes) == len(set(byes)) == 4
+    print(f"✓ Byes: {byes}")
+
+    # A new runner finds every matchup in the shared cache
+    assert runner.matchups_simulated == 0
+    assert cache.stats()['hits'] > 0
+    print(f"✓ Second runner reused {runner.matchups_reused} cached matchups")
+
+    try:
+        runner.run(decks, 'knockout')
+        assert False, "Unknown formats should be rejected"
+    except ValueError:
+        print("✓ Unknown formats are rejected")
+
+
+if __name__ == '__main__':
+    test_round_robin_schedule()
+    test_round_robin_tournament()
+    test_swiss_tournament()